@@ -16,12 +16,17 @@ const int flowPin = 2;  // YF-S302 sinyal pini (D2)
  // --- OLED TANIMLAMA (U8G2 Kütüphanesi ile) --
 // Adres 0x3C, SH1106 veya SSD1306 128x64 için en uygun kurulum
  U8G2_SSD1306_128X64_NONAME_F_HW_I2C u8g2(U8G2_R0, U8X8_PIN_NONE); 
+// --- SERİ PROTOKOL --
+// 0: metin "flow,cumulative,ir" (varsayılan)
+// 1: 15 baytlık ikili çerçeve (A5 5A | sıra no | flow | toplam | ir | CRC16), Python otomatik algılar
+#define IKILI_PROTOKOL 0
 // --- DEĞİŞKENLER --
 volatile int pulseCount = 0;    // Akış sensöründen gelen pulse sayısı
  float calibrationFactor = 7.5;  // YF-S302 için yaklaşık katsayı (pulse → litre/dk)
 float flowRate = 0.0;           // Anlık debi (L/dk)
  float totalLiters = 0.0;        // Toplam tüketim (L)
  unsigned long oldTime = 0;      // Zaman ölçümü için (ms)
+ uint16_t seqNo = 0;             // İkili çerçeve sıra numarası (kayıp tespiti için)
  // ---------------------------
 // PULSE INTERRUPT FONKSİYONU
  // ---------------------------
@@ -29,6 +34,35 @@ void pulseCounter() {
  pulseCount++;
  }
  // ---------------------------
+// CRC-16/CCITT-FALSE (başlangıç 0xFFFF, polinom 0x1021)
+ // ---------------------------
+uint16_t crc16(const uint8_t *data, uint8_t len) {
+ uint16_t crc = 0xFFFF;
+ for (uint8_t i = 0; i < len; i++) {
+ crc ^= (uint16_t)data[i] << 8;
+ for (uint8_t b = 0; b < 8; b++) {
+ crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : (crc << 1);
+ }
+ }
+ return crc;
+ }
+ // ---------------------------
+// İkili çerçeve gönderimi (alanlar little-endian, AVR'de float 4 bayt IEEE-754)
+ // ---------------------------
+void sendFrame(float flow, float total, uint8_t ir) {
+ uint8_t frame[15];
+ frame[0] = 0xA5;
+ frame[1] = 0x5A;
+ memcpy(frame + 2, &seqNo, 2);
+ memcpy(frame + 4, &flow, 4);
+ memcpy(frame + 8, &total, 4);
+ frame[12] = ir;
+ uint16_t crc = crc16(frame + 2, 11);
+ memcpy(frame + 13, &crc, 2);
+ Serial.write(frame, sizeof(frame));
+ seqNo++;
+ }
+ // ---------------------------
 // Kurulum
  // ---------------------------
 void setup() {
@@ -47,6 +81,8 @@ digitalWrite(greenLedPin, LOW);
  u8g2.begin();
  u8g2.clearDisplay();
  oldTime = millis();  
+ // Python tarafına hazır olduğunu bildir (port açılınca kart yeniden başlar; sabit bekleme yerine bu satır beklenir)
+ Serial.println("HAZIR");
 }
  // ---------------------------
 // Ana döngü
@@ -78,12 +114,16 @@ digitalWrite(redLedPin, LOW);
  // --- 2. OLED Güncelleme --
 updateDisplayU8g2(pulses, irState);
  // --- 3. Python Çıktısı (Seri Port) --
+#if IKILI_PROTOKOL
+ sendFrame(flowRate, totalLiters, (uint8_t)irState);
+#else
 // Format: flow,cumulative,ir
  Serial.print(flowRate, 2);  
 Serial.print(",");
  Serial.print(totalLiters, 2);
  Serial.print(",");
  Serial.println(irState);
+#endif
 // Zamanı güncelle
  oldTime = currentTime;
  }
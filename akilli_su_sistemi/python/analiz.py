@@ -0,0 +1,8 @@
+# GEÇMİŞ ÜZERİNDE ZAMAN ARALIĞI SORGULARI
+# Sorgu kodu su_izleme/sorgu.py'ye taşındı; bu betik eski kullanım için kalır:
+#   python analiz.py --bas ... --bit ...  ile  python -m su_izleme report --bas ... --bit ...  aynıdır
+
+from su_izleme.sorgu import BLOK, GecmisSorgusu, ZamanIndeksi, main  # noqa: F401
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+# SU İZLEME PAKETİ
+# Canlı izleme, raporlar, grafikler ve ölçümler; tek giriş noktası: python -m su_izleme <komut>
+# (bkz. su_izleme/cli.py). Water1/2/3.py canlı izlemenin ön ayarlı betikleridir.
+# Not: Paket içe aktarılırken pandas/matplotlib yüklenmez; ağır modüller ihtiyaç anında yüklenir.
+
+# CSV ve bellek içi depo için ortak sütun sırası
+SUTUNLAR = ["timestamp", "flow_lpm", "cumulative_liters", "ir_state"]
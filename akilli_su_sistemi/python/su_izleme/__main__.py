@@ -0,0 +1,6 @@
+# python -m su_izleme <komut>  (bkz. su_izleme/cli.py)
+
+from su_izleme.cli import main
+
+if __name__ == "__main__":  # Süreç havuzları ("spawn") bu modülü __mp_main__ adıyla yeniden yükler
+    main()
@@ -0,0 +1,48 @@
+# HIZLI AÇILIŞ YARDIMCILARI
+# Betikler eskiden açılışta önce pandas/matplotlib'i yüklüyor, sonra geçmişi okuyor, seri portu açtıktan
+# sonra da Arduino'nun yeniden başlaması için sabit 2 saniye bekliyordu; elektrik kesintisinden sonra
+# bu süre boyunca gelen örnekler kayboluyordu. Burada:
+#   - Ağır modüllerin arka planda içe aktarılması (ilk kullanıldıkları ana kadar hazır olurlar;
+#     ihtiyaç duyan kod normal "import" yazar, yükleme sürüyorsa Python'un içe aktarma kilidi bekletir)
+#   - Sabit bekleme yerine hazır el sıkışması: Arduino setup() sonunda HAZIR_ISARETI satırını basar
+# Ölçüm:  python -m su_izleme.bench.acilis  (python -X importtime ile)
+
+import importlib
+import threading
+import time
+
+HAZIR_ISARETI = b"HAZIR"  # Water2.ino setup() sonunda Serial.println("HAZIR")
+HAZIR_ZAMAN_ASIMI = 3.0  # Saniye; işaret gelmezse (eski çizim, USB-seri çevirici) beklemeden devam edilir
+
+
+def arka_planda_ice_aktar(*moduller):
+    """Modülleri daemon iş parçacığında içe aktarır; iş parçacığını döndürür"""
+
+    def yukle():
+        for modul in moduller:
+            try:
+                importlib.import_module(modul)
+            except Exception as e:
+                print(f"'{modul}' yüklenemedi: {e}")
+
+    is_parcacigi = threading.Thread(target=yukle, name="arka-plan-ice-aktarma", daemon=True)
+    is_parcacigi.start()
+    return is_parcacigi
+
+
+def hazir_bekle(ser, zaman_asimi=HAZIR_ZAMAN_ASIMI):
+    """Arduino'nun hazır olduğunu bildirmesini bekler; (hazır mı, okunan baytlar) döndürür.
+
+    HAZIR_ISARETI veya tam bir veri satırı gelince hemen döner. Okunan baytlar atılmaz:
+    işaretten sonraki kısım (işaret yoksa hepsi) ayrıştırıcıya verilmek üzere döndürülür.
+    """
+    bitis = time.monotonic() + zaman_asimi
+    tampon = b""
+    while time.monotonic() < bitis:
+        tampon += ser.read(max(getattr(ser, "in_waiting", 0), 1))
+        konum = tampon.find(HAZIR_ISARETI)
+        if konum >= 0:
+            return True, tampon[konum + len(HAZIR_ISARETI):].lstrip(b"\r\n")
+        if b"," in tampon.rpartition(b"\n")[0]:  # İşaretsiz çizim: veri zaten akıyor
+            return True, tampon
+    return False, tampon
@@ -0,0 +1,308 @@
+# ÇOKLU SAYAÇ AĞ GEÇİDİ (asyncio)
+# Her musluk için ayrı bir Python süreci çalıştırmak yerine, onlarca YF-S302 sayacını
+# (seri port, pty veya tcp://host:port) tek süreçte eşzamanlı okur. Her örnek sayaç
+# kimliğiyle etiketlenir ve ortak bir kuyruk üzerinden depo/analiz işleyicisine iletilir.
+# Her bağlantıda metin/ikili protokol otomatik algılanır (su_izleme/ikili.py).
+#
+# Kullanım:
+#   python -m su_izleme.ag_gecidi --sayac mutfak=/dev/ttyUSB0 --sayac banyo=tcp://127.0.0.1:9000 \
+#       [--veri-dizini veri] [--baud 9600]
+
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+
+from su_izleme.depo import VeriDeposu
+from su_izleme.anomali import AnomaliDedektoru
+from su_izleme.ikili import OtomatikCozucu
+from su_izleme.normallestir import SayacNormallestirici
+from su_izleme.ozet import Ozetleyici
+from su_izleme.profil import SAPMA_ESIGI, HaftalikProfil
+from su_izleme.tuketim import ArtimliAnaliz
+
+YENIDEN_BAGLANMA_S = 2.0  # Kopan bağlantı bu kadar saniye sonra yeniden denenir
+
+
+async def kaynak_ac(kaynak, baud=9600):
+    """Kaynağı açar, (asyncio.StreamReader, kapatma fonksiyonu) döndürür"""
+    loop = asyncio.get_running_loop()
+    if kaynak.startswith("tcp://"):
+        host, _, port = kaynak[len("tcp://"):].rpartition(":")
+        reader, writer = await asyncio.open_connection(host, int(port))
+        return reader, writer.close
+
+    try:
+        import serial
+    except ImportError:
+        serial = None
+
+    reader = asyncio.StreamReader()
+    if os.name == "posix":
+        # Seri port/pty dosya tanımlayıcısı olay döngüsüne doğrudan bağlanır (iş parçacığı yok)
+        if serial is not None:
+            ser = serial.Serial(kaynak, baud, timeout=0)
+            fd, kapat = ser.fileno(), ser.close
+        else:
+            fd = os.open(kaynak, os.O_RDONLY | os.O_NONBLOCK | os.O_NOCTTY)
+            kapat = lambda: os.close(fd)  # noqa: E731
+        dosya = open(fd, "rb", buffering=0, closefd=False)
+        transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), dosya)
+
+        def kapat_hepsi():
+            transport.close()
+            kapat()
+        return reader, kapat_hepsi
+
+    # Windows: COM portları olay döngüsüne bağlanamaz, engelleyen okuma bir iş parçacığında yapılır
+    if serial is None:
+        raise RuntimeError("Seri port için pyserial gerekli")
+    ser = serial.Serial(kaynak, baud, timeout=0.5)
+
+    async def pompala():
+        while ser.is_open:
+            veri = await loop.run_in_executor(None, ser.read, max(ser.in_waiting, 1))
+            if veri:
+                reader.feed_data(veri)
+        reader.feed_eof()
+
+    gorev = asyncio.ensure_future(pompala())
+
+    def kapat_seri():
+        gorev.cancel()
+        ser.close()
+    return reader, kapat_seri
+
+
+class SayacIstatistik:
+    __slots__ = ("okunan", "ornek", "hatali", "dusen", "kayip", "baglanti", "son_ornek")
+
+    def __init__(self):
+        self.okunan = self.ornek = self.hatali = self.dusen = self.kayip = self.baglanti = 0
+        self.son_ornek = None
+
+
+class AgGecidi:
+    """N kaynağı tek olay döngüsünde okuyup etiketli örnekleri işleyiciye ileten ağ geçidi.
+
+    isleyici(toplu) çağrılır; toplu, (sayac, ts, flow, cumulative, ir) demetlerinden oluşan
+    bir listedir. İşleyici bir coroutine döndürürse beklenir.
+    """
+
+    def __init__(self, sayaclar, isleyici, baud=9600, kuyruk_boyu=100_000, max_toplu=4096):
+        self.sayaclar = dict(sayaclar)
+        self.isleyici = isleyici
+        self.baud = baud
+        self.max_toplu = max_toplu
+        self.kuyruk = None
+        self._kuyruk_boyu = kuyruk_boyu
+        self._gorevler = []
+        self._kapaticilar = {}
+        self.istatistik = {kimlik: SayacIstatistik() for kimlik in self.sayaclar}
+
+    async def _oku(self, kimlik, kaynak):
+        ist = self.istatistik[kimlik]
+        while True:
+            try:
+                reader, kapat = await kaynak_ac(kaynak, self.baud)
+            except (OSError, RuntimeError) as e:
+                print(f"[{kimlik}] {kaynak} açılamadı: {e}")
+                await asyncio.sleep(YENIDEN_BAGLANMA_S)
+                continue
+            ist.baglanti += 1
+            self._kapaticilar[kimlik] = kapat
+            cozucu = OtomatikCozucu()  # Yeniden bağlanan cihaz protokolünü değiştirmiş olabilir
+            hatali, kayip = ist.hatali, ist.kayip
+            try:
+                while True:
+                    ham = await reader.read(65536)
+                    if not ham:
+                        break  # Bağlantı kapandı
+                    ts = datetime.now()
+                    ist.okunan += 1
+                    flow, cumulative, ir = cozucu.besle(ham)
+                    ist.hatali, ist.kayip = hatali + cozucu.hatali, kayip + cozucu.kayip
+                    for degerler in zip(flow.tolist(), cumulative.tolist(), ir.tolist()):
+                        try:
+                            self.kuyruk.put_nowait((kimlik, ts) + degerler)
+                            ist.ornek += 1
+                            ist.son_ornek = ts
+                        except asyncio.QueueFull:
+                            ist.dusen += 1
+            except OSError as e:
+                print(f"[{kimlik}] okuma hatası: {e}")
+            finally:
+                self._kapaticilar.pop(kimlik, None)
+                kapat()
+            await asyncio.sleep(YENIDEN_BAGLANMA_S)
+
+    async def _tuket(self):
+        while True:
+            toplu = [await self.kuyruk.get()]
+            while len(toplu) < self.max_toplu and not self.kuyruk.empty():
+                toplu.append(self.kuyruk.get_nowait())
+            try:
+                sonuc = self.isleyici(toplu)
+                if asyncio.iscoroutine(sonuc):
+                    await sonuc
+            except Exception as e:
+                print(f"Ağ geçidi işleyici hatası: {e}")
+
+    async def baslat(self):
+        self.kuyruk = asyncio.Queue(maxsize=self._kuyruk_boyu)
+        self._gorevler = [asyncio.create_task(self._oku(k, v)) for k, v in self.sayaclar.items()]
+        self._gorevler.append(asyncio.create_task(self._tuket()))
+
+    async def durdur(self):
+        for gorev in self._gorevler:
+            gorev.cancel()
+        await asyncio.gather(*self._gorevler, return_exceptions=True)
+        # Kuyrukta kalanlar işleyiciye teslim edilir
+        kalan = []
+        while self.kuyruk is not None and not self.kuyruk.empty():
+            kalan.append(self.kuyruk.get_nowait())
+        if kalan:
+            sonuc = self.isleyici(kalan)
+            if asyncio.iscoroutine(sonuc):
+                await sonuc
+
+    def durum_satiri(self):
+        toplam = sum(i.ornek for i in self.istatistik.values())
+        hatali = sum(i.hatali for i in self.istatistik.values())
+        dusen = sum(i.dusen for i in self.istatistik.values())
+        kayip = sum(i.kayip for i in self.istatistik.values())
+        bagli = len(self._kapaticilar)
+        return (f"Sayaç: {bagli}/{len(self.sayaclar)} bağlı | Örnek: {toplam} | Hatalı: {hatali} | "
+                f"Düşen: {dusen} | Kayıp: {kayip} | Kuyruk: {self.kuyruk.qsize() if self.kuyruk else 0}")
+
+
+class CokluSayacDeposu:
+    """Ağ geçidi işleyicisi: örnekleri sayaç başına bellek deposuna, artımlı analize ve
+    (veri_dizini verilmişse) <veri_dizini>/<sayac>/ altındaki sütunsal depoya yazar.
+    Her sayacın 1 dk / 1 sa / 1 gün özetleri de güncellenir (<veri_dizini>/<sayac>.ozet/) ve örnekler
+    sayaç başına anomali dedektöründen geçirilir; uyarılar anında yazdırılır. Sayaç sıfırlamalarına
+    rağmen artan ömür boyu toplam <veri_dizini>/<sayac>.sayac.json kontrol noktasıyla tutulur.
+    Tüm sayaçların haftalık profili tek matriste tutulur (<veri_dizini>/profil.npz); kapanan saatler
+    kendi sayacının profiline göre skorlanıp olağan dışı olanlar uyarılır."""
+
+    def __init__(self, veri_dizini=None, pencere=86_400, sapma_esigi=SAPMA_ESIGI):
+        self.veri_dizini = veri_dizini
+        self.pencere = pencere
+        self.sapma_esigi = sapma_esigi
+        self.profil = HaftalikProfil(os.path.join(veri_dizini, "profil.npz") if veri_dizini else None)
+        self.depolar = {}
+        self.analizler = {}
+        self.kolonlar = {}
+        self.ozetler = {}
+        self.dedektorler = {}
+        self.sayaclar = {}
+
+    def _sayac(self, kimlik):
+        if kimlik not in self.depolar:
+            self.depolar[kimlik] = VeriDeposu(pencere=self.pencere)
+            self.analizler[kimlik] = ArtimliAnaliz()
+            self.dedektorler[kimlik] = AnomaliDedektoru()
+            if self.veri_dizini:
+                from su_izleme.kalici import KolonDeposu
+
+                kolon = self.kolonlar[kimlik] = KolonDeposu(os.path.join(self.veri_dizini, kimlik))
+                ozet = self.ozetler[kimlik] = Ozetleyici(os.path.join(self.veri_dizini, kimlik + ".ozet"))
+                sayac = self.sayaclar[kimlik] = SayacNormallestirici(
+                    os.path.join(self.veri_dizini, kimlik + ".sayac.json"))
+                if len(kolon):
+                    gecmis = kolon.yukle()
+                    ozet.yakala(gecmis["timestamp"], gecmis["flow_lpm"],
+                                gecmis["cumulative_liters"], gecmis["ir_state"])
+                    sayac.yakala(gecmis["timestamp"], gecmis["cumulative_liters"])
+                    self.profil.ornek_ekle(gecmis["timestamp"], gecmis["flow_lpm"], kimlik)
+                    self.profil.saat_ekle(self.profil.yeni_saatler(ozet, kimlik), kimlik)
+            else:
+                self.ozetler[kimlik] = Ozetleyici()
+                self.sayaclar[kimlik] = SayacNormallestirici()
+        return kimlik
+
+    def __call__(self, toplu):
+        gruplar = {}
+        for kimlik, *ornek in toplu:
+            gruplar.setdefault(kimlik, []).append(ornek)
+        for kimlik, ornekler in gruplar.items():
+            self._sayac(kimlik)
+            sutunlar = list(zip(*ornekler))
+            diziler = [np.array(sutunlar[0], dtype="datetime64[ns]")] + [np.asarray(s) for s in sutunlar[1:]]
+            self.depolar[kimlik].ekle_toplu(*diziler)
+            self.analizler[kimlik].toplu_guncelle(*diziler)
+            self.ozetler[kimlik].ekle_toplu(*diziler)
+            self.sayaclar[kimlik].toplu(diziler[0], diziler[2])
+            alarmlar = self.dedektorler[kimlik].toplu_guncelle(diziler[0], diziler[1], diziler[3])
+            self.profil.ornek_ekle(diziler[0], diziler[1], kimlik)
+            saatler = self.profil.yeni_saatler(self.ozetler[kimlik], kimlik)
+            if len(saatler):
+                profil_alarmlari = self.profil.saat_alarmlari(saatler, self.sapma_esigi, kimlik)
+                self.profil.saat_ekle(saatler, kimlik)
+                self.dedektorler[kimlik].ekle(profil_alarmlari)
+                alarmlar = alarmlar + profil_alarmlari
+            for alarm in alarmlar:
+                print(f"[{kimlik}] UYARI {alarm}")
+            if kimlik in self.kolonlar:
+                self.kolonlar[kimlik].ekle_toplu(*diziler)
+
+    def kaydet(self):
+        """Özet katmanlarını, haftalık profili ve sayaç kontrol noktalarını diske yazar"""
+        for ozet in self.ozetler.values():
+            ozet.kaydet()
+        self.profil.kaydet()
+        for sayac in self.sayaclar.values():
+            sayac.kaydet()
+
+    def ozet(self):
+        """Sayaç başına (kayıt, ortalama debi, ömür boyu toplam, gereksiz) özeti"""
+        return {k: {"kayit": a.kayit_sayisi, "ortalama_debi": a.ortalama_debi(),
+                    "toplam": round(self.sayaclar[k].omur_toplam, 2), "gereksiz": a.gereksiz_tuketim(),
+                    "sifirlama": self.sayaclar[k].sifirlama_sayisi,
+                    "anomali": self.dedektorler[k].alarm_sayisi}
+                for k, a in self.analizler.items()}
+
+
+def _sayac_ayristir(deger):
+    kimlik, ayrac, kaynak = deger.partition("=")
+    if not ayrac or not kimlik or not kaynak:
+        raise argparse.ArgumentTypeError("Biçim: KİMLİK=KAYNAK (ör. mutfak=/dev/ttyUSB0)")
+    return kimlik, kaynak
+
+
+async def _ana(args):
+    depo = CokluSayacDeposu(args.veri_dizini)
+    gecit = AgGecidi(dict(args.sayac), depo, baud=args.baud)
+    await gecit.baslat()
+    print(f"Ağ geçidi başlatıldı: {len(gecit.sayaclar)} sayaç (Ctrl+C ile durdur)")
+    try:
+        while True:
+            await asyncio.sleep(args.rapor_araligi)
+            print(f"[{time.strftime('%H:%M:%S')}] {gecit.durum_satiri()}")
+            depo.kaydet()
+    finally:
+        await gecit.durdur()
+        depo.kaydet()
+        for kimlik, ozet in sorted(depo.ozet().items()):
+            print(f"{kimlik}: {ozet}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Çoklu sayaç asyncio ağ geçidi")
+    parser.add_argument("--sayac", type=_sayac_ayristir, action="append", required=True,
+                        help="KİMLİK=KAYNAK; kaynak seri port, pty yolu veya tcp://host:port")
+    parser.add_argument("--baud", type=int, default=9600)
+    parser.add_argument("--veri-dizini", help="Sayaç başına sütunsal depo dizini")
+    parser.add_argument("--rapor-araligi", type=float, default=10.0, help="Durum satırı aralığı (s)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_ana(args))
+    except KeyboardInterrupt:
+        print("\nAğ geçidi durduruldu.")
+
+
+if __name__ == "__main__":
+    main()
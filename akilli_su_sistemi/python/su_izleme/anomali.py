@@ -0,0 +1,195 @@
+# AKIŞ İÇİ SIZINTI / ANOMALİ DEDEKTÖRÜ
+# optimizasyon_analizi sadece ortalama debiyi eşikle karşılaştırıyor ve her UPDATE_INTERVAL
+# kayıtta tüm geçmişi tarıyordu; açık kalan bir musluk geç fark ediliyordu. Bu dedektör her
+# örneği geldiği anda, sabit bellek ve sabit maliyetle işler. Üç kural vardır:
+#
+#   surekli_akis    Kişi yokken (IR=0) debi AKIS_ESIGI'nin üzerinde SUREKLI_DK dakikadan uzun sürdü
+#                   (açık unutulmuş musluk, patlak). Olay bitene kadar bir kez uyarılır.
+#   taban_kayma     Kişi yokken ölçülen (taban) debide yukarı yönlü kayma: taban debinin EWMA ortalaması
+#                   ve sapması referans alınır, standartlaştırılmış değerler tek yönlü CUSUM'da biriktirilir.
+#                   CUSUM eşiği aşınca uyarılır. CUSUM sıfırdayken referans güncellenir, böylece
+#                   yavaş bir sızıntı referansın içine karışmaz.
+#   gece_sizintisi  Gece penceresinde (ör. 02-05) kişi yokken alınan örneklerin çoğunda debi > 0
+#                   (asgari gece debisi sıfıra hiç inmedi: rezervuar, damlayan musluk). Pencere bitince
+#                   bir kez değerlendirilir.
+#
+# Zaman damgaları yerel saattir (CSV'deki gibi); saat doğrudan damgadan hesaplanır.
+# Debisi sayı olmayan (NaN, sonsuz) örnekler atlanır: tek bir NaN referansı ve CUSUM'u kalıcı bozardı.
+
+import math
+from collections import deque
+
+import numpy as np
+
+AKIS_ESIGI = 0.1  # L/dk; bunun üzeri "akış var" sayılır
+SUREKLI_DK = 10  # Kişi yokken bu kadar dakika kesintisiz akış uyarı verir
+BOSLUK_S = 10.0  # Ardışık iki örnek arası bundan uzunsa (cihaz kapalı) süren olay kesilir
+EWMA_ALFA = 0.001  # Taban debi referansının güncellenme hızı
+ISINMA = 600  # Referans bu kadar taban örneğinden sonra kullanılmaya başlanır
+CUSUM_K = 0.5  # Standart sapma cinsinden tolerans
+CUSUM_H = 10.0  # CUSUM uyarı eşiği
+MIN_SAPMA = 0.1  # L/dk; taban debi çoğunlukla 0 olduğundan sapmanın alt sınırı
+GECE = (2, 5)  # Gece penceresi [baş, bitiş) saat
+GECE_ORAN = 0.9  # Gece taban örneklerinin bu oranında debi > 0 ise sızıntı
+GECE_MIN_ORNEK = 600  # Gece penceresinde değerlendirme için gereken en az taban örneği
+MAKS_ALARM = 100  # Bellekte tutulan son uyarı sayısı
+
+_NS_SAAT = 3_600_000_000_000
+
+
+class Alarm:
+    """Tek bir uyarı: zaman (np.datetime64), tür ve okunabilir mesaj"""
+
+    __slots__ = ("zaman", "tur", "mesaj")
+
+    def __init__(self, zaman_ns, tur, mesaj):
+        self.zaman = np.datetime64(zaman_ns, "ns")
+        self.tur = tur
+        self.mesaj = mesaj
+
+    def __str__(self):
+        return f"[{str(self.zaman.astype('datetime64[s]')).replace('T', ' ')}] {self.mesaj}"
+
+    def __repr__(self):
+        return f"Alarm({self.tur!r}, {str(self)!r})"
+
+
+class AnomaliDedektoru:
+    """Örnekleri tek tek işleyip anında uyarı üreten sabit bellekli dedektör.
+
+    toplu_guncelle() bir parti örneği işler ve o partide oluşan uyarıların listesini döndürür;
+    son MAKS_ALARM uyarı 'alarmlar' içinde de tutulur. Örneklerin zaman sırasıyla geldiği varsayılır.
+    """
+
+    def __init__(self, akis_esigi=AKIS_ESIGI, surekli_dk=SUREKLI_DK, bosluk_s=BOSLUK_S,
+                 ewma_alfa=EWMA_ALFA, isinma=ISINMA, cusum_k=CUSUM_K, cusum_h=CUSUM_H,
+                 min_sapma=MIN_SAPMA, gece=GECE, gece_oran=GECE_ORAN, gece_min_ornek=GECE_MIN_ORNEK):
+        self.akis_esigi = akis_esigi
+        self.surekli_ns = int(surekli_dk * 60e9)
+        self.bosluk_ns = int(bosluk_s * 1e9)
+        self.ewma_alfa = ewma_alfa
+        self.isinma = isinma
+        self.cusum_k = cusum_k
+        self.cusum_h = cusum_h
+        self.min_sapma = min_sapma
+        self.gece = gece
+        self.gece_oran = gece_oran
+        self.gece_min_ornek = gece_min_ornek
+        self.alarmlar = deque(maxlen=MAKS_ALARM)
+        self.alarm_sayisi = 0
+        self.ornek_sayisi = 0
+
+        self._son_ns = None
+        self._akis_bas = None  # Kişi yokken süren akışın başladığı an
+        self._akis_uyarildi = False
+        self._taban_n = 0  # Referansa katılan taban örneği
+        self._taban_ort = 0.0
+        self._taban_var = 0.0
+        self._cusum = 0.0
+        self._kayma_uyarildi = False
+        self._gece_n = 0  # Bu gece penceresindeki taban örnekleri
+        self._gece_akan = 0  # ... bunlardan debisi > 0 olanlar
+        self._gece_debi = 0.0
+
+    def ekle(self, alarmlar):
+        """Başka kaynaklardan gelen uyarıları (ör. profil.HaftalikProfil.saat_alarmlari) listeye katar"""
+        self.alarmlar.extend(alarmlar)
+        self.alarm_sayisi += len(alarmlar)
+
+    def guncelle(self, timestamp, flow, ir_state):
+        """Tek örneği işler; oluşan uyarıların listesini döndürür"""
+        return self.toplu_guncelle([timestamp], [flow], [ir_state])
+
+    def toplu_guncelle(self, timestamp, flow, ir_state):
+        """Zaman sırasındaki örnek dizilerini işler; bu partide oluşan uyarıları döndürür"""
+        zaman = np.asarray(timestamp, dtype="datetime64[ns]").view(np.int64).tolist()
+        debiler = np.asarray(flow, dtype=np.float64).tolist()
+        irler = np.asarray(ir_state).tolist()
+        yeni = []
+
+        # Sıcak döngü: durum yerel değişkenlerde tutulur, sonunda geri yazılır
+        akis_esigi, surekli_ns, bosluk_ns = self.akis_esigi, self.surekli_ns, self.bosluk_ns
+        alfa, isinma, k, h, min_sapma = self.ewma_alfa, self.isinma, self.cusum_k, self.cusum_h, self.min_sapma
+        gece_bas, gece_bit = self.gece
+        gece_gecer = gece_bas > gece_bit  # Pencere gece yarısını geçiyor (ör. 23-05)
+        son_ns, akis_bas, akis_uyarildi = self._son_ns, self._akis_bas, self._akis_uyarildi
+        taban_n, ort, var, cusum, kayma_uyarildi = (self._taban_n, self._taban_ort, self._taban_var,
+                                                    self._cusum, self._kayma_uyarildi)
+        gece_n, gece_akan, gece_debi = self._gece_n, self._gece_akan, self._gece_debi
+
+        for ns, debi, ir in zip(zaman, debiler, irler):
+            if not math.isfinite(debi):
+                continue  # Eksik ölçüm: boşluk gibi (BOSLUK_S'den uzun sürerse akış olayı kesilir)
+            if son_ns is not None and ns - son_ns > bosluk_ns:
+                akis_bas = None
+            son_ns = ns
+
+            # Gece penceresi: pencereden çıkan ilk örnekte biten gece değerlendirilir
+            saat = (ns // _NS_SAAT) % 24
+            gece_mi = (saat >= gece_bas or saat < gece_bit) if gece_gecer else gece_bas <= saat < gece_bit
+            if not gece_mi and gece_n:
+                if gece_n >= self.gece_min_ornek and gece_akan >= self.gece_oran * gece_n:
+                    ort_gece = gece_debi / gece_n
+                    yeni.append(Alarm(ns, "gece_sizintisi",
+                                      f"Gece sızıntısı: kişi yokken örneklerin %{100 * gece_akan / gece_n:.0f}'inde "
+                                      f"akış var, ortalama {ort_gece:.3f} L/dk (~{ort_gece * 60 * 24:.0f} L/gün)"))
+                gece_n = gece_akan = 0
+                gece_debi = 0.0
+
+            if ir:
+                akis_bas = None
+                continue
+
+            # --- Kişi yokken (taban) örnekler ---
+            if debi > akis_esigi:
+                if akis_bas is None:
+                    akis_bas = ns
+                    akis_uyarildi = False
+                elif not akis_uyarildi and ns - akis_bas >= surekli_ns:
+                    akis_uyarildi = True
+                    yeni.append(Alarm(ns, "surekli_akis",
+                                      f"Sürekli akış: kimse yokken {(ns - akis_bas) / 60e9:.0f} dakikadır "
+                                      f"su akıyor ({debi:.2f} L/dk)"))
+            else:
+                akis_bas = None
+
+            if gece_mi:
+                gece_n += 1
+                gece_debi += debi
+                if debi > 0:
+                    gece_akan += 1
+
+            if taban_n < isinma:
+                # Isınma: referans basit ortalama/varyans ile kurulur
+                taban_n += 1
+                fark = debi - ort
+                ort += fark / taban_n
+                var += (fark * (debi - ort) - var) / taban_n
+                continue
+            sapma = var ** 0.5
+            z = (debi - ort) / (sapma if sapma > min_sapma else min_sapma)
+            cusum = cusum + z - k
+            if cusum <= 0:
+                cusum = 0.0
+                kayma_uyarildi = False
+                fark = debi - ort
+                ort += alfa * fark
+                var = (1 - alfa) * (var + alfa * fark * fark)
+            elif cusum > h:
+                if not kayma_uyarildi:
+                    kayma_uyarildi = True
+                    yeni.append(Alarm(ns, "taban_kayma",
+                                      f"Taban debide kayma: kimse yokken debi {debi:.2f} L/dk, "
+                                      f"olağan {ort:.3f} L/dk"))
+                if cusum > 2 * h:  # Kayma bitince CUSUM'un makul sürede sıfıra dönebilmesi için
+                    cusum = 2 * h
+
+        self._son_ns, self._akis_bas, self._akis_uyarildi = son_ns, akis_bas, akis_uyarildi
+        self._taban_n, self._taban_ort, self._taban_var = taban_n, ort, var
+        self._cusum, self._kayma_uyarildi = cusum, kayma_uyarildi
+        self._gece_n, self._gece_akan, self._gece_debi = gece_n, gece_akan, gece_debi
+        self.ornek_sayisi += len(zaman)
+        if yeni:
+            self.alarmlar.extend(yeni)
+            self.alarm_sayisi += len(yeni)
+        return yeni
@@ -0,0 +1,145 @@
+# SERİ PORT SATIR AYRIŞTIRICI
+# Arduino'nun gönderdiği "flow,cumulative,ir" satırlarını sayılara çevirir.
+
+import numpy as np
+
+
+def satir_ayristir(ham):
+    """Tek bir satırı (bytes veya str) (flow, cumulative, ir_state) olarak döndürür.
+
+    Boş / virgülsüz satırlarda None döner; sayıya çevrilemeyen değerlerde ValueError fırlatır.
+    """
+    if isinstance(ham, bytes):
+        ham = ham.decode("utf-8", errors="ignore")
+    line = ham.strip()
+    if not line or "," not in line:
+        return None
+    parts = line.split(",")
+    if len(parts) < 3:
+        return None
+    return float(parts[0]), float(parts[1]), int(parts[2])
+
+
+# --- TOPLU (VEKTÖREL) AYRIŞTIRMA ---
+# Okuyucu geride kaldığında veya cihazda kaydedilmiş günlükler içe aktarılırken binlerce
+# satır tek bayt bloğu olarak gelir. Blok tamamen Arduino biçimindeyse ("1.25,10.50,1\r\n")
+# ayraç düzeni kontrol edilip tüm sayılar tek np.fromstring çağrısıyla çevrilir. Aksi halde
+# satır bazında maskeler çıkarılır: basit satırlar yine toplu, alışılmadık satırlar (boşluk, nan,
+# üslü sayı, fazladan alan vb.) tek tek satir_ayristir ile ayrıştırılır. Sonuç her durumda
+# satır satır ayrıştırmayla birebir aynıdır.
+
+_IZINLI = np.zeros(256, dtype=bool)
+_IZINLI[list(b"0123456789.-,\r\n")] = True
+
+
+def _temiz_blok(tam):
+    """Her satırı tam olarak "sayı,sayı,tamsayı" olan bloğu hızlı yoldan çevirir, değilse None"""
+    b = np.frombuffer(tam, dtype=np.uint8)
+    cr = b == 13
+    if not _IZINLI[b].all() or (cr[:-1] & (b[1:] != 10)).any():
+        return None
+    konum = np.flatnonzero((b == 44) | (b == 10))
+    if len(konum) % 3:
+        return None
+    tur = b[konum].reshape(-1, 3)
+    if not ((tur[:, 0] == 44) & (tur[:, 1] == 44) & (tur[:, 2] == 10)).all():
+        return None
+    # Boş alan: iki ayraç arasında hiç bayt (veya sadece \r) yoksa
+    uzunluk = np.diff(konum, prepend=-1) - cr[np.maximum(konum - 1, 0)]
+    if (uzunluk < 2).any():
+        return None
+    # ir alanı (her satırın üçüncü alanı) tam sayı olmalı
+    noktalar = np.flatnonzero(b == 46)
+    if len(noktalar) and (np.searchsorted(konum, noktalar) % 3 == 2).any():
+        return None
+    try:
+        return np.fromstring(tam.replace(b"\r", b"").replace(b"\n", b",")[:-1], sep=",").reshape(-1, 3)
+    except ValueError:  # "1.2.3", "1-2" gibi sayı olmayan bir alan
+        return None
+
+
+def toplu_ayristir(ham):
+    """Çok satırlı bir bayt bloğunu ayrıştırır, satır başına istisna fırlatmaz.
+
+    (flow, cumulative, ir, bozuk, kalan) döndürür: ilk dördü boş/virgülsüz satırlar atlanmış
+    hâliyle satır sırasındaki dizilerdir; bozuk=True olan satırlarda flow/cumulative NaN'dır.
+    kalan, son satır sonundan sonraki yarım satırdır (bir sonraki bloğun başına eklenmeli).
+    """
+    son = ham.rfind(b"\n")
+    if son < 0:
+        return _bos_sonuc() + (ham,)
+    tam, kalan = ham[:son + 1], ham[son + 1:]
+    degerler = _temiz_blok(tam)
+    if degerler is not None:
+        return (degerler[:, 0].copy(), degerler[:, 1].copy(), degerler[:, 2].astype(np.int64),
+                np.zeros(len(degerler), dtype=bool), kalan)
+
+    b = np.frombuffer(tam, dtype=np.uint8)
+    yeni_satir = b == 10
+    sonlar = np.flatnonzero(yeni_satir)
+    baslar = np.concatenate(([0], sonlar[:-1] + 1))
+    n = len(sonlar)
+    satir = np.cumsum(yeni_satir, dtype=np.int32) - yeni_satir  # Her baytın ait olduğu satır
+
+    # Satır sonundaki \r alanın bir parçası sayılmaz
+    cr = b == 13
+    sonda_cr = np.zeros(len(b), dtype=bool)
+    sonda_cr[:-1] = cr[:-1] & yeni_satir[1:]
+    virgul = b == 44
+    ayrac = virgul | yeni_satir | sonda_cr
+    onceki = np.concatenate(([True], ayrac[:-1]))  # Bayt bir alanın ilk baytı mı
+    sonraki = np.concatenate((ayrac[1:], [True]))  # Bayt bir alanın son baytı mı
+    nokta = b == 46
+    eksi = b == 45
+    alan_no = np.cumsum(ayrac, dtype=np.int32)
+    virgul_kum = np.cumsum(virgul, dtype=np.int32)
+    virgul_sira = virgul_kum - np.concatenate(([0], virgul_kum))[baslar][satir]
+
+    hatali_bayt = (
+        (~_IZINLI[b] | (cr & ~sonda_cr))  # Beklenmeyen karakter
+        | (virgul & (onceki | sonraki))  # Boş alan
+        | (eksi & (~onceki | sonraki))  # İşaret alan başında değil ya da tek başına
+        | (nokta & (onceki | sonraki | np.concatenate(([False], eksi[:-1]))))  # ".5", "5.", "-.5"
+        | (nokta & (virgul_sira >= 2))  # ir alanı tam sayı olmalı
+    )
+    iki_nokta = np.flatnonzero(np.bincount(alan_no[nokta], minlength=alan_no[-1] + 1) > 1)
+    if len(iki_nokta):
+        hatali_bayt |= np.isin(alan_no, iki_nokta) & nokta
+    virgul_sayisi = np.bincount(satir[virgul], minlength=n)
+    atla = virgul_sayisi < 2  # satir_ayristir bunlar için None döner
+    hizli = (virgul_sayisi == 2) & (np.bincount(satir[hatali_bayt], minlength=n) == 0)
+    yavas = np.flatnonzero(~atla & ~hizli)
+
+    flow = np.full(n, np.nan)
+    cumulative = np.full(n, np.nan)
+    ir = np.zeros(n, dtype=np.int64)
+    bozuk = np.zeros(n, dtype=bool)
+
+    if hizli.any():
+        secili = b[hizli[satir] & ~sonda_cr]
+        secili = np.where(secili == 10, 44, secili).astype(np.uint8).tobytes()
+        try:
+            degerler = np.fromstring(secili[:-1], sep=",").reshape(-1, 3)
+        except ValueError:  # Beklenmez; güvenlik için blok satır satır ayrıştırılır
+            yavas = np.flatnonzero(~atla)
+        else:
+            flow[hizli], cumulative[hizli], ir[hizli] = degerler[:, 0], degerler[:, 1], degerler[:, 2]
+
+    for i in yavas.tolist():
+        try:
+            degerler = satir_ayristir(tam[baslar[i]:sonlar[i]])
+        except ValueError:
+            bozuk[i] = True
+            flow[i] = cumulative[i] = np.nan
+            continue
+        if degerler is None:
+            atla[i] = True
+        else:
+            flow[i], cumulative[i], ir[i] = degerler
+
+    tut = ~atla
+    return flow[tut], cumulative[tut], ir[tut], bozuk[tut], kalan
+
+
+def _bos_sonuc():
+    return np.empty(0), np.empty(0), np.empty(0, dtype=np.int64), np.empty(0, dtype=bool)
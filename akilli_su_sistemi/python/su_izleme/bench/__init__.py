@@ -0,0 +1,35 @@
+# PERFORMANS ÖLÇÜMLERİ
+# Her modül "python -m su_izleme.bench.<ad>" veya "python -m su_izleme bench <ad>" şeklinde çalıştırılabilir.
+
+import importlib
+import os
+import sys
+
+YARDIMCILAR = ("sentetik",)  # Ölçüm değil, ölçümlerin ortak veri üreticisi
+
+
+def olcumler():
+    """Çalıştırılabilir ölçüm modüllerinin adları ve ilk açıklama satırları"""
+    dizin = os.path.dirname(os.path.abspath(__file__))
+    sonuc = {}
+    for dosya in sorted(os.listdir(dizin)):
+        ad, uzanti = os.path.splitext(dosya)
+        if uzanti != ".py" or ad.startswith("_") or ad in YARDIMCILAR:
+            continue
+        with open(os.path.join(dizin, dosya), encoding="utf-8") as f:
+            sonuc[ad] = f.readline().lstrip("# ").strip()
+    return sonuc
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    hepsi = olcumler()
+    if not argv or argv[0] in ("-h", "--help"):
+        print("Kullanım: python -m su_izleme bench <ad> [seçenekler]\n")
+        for ad, aciklama in hepsi.items():
+            print(f"  {ad:<20} {aciklama}")
+        return
+    if argv[0] not in hepsi:
+        print(f"Bilinmeyen ölçüm: {argv[0]} (mevcut: {', '.join(hepsi)})")
+        sys.exit(2)
+    importlib.import_module(f"su_izleme.bench.{argv[0]}").main(argv[1:])
@@ -0,0 +1,151 @@
+# BETİK AÇILIŞ SÜRESİ ÖLÇÜMÜ
+# Elektrik kesintisinden sonra seri okumanın ne kadar geç başladığını parçalarına ayırır:
+#   1. İçe aktarma: Water1/2/3.py'nin en üst düzey import satırları ve çalıştırdıkları izleme modülü
+#      ayrı bir süreçte "python -X importtime" ile içe aktarılır; eski hali (pandas + matplotlib.pyplot
+#      en üstte) ile karşılaştırılır ve en ağır modüller listelenir
+#   2. Hazır el sıkışması: pty üzerinden açılışı --acilis-ms süren sahte bir Arduino; acilis.hazir_bekle
+#      ile eski sabit 2 saniyelik bekleme karşılaştırılır, açılışta gönderilen satırların kaybolmadığı doğrulanır
+#   3. Geçmiş yükleme: eskiden seri port açılmadan önce yapılan yükleme süresi (artık arka planda,
+#      bu sürede gelen örnekler kuyrukta bekler)
+# Kullanım:  python -m su_izleme.bench.acilis [--tekrar 5] [--satir 1000000] [--acilis-ms 800]
+
+import argparse
+import ast
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import serial
+
+from su_izleme.acilis import HAZIR_ISARETI, hazir_bekle
+from su_izleme.bench.baslangic import depo_hazirla
+from su_izleme.depo import VeriDeposu
+from su_izleme.ozet import Ozetleyici
+from su_izleme.simulator import PtyCikis
+from su_izleme.tuketim import ArtimliAnaliz
+
+KOK = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BETIKLER = ("Water1.py", "Water2.py", "Water3.py")
+ESKI_EK = "import pandas\nimport matplotlib.pyplot\n"  # Betiklerin eskiden en üstte yüklediği modüller
+IZLEME = "import su_izleme.izleme"  # Betiklerin çağırdığı monitor komutu seri okumadan önce bunu yükler
+
+
+def ice_aktarmalar(betik):
+    """Betiğin en üst düzeydeki import satırlarını (ve izleme modülünü) kaynak kod olarak döndürür"""
+    with open(os.path.join(KOK, betik), encoding="utf-8") as f:
+        agac = ast.parse(f.read())
+    satirlar = [ast.unparse(dugum) for dugum in agac.body if isinstance(dugum, (ast.Import, ast.ImportFrom))]
+    return "\n".join(satirlar + [IZLEME])
+
+
+def ice_aktarma_suresi(kod, tekrar):
+    """(medyan duvar saati süresi s, -X importtime'a göre en ağır 5 üst düzey modül) döndürür"""
+    ortam = dict(os.environ, PYTHONPATH=KOK)
+    sureler = []
+    for _ in range(tekrar):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", kod], check=True, env=ortam, cwd=KOK)
+        sureler.append(time.perf_counter() - t0)
+    cikti = subprocess.run([sys.executable, "-X", "importtime", "-c", kod], check=True, env=ortam, cwd=KOK,
+                           capture_output=True, text=True).stderr
+    # "import time:  self [us] | cumulative | imported package"; girintisiz satırlar üst düzey modüller
+    ust = [(int(m.group(1)), m.group(2)) for m in re.finditer(r"^import time:\s+\d+ \|\s+(\d+) \| (\S.*)$",
+                                                               cikti, re.M)]
+    ust.sort(reverse=True)
+    sureler.sort()
+    return sureler[len(sureler) // 2], ust[:5]
+
+
+def sahte_arduino(yaz, acilis_s, satir):
+    """Port açılınca yeniden başlayan Arduino: acilis_s boyunca sessiz, sonra HAZIR ve 10 ms'de bir satır"""
+    time.sleep(acilis_s)
+    yaz(HAZIR_ISARETI + b"\r\n")
+    for i in range(satir):
+        yaz(f"1.00,{i / 100:.2f},1\r\n".encode())
+        time.sleep(0.01)
+
+
+def el_sikisma(acilis_s):
+    """(bekleme süresi s, hazır mı, bekleme sırasında okunan veri satırı) döndürür"""
+    pty = PtyCikis()
+    ser = serial.Serial(pty.yol, 9600, timeout=0.1)
+    try:
+        gonderici = threading.Thread(target=sahte_arduino, args=(pty, acilis_s, 50), daemon=True)
+        t0 = time.perf_counter()
+        gonderici.start()
+        hazir, tampon = hazir_bekle(ser)
+        sure = time.perf_counter() - t0
+        gonderici.join()
+        return sure, hazir, tampon.count(b"\n")
+    finally:
+        ser.close()
+        pty.kapat()
+
+
+def gecmis_yukleme(n, dizin):
+    """Water2'nin açılışta geçmişi yükleme adımlarının süresi (özetler kalıcı durumdan yakalanır)"""
+    kolon = depo_hazirla(os.path.join(dizin, "kolon"), n)
+    ozet_dizini = os.path.join(dizin, "ozet")
+    gecmis = kolon.yukle()
+    ozet = Ozetleyici(ozet_dizini)
+    ozet.yakala(gecmis["timestamp"], gecmis["flow_lpm"], gecmis["cumulative_liters"], gecmis["ir_state"])
+    ozet.kaydet()
+
+    t0 = time.perf_counter()
+    gecmis = kolon.yukle()
+    VeriDeposu().ekle_toplu(gecmis["timestamp"], gecmis["flow_lpm"], gecmis["cumulative_liters"], gecmis["ir_state"])
+    ArtimliAnaliz().toplu_guncelle(gecmis["timestamp"], gecmis["flow_lpm"],
+                                   gecmis["cumulative_liters"], gecmis["ir_state"])
+    Ozetleyici(ozet_dizini).yakala(gecmis["timestamp"], gecmis["flow_lpm"],
+                                   gecmis["cumulative_liters"], gecmis["ir_state"])
+    return time.perf_counter() - t0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Betik açılış süresi ölçümü")
+    parser.add_argument("--tekrar", type=int, default=5, help="İçe aktarma ölçümü tekrar sayısı")
+    parser.add_argument("--satir", type=int, default=1_000_000, help="Geçmiş yükleme ölçümündeki satır sayısı")
+    parser.add_argument("--acilis-ms", type=int, default=800, help="Sahte Arduino'nun açılış süresi")
+    parser.add_argument("--dizin", help="Geçici dosyaların yazılacağı dizin")
+    args = parser.parse_args(argv)
+    hatalar = 0
+
+    print("1. İçe aktarma (yeni süreç, medyan)")
+    print(f"{'Betik':<10} | {'Şimdi':>9} | {'Eski':>9} | En ağır (şimdi, -X importtime)")
+    print("-" * 90)
+    bos, _ = ice_aktarma_suresi("pass", args.tekrar)
+    for betik in BETIKLER:
+        kod = ice_aktarmalar(betik)
+        simdi, agir = ice_aktarma_suresi(kod, args.tekrar)
+        eski, _ = ice_aktarma_suresi(kod + "\n" + ESKI_EK, args.tekrar)
+        hatalar += "pandas" in kod or "matplotlib" in kod
+        print(f"{betik:<10} | {(simdi - bos) * 1e3:>6.0f} ms | {(eski - bos) * 1e3:>6.0f} ms | "
+              + ", ".join(f"{ad.strip()} {us / 1e3:.0f}" for us, ad in agir[:3]))
+    print(f"(yorumlayıcının kendi açılışı {bos * 1e3:.0f} ms düşülmüştür)")
+
+    print()
+    print(f"2. Hazır el sıkışması (Arduino açılışı {args.acilis_ms} ms)")
+    sure, hazir, satir = el_sikisma(args.acilis_ms / 1000)
+    print(f"   Eski sabit bekleme: 2000 ms | hazir_bekle: {sure * 1e3:.0f} ms | hazır: "
+          f"{'evet' if hazir else 'HAYIR'} | ayrıştırıcıya aktarılan satır: {satir}")
+    hatalar += not hazir or sure > 2.0
+
+    print()
+    dizin = tempfile.mkdtemp(dir=args.dizin)
+    try:
+        sure = gecmis_yukleme(args.satir, dizin)
+    finally:
+        shutil.rmtree(dizin, ignore_errors=True)
+    print(f"3. Geçmiş yükleme ({args.satir:,} satır): {sure * 1e3:.0f} ms "
+          f"(eskiden seri port açılmadan önce, şimdi arka planda)")
+    if hatalar:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# BÜYÜK CSV AKTARIMI: PARÇA BOYU, SÜREÇ SAYISI VE TEPE BELLEK
+# --satir'lık sentetik su_tuketim.csv (--bozuk-oran kadar satırın zaman damgası bozuk, bir o kadarının
+# debisi sayı değil, ayrıca bir o kadar fazladan alanlı satır) KolonDeposu.csv_esitle ile farklı parça
+# boyu × süreç sayısında sütunsal depoya aktarılır.
+#   - Doğruluk: her yapılandırmanın deposu tek süreçli aktarımla birebir aynı, hatalı satır sayısı
+#     enjekte edilen bozuk satır sayısına eşit olmalı (bozuk satırlar atılır, 0 yapılıp depoya girmez)
+#   - Süre ve tepe bellek: CSV üretimi ve her aktarım ayrı bir süreçte çalışır; aktaran sürecin tepe
+#     RSS'i (VmHWM) ve en büyük işçininki (ru_maxrss) ayrı yazdırılır. Tepe bellek dosya boyuyla
+#     değil parça boyuyla büyümeli.
+# Not: hızlanma çekirdek sayısıyla sınırlıdır (os.cpu_count() ölçümün başında yazdırılır).
+# Kullanım:  python -m su_izleme.bench.aktarim [--satir 2000000] [--parca-mb 4 16 64] [--isler 1 4]
+
+import argparse
+import multiprocessing
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from su_izleme import SUTUNLAR
+from su_izleme.bench.baslangic import _bloklar
+from su_izleme.kalici import KolonDeposu
+
+
+def csv_hazirla(yol, n, bozuk_oran, seed=0):
+    """Bozuk satırlı CSV yazar; (bozuk satır sayısı, eklenen fazladan alanlı satır sayısı) döndürür"""
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    bozuk = eklenen = 0
+    for veri in _bloklar(n):
+        df = pd.DataFrame(veri).astype({"timestamp": str, "flow_lpm": object})
+        secilen = rng.random(len(df)) < bozuk_oran
+        df.loc[secilen, "timestamp"] = "2024-13-45 99:99:99"  # Satır atılır, hatalı sayılır
+        debi_bozuk = rng.random(len(df)) < bozuk_oran
+        df.loc[debi_bozuk, "flow_lpm"] = "nan?"  # Satır atılır, hatalı sayılır
+        bozuk += int((secilen | debi_bozuk).sum())
+        df.to_csv(yol, mode="a", index=False, header=not os.path.exists(yol))
+        fazla = int(len(df) * bozuk_oran)  # read_csv'nin atladığı satırlar da sayılmalı
+        with open(yol, "a", encoding="utf-8") as f:
+            f.write("2024-01-01 00:00:00,1.0,2.0,0,fazla\n" * fazla)
+        bozuk += fazla
+        eklenen += fazla
+    return bozuk, eklenen
+
+
+def _tepe_rss():
+    """Sürecin tepe RSS'i (MB). ru_maxrss exec'ten önceki (üreten sürecin) tepesini de taşıdığı için
+    /proc'taki VmHWM tercih edilir."""
+    try:
+        with open("/proc/self/status") as f:
+            for satir in f:
+                if satir.startswith("VmHWM:"):
+                    return int(satir.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _ayri_surecte(islev, *args):
+    baglam = multiprocessing.get_context("spawn")
+    kuyruk = baglam.Queue()
+    surec = baglam.Process(target=_calistir, args=(kuyruk, islev) + args)
+    surec.start()
+    sonuc = kuyruk.get()
+    surec.join()
+    return sonuc
+
+
+def _calistir(kuyruk, islev, *args):
+    kuyruk.put(islev(*args))
+
+
+def aktar(csv_yolu, hedef, parca_bayt, is_sayisi):
+    """Ayrı süreçte çalışır: (süre, aktarılan, hatalı, aktaran tepe MB, en büyük işçi tepe MB)"""
+    t0 = time.perf_counter()
+    aktarilan, hatali = KolonDeposu(hedef).csv_esitle(csv_yolu, parca_bayt=parca_bayt, is_sayisi=is_sayisi)
+    sure = time.perf_counter() - t0
+    return sure, aktarilan, hatali, _tepe_rss(), resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Büyük CSV'nin parçalı, çok süreçli aktarımı")
+    parser.add_argument("--satir", type=int, default=2_000_000)
+    parser.add_argument("--bozuk-oran", type=float, default=0.001)
+    parser.add_argument("--parca-mb", type=float, nargs="+", default=[4, 16, 64])
+    parser.add_argument("--isler", type=int, nargs="+", help="Denenecek süreç sayıları (varsayılan: 1 ve çekirdek sayısı, en az 2)")
+    parser.add_argument("--dizin", help="Geçici dosyaların yazılacağı dizin")
+    args = parser.parse_args(argv)
+    cekirdek = os.cpu_count() or 1
+    isler = args.isler or [1, max(2, cekirdek)]
+    hatalar = 0
+
+    dizin = tempfile.mkdtemp(dir=args.dizin)
+    try:
+        csv_yolu = os.path.join(dizin, "su_tuketim.csv")
+        t0 = time.perf_counter()
+        bozuk, eklenen = _ayri_surecte(csv_hazirla, csv_yolu, args.satir, args.bozuk_oran)
+        boyut = os.path.getsize(csv_yolu) / 2**20
+        print(f"{args.satir:,} satır, {boyut:.0f} MB, {bozuk} bozuk satır "
+              f"({time.perf_counter() - t0:.1f} s'de üretildi); çekirdek: {cekirdek}")
+
+        print(f"\n{'Parça':>7} | {'Süreç':>5} | {'Süre':>7} | {'satır/s':>10} | {'Ana RSS':>8} | {'İşçi RSS':>8} | Hatalı")
+        print("-" * 70)
+        referans = None
+        for parca_mb in args.parca_mb:
+            for is_sayisi in isler:
+                hedef = os.path.join(dizin, "kolon")
+                sure, aktarilan, hatali, ana, isci = _ayri_surecte(aktar, csv_yolu, hedef, int(parca_mb * 2**20), is_sayisi)
+                gecmis = KolonDeposu(hedef).yukle()
+                if referans is None:
+                    referans = gecmis
+                ayni = all(np.array_equal(gecmis[ad], referans[ad]) for ad in SUTUNLAR)
+                dogru = ayni and hatali == bozuk and aktarilan == args.satir + eklenen - bozuk
+                hatalar += not dogru
+                print(f"{parca_mb:>4.0f} MB | {is_sayisi:>5} | {sure:>5.2f} s | {aktarilan / sure:>10,.0f} | "
+                      f"{ana:>5.0f} MB | {isci:>5.0f} MB | {hatali}{'' if dogru else '  HATA'}")
+                shutil.rmtree(hedef)
+    finally:
+        shutil.rmtree(dizin, ignore_errors=True)
+    if hatalar:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# ARTIMLI ANALİZ ÖLÇÜMÜ VE DOĞRULAMASI
+# Toplu hesapların (ortalama_tuketim, gereksiz_tuketim_hesapla) süresi geçmişle büyürken
+# ArtimliAnaliz raporunun sabit sürede kaldığını gösterir ve iki yolun aynı sonucu
+# verdiğini kayıtlı veri (--csv) veya sentetik veri üzerinde doğrular. Sayaç değeri eksik (NaN, ayrıştırıcı
+# "nan" kabul eder) örnekler içeren veride toplu, tek tek ve parti parti hesapların aynı kaldığı da denetlenir;
+# debisi NaN örnekler ortalama debiyi bozmamalı (pandas mean() gibi atlanmalı).
+# Kullanım:  python -m su_izleme.bench.analiz [--csv su_tuketim.csv] [--boyutlar ...]
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from su_izleme.bench.sentetik import sentetik_veri
+from su_izleme.depo import VeriDeposu
+from su_izleme.tuketim import ArtimliAnaliz, gereksiz_tuketim_hesapla, ortalama_tuketim
+
+
+def csv_oku(yol):
+    """Kayıtlı su_tuketim.csv dosyasını Water2.py ile aynı kurallarla okur"""
+    import pandas as pd
+
+    df = pd.read_csv(yol)
+    veri = {ad: pd.to_numeric(df[ad], errors="coerce").fillna(0).to_numpy()
+            for ad in ("flow_lpm", "cumulative_liters", "ir_state")}
+    veri["timestamp"] = pd.to_datetime(df["timestamp"]).to_numpy()
+    return veri
+
+
+def dogrula(veri):
+    """Verinin yarısını toplu, yarısını tek tek ArtimliAnaliz'e verir ve toplu sonuçla karşılaştırır"""
+    depo = VeriDeposu()
+    depo.ekle_toplu(veri["timestamp"], veri["flow_lpm"], veri["cumulative_liters"], veri["ir_state"])
+
+    analiz = ArtimliAnaliz()
+    yari = len(depo) // 2
+    analiz.toplu_guncelle(*(veri[ad][:yari] for ad in ("timestamp", "flow_lpm", "cumulative_liters", "ir_state")))
+    for ts, f, c, ir in zip(veri["timestamp"][yari:], veri["flow_lpm"][yari:].tolist(),
+                            veri["cumulative_liters"][yari:].tolist(), veri["ir_state"][yari:].tolist()):
+        analiz.guncelle(ts, f, c, ir)
+
+    beklenen = (ortalama_tuketim(depo), gereksiz_tuketim_hesapla(depo), float(depo["cumulative_liters"][-1]))
+    bulunan = (analiz.ortalama_debi(), analiz.gereksiz_tuketim(), analiz.toplam())
+    return np.allclose(beklenen, bulunan, atol=0.011), beklenen, bulunan
+
+
+def eksik_sayacli(veri, oran=0.01, seed=5):
+    """Sayaç değerlerinin bir kısmı (tek tek ve art arda) NaN yapılmış kopya"""
+    rng = np.random.default_rng(seed)
+    veri = dict(veri)
+    cumulative = veri["cumulative_liters"].copy()
+    for i in rng.choice(len(cumulative) - 3, int(len(cumulative) * oran), replace=False):
+        cumulative[i:i + rng.integers(1, 4)] = np.nan
+    veri["cumulative_liters"] = cumulative
+    return veri
+
+
+def eksik_dogrula(veri):
+    """NaN sayaçlı veride toplu hesap = tek tek güncelleme = iki partide toplu güncelleme"""
+    ad = ("timestamp", "flow_lpm", "cumulative_liters", "ir_state")
+    depo = VeriDeposu()
+    depo.ekle_toplu(*(veri[a] for a in ad))
+    tek = ArtimliAnaliz()
+    for ornek in zip(veri["timestamp"], *(veri[a].tolist() for a in ad[1:])):
+        tek.guncelle(*ornek)
+    parti = ArtimliAnaliz()
+    yari = len(depo) // 2 + 1
+    parti.toplu_guncelle(*(veri[a][:yari] for a in ad))
+    parti.toplu_guncelle(*(veri[a][yari:] for a in ad))
+    sonuc = (gereksiz_tuketim_hesapla(depo), tek.gereksiz_tuketim(), parti.gereksiz_tuketim())
+    return np.allclose(sonuc, sonuc[0], atol=0.011) and np.isfinite(tek.toplam()), sonuc
+
+
+def eksik_debi_dogrula(veri, oran=0.01, seed=6):
+    """Debinin bir kısmı NaN iken ortalama debi: pandas mean() = tek tek = toplu güncelleme"""
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    flow = veri["flow_lpm"].astype(np.float64)
+    flow[rng.choice(len(flow), int(len(flow) * oran), replace=False)] = np.nan
+    ad = ("timestamp", "flow_lpm", "cumulative_liters", "ir_state")
+    veri = dict(veri, flow_lpm=flow)
+    tek = ArtimliAnaliz()
+    for ornek in zip(veri["timestamp"], *(veri[a].tolist() for a in ad[1:])):
+        tek.guncelle(*ornek)
+    parti = ArtimliAnaliz()
+    parti.toplu_guncelle(*(veri[a] for a in ad))
+    sonuc = (round(float(pd.Series(flow).mean()), 2), tek.ortalama_debi(), parti.ortalama_debi())
+    return all(s == sonuc[0] for s in sonuc), sonuc
+
+
+def olc(boyutlar, tekrar=5):
+    sonuc = []
+    for n in boyutlar:
+        veri = sentetik_veri(n)
+        depo = VeriDeposu()
+        depo.ekle_toplu(veri["timestamp"], veri["flow_lpm"], veri["cumulative_liters"], veri["ir_state"])
+        analiz = ArtimliAnaliz()
+        analiz.toplu_guncelle(veri["timestamp"], veri["flow_lpm"], veri["cumulative_liters"], veri["ir_state"])
+
+        t0 = time.perf_counter()
+        for _ in range(tekrar):
+            ortalama_tuketim(depo), gereksiz_tuketim_hesapla(depo)
+        toplu = (time.perf_counter() - t0) / tekrar
+
+        t0 = time.perf_counter()
+        for _ in range(tekrar):
+            analiz.ortalama_debi(), analiz.gereksiz_tuketim(), analiz.toplam()
+        artimli = (time.perf_counter() - t0) / tekrar
+
+        ts = veri["timestamp"][-1]
+        t0 = time.perf_counter()
+        for _ in range(10_000):
+            analiz.guncelle(ts, 1.0, 0.0, 0)
+        guncelleme = (time.perf_counter() - t0) / 10_000
+        sonuc.append((n, toplu, artimli, guncelleme))
+    return sonuc
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Toplu ve artımlı analiz karşılaştırması")
+    parser.add_argument("--csv", help="Doğrulama için kayıtlı su_tuketim.csv dosyası")
+    parser.add_argument("--boyutlar", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args(argv)
+
+    veri = csv_oku(args.csv) if args.csv else sentetik_veri(50_000)
+    tamam, beklenen, bulunan = dogrula(veri)
+    print(f"Doğrulama ({'CSV' if args.csv else 'sentetik'}): {'TAMAM' if tamam else 'HATA'}")
+    print(f"  toplu   (ortalama, gereksiz, toplam): {beklenen}")
+    print(f"  artımlı (ortalama, gereksiz, toplam): {bulunan}")
+    eksik_tamam, gereksiz = eksik_dogrula(eksik_sayacli(veri))
+    print(f"NaN sayaçlı veri: {'TAMAM' if eksik_tamam else 'HATA'}")
+    print(f"  gereksiz (toplu, tek tek, iki parti): {gereksiz}")
+    debi_tamam, ortalama = eksik_debi_dogrula(veri)
+    print(f"NaN debili veri: {'TAMAM' if debi_tamam else 'HATA'}")
+    print(f"  ortalama (pandas, tek tek, toplu): {ortalama}\n")
+
+    print(f"{'Kayıt':>12} | {'Toplu rapor':>12} | {'Artımlı rapor':>13} | {'Örnek güncelleme':>16}")
+    print("-" * 62)
+    for n, toplu, artimli, guncelleme in olc(args.boyutlar):
+        print(f"{n:>12,} | {toplu * 1e3:>9.2f} ms | {artimli * 1e6:>10.2f} µs | {guncelleme * 1e6:>13.2f} µs")
+
+    if not (tamam and eksik_tamam and debi_tamam):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# TOPLU AYRIŞTIRMA ÖLÇÜMÜ VE DOĞRULAMASI
+# Satır satır satir_ayristir ile toplu_ayristir'ı aynı bayt akışı üzerinde karşılaştırır:
+# sonuçların (değerler + bozuk satırlar) birebir aynı olduğunu doğrular ve satır/s hızını
+# farklı blok boyları için ölçer. Akış simülatörden veya cihazda kaydedilmiş ham bir günlükten gelir.
+# Kullanım:  python -m su_izleme.bench.ayristir [--satir 1000000] [--bozuk-oran 0.01] [--gunluk seri.log]
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from su_izleme.ayristir import satir_ayristir, toplu_ayristir
+from su_izleme.simulator import Simulator
+
+
+def satir_satir(ham):
+    """Eski yol: her satır için split/float/int, hatalar try/except ile sayılır"""
+    sonuc, bozuk = [], 0
+    for satir in ham.split(b"\n")[:-1]:
+        try:
+            degerler = satir_ayristir(satir)
+        except ValueError:
+            bozuk += 1
+            continue
+        if degerler is not None:
+            sonuc.append(degerler)
+    return sonuc, bozuk
+
+
+def toplu(ham, blok):
+    """Akışı 'blok' baytlık parçalar halinde (seri porttan okunuyormuş gibi) ayrıştırır"""
+    parcalar, bozuk, kalan = [], 0, b""
+    for i in range(0, len(ham), blok):
+        flow, cumulative, ir, hatali, kalan = toplu_ayristir(kalan + ham[i:i + blok])
+        bozuk += int(hatali.sum())
+        parcalar.append((flow[~hatali], cumulative[~hatali], ir[~hatali]))
+    return [np.concatenate(s) for s in zip(*parcalar)], bozuk
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Satır satır ve toplu ayrıştırma karşılaştırması")
+    parser.add_argument("--satir", type=int, default=1_000_000, help="Simülatörden üretilecek satır sayısı")
+    parser.add_argument("--bozuk-oran", type=float, default=0.01)
+    parser.add_argument("--gunluk", help="Simülatör yerine ham seri günlük dosyası")
+    parser.add_argument("--bloklar", type=int, nargs="+", default=[256, 4096, 65536, 1 << 20])
+    args = parser.parse_args(argv)
+
+    if args.gunluk:
+        with open(args.gunluk, "rb") as f:
+            ham = f.read()
+    else:
+        ham = b"".join(Simulator(bozuk_oran=args.bozuk_oran).satirlar(args.satir))
+    satir_sayisi = ham.count(b"\n")
+
+    t0 = time.perf_counter()
+    beklenen, beklenen_bozuk = satir_satir(ham)
+    eski_sure = time.perf_counter() - t0
+    beklenen = [np.array(s) for s in zip(*beklenen)] if beklenen else [np.empty(0)] * 3
+    print(f"{satir_sayisi:,} satır, {len(ham) / 1e6:.1f} MB | geçerli: {len(beklenen[0]):,} | bozuk: {beklenen_bozuk:,}")
+    print(f"{'Yöntem':<22} | {'Süre (s)':>9} | {'Satır/s':>12} | Aynı sonuç")
+    print("-" * 62)
+    print(f"{'satır satır':<22} | {eski_sure:>9.3f} | {satir_sayisi / eski_sure:>12,.0f} | -")
+
+    hepsi_ayni = True
+    for blok in args.bloklar:
+        t0 = time.perf_counter()
+        sonuc, bozuk = toplu(ham, blok)
+        sure = time.perf_counter() - t0
+        ayni = bozuk == beklenen_bozuk and all(np.array_equal(a, b) for a, b in zip(sonuc, beklenen))
+        hepsi_ayni &= ayni
+        print(f"{f'toplu ({blok:,} B)':<22} | {sure:>9.3f} | {satir_sayisi / sure:>12,.0f} | "
+              f"{'evet' if ayni else 'HAYIR'}")
+    if not hepsi_ayni:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
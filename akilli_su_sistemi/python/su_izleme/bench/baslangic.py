@@ -0,0 +1,100 @@
+# AÇILIŞ SÜRESİ ÖLÇÜMÜ
+# Geçmişin sütunsal depodan yüklenme süresini 1M / 10M / 50M satırda ölçer ve
+# isteğe bağlı olarak eski yol (pd.read_csv + to_numeric + to_datetime) ile karşılaştırır.
+# Kullanım:  python -m su_izleme.bench.baslangic [--boyutlar 1000000 10000000 50000000] [--csv-maks 1000000]
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from su_izleme import SUTUNLAR
+from su_izleme.bench.sentetik import sentetik_veri
+from su_izleme.depo import VeriDeposu
+from su_izleme.kalici import KolonDeposu
+from su_izleme.tuketim import ArtimliAnaliz
+
+BLOK = 1_000_000
+
+
+def _bloklar(n):
+    """n satırı BLOK'luk parçalar halinde, zaman ve sayaç devamlı olacak şekilde üretir"""
+    uretilen = 0
+    toplam = 0.0
+    while uretilen < n:
+        adet = min(BLOK, n - uretilen)
+        veri = sentetik_veri(adet, seed=uretilen)
+        veri["timestamp"] = veri["timestamp"] + uretilen * 1_000_000_000
+        veri["cumulative_liters"] = veri["cumulative_liters"] + toplam
+        toplam = float(veri["cumulative_liters"][-1])
+        uretilen += adet
+        yield veri
+
+
+def depo_hazirla(dizin, n, csv_yolu=None):
+    depo = KolonDeposu(dizin)
+    for veri in _bloklar(n):
+        depo.ekle_toplu(*(veri[ad] for ad in SUTUNLAR))
+        if csv_yolu:
+            import pandas as pd
+
+            pd.DataFrame(veri).to_csv(csv_yolu, mode="a", index=False,
+                                      header=not os.path.exists(csv_yolu))
+    return depo
+
+
+def eski_acilis(csv_yolu):
+    """Water2.py'nin önceki açılış yolu"""
+    import pandas as pd
+
+    data = pd.read_csv(csv_yolu)
+    data["flow_lpm"] = pd.to_numeric(data["flow_lpm"], errors="coerce").fillna(0)
+    data["cumulative_liters"] = pd.to_numeric(data["cumulative_liters"], errors="coerce").fillna(0)
+    data["ir_state"] = pd.to_numeric(data["ir_state"], errors="coerce").fillna(0)
+    data["timestamp"] = pd.to_datetime(data["timestamp"])
+    return data
+
+
+def yeni_acilis(depo):
+    """Water2.py'nin yeni açılış yolu: tek okuma + depoya kopya + artımlı analiz"""
+    gecmis = depo.yukle()
+    data = VeriDeposu(kapasite=len(depo))
+    data.ekle_toplu(*(gecmis[ad] for ad in SUTUNLAR))
+    analiz = ArtimliAnaliz()
+    analiz.toplu_guncelle(*(gecmis[ad] for ad in SUTUNLAR))
+    return data, analiz
+
+
+def _sure(fonk, *args):
+    t0 = time.perf_counter()
+    fonk(*args)
+    return time.perf_counter() - t0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Geçmiş yükleme (açılış) süresi ölçümü")
+    parser.add_argument("--boyutlar", type=int, nargs="+", default=[1_000_000, 10_000_000, 50_000_000])
+    parser.add_argument("--csv-maks", type=int, default=1_000_000,
+                        help="Bu boyuta kadar eski CSV yolunu da ölç (0 = ölçme)")
+    parser.add_argument("--dizin", help="Geçici dosyaların yazılacağı dizin")
+    args = parser.parse_args(argv)
+
+    print(f"{'Satır':>12} | {'memmap':>9} | {'fromfile':>9} | {'Açılış':>9} | {'Eski CSV':>9}")
+    print("-" * 62)
+    for n in args.boyutlar:
+        dizin = tempfile.mkdtemp(dir=args.dizin)
+        try:
+            csv_yolu = os.path.join(dizin, "su_tuketim.csv") if n <= args.csv_maks else None
+            depo = depo_hazirla(os.path.join(dizin, "kolon"), n, csv_yolu)
+            t_mmap = _sure(depo.yukle, True)
+            t_okuma = _sure(depo.yukle, False)
+            t_acilis = _sure(yeni_acilis, depo)
+            t_csv = f"{_sure(eski_acilis, csv_yolu):>7.2f} s" if csv_yolu else f"{'-':>9}"
+            print(f"{n:>12,} | {t_mmap * 1e3:>6.1f} ms | {t_okuma:>7.2f} s | {t_acilis:>7.2f} s | {t_csv}")
+        finally:
+            shutil.rmtree(dizin, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
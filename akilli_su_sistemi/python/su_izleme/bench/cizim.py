@@ -0,0 +1,99 @@
+# GRAFİK ÇİZİM ÖLÇÜMÜ
+# Eski gorsellestir (her seferinde yeni pyplot figürü, tüm noktalar, 300 dpi, plt.close yok)
+# ile kalıcı figürlü Cizici'yi (yerinde güncelleme + piksel başına min/maks seyreltme)
+# artan geçmiş boyutlarında karşılaştırır. Ayrıca art arda çizimlerden sonra geride kalan belleği gösterir.
+# Kullanım:  python -m su_izleme.bench.cizim [--boyutlar 10000 100000 1000000] [--tekrar 5]
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+from su_izleme.bench.sentetik import sentetik_veri  # noqa: E402
+from su_izleme.cizim import Cizici  # noqa: E402
+from su_izleme.depo import VeriDeposu  # noqa: E402
+
+
+def eski_gorsellestir(depo, dosya, kapat):
+    """Water2.py'deki eski gorsellestir (kapat=False iken plt.close() çağrılmaz)"""
+    df = depo.gorunum()
+    plt.figure(figsize=(12, 8))
+    plt.subplot(2, 1, 1)
+    plt.plot(df["timestamp"], df["flow_lpm"], "b-", linewidth=1)
+    plt.title("Anlık Debi Akışı (Litre/dk)", fontsize=14)
+    plt.subplot(2, 1, 2)
+    plt.plot(df["timestamp"], df["cumulative_liters"], "g-", linewidth=2)
+    plt.title("Toplam Tüketim (Litre)", fontsize=14)
+    plt.tight_layout()
+    plt.savefig(dosya, dpi=300, bbox_inches="tight")
+    if kapat:
+        plt.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Eski ve kalıcı figürlü grafik çiziminin karşılaştırması")
+    parser.add_argument("--boyutlar", type=int, nargs="+", default=[10_000, 100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--eski-maks", type=int, default=1_000_000, help="Eski yöntemin ölçüleceği en büyük boyut")
+    parser.add_argument("--tekrar", type=int, default=5, help="Her boyutta art arda çizim sayısı")
+    args = parser.parse_args(argv)
+
+    dizin = tempfile.mkdtemp()
+    # Bellek: 10k kayıt üzerinde art arda 20 çizimden sonra geride kalan Python/NumPy nesneleri
+    depo = VeriDeposu()
+    veri = sentetik_veri(10_000)
+    depo.ekle_toplu(veri["timestamp"], veri["flow_lpm"], veri["cumulative_liters"], veri["ir_state"])
+    print("Art arda 20 çizimden sonra geride kalan bellek (10.000 kayıt, tracemalloc):")
+    for ad, kapat in (("eski, plt.close yok", False), ("eski, plt.close ile", True), ("yeni (Cizici)", None)):
+        gc.collect()
+        tracemalloc.start()
+        if kapat is None:
+            cizici = Cizici(os.path.join(dizin, "yeni.png"))
+            for _ in range(20):
+                cizici.ciz(depo, zorla=True)
+        else:
+            for _ in range(20):
+                eski_gorsellestir(depo, os.path.join(dizin, "eski.png"), kapat=kapat)
+        gc.collect()
+        kalan = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"  {ad:<22}: {kalan / 2**20:>6.1f} MB (açık figür: {len(plt.get_fignums())})")
+        plt.close("all")
+        if kapat is None:
+            cizici.kapat()
+
+    print()
+    print(f"{'Kayıt':>11} | {'Eski (s/çizim)':>14} | {'Yeni (s/çizim)':>14} | {'Hızlanma':>8}")
+    print("-" * 58)
+    for n in args.boyutlar:
+        veri = sentetik_veri(n)
+        depo = VeriDeposu(kapasite=n)
+        depo.ekle_toplu(veri["timestamp"], veri["flow_lpm"], veri["cumulative_liters"], veri["ir_state"])
+
+        eski = None
+        if n <= args.eski_maks:
+            t0 = time.perf_counter()
+            for _ in range(args.tekrar):
+                eski_gorsellestir(depo, os.path.join(dizin, "eski.png"), kapat=True)
+            eski = (time.perf_counter() - t0) / args.tekrar
+
+        cizici = Cizici(os.path.join(dizin, "yeni.png"))
+        t0 = time.perf_counter()
+        for _ in range(args.tekrar):
+            cizici.ciz(depo, zorla=True)
+        yeni = (time.perf_counter() - t0) / args.tekrar
+        cizici.kapat()
+
+        eski_yazi = f"{eski:>14.3f}" if eski is not None else f"{'-':>14}"
+        hiz_yazi = f"{eski / yeni:>7.1f}x" if eski is not None else f"{'-':>8}"
+        print(f"{n:>11,} | {eski_yazi} | {yeni:>14.3f} | {hiz_yazi}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# VERİ DEPOSU EKLEME HIZI ÖLÇÜMÜ
+# Kayıt sayısı 10 binden 10 milyona çıkarken tek tek ekleme hızının sabit kaldığını gösterir.
+# Kullanım:  python -m su_izleme.bench.depo [--boyutlar 10000 100000 1000000 10000000] [--pandas]
+
+import argparse
+import time
+
+from su_izleme.bench.sentetik import sentetik_veri
+from su_izleme.depo import VeriDeposu
+
+BLOK = 65536  # Döngüde tekrar kullanılan örnek bloğu (bellek şişmesin diye)
+PENCERE = 10000  # Her kontrol noktasından önceki bu kadar eklemenin hızı ölçülür
+
+
+def _kaynak():
+    veri = sentetik_veri(BLOK)
+    return list(zip(list(veri["timestamp"]), veri["flow_lpm"].tolist(),
+                    veri["cumulative_liters"].tolist(), veri["ir_state"].tolist()))
+
+
+def depo_olc(boyutlar, pencere=None):
+    """Tek bir depoya sırayla ekleme yapar, her kontrol noktasında anlık hızı döndürür"""
+    satirlar = _kaynak()
+    depo = VeriDeposu(pencere=pencere)
+    sonuc = []
+    eklenen = 0
+    for hedef in sorted(boyutlar):
+        # Kontrol noktasına kadar ölçümsüz doldur
+        while eklenen < hedef - PENCERE:
+            adet = min(hedef - PENCERE - eklenen, BLOK)
+            for satir in satirlar[:adet]:
+                depo.ekle(*satir)
+            eklenen += adet
+        # Son PENCERE eklemeyi ölç
+        adet = hedef - eklenen
+        t0 = time.perf_counter()
+        for k in range(adet):
+            depo.ekle(*satirlar[k % BLOK])
+        sure = time.perf_counter() - t0
+        eklenen += adet
+        sonuc.append((hedef, adet / sure if sure > 0 else float("inf")))
+    return sonuc
+
+
+def pandas_olc(boyutlar):
+    """Karşılaştırma için eski data.loc[len(data)] = new_row yöntemini ölçer"""
+    import pandas as pd
+
+    satirlar = _kaynak()
+    data = pd.DataFrame(columns=["timestamp", "flow_lpm", "cumulative_liters", "ir_state"])
+    sonuc = []
+    for hedef in sorted(boyutlar):
+        adet = min(1000, hedef - len(data))
+        while len(data) < hedef - adet:
+            data.loc[len(data)] = list(satirlar[len(data) % BLOK])
+        t0 = time.perf_counter()
+        for _ in range(adet):
+            data.loc[len(data)] = list(satirlar[len(data) % BLOK])
+        sure = time.perf_counter() - t0
+        sonuc.append((hedef, adet / sure if sure > 0 else float("inf")))
+    return sonuc
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="VeriDeposu ekleme hızı ölçümü")
+    parser.add_argument("--boyutlar", type=int, nargs="+",
+                        default=[10_000, 100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--pencere", type=int, default=None,
+                        help="Halka modunda ölç (son N örnek)")
+    parser.add_argument("--pandas", action="store_true",
+                        help="Karşılaştırma için pandas .loc eklemesini de ölç (yavaş, 20 bine kadar)")
+    args = parser.parse_args(argv)
+
+    print(f"{'Kayıt':>12} | {'Ekleme/s':>12}")
+    print("-" * 27)
+    for hedef, hiz in depo_olc(args.boyutlar, args.pencere):
+        print(f"{hedef:>12,} | {hiz:>12,.0f}")
+
+    if args.pandas:
+        print("\npandas data.loc[len(data)] = new_row")
+        for hedef, hiz in pandas_olc([b for b in args.boyutlar if b <= 20_000] or [10_000]):
+            print(f"{hedef:>12,} | {hiz:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# AĞ GEÇİDİ YÜK TESTİ
+# N adet sahte sayaç (pty) açar, ayrı bir süreçten her birine R Hz ile "flow,cumulative,ir"
+# satırları yazar ve ağ geçidinin toplam verimini ve sayaç başına gecikmesini ölçer.
+# Gecikme: satırın planlanan gönderim anından depo/analiz işleyicisine ulaşmasına kadar geçen süre.
+# Sadece POSIX (Linux/macOS) üzerinde çalışır.
+# Kullanım:  python -m su_izleme.bench.gecit_yuk [--sayaclar 1 10 50 100 200] [--hiz 10] [--sure 10]
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+import tty
+
+import numpy as np
+
+from su_izleme.ag_gecidi import AgGecidi, CokluSayacDeposu
+
+
+def _yazici(masterlar, hiz, sure, t0):
+    """Alt süreç: her tikte tüm sayaçlara bir satır yazar (cumulative alanı = sıra no)"""
+    adim = 1.0 / hiz
+    k = 0
+    while k * adim < sure:
+        bekle = t0 + k * adim - time.time()
+        if bekle > 0:
+            time.sleep(bekle)
+        satir = f"2.50,{k},{k % 2}\n".encode()
+        for fd in masterlar:
+            os.write(fd, satir)
+        k += 1
+
+
+async def _olc(n, hiz, sure):
+    ptyler = []
+    for _ in range(n):
+        master, slave = os.openpty()
+        tty.setraw(slave)
+        ptyler.append((master, slave, os.ttyname(slave)))
+
+    depo = CokluSayacDeposu()
+    gecikmeler = {f"s{i}": [] for i in range(n)}
+    t0 = time.time() + 1.0  # Ağ geçidi bağlansın diye 1 s sonra başla
+
+    def isleyici(toplu):
+        simdi = time.time()
+        for kimlik, _ts, _flow, sira, _ir in toplu:
+            gecikmeler[kimlik].append(simdi - (t0 + sira / hiz))
+        depo(toplu)
+
+    gecit = AgGecidi({f"s{i}": yol for i, (_, _, yol) in enumerate(ptyler)}, isleyici)
+    await gecit.baslat()
+
+    yazici = multiprocessing.Process(target=_yazici, args=([m for m, _, _ in ptyler], hiz, sure, t0))
+    yazici.start()
+    await asyncio.get_running_loop().run_in_executor(None, yazici.join)
+    await asyncio.sleep(0.5)  # Yoldaki satırlar gelsin
+    await gecit.durdur()
+    for master, slave, _ in ptyler:
+        os.close(master)
+        os.close(slave)
+
+    hepsi = np.concatenate([np.asarray(v) for v in gecikmeler.values()]) if n else np.empty(0)
+    p99_sayac = [np.percentile(v, 99) for v in gecikmeler.values() if v]
+    beklenen = n * int(np.ceil(sure * hiz))
+    return {
+        "sayac": n,
+        "beklenen": beklenen,
+        "alinan": len(hepsi),
+        "verim": len(hepsi) / sure,
+        "p50_ms": float(np.percentile(hepsi, 50)) * 1e3 if len(hepsi) else float("nan"),
+        "p99_ms": float(np.percentile(hepsi, 99)) * 1e3 if len(hepsi) else float("nan"),
+        "en_kotu_sayac_p99_ms": max(p99_sayac) * 1e3 if p99_sayac else float("nan"),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ağ geçidi yük testi (sahte pty sayaçlar)")
+    parser.add_argument("--sayaclar", type=int, nargs="+", default=[1, 10, 50, 100, 200])
+    parser.add_argument("--hiz", type=float, default=10.0, help="Sayaç başına satır/s")
+    parser.add_argument("--sure", type=float, default=10.0, help="Her ölçümün süresi (s)")
+    args = parser.parse_args(argv)
+
+    print(f"{'Sayaç':>6} | {'Alınan/Beklenen':>17} | {'Verim (örnek/s)':>15} | "
+          f"{'p50':>8} | {'p99':>8} | {'En kötü sayaç p99':>17}")
+    print("-" * 86)
+    for n in args.sayaclar:
+        s = asyncio.run(_olc(n, args.hiz, args.sure))
+        print(f"{s['sayac']:>6} | {s['alinan']:>8}/{s['beklenen']:<8} | {s['verim']:>15,.0f} | "
+              f"{s['p50_ms']:>5.1f} ms | {s['p99_ms']:>5.1f} ms | {s['en_kotu_sayac_p99_ms']:>14.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# YAZMA GÜNLÜĞÜ: KURTARMA DOĞRULUĞU VE SÜRESİ
+#   - Doğruluk: yarım kalan son kayıt, ortasında bayt bozulan bölüm ve derleme sırasında kesilen
+#     (niyet yazılmış, satırlar yarım eklenmiş) sütunsal depo senaryolarında kurtarılan satır sayısı;
+#     geçmiş yüklenirken kapanan bu oturum bölümlerinin depoya derlemeyi_ac()'tan önce girmemesi;
+#     günlük kaynaklı depoda CSV depodan ileri gittiğinde (günlüksüz oturum) uyarı verilmesi
+#   - Kurtarma süresi: --boyutlar satırlık geçmiş + sabit --kuyruk kayıtlık derlenmemiş günlük için
+#     derle() + yukle() süresi (geçmiş büyüse de sabit kalmalı)
+#   - Yazma maliyeti: canlı akıştaki gibi tek örneklik ve 256'lık partilerle ekle_toplu
+# Kullanım:  python -m su_izleme.bench.gunluk [--boyutlar 1000000 5000000] [--kuyruk 600]
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from su_izleme import SUTUNLAR
+from su_izleme.bench.baslangic import depo_hazirla
+from su_izleme.bench.sentetik import sentetik_veri
+from su_izleme.gunluk import BASLIK_BAYT, KAYIT_TIPI, YazmaGunlugu, bolum_oku
+from su_izleme.kalici import KolonDeposu
+
+
+def _yaz(gunluk, veri, parti):
+    for i in range(0, len(veri["timestamp"]), parti):
+        gunluk.ekle_toplu(*(veri[ad][i:i + parti] for ad in SUTUNLAR))
+
+
+def dogruluk(dizin):
+    """[(senaryo, beklenen, bulunan)] döndürür"""
+    sonuc = []
+    veri = sentetik_veri(1000, seed=1)
+
+    # Yarım son kayıt: çökme write() ortasında
+    kolon = KolonDeposu(os.path.join(dizin, "k1"))
+    gunluk = YazmaGunlugu(os.path.join(dizin, "g1"), kolon)
+    _yaz(gunluk, veri, 7)
+    yol = gunluk._yol(gunluk._no)
+    with open(yol, "ab") as f:
+        f.write(b"\x01" * (KAYIT_TIPI.itemsize // 2))
+    sonuc.append(("yarım son kayıt", 1000, len(bolum_oku(yol)[0]["timestamp"])))
+
+    # Ortada bozulan bayt: o kayıttan sonrası atılır
+    with open(yol, "r+b") as f:
+        f.seek(BASLIK_BAYT + 600 * KAYIT_TIPI.itemsize + 9)
+        f.write(b"\xff")
+    sonuc.append(("600. kayıtta bozulma", 600, len(bolum_oku(yol)[0]["timestamp"])))
+
+    # Derleme ortasında kesilme: niyet yazıldı, satırlar yarım eklendi, bölüm silinmedi
+    kolon = KolonDeposu(os.path.join(dizin, "k2"))
+    gunluk = YazmaGunlugu(os.path.join(dizin, "g2"), kolon)
+    kolon.gunluge_gec()
+    _yaz(gunluk, veri, 100)
+    gunluk.kapat()
+    kolon.meta["gunluk_derleme"] = [1, 0]
+    kolon.ekle_toplu(*(veri[ad][:321] for ad in SUTUNLAR))
+    gunluk = YazmaGunlugu(gunluk.dizin, kolon)  # Yeni açılış
+    gunluk.derle()
+    sonuc.append(("derleme ortasında kesilme", 1000, len(kolon)))
+
+    # Bölüm eklendi ama silinemeden kesildi: tekrar eklenmemeli
+    _yaz(gunluk, veri, 100)
+    gunluk._kapat_bolum()
+    kopya = gunluk._yol(gunluk._no) + ".kopya"
+    shutil.copy(gunluk._yol(gunluk._no), kopya)
+    gunluk.derlemeyi_ac()
+    os.replace(kopya, gunluk._yol(gunluk._no))
+    gunluk.derle()
+    sonuc.append(("silinmemiş derlenmiş bölüm", 2000, len(kolon)))
+    zaman = kolon.yukle()["timestamp"]
+    sonuc.append(("derlenen zaman damgaları", True, bool((zaman[:1000] == veri["timestamp"]).all())))
+
+    # Günlük kaynaklı depo CSV'yi okumaz: CSV'ye depodan yeni satır eklenmişse uyarılır
+    csv_yolu = os.path.join(dizin, "k2.csv")
+    with open(csv_yolu, "w", encoding="utf-8") as f:
+        f.write(",".join(SUTUNLAR) + "\n")
+        for t, d, c, ir in zip(veri["timestamp"].astype("datetime64[us]").tolist(), veri["flow_lpm"].tolist(),
+                               veri["cumulative_liters"].tolist(), veri["ir_state"].tolist()):
+            f.write(f"{t},{d},{c},{ir}\n")
+    sonuc.append(("CSV depoyla aynı: uyarı", False, kolon.csv_ileride(csv_yolu)))
+    with open(csv_yolu, "a", encoding="utf-8") as f:
+        f.write(f"{(veri['timestamp'][-1] + 1_000_000_000).astype('datetime64[us]').tolist()},1.0,0.0,0\n")
+    sonuc.append(("CSV depodan ileride: uyarı", True, kolon.csv_ileride(csv_yolu)))
+
+    # Geçmiş yüklenirken bu oturumun bölümleri kapanır (bolum_sure=0: her partide yeni bölüm):
+    # kurtarma sadece önceki oturumu derler, bu oturumunkiler derlemeyi_ac()'ı bekler
+    kolon = KolonDeposu(os.path.join(dizin, "k3"))
+    kolon.gunluge_gec()
+    onceki = YazmaGunlugu(os.path.join(dizin, "g3"), kolon)
+    _yaz(onceki, veri, 100)
+    onceki._kapat_bolum()  # Çökme
+    gunluk = YazmaGunlugu(onceki.dizin, kolon, bolum_sure=0.0)
+    _yaz(gunluk, veri, 100)
+    gunluk.derle()
+    sonuc.append(("yüklemede kapanan bölümler", 1000, len(kolon)))
+    _yaz(gunluk, veri, 100)
+    gunluk.derlemeyi_ac()
+    sonuc.append(("derlemeyi_ac sonrası", 2900, len(kolon)))  # Açık son bölüm kapanışta derlenir
+    gunluk.kapat()
+    sonuc.append(("kapanış sonrası", 3000, len(kolon)))
+    return sonuc
+
+
+def kurtarma(dizin, satir, kuyruk):
+    """satir'lık geçmiş + kuyruk kayıtlık derlenmemiş günlük; (derle s, yukle s, depo satırı)"""
+    kolon = depo_hazirla(os.path.join(dizin, f"kolon{satir}"), satir)
+    kolon.gunluge_gec()
+    gunluk = YazmaGunlugu(os.path.join(dizin, f"gunluk{satir}"), kolon)
+    veri = sentetik_veri(kuyruk, seed=satir)
+    veri["timestamp"] = veri["timestamp"] + satir * 1_000_000_000
+    _yaz(gunluk, veri, 1)
+    gunluk._kapat_bolum()  # Çökme: bölüm derlenmeden kaldı
+    os.sync()  # Az önce yazılan geçmişin kirli sayfaları derlemenin fsync'ine sayılmasın
+
+    kolon = KolonDeposu(kolon.dizin)  # Yeni açılış
+    gunluk = YazmaGunlugu(gunluk.dizin, kolon)
+    t0 = time.perf_counter()
+    gunluk.derle()
+    t1 = time.perf_counter()
+    gecmis = kolon.yukle()
+    t2 = time.perf_counter()
+    return t1 - t0, t2 - t1, len(gecmis["timestamp"])
+
+
+def yazma(dizin, n=20_000):
+    """(tek örneklik ekle_toplu µs, 256'lık partide örnek başına µs)"""
+    sonuc = []
+    for parti in (1, 256):
+        kolon = KolonDeposu(os.path.join(dizin, f"yk{parti}"))
+        gunluk = YazmaGunlugu(os.path.join(dizin, f"yg{parti}"), kolon, fsync_sure=1e9)
+        veri = sentetik_veri(n, seed=parti)
+        t0 = time.perf_counter()
+        _yaz(gunluk, veri, parti)
+        sonuc.append((time.perf_counter() - t0) / n * 1e6)
+        gunluk.kapat()
+    return sonuc
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Yazma günlüğü kurtarma doğruluğu ve süresi")
+    parser.add_argument("--boyutlar", type=int, nargs="+", default=[1_000_000, 5_000_000])
+    parser.add_argument("--kuyruk", type=int, default=600, help="Derlenmemiş günlük kaydı (1 Hz'de 10 dk)")
+    parser.add_argument("--dizin", help="Geçici dosyaların yazılacağı dizin")
+    args = parser.parse_args(argv)
+    hatalar = 0
+
+    dizin = tempfile.mkdtemp(dir=args.dizin)
+    try:
+        print(f"{'Senaryo':<28} | {'Beklenen':>8} | {'Bulunan':>8}")
+        print("-" * 50)
+        for senaryo, beklenen, bulunan in dogruluk(dizin):
+            hatalar += beklenen != bulunan
+            print(f"{senaryo:<28} | {beklenen!s:>8} | {bulunan!s:>8}{'' if beklenen == bulunan else '  HATA'}")
+
+        print()
+        print(f"{'Geçmiş':>12} | {'Kuyruk':>7} | {'derle':>9} | {'yukle':>9} | Toplam satır")
+        print("-" * 62)
+        for satir in args.boyutlar:
+            derle, yukle, toplam = kurtarma(dizin, satir, args.kuyruk)
+            hatalar += toplam != satir + args.kuyruk
+            print(f"{satir:>12,} | {args.kuyruk:>7,} | {derle * 1e3:>6.1f} ms | {yukle * 1e3:>6.1f} ms | {toplam:,}")
+            shutil.rmtree(os.path.join(dizin, f"kolon{satir}"), ignore_errors=True)
+
+        tek, parti = yazma(dizin)
+        print()
+        print(f"Yazma: tek örneklik parti {tek:.1f} µs/örnek, 256'lık parti {parti:.2f} µs/örnek (fsync hariç)")
+    finally:
+        shutil.rmtree(dizin, ignore_errors=True)
+    if hatalar:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# GEREKSİZ TÜKETİM HESABI: ESKİ VE YENİ YÖNTEM
+# Eski gereksiz_tuketim_hesapla önce IR=0 satırlarını süzüp zaman farkını bu alt küme içinde
+# alıyordu; kişi varken geçen her aralık, aralıktan sonraki ilk IR=0 örneğinin debisiyle
+# çarpılıp gereksiz sayılıyordu. Yeni yöntem (tuketim.tuketim_araliklari) tüm zaman çizelgesinde
+# ardışık örnekler arasındaki sayaç farkını kişi var / yok aralıklarına paylaştırır.
+#
+# Doğruluk: her örneğin gerçek hacmi (debi × önceki örnekten bu yana geçen süre) bilinen sentetik
+# veride, IR sensörünün kişi gittikten sonra 1 örnek geç düştüğü (musluk o an hâlâ açık) senaryo da
+# ölçülür. Ayrıca var + yok hacminin sayaçtaki toplam artışa eşit olduğu doğrulanır.
+# Hız: eski pandas yolu (kopya + süzme + zaman ayrıştırma) ile yeni yol karşılaştırılır.
+# Kullanım:  python -m su_izleme.bench.israf [--boyutlar 100000 1000000 10000000]
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from su_izleme.bench.sentetik import sentetik_veri
+from su_izleme.depo import VeriDeposu
+from su_izleme.tuketim import aralik_toplamlari, gereksiz_tuketim_hesapla, tuketim_araliklari
+
+
+def eski_gereksiz(df):
+    """Water2.py'nin ilk sürümündeki gereksiz_tuketim_hesapla (pandas DataFrame üzerinde)"""
+    import pandas as pd
+
+    waste_data = df[df["ir_state"] == 0].copy()
+    if waste_data.empty:
+        return 0.0
+    waste_data["timestamp"] = pd.to_datetime(waste_data["timestamp"])
+    waste_data = waste_data.sort_values("timestamp")
+    waste_data["time_diff"] = waste_data["timestamp"].diff().dt.total_seconds().fillna(0) / 60.0
+    waste_data["waste_liters"] = waste_data["flow_lpm"] * waste_data["time_diff"]
+    return round(waste_data["waste_liters"].sum(), 2)
+
+
+def gercek_gereksiz(veri):
+    """Sentetik verinin gerçek değeri: IR=0 örneklerinin debi × (önceki örnekten bu yana geçen süre)"""
+    dt = np.diff(veri["timestamp"]).astype(np.int64) / 60e9
+    return round(float(np.dot(veri["flow_lpm"][1:], dt * (veri["ir_state"][1:] == 0))), 2)
+
+
+def gecikmeli_ir(veri):
+    """IR sensörü kişi gittikten 1 örnek sonra düşer: o örnekte musluk hâlâ açıktır"""
+    veri = dict(veri)
+    ir = veri["ir_state"]
+    gidis = np.flatnonzero((ir[:-1] == 1) & (ir[1:] == 0)) + 1
+    flow = veri["flow_lpm"].copy()
+    flow[gidis] = flow[gidis - 1]
+    veri["flow_lpm"] = flow
+    veri["cumulative_liters"] = np.round(np.cumsum(flow / 60.0), 2)
+    return veri
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gereksiz tüketim hesabı: eski ve yeni yöntem")
+    parser.add_argument("--boyutlar", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--dogrulama", type=int, default=200_000, help="Doğruluk için örnek sayısı")
+    args = parser.parse_args(argv)
+    import pandas as pd
+
+    hatalar = 0
+    print(f"{'Senaryo':<22} | {'Gerçek (L)':>10} | {'Eski (L)':>10} | {'Yeni (L)':>10} | Var + yok = sayaç artışı")
+    print("-" * 84)
+    for ad, veri in (("sentetik", sentetik_veri(args.dogrulama)),
+                     ("IR 1 örnek gecikmeli", gecikmeli_ir(sentetik_veri(args.dogrulama)))):
+        araliklar = tuketim_araliklari(veri["timestamp"], veri["flow_lpm"], veri["cumulative_liters"], veri["ir_state"])
+        toplamlar = aralik_toplamlari(araliklar)
+        yeni = round(toplamlar["yokluk_litre"], 2)
+        artis = veri["cumulative_liters"][-1] - veri["cumulative_liters"][0]
+        korunum = abs(toplamlar["varlik_litre"] + toplamlar["yokluk_litre"] - artis) < 1e-6
+        gercek = gercek_gereksiz(veri)
+        # Sayaç 0,01 L'ye yuvarlandığı için aralık başına en fazla 0,01 L fark olabilir
+        tolerans = 0.01 * len(araliklar["litre"]) / 2 + 0.01
+        dogru = korunum and abs(yeni - gercek) <= tolerans
+        hatalar += not dogru
+        print(f"{ad:<22} | {gercek:>10.2f} | {eski_gereksiz(pd.DataFrame(veri)):>10.2f} | {yeni:>10.2f} | "
+              f"{'evet' if korunum else 'HAYIR'}")
+
+    print()
+    print(f"{'Kayıt':>12} | {'Eski (pandas)':>13} | {'Yeni (depo)':>11} | {'Yeni (pandas)':>13}")
+    print("-" * 60)
+    for n in args.boyutlar:
+        veri = sentetik_veri(n)
+        df = pd.DataFrame(veri)
+        depo = VeriDeposu(kapasite=n)
+        depo.ekle_toplu(veri["timestamp"], veri["flow_lpm"], veri["cumulative_liters"], veri["ir_state"])
+        sureler = []
+        for fonk, girdi in ((eski_gereksiz, df), (gereksiz_tuketim_hesapla, depo), (gereksiz_tuketim_hesapla, df)):
+            t0 = time.perf_counter()
+            fonk(girdi)
+            sureler.append(time.perf_counter() - t0)
+        print(f"{n:>12,} | " + " | ".join(f"{s * 1e3:>10.1f} ms" for s in sureler))
+    if hatalar:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
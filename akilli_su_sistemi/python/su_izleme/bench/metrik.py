@@ -0,0 +1,78 @@
+# METRİK MALİYETİ VE DOĞRULUĞU
+#   - Doğruluk: Histogram'ın p50 / p99 değerleri log-normal dağılımlı sürelerde np.percentile ile
+#     karşılaştırılır (kovanın geometrik ortası kullanıldığı için en fazla ±%(√KOVA_ORANI-1) sapma beklenir)
+#   - Maliyet: aynı geçmiş Analiz aşamasından (tekrar.tekrar) metrikler kapalı ve açık iki kez geçirilir;
+#     örnek başına süre farkı ve kanca çağrısının tek başına maliyeti gösterilir
+# Kullanım:  python -m su_izleme.bench.metrik [--satir 200000] [--tekrar 3]
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from su_izleme.bench.baslangic import depo_hazirla
+from su_izleme.izleme import Analiz
+from su_izleme.metrik import KOVA_ORANI, Histogram, Metrikler
+from su_izleme.tekrar import tekrar
+
+
+def dogruluk(n, rng):
+    """[(yüzdelik, gerçek değer, histogram tahmini)] döndürür"""
+    sureler = rng.lognormal(np.log(2e-4), 1.5, n)
+    histogram = Histogram()
+    for sure in sureler.tolist():
+        histogram.ekle(sure)
+    return [(p, float(np.percentile(sureler, p)), histogram.yuzdelik(p)) for p in (50, 90, 99)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Metrik maliyeti ve doğruluğu")
+    parser.add_argument("--satir", type=int, default=200_000, help="Yeniden işlenen geçmiş satırı")
+    parser.add_argument("--tekrar", type=int, default=3)
+    parser.add_argument("--dizin", help="Geçici dosyaların yazılacağı dizin")
+    args = parser.parse_args(argv)
+    hatalar = 0
+
+    print(f"{'Yüzdelik':<9} | {'Gerçek':>10} | {'Histogram':>10} | Sapma")
+    print("-" * 46)
+    for p, gercek, tahmin in dogruluk(100_000, np.random.default_rng(0)):
+        sapma = tahmin / gercek - 1
+        hatalar += abs(sapma) > KOVA_ORANI ** 0.5 - 1 + 1e-9
+        print(f"p{p:<8} | {gercek * 1e3:>7.3f} ms | {tahmin * 1e3:>7.3f} ms | {sapma * 100:+.1f}%")
+
+    metrikler = Metrikler()
+    n = 1_000_000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        metrikler.kanca("analiz", 1, 3e-4)
+    kanca_us = (time.perf_counter() - t0) / n * 1e6
+
+    dizin = tempfile.mkdtemp(dir=args.dizin)
+    try:
+        kolon = depo_hazirla(dizin, args.satir)
+        sonuclar = {}
+        for ad, acik in (("kapalı", False), ("açık", True)):
+            sureler = []
+            for _ in range(args.tekrar):
+                kanca = Metrikler().kanca if acik else None
+                analiz = Analiz(rapor_araligi=0, anlik_araligi=0, kanca=kanca)
+                adet, sure, _ = tekrar(kolon, analiz, kanca=kanca)
+                sureler.append(sure / adet)
+            sonuclar[ad] = min(sureler)
+    finally:
+        shutil.rmtree(dizin, ignore_errors=True)
+
+    print()
+    print(f"Kanca çağrısı: {kanca_us:.2f} µs (parti başına bir kez; parti en fazla 256 örnek)")
+    print(f"Analiz aşaması, {args.satir:,} satır: metrik kapalı {sonuclar['kapalı'] * 1e6:.2f} µs/örnek, "
+          f"açık {sonuclar['açık'] * 1e6:.2f} µs/örnek "
+          f"({(sonuclar['açık'] / sonuclar['kapalı'] - 1) * 100:+.1f}%)")
+    if hatalar:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# SAYAÇ NORMALLEŞTİRME ÖLÇÜMÜ VE DOĞRULAMASI
+# N günlük 1 Hz sentetik veriye Arduino yeniden başlamaları (sayaç 0'dan sayar) ve veri boşlukları
+# (seri port koptu, cihaz açık kaldı) eklenir:
+#   - Her örneğin ömür boyu toplamı, sıfırlama eklenmemiş sayaçla karşılaştırılır; eski rapor değeri
+#     (son satırın cumulative_liters değeri) de gösterilir,
+#   - Küçük partilerle işlemenin tek seferde işlemeyle aynı sonucu verdiği doğrulanır,
+#   - Açılışta kontrol noktasıyla yakalama ile tüm geçmişin yeniden taranması karşılaştırılır.
+# Kullanım:  python -m su_izleme.bench.normallestir [--gun 90] [--sifirlama 20] [--bosluk 50]
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from su_izleme.bench.sentetik import sentetik_veri
+from su_izleme.normallestir import SayacNormallestirici
+
+TOLERANS = 1e-6  # L; partili / tek seferde toplamlar arasında kabul edilen kayan nokta farkı
+
+
+def olay_ekle(veri, sifirlama, bosluk, rng):
+    """Sayacı rastgele noktalarda sıfırlar ve rastgele satır aralıklarını siler.
+
+    Sıfırlanmış ham sayaç dizisi, doğru ömür boyu toplam ve tutulan satır maskesini döndürür.
+    Sıfırlamalar tutulan iki ardışık satır arasına konur: silinen aralığın içindeki bir sıfırlamadan
+    sonra sayaç eski değerini geçmişse hiçbir yöntem onu göremez (kısa geçmişte sık olur).
+    """
+    n = len(veri["timestamp"])
+    gercek = veri["cumulative_liters"]
+    tut = np.ones(n, dtype=bool)
+    for bas in rng.choice(n - 3600, bosluk, replace=False):
+        tut[bas:bas + int(rng.integers(60, 3600))] = False
+    adaylar = np.flatnonzero(tut[1:] & tut[:-1]) + 1
+    ham = gercek.copy()
+    for r in np.sort(rng.choice(adaylar, sifirlama, replace=False)):
+        ham[r:] = np.round(gercek[r:] - gercek[r - 1], 2)  # Yeniden başlayan kart 0'dan sayar
+    return ham, gercek, tut
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sayaç sıfırlama / boşluk normalleştirme ölçümü")
+    parser.add_argument("--gun", type=int, default=90)
+    parser.add_argument("--sifirlama", type=int, default=20)
+    parser.add_argument("--bosluk", type=int, default=50)
+    parser.add_argument("--parti", type=int, default=100)
+    parser.add_argument("--dizin", help="Kontrol noktasının yazılacağı dizin")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    veri = sentetik_veri(args.gun * 86_400)
+    ham, gercek, tut = olay_ekle(veri, args.sifirlama, args.bosluk, rng)
+    zaman, ham, gercek = veri["timestamp"][tut], ham[tut], gercek[tut]
+    n = len(zaman)
+    hatalar = 0
+
+    t0 = time.perf_counter()
+    tek = SayacNormallestirici()
+    omur = tek.toplu(zaman, ham)
+    t_tek = time.perf_counter() - t0
+    dogru = np.allclose(omur, gercek, atol=0.01 * (args.sifirlama + 1))
+    hatalar += not dogru
+    print(f"{n:,} örnek, {args.sifirlama} sıfırlama, {args.bosluk} boşluk eklendi")
+    print(f"  Gerçek toplam         : {gercek[-1]:>12.2f} L")
+    print(f"  Eski (son ham değer)  : {ham[-1]:>12.2f} L")
+    print(f"  Ömür boyu toplam      : {tek.omur_toplam:>12.2f} L | her örnekte gerçekle aynı: "
+          f"{'evet' if dogru else 'HAYIR'}")
+    print(f"  Bulunan sıfırlama / boşluk: {tek.sifirlama_sayisi} / {tek.bosluk_sayisi} "
+          f"({tek.bosluk_s / 3600:.1f} sa)")
+    # Üst üste gelen boşluklar birleşebilir, tüketimsiz anda olan sıfırlama fark edilmez (kayıp da yoktur)
+    hatalar += not (0 < tek.sifirlama_sayisi <= args.sifirlama and 0 < tek.bosluk_sayisi <= args.bosluk)
+
+    partili = SayacNormallestirici()
+    t0 = time.perf_counter()
+    parcalar = [partili.toplu(zaman[i:i + args.parti], ham[i:i + args.parti]) for i in range(0, n, args.parti)]
+    t_parti = time.perf_counter() - t0
+    # Ofset parti parti biriktirildiği için son basamakta (ulp) farklı olabilir; sıfırlama sayısı birebir aynı olmalı
+    ayni = (np.allclose(np.concatenate(parcalar), omur, rtol=0, atol=TOLERANS)
+            and partili.sifirlama_sayisi == tek.sifirlama_sayisi)
+    hatalar += not ayni
+    print(f"  {args.parti}'lük partilerle aynı sonuç: {'evet' if ayni else 'HAYIR'}")
+
+    dizin = tempfile.mkdtemp(dir=args.dizin)
+    try:
+        # Önceki oturum son 1 saat hariç tüm geçmişi işleyip kontrol noktası yazmış
+        yol = os.path.join(dizin, "sayac.json")
+        onceki = SayacNormallestirici(yol)
+        onceki.toplu(zaman[:-3600], ham[:-3600])
+        onceki.kaydet()
+
+        t0 = time.perf_counter()
+        acilis = SayacNormallestirici(yol)
+        yeni = acilis.yakala(zaman, ham)
+        t_acilis = time.perf_counter() - t0
+        ayni = abs(acilis.omur_toplam - tek.omur_toplam) <= TOLERANS and yeni == 3600
+        hatalar += not ayni
+        print(f"  Kontrol noktasıyla açılış: {yeni:,} yeni satır, aynı toplam: {'evet' if ayni else 'HAYIR'}")
+    finally:
+        shutil.rmtree(dizin, ignore_errors=True)
+
+    print()
+    print(f"{'Yöntem':<32} | {'Süre':>10} | {'Örnek/s':>12}")
+    print("-" * 60)
+    print(f"{'Tüm geçmişi yeniden tarama':<32} | {t_tek * 1e3:>7.1f} ms | {n / t_tek:>12,.0f}")
+    print(f"{f'{args.parti} örneklik partiler':<32} | {t_parti * 1e3:>7.1f} ms | {n / t_parti:>12,.0f}")
+    print(f"{'Açılış (kontrol noktası)':<32} | {t_acilis * 1e3:>7.1f} ms |")
+    if hatalar:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
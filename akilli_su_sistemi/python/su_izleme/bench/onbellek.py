@@ -0,0 +1,154 @@
+# SÜRÜMLÜ ÖNBELLEK: DOĞRULUK, İSABET ORANI VE YANIT SÜRESİ
+# --gun günlük 1 Hz geçmişle bir Analiz kurulur, sonra --parti örneklik canlı partiler işlenir. Her
+# partiden sonra --tuketici adet tüketici /rapor, /anlik, /ozet ve rastgele geçmiş / güncel /aralik ister
+# (sunucu.SorguSunucusu.yanit, ağ olmadan).
+#   - Doğruluk: önbellekten gelen her yanıt aynı anda önbelleksiz hesaplanan yanıtla aynı olmalı;
+#     hesap sürerken aralığa örnek eklenirse sonuç saklanmamalı (bayat); boyut sınırı aşılmamalı
+#   - Süre: aynı istek akışı önbellekli ve önbelleksiz (maks_kayit=0) çalıştırılır
+# Kullanım:  python -m su_izleme.bench.onbellek [--gun 7] [--parti 10] [--tur 200] [--tuketici 20]
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from su_izleme import SUTUNLAR
+from su_izleme.bench.sentetik import sentetik_veri
+from su_izleme.izleme import Analiz
+from su_izleme.onbellek import SurumluOnbellek
+from su_izleme.sunucu import SorguSunucusu
+
+SAAT_NS = 3600 * 10**9
+
+
+def analiz_kur(gun, onbellek):
+    veri = sentetik_veri(gun * 86_400 + 100_000, seed=7)
+    gecmis = gun * 86_400
+    analiz = Analiz(rapor_araligi=0, anlik_araligi=0)
+    analiz.onbellek = onbellek
+    analiz.gecmis({ad: veri[ad][:gecmis] for ad in SUTUNLAR})
+    canli = [(np.datetime64(t, "ns"), f, c, i) for t, f, c, i in
+             zip(veri["timestamp"][gecmis:].view(np.int64).tolist(), veri["flow_lpm"][gecmis:].tolist(),
+                 veri["cumulative_liters"][gecmis:].tolist(), veri["ir_state"][gecmis:].tolist())]
+    return analiz, canli, int(veri["timestamp"][0].astype(np.int64))
+
+
+def istekler(rng, ilk_ns, son_ns, tuketici):
+    """Bir partiden sonraki istekler: çoğu aynı panolar, birkaçı rastgele geçmiş aralık"""
+    gun_bas = son_ns - son_ns % (24 * SAAT_NS)
+    hedefler = ["/rapor", "/anlik", "/ozet",
+                f"/aralik?bas={_iso(gun_bas)}&bit={_iso(gun_bas + 24 * SAAT_NS)}",  # Bugün (güncel)
+                f"/aralik?bas={_iso(ilk_ns)}&bit={_iso(ilk_ns + 24 * SAAT_NS)}&nokta=200"]  # İlk gün (geçmiş)
+    for _ in range(max(tuketici - len(hedefler), 0)):
+        saat = int(rng.integers(0, (son_ns - ilk_ns) // SAAT_NS - 24))
+        hedefler.append(f"/aralik?bas={_iso(ilk_ns + saat * SAAT_NS)}&bit={_iso(ilk_ns + (saat + 6) * SAAT_NS)}")
+    return hedefler
+
+
+def _iso(ns):
+    return str(np.datetime64(ns, "ns").astype("datetime64[s]"))
+
+
+def calistir(analiz, canli, ilk_ns, args, kontrol=None):
+    """Partileri işleyip her partiden sonra istekleri yanıtlar; (istek süresi s, istek, hatalı)"""
+    sunucu = SorguSunucusu(analiz)
+    rng = np.random.default_rng(3)
+    sure, adet, hatali = 0.0, 0, 0
+    for j in range(args.tur):
+        parti = canli[j * args.parti:(j + 1) * args.parti]
+        analiz(parti)
+        son_ns = int(parti[-1][0].astype(np.int64))
+        hedefler = istekler(rng, ilk_ns, son_ns, args.tuketici)
+        t0 = time.perf_counter()
+        for _ in range(args.tekrar):  # Aynı panolar aynı partide birden çok kez
+            yanitlar = [sunucu.yanit(h) for h in hedefler]
+        sure += time.perf_counter() - t0
+        adet += len(hedefler) * args.tekrar
+        if kontrol is not None:
+            taze = kontrol(hedefler)
+            for h, y, t in zip(hedefler, yanitlar, taze):
+                if y != t:
+                    hatali += 1
+                    print(f"HATA parti {j}: {h} önbellekten farklı")
+    return sure, adet, hatali
+
+
+def taze_yanitlar(analiz):
+    """Önbelleği atlayan aynı hesap (doğrulama için)"""
+    sunucu = SorguSunucusu(analiz)
+
+    def kontrol(hedefler):
+        asil = analiz.onbellek
+        analiz.onbellek = SurumluOnbellek(maks_kayit=0)
+        try:
+            return [sunucu.yanit(h) for h in hedefler]
+        finally:
+            analiz.onbellek = asil
+    return kontrol
+
+
+def birim_kontrolleri():
+    """[(kontrol, geçti mi)]: bayat sonuç, aralık dışı parti, boyut sınırı"""
+    sonuc = []
+    o = SurumluOnbellek()
+    o.al("gecmis", lambda: "a", 0, 100)
+    o.al("guncel", lambda: "b", 100, None)
+    o.ilerlet(5, 150, 160)
+    sonuc.append(("aralık dışı kayıt korunur", "gecmis" in o._kayitlar and "guncel" not in o._kayitlar))
+
+    def yarisan():
+        o.ilerlet(1, 170, 170)  # Hesap sürerken aralığa örnek geldi
+        return "c"
+    o.al("yaris", yarisan, 100, None)
+    sonuc.append(("hesap sırasında bayatlayan saklanmaz", "yaris" not in o._kayitlar and o.bayat == 1))
+
+    kucuk = SurumluOnbellek(maks_bayt=64 * 1024)
+    for i in range(200):
+        kucuk.al(i, lambda: np.zeros(1000), i, i + 1)
+    sonuc.append(("boyut sınırı", kucuk.bayt <= kucuk.maks_bayt and kucuk.tahliye > 0))
+    return sonuc
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sürümlü sonuç önbelleği ölçümü")
+    parser.add_argument("--gun", type=int, default=7, help="Geçmiş (1 Hz gün)")
+    parser.add_argument("--parti", type=int, default=10, help="Canlı parti başına örnek")
+    parser.add_argument("--tur", type=int, default=200, help="Parti sayısı")
+    parser.add_argument("--tuketici", type=int, default=20, help="Parti başına farklı istek")
+    parser.add_argument("--tekrar", type=int, default=3, help="Her isteğin parti başına tekrarı")
+    args = parser.parse_args(argv)
+    if args.gun < 2:
+        parser.error("Rastgele geçmiş aralıklar için en az 2 gün gerekir")
+    hatalar = 0
+
+    for kontrol, gecti in birim_kontrolleri():
+        hatalar += not gecti
+        print(f"{kontrol:<38} {'tamam' if gecti else 'HATA'}")
+
+    analiz, canli, ilk_ns = analiz_kur(args.gun, SurumluOnbellek())
+    sure, adet, hatali = calistir(analiz, canli, ilk_ns, args, taze_yanitlar(analiz))
+    hatalar += hatali
+    print(f"{'önbellekli yanıt = önbelleksiz yanıt':<38} {'tamam' if not hatali else f'HATA ({hatali})'}")
+    ist = analiz.onbellek.istatistik()
+
+    # Süre: doğrulama olmadan iki çalıştırma
+    sureler = {}
+    for ad, onbellek in (("önbelleksiz", SurumluOnbellek(maks_kayit=0)), ("önbellekli", SurumluOnbellek())):
+        analiz, canli, ilk_ns = analiz_kur(args.gun, onbellek)
+        sureler[ad] = calistir(analiz, canli, ilk_ns, args)[:2]
+
+    print(f"\n{args.gun} gün geçmiş, {args.tur} parti × {args.parti} örnek, parti başına {args.tuketici} istek × {args.tekrar}")
+    print(f"{'':<12} | {'İstek başına':>12} | {'Toplam':>8}")
+    print("-" * 38)
+    for ad, (s, n) in sureler.items():
+        print(f"{ad:<12} | {s / n * 1e6:>9.1f} µs | {s:>6.2f} s")
+    print(f"Hızlanma: {sureler['önbelleksiz'][0] / sureler['önbellekli'][0]:.1f}x")
+    print(f"İsabet: {ist['isabet']} | Iska: {ist['iska']} (%{ist['isabet_orani'] * 100:.0f} isabet) | "
+          f"Geçersiz: {ist['gecersiz']} | Tahliye: {ist['tahliye']} | {ist['kayit']} kayıt, {ist['bayt'] / 1024:.0f} KB")
+    if hatalar:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
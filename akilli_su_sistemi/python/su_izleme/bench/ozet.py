@@ -0,0 +1,123 @@
+# ÖZET KATMANLARI ÖLÇÜMÜ VE DOĞRULAMASI
+# N günlük 1 Hz sentetik veriyle (90 gün ≈ 7,8M örnek):
+#   - Özetlerin seri porttan gelir gibi küçük partilerle ve tek seferde kurulma süresini,
+#   - Diske yazma / yeniden açma süresini,
+#   - N günlük grafiğin ham veriden (Cizici, min/maks seyreltme) ve özetlerden (ozet_ciz) çizim süresini
+# ölçer. Her katmanın kovaları kaba kuvvetle (np.unique + bincount) hesaplananla karşılaştırılır.
+# Örneklerin NAN_ORANI kadarının debisi NaN yapılır (ayrıştırıcı "nan" kabul eder): debi alanları bunları atlamalı.
+# Kullanım:  python -m su_izleme.bench.ozet [--gun 90] [--parti 100]
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+import numpy as np  # noqa: E402
+
+from su_izleme.bench.sentetik import sentetik_veri  # noqa: E402
+from su_izleme.cizim import Cizici, ozet_ciz  # noqa: E402
+from su_izleme.depo import VeriDeposu  # noqa: E402
+from su_izleme.ozet import BOSLUK_S, KATMANLAR, OZET_TIPI, Ozetleyici  # noqa: E402
+
+NAN_ORANI = 0.001
+
+
+def dogrula(ozetleyici, veri):
+    """Her katmanı ham veriden kaba kuvvetle hesaplanan kovalarla karşılaştırır"""
+    t = veri["timestamp"].view(np.int64)
+    flow, cumulative = veri["flow_lpm"], veri["cumulative_liters"]
+    sure = np.diff(t, prepend=t[0]) / 1e9
+    sure[(sure < 0) | (sure > BOSLUK_S)] = 0
+    litre = np.diff(cumulative, prepend=cumulative[0])
+    litre = np.where(litre >= 0, litre, cumulative)
+    varlik = np.where(veri["ir_state"] != 0, sure, 0.0)
+    sonlu = np.isfinite(flow)
+
+    hepsi_ayni = True
+    for ad, genislik in KATMANLAR.items():
+        kovalar = ozetleyici.katman(ad)
+        baslangic, grup = np.unique(t // (genislik * 1_000_000_000), return_inverse=True)
+        enk = np.full(len(baslangic), np.inf)
+        enb = np.full(len(baslangic), -np.inf)
+        np.minimum.at(enk, grup[sonlu], flow[sonlu])
+        np.maximum.at(enb, grup[sonlu], flow[sonlu])
+        ayni = (len(kovalar) == len(baslangic)
+                and np.array_equal(kovalar["baslangic"], baslangic * genislik * 1_000_000_000)
+                and np.array_equal(kovalar["adet"], np.bincount(grup))
+                and np.array_equal(kovalar["debi_adet"], np.bincount(grup[sonlu], minlength=len(baslangic)))
+                and np.array_equal(kovalar["debi_min"], enk)
+                and np.array_equal(kovalar["debi_maks"], enb)
+                and np.allclose(kovalar["debi_toplam"], np.bincount(grup[sonlu], flow[sonlu], minlength=len(baslangic)))
+                and np.allclose(kovalar["litre"], np.bincount(grup, litre))
+                and np.allclose(kovalar["varlik_s"], np.bincount(grup, varlik))
+                and np.allclose(kovalar["yokluk_s"], np.bincount(grup, sure - varlik)))
+        print(f"  {ad:<5}: {len(kovalar):>7,} kova | kaba kuvvetle aynı: {'evet' if ayni else 'HAYIR'}")
+        hepsi_ayni &= ayni
+    return hepsi_ayni
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Özet katmanlarının kurulum, kalıcılık ve çizim ölçümü")
+    parser.add_argument("--gun", type=int, default=90)
+    parser.add_argument("--parti", type=int, default=100, help="Canlı eklemeyi taklit eden parti boyu")
+    parser.add_argument("--tekrar", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    n = args.gun * 86_400
+    veri = sentetik_veri(n)
+    veri["flow_lpm"][np.random.default_rng(3).choice(n, int(n * NAN_ORANI), replace=False)] = np.nan
+    sutunlar = (veri["timestamp"], veri["flow_lpm"], veri["cumulative_liters"], veri["ir_state"])
+    print(f"{args.gun} gün, {n:,} örnek")
+    dizin = tempfile.mkdtemp()
+    try:
+        t0 = time.perf_counter()
+        ozetleyici = Ozetleyici(os.path.join(dizin, "ozet"))
+        ozetleyici.ekle_toplu(*sutunlar)
+        ozetleyici.kaydet()
+        print(f"Tek seferde kurulum + kayıt: {time.perf_counter() - t0:.2f} s")
+
+        canli = Ozetleyici()
+        parti_sayisi = min(n // args.parti, 20_000)
+        t0 = time.perf_counter()
+        for i in range(parti_sayisi):
+            canli.ekle_toplu(*(s[i * args.parti:(i + 1) * args.parti] for s in sutunlar))
+        sure = time.perf_counter() - t0
+        print(f"Canlı ekleme ({args.parti} örneklik partiler): {parti_sayisi * args.parti / sure:,.0f} örnek/s "
+              f"({sure / parti_sayisi * 1e6:.0f} µs/parti)")
+
+        t0 = time.perf_counter()
+        ozetleyici = Ozetleyici(os.path.join(dizin, "ozet"))
+        print(f"Diskten açılış: {(time.perf_counter() - t0) * 1000:.1f} ms")
+        print("Doğrulama:")
+        dogru = dogrula(ozetleyici, veri)
+
+        depo = VeriDeposu(kapasite=n)
+        depo.ekle_toplu(*sutunlar)
+        cizici = Cizici(os.path.join(dizin, "ham.png"))
+        t0 = time.perf_counter()
+        for _ in range(args.tekrar):
+            cizici.ciz(depo, zorla=True)
+        ham_sure = (time.perf_counter() - t0) / args.tekrar
+        cizici.kapat()
+
+        t0 = time.perf_counter()
+        for _ in range(args.tekrar):
+            katman = ozet_ciz(ozetleyici, os.path.join(dizin, "ozet.png"), gun=args.gun)
+        ozet_sure = (time.perf_counter() - t0) / args.tekrar
+        print(f"{args.gun} günlük grafik: ham veriden {ham_sure:.3f} s | özetlerden ({katman}) {ozet_sure:.3f} s")
+        ham_boyut = sum(s.nbytes for s in sutunlar)
+        ozet_boyut = sum(len(ozetleyici.katman(ad)) for ad in KATMANLAR) * OZET_TIPI.itemsize
+        print(f"Bellekte tutulan: ham {ham_boyut / 2**20:.1f} MB | özetler {ozet_boyut / 2**20:.1f} MB")
+    finally:
+        shutil.rmtree(dizin)
+    if not dogru:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+# HAFTALIK PROFİL: DOĞRULUK VE SKORLAMA SÜRESİ
+# --sayac adet sayaç için --hafta haftalık sentetik saatlik tüketim (haftanın saatine bağlı desen + gürültü)
+# ve dakikalık debi örnekleri üretilip profil.HaftalikProfil kurulur.
+#   - Doğruluk: kova ortalama / sapmaları doğrudan hesapla aynı (MIN_GOZLEM'den az gözlemli kovalar iki
+#     tarafta da NaN); iki partide kurulan profil tek seferde kurulanla aynı; kaydedip açılan profil aynı;
+#     NaN debili örnekler kovaları değiştirmez;
+#     desenin 5 katı tüketilen saat uyarı verir, desene uyan saatler vermez (en az UYARI_HAFTA haftalık
+#     geçmişte: daha az gözlemle sapma tahmini rastgele uyarı üretecek kadar oynak)
+#   - Süre: tüm sayaçların bir gününün (sayaç × 24 saat) tek çağrıda skorlanması, aynı işin sayaç başına
+#     döngüyle yapılması ve bir sayacın bir günlük 1 Hz örneklerinin (86.400) skorlanması
+# Kullanım:  python -m su_izleme.bench.profil [--sayac 500] [--hafta 8]
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from su_izleme.ozet import OZET_TIPI
+from su_izleme.profil import HAFTA_SAAT, MIN_GOZLEM, SAAT_NS, SAPMA_ESIGI, HaftalikProfil, haftanin_saati
+
+PAZARTESI_NS = int(np.datetime64("2024-01-01T00:00", "ns").astype(np.int64))
+GUN_NS = 86_400 * 10**9
+UYARI_HAFTA = 6  # Uyarı denetimi için en az geçmiş (hafta)
+
+
+def desen(rng):
+    """Haftanın saatine göre olağan saatlik tüketim (L): sabah / akşam tepeleri, gece ~0"""
+    saat = np.arange(HAFTA_SAAT) % 24
+    hafta_sonu = np.arange(HAFTA_SAAT) >= 120
+    temel = 2 + 30 * np.exp(-((saat - 7.5) ** 2) / 2) + 20 * np.exp(-((saat - 20) ** 2) / 4)
+    temel[saat < 5] = 0.5
+    return temel * np.where(hafta_sonu, 1.3, 1.0) * rng.uniform(0.5, 2.0)
+
+
+def saatlik_kovalar(rng, ornek_desen, hafta, bas_ns=PAZARTESI_NS):
+    n = hafta * HAFTA_SAAT
+    kovalar = np.zeros(n, dtype=OZET_TIPI)
+    kovalar["baslangic"] = bas_ns + np.arange(n, dtype=np.int64) * SAAT_NS
+    kovalar["litre"] = np.maximum(np.tile(ornek_desen, hafta) * rng.normal(1, 0.2, n), 0)
+    kovalar["adet"] = 3600
+    kovalar["yokluk_s"] = 3600.0
+    return kovalar
+
+
+def dakikalik_ornekler(rng, ornek_desen, hafta, bas_ns=PAZARTESI_NS):
+    n = hafta * HAFTA_SAAT * 60
+    zaman = bas_ns + np.arange(n, dtype=np.int64) * 60 * 10**9
+    debi = np.maximum(ornek_desen[haftanin_saati(zaman)] / 60 * rng.exponential(1.0, n), 0)
+    return zaman.view("datetime64[ns]"), debi
+
+
+def dogruluk(dizin, hafta):
+    """[(kontrol, geçti mi)]"""
+    rng = np.random.default_rng(1)
+    d = desen(rng)
+    kovalar = saatlik_kovalar(rng, d, hafta)
+    zaman, debi = dakikalik_ornekler(rng, d, hafta)
+    sonuc = []
+
+    tek = HaftalikProfil(os.path.join(dizin, "tek.npz"))
+    tek.saat_ekle(kovalar)
+    tek.ornek_ekle(zaman, debi)
+    hs = haftanin_saati(zaman)
+    ort, sapma = tek.tablo("ornek")
+    beklenen_ort = np.array([debi[hs == b].mean() for b in range(HAFTA_SAAT)])
+    beklenen_sapma = np.array([debi[hs == b].std() for b in range(HAFTA_SAAT)])
+    sonuc.append(("örnek kovası ortalama / sapma", np.allclose(ort[0], beklenen_ort)
+                  and np.allclose(sapma[0], np.fmax(beklenen_sapma, 0.1))))
+    litre_hs = haftanin_saati(kovalar["baslangic"])
+    beklenen_ort = np.array([kovalar["litre"][litre_hs == b].mean() for b in range(HAFTA_SAAT)])
+    beklenen_ort[np.array([(litre_hs == b).sum() for b in range(HAFTA_SAAT)]) < MIN_GOZLEM["saat"]] = np.nan
+    sonuc.append(("saat kovası ortalama", np.allclose(tek.tablo("saat")[0][0], beklenen_ort, equal_nan=True)))
+
+    # Artımlı: iki parti (ikincisi öncekiyle örtüşüyor: tekrar eklenmemeli) = tek seferde
+    parca = HaftalikProfil()
+    yari = len(zaman) // 2
+    parca.ornek_ekle(zaman[:yari], debi[:yari])
+    parca.ornek_ekle(zaman[yari - 100:], debi[yari - 100:])
+    parca.saat_ekle(kovalar[:100])
+    parca.saat_ekle(kovalar[50:])
+    sonuc.append(("artımlı = tek seferde", all(np.allclose(parca.istatistik[t], tek.istatistik[t])
+                                               for t in ("ornek", "saat"))))
+
+    nanli = HaftalikProfil()
+    nan_debi = debi.copy()
+    nan_debi[::97] = np.nan
+    nanli.ornek_ekle(zaman, nan_debi)
+    gecerli = np.isfinite(nan_debi)
+    beklenen = HaftalikProfil()
+    beklenen.ornek_ekle(zaman[gecerli], debi[gecerli])
+    sonuc.append(("NaN örnekler atlanır", np.allclose(nanli.istatistik["ornek"], beklenen.istatistik["ornek"])
+                  and nanli.hazir("ornek") == beklenen.hazir("ornek")))
+
+    tek.kaydet()
+    acilan = HaftalikProfil(tek.dosya)
+    sonuc.append(("kaydet / aç", acilan.kimlikler == tek.kimlikler
+                  and all(np.array_equal(acilan.istatistik[t], tek.istatistik[t]) for t in ("ornek", "saat"))
+                  and all(np.array_equal(acilan.son[t], tek.son[t]) for t in ("ornek", "saat"))))
+
+    # Sonraki hafta: saatler desene uyar, salı 08:00 desenin 5 katı
+    yeni = saatlik_kovalar(rng, d, 1, int(kovalar["baslangic"][-1]) + SAAT_NS)
+    yeni["litre"] = d
+    sira = 24 + 8
+    yeni["litre"][sira] = d[sira] * 5
+    if hafta >= UYARI_HAFTA:
+        alarmlar = tek.saat_alarmlari(yeni, SAPMA_ESIGI)
+        sonuc.append(("olağan dışı saat uyarısı", len(alarmlar) == 1 and "Sal 08:00" in alarmlar[0].mesaj))
+    else:
+        sonuc.append(("olağan dışı saat uyarısı", None))
+    eksik = yeni[:1].copy()
+    eksik["yokluk_s"] = 600
+    sonuc.append(("kapsamı eksik saat skorlanmaz", bool(np.isnan(tek.saat_skoru(eksik))[0])))
+    return sonuc
+
+
+def profil_kur(sayac, hafta):
+    rng = np.random.default_rng(2)
+    profil = HaftalikProfil()
+    desenler = []
+    for s in range(sayac):
+        d = desen(rng)
+        desenler.append(d)
+        profil.saat_ekle(saatlik_kovalar(rng, d, hafta), f"sayac{s}")
+    return profil, np.array(desenler)
+
+
+def olc(islev, tekrar=20):
+    sureler = []
+    for _ in range(tekrar):
+        t0 = time.perf_counter()
+        islev()
+        sureler.append(time.perf_counter() - t0)
+    return float(np.median(sureler))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Haftalık profil doğruluğu ve skorlama süresi")
+    parser.add_argument("--sayac", type=int, default=500)
+    parser.add_argument("--hafta", type=int, default=8, help="Profili kuran geçmiş (hafta)")
+    parser.add_argument("--dizin", help="Geçici dosyaların yazılacağı dizin")
+    args = parser.parse_args(argv)
+    if args.hafta < 1 or args.sayac < 1:
+        parser.error("--hafta ve --sayac en az 1 olmalı")
+    hatalar = 0
+
+    dizin = tempfile.mkdtemp(dir=args.dizin)
+    try:
+        for kontrol, gecti in dogruluk(dizin, args.hafta):
+            if gecti is None:
+                print(f"{kontrol:<32} atlandı (--hafta < {UYARI_HAFTA})")
+                continue
+            hatalar += not gecti
+            print(f"{kontrol:<32} {'tamam' if gecti else 'HATA'}")
+    finally:
+        shutil.rmtree(dizin, ignore_errors=True)
+
+    t0 = time.perf_counter()
+    profil, desenler = profil_kur(args.sayac, args.hafta)
+    print(f"\n{args.sayac} sayaç × {args.hafta} hafta saatlik geçmişle profil {time.perf_counter() - t0:.2f} s'de kuruldu")
+
+    # Bir gün: her sayacın 24 saatlik tüketimi (sayaç, 24)
+    rng = np.random.default_rng(3)
+    gun = PAZARTESI_NS + (args.hafta * 7 + 2) * GUN_NS  # Geçmişten sonraki çarşamba
+    zaman = gun + np.arange(24, dtype=np.int64) * SAAT_NS
+    hs = haftanin_saati(zaman)
+    litre = desenler[:, hs] * rng.normal(1, 0.2, (args.sayac, 24))
+    satirlar = np.array([profil.satir(f"sayac{s}") for s in range(args.sayac)])[:, None]
+    zaman_matris = np.broadcast_to(zaman, litre.shape)
+
+    profil.tablo("saat")  # Tablo ilk skorda bir kez hesaplanır (ekleme sonrası)
+    vektor = olc(lambda: profil.skor("saat", zaman_matris, litre, satirlar))
+    z = profil.skor("saat", zaman_matris, litre, satirlar)
+    dongu = olc(lambda: [profil.skor("saat", zaman, litre[s], s) for s in range(args.sayac)], tekrar=3)
+    ayni = np.allclose(np.array([profil.skor("saat", zaman, litre[s], s) for s in range(args.sayac)]), z,
+                       equal_nan=True)  # Az gözlemli kovalar iki yolda da NaN
+    hatalar += not ayni
+    tablo_sure = olc(lambda: (profil._tablolar.clear(), profil.tablo("saat")))
+
+    ornek_profil = HaftalikProfil()
+    d = desen(rng)
+    ornek_profil.ornek_ekle(*dakikalik_ornekler(rng, d, args.hafta))
+    ornek_zaman = (gun + np.arange(86_400, dtype=np.int64) * 10**9).view("datetime64[ns]")
+    ornek_debi = rng.exponential(1.0, 86_400)
+    ornek_sure = olc(lambda: ornek_profil.ornek_skoru(ornek_zaman, ornek_debi))
+
+    print(f"\n{'İş':<44} | {'Süre':>9}")
+    print("-" * 58)
+    print(f"{f'{args.sayac} sayaç × 24 saat, tek çağrı':<44} | {vektor * 1e3:>6.2f} ms")
+    print(f"{f'{args.sayac} sayaç × 24 saat, sayaç başına döngü':<44} | {dongu * 1e3:>6.2f} ms"
+          f"{'' if ayni else '  HATA: sonuçlar farklı'}")
+    print(f"{'Tablo hesabı (eklemeden sonra bir kez)':<44} | {tablo_sure * 1e3:>6.2f} ms")
+    print(f"{'1 sayaç × 86.400 örnek (1 Hz gün)':<44} | {ornek_sure * 1e3:>6.2f} ms")
+    print(f"\nUyarı eşiğini (z > {SAPMA_ESIGI}) aşan saat: {int((z > SAPMA_ESIGI).sum())} / {z.size}")
+    if hatalar:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
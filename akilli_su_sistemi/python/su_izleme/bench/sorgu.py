@@ -0,0 +1,100 @@
+# ZAMAN ARALIĞI SORGUSU ÖLÇÜMÜ
+# sorgu.GecmisSorgusu'nun sorgu süresinin dosya boyuna değil aralığın genişliğine bağlı olduğunu gösterir:
+# farklı boyutlardaki sütunsal depolarda aynı genişlikte (2 sa, 1 gün, 7 gün) rastgele aralıklar sorgulanır.
+# Her sorgunun sonucu (toplam, ortalama, gereksiz) tüm geçmiş üzerinden kaba kuvvetle hesaplananla
+# karşılaştırılır. En küçük boyutta eski yol (tüm CSV'yi pandas'a yükleyip filtreleme) da ölçülür.
+# Kullanım:  python -m su_izleme.bench.sorgu [--boyutlar 1000000 4000000 16000000] [--sorgu 20]
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from su_izleme.bench.baslangic import depo_hazirla
+from su_izleme.sorgu import GecmisSorgusu
+from su_izleme.tuketim import kaydir, ornek_hacimleri
+
+GENISLIKLER = {"2 sa": 2 * 3600, "1 gün": 86_400, "7 gün": 7 * 86_400}
+
+
+def kaba_kuvvet(gecmis, bas, bit):
+    """Tüm geçmiş üzerinden (toplam, ortalama, gereksiz)"""
+    zaman = gecmis["timestamp"]
+    _, litre = ornek_hacimleri(zaman.view(np.int64), gecmis["flow_lpm"], gecmis["cumulative_liters"],
+                               kaydir(zaman.view(np.int64), zaman[0].view(np.int64)),
+                               kaydir(gecmis["cumulative_liters"], gecmis["cumulative_liters"][0]))
+    maske = (zaman >= bas) & (zaman < bit)
+    debi = gecmis["flow_lpm"][maske]
+    return (round(float(litre[maske].sum()), 2),
+            round(float(debi.mean()), 2) if len(debi) else 0.0,
+            round(float(litre[maske & (gecmis["ir_state"] == 0)].sum()), 2))
+
+
+def eski_sorgu(csv_yolu, bas, bit):
+    """Eski yol: tüm CSV pandas'a yüklenip filtrelenir"""
+    import pandas as pd
+
+    df = pd.read_csv(csv_yolu)
+    df["timestamp"] = pd.to_datetime(df["timestamp"])
+    aralik = df[(df["timestamp"] >= bas) & (df["timestamp"] < bit)]
+    return float(aralik["flow_lpm"].mean())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seyrek zaman indeksiyle aralık sorgusu ölçümü")
+    parser.add_argument("--boyutlar", type=int, nargs="+", default=[1_000_000, 4_000_000, 16_000_000])
+    parser.add_argument("--sorgu", type=int, default=20, help="Her genişlikte rastgele sorgu sayısı")
+    parser.add_argument("--csv-maks", type=int, default=1_000_000,
+                        help="Bu boyuta kadar eski CSV yolunu da ölç (0 = ölçme)")
+    parser.add_argument("--dizin", help="Geçici dosyaların yazılacağı dizin")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    print(f"{'Satır':>12} | {'İndeks':>9} | " + " | ".join(f"{ad:>16}" for ad in GENISLIKLER) + " | Eski CSV (2 sa)")
+    print("-" * (33 + 19 * len(GENISLIKLER) + 16))
+    hepsi_ayni = True
+    for n in args.boyutlar:
+        dizin = tempfile.mkdtemp(dir=args.dizin)
+        try:
+            csv_yolu = os.path.join(dizin, "su_tuketim.csv") if n <= args.csv_maks else None
+            depo = depo_hazirla(os.path.join(dizin, "kolon"), n, csv_yolu)
+            gecmis = depo.yukle()
+            t0 = time.perf_counter()
+            sorgu = GecmisSorgusu(depo.dizin)
+            t_indeks = time.perf_counter() - t0
+
+            hucreler = []
+            for genislik in GENISLIKLER.values():
+                sureler, okunan = [], 0
+                for _ in range(args.sorgu):
+                    bas = gecmis["timestamp"][0] + np.timedelta64(int(rng.integers(0, max(n - genislik, 1))), "s")
+                    bit = bas + np.timedelta64(genislik, "s")
+                    t0 = time.perf_counter()
+                    sonuc = (sorgu.toplam(bas, bit), sorgu.ortalama(bas, bit), sorgu.gereksiz(bas, bit))
+                    sureler.append(time.perf_counter() - t0)
+                    okunan += sorgu.okunan_satir
+                    if sonuc != kaba_kuvvet(gecmis, bas, bit):
+                        hepsi_ayni = False
+                        print(f"FARKLI: {bas} - {bit}: {sonuc} != {kaba_kuvvet(gecmis, bas, bit)}")
+                hucreler.append(f"{np.median(sureler) * 1e3:>6.2f} ms {okunan // args.sorgu:>7}")
+
+            eski = "-"
+            if csv_yolu:
+                bas = gecmis["timestamp"][n // 2]
+                t0 = time.perf_counter()
+                eski_sorgu(csv_yolu, bas, bas + np.timedelta64(2 * 3600, "s"))
+                eski = f"{(time.perf_counter() - t0) * 1e3:.0f} ms"
+            print(f"{n:>12,} | {t_indeks * 1e3:>6.0f} ms | " + " | ".join(hucreler) + f" | {eski}")
+        finally:
+            shutil.rmtree(dizin, ignore_errors=True)
+    print("(hücre: 3 sorgunun (toplam + ortalama + gereksiz) medyan süresi ve sorgu başına okunan satır)")
+    if not hepsi_ayni:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
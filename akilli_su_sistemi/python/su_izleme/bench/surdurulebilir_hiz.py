@@ -0,0 +1,101 @@
+# SÜRDÜRÜLEBİLİR ÖRNEK HIZI ÖLÇÜMÜ
+# Simülatörü bir pty üzerinden Water2.py'nin okuma yoluna (pyserial readline + BoruHatti +
+# CSV yazıcı + depo + artımlı analiz) bağlar, hızı kademeli artırır ve kayıpsız
+# işlenebilen en yüksek satır/s değerini bulur. Sadece POSIX üzerinde çalışır.
+# --ikili ile simülatör ikili çerçeve gönderir ve okuma yolu parça çözücüye (ikili.py) geçer.
+# Kullanım:  python -m su_izleme.bench.surdurulebilir_hiz [--hizlar 100 1000 5000 ...] [--sure 5] [--ikili]
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import serial
+
+from su_izleme import SUTUNLAR
+from su_izleme.boru_hatti import Asama, BoruHatti
+from su_izleme.depo import VeriDeposu
+from su_izleme.ikili import OtomatikCozucu
+from su_izleme.simulator import PtyCikis, Simulator, yayinla
+from su_izleme.tuketim import ArtimliAnaliz
+from su_izleme.yazici import TamponluCSVYazici
+
+
+def olc(hiz, sure, dizin, bozuk_oran=0.0, ikili=False):
+    """Tek bir hızda ölçüm yapar, sonuç sözlüğü döndürür"""
+    pty = PtyCikis()
+    ser = serial.Serial(pty.yol, 9600, timeout=0.1)
+    yazici = TamponluCSVYazici(os.path.join(dizin, f"su_{int(hiz)}.csv"), basliklar=SUTUNLAR)
+    depo = VeriDeposu()
+    analiz = ArtimliAnaliz()
+
+    def kayit(ornekler):
+        for ornek in ornekler:
+            yazici.yaz(list(ornek))
+
+    def analiz_asamasi(ornekler):
+        for ornek in ornekler:
+            depo.ekle(*ornek)
+            analiz.guncelle(*ornek)
+
+    boru = BoruHatti(ser, [Asama("kayit", kayit, 4096), Asama("analiz", analiz_asamasi, 4096)],
+                     cozucu=OtomatikCozucu() if ikili else None)
+    boru.baslat()
+    gonderilen = yayinla(pty, Simulator(bozuk_oran=bozuk_oran, ikili=ikili), hiz, sure=sure)
+
+    # Yoldaki satırlar işlensin: sayaç 0.5 s boyunca artmazsa dur
+    onceki = -1
+    while boru.okunan != onceki:
+        onceki = boru.okunan
+        time.sleep(0.5)
+    boru.durdur()
+    yazici.kapat()
+    ser.close()
+    pty.kapat()
+
+    s = boru.istatistik()
+    return {
+        "hedef": hiz,
+        "gonderilen": gonderilen,
+        "islenen": s["ornek"],
+        "hatali": s["hatali"],
+        "dusen": s["dusen"],
+        "kayip": s["kayip"],
+        "tasan_bayt": pty.tasan_bayt,
+        # İkili modda bozulan çerçeveler sıra atlaması olarak sayılır; akışın ilk/son çerçevesi
+        # bozulursa atlama görünmediği için bir çerçevelik pay bırakılır
+        "kayipsiz": (pty.tasan_bayt == 0 and s["dusen"] == 0 and
+                     s["ornek"] + (s["kayip"] + 1 if ikili else s["hatali"]) >= gonderilen),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Okuma yolunun kayıpsız kaldırabildiği en yüksek hız")
+    parser.add_argument("--hizlar", type=float, nargs="+", default=[100, 1000, 2000, 5000, 10000, 20000, 50000])
+    parser.add_argument("--sure", type=float, default=5.0, help="Her hızda ölçüm süresi (s)")
+    parser.add_argument("--bozuk-oran", type=float, default=0.0)
+    parser.add_argument("--ikili", action="store_true", help="Metin yerine ikili çerçeve protokolü")
+    args = parser.parse_args(argv)
+
+    dizin = tempfile.mkdtemp()
+    en_yuksek = 0
+    print(f"{'Hedef/s':>9} | {'Gönderilen':>10} | {'İşlenen':>9} | {'Hatalı':>7} | {'Düşen':>6} | "
+          f"{'Taşan bayt':>10} | Kayıpsız")
+    print("-" * 78)
+    try:
+        for hiz in sorted(args.hizlar):
+            s = olc(hiz, args.sure, dizin, args.bozuk_oran, args.ikili)
+            print(f"{s['hedef']:>9,.0f} | {s['gonderilen']:>10,} | {s['islenen']:>9,} | {s['hatali']:>7,} | "
+                  f"{s['dusen']:>6,} | {s['tasan_bayt']:>10,} | {'evet' if s['kayipsiz'] else 'HAYIR'}")
+            if not s["kayipsiz"]:
+                break
+            en_yuksek = hiz
+    finally:
+        shutil.rmtree(dizin, ignore_errors=True)
+    birim = "çerçeve/s" if args.ikili else "satır/s"
+    print(f"\nKayıpsız en yüksek hız: {en_yuksek:,.0f} {birim}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+# ÖLÇÜM TAKIMI: ALIM, KAYIT, ANALİZ VE ÇİZİM SÜRELERİ (JSON + KARŞILAŞTIRMA)
+# Tekrarlanabilir sentetik veriyle (sentetik.py, aynı tohum = aynı veri) canlı izlemenin her aşamasını
+# 10 bin / 1 milyon / 10 milyon kayıtta ölçer ve sonucu JSON olarak saklar. İki çalıştırmanın JSON'u
+# karşılaştırılıp eşiği aşan yavaşlamalar işaretlenir (çıkış kodu 1). Ölçülen aşamalar (eski adlarıyla):
+#   satir_ayristir           Seri port satırlarının tek tek ayrıştırılması (ayristir.satir_ayristir)
+#   toplu_ayristir           Aynı satırların bloklar halinde ayrıştırılması (ayristir.toplu_ayristir)
+#   kaydet_csv               Örneklerin CSV'ye yazılması (yazici.TamponluCSVYazici, canlı ayarlarıyla)
+#   dataframe_ekle           Örneklerin tek tek belleğe eklenmesi (depo.VeriDeposu.ekle)
+#   gereksiz_tuketim_hesapla Tüm geçmiş üzerinde toplu hesap (tuketim.gereksiz_tuketim_hesapla)
+#   analiz_gecmis            Geçmişin canlı analize yüklenmesi (izleme.Analiz.gecmis: özet, profil, sayaç)
+#   optimizasyon_analizi     Rapor metni (izleme.Analiz.rapor, önbelleksiz)
+#   gorsellestir             Tüm geçmişin grafiği (cizim.Cizici.ciz, kalıcı figür)
+# Örnek başına aşamalar bloklar halinde hazırlanır (bellek sınırlı kalsın); sadece aşamanın kendisi
+# süreye katılır. Her ölçüm --tekrar kez veya --butce saniye dolana kadar tekrarlanır; ortanca ve en iyi
+# süre saklanır. Karşılaştırma en iyi süreyle yapılır (arka plan yükünden en az etkilenen değer).
+# Kullanım:
+#   python -m su_izleme bench takim calistir [--boyutlar 10000 1000000 10000000] [--cikti sonuc.json]
+#   python -m su_izleme bench takim karsilastir eski.json yeni.json [--esik 0.10] [--taban-ms 1]
+#   python -m su_izleme bench takim uret veri.csv [--satir 10000] [--tohum 0]
+
+import argparse
+import csv
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+from su_izleme import SUTUNLAR
+from su_izleme.bench.sentetik import sentetik_veri
+
+BICIM = 1  # JSON dosya biçimi sürümü
+BLOK = 65536  # Örnek başına aşamalarda bir seferde hazırlanan örnek sayısı
+RAPOR_TEKRARI = 1000  # optimizasyon_analizi bir ölçümde bu kadar çağrılır (tek çağrı µs mertebesinde)
+ESIK = 0.10  # En iyi süre bu orandan fazla artarsa yavaşlama sayılır
+TABAN_MS = 1.0  # Bundan küçük mutlak farklar gürültü sayılır
+
+
+# -----------------------------
+# VERİ
+# -----------------------------
+
+def bloklar(veri):
+    """Veriyi canlı akıştaki türlerle BLOK'luk parçalar halinde verir: (zamanlar, debiler, toplamlar, ir'ler)"""
+    for bas in range(0, len(veri["timestamp"]), BLOK):
+        dilim = slice(bas, bas + BLOK)
+        yield (veri["timestamp"][dilim].astype("datetime64[us]").tolist(),  # datetime (okuyucudaki gibi)
+               veri["flow_lpm"][dilim].tolist(), veri["cumulative_liters"][dilim].tolist(),
+               veri["ir_state"][dilim].tolist())
+
+
+def seri_satirlari(veri):
+    """Arduino'nun gönderdiği "flow,cumulative,ir\\r\\n" satırları, BLOK'luk listeler halinde"""
+    for _, debi, toplam, ir in bloklar(veri):
+        yield [b"%.2f,%.2f,%d\r\n" % s for s in zip(debi, toplam, ir)]
+
+
+def csv_uret(yol, n, tohum=0):
+    """n satırlık sentetik geçmişi canlı kayıtla aynı biçimde CSV'ye yazar"""
+    with open(yol, "w", newline="", encoding="utf-8") as f:
+        yazar = csv.writer(f)
+        yazar.writerow(SUTUNLAR)
+        for zaman, debi, toplam, ir in bloklar(sentetik_veri(n, seed=tohum)):
+            yazar.writerows(zip(zaman, debi, toplam, ir))
+
+
+# -----------------------------
+# AŞAMALAR
+# -----------------------------
+# Her aşama (veri, ortak, dizin) alır, (süre s, işlenen adet) döndürür. ortak, aynı boyuttaki
+# aşamaların paylaştığı nesnelerdir (depo, analiz); hatalar listesine doğrulama hataları eklenir.
+
+def satir_ayristir_olc(veri, ortak, dizin):
+    from su_izleme.ayristir import satir_ayristir
+
+    sure, adet = 0.0, 0
+    for satirlar in seri_satirlari(veri):
+        t0 = time.perf_counter()
+        for satir in satirlar:
+            satir_ayristir(satir)
+        sure += time.perf_counter() - t0
+        adet += len(satirlar)
+    return sure, adet
+
+
+def toplu_ayristir_olc(veri, ortak, dizin):
+    from su_izleme.ayristir import toplu_ayristir
+
+    sure, adet = 0.0, 0
+    for satirlar in seri_satirlari(veri):
+        ham = b"".join(satirlar)
+        t0 = time.perf_counter()
+        debi, _, _, bozuk, _ = toplu_ayristir(ham)
+        sure += time.perf_counter() - t0
+        adet += len(satirlar)
+        if len(debi) != len(satirlar) or bozuk.any():
+            ortak["hatalar"].append("toplu_ayristir: satır sayısı farklı veya bozuk satır var")
+    return sure, adet
+
+
+def kaydet_csv_olc(veri, ortak, dizin):
+    from su_izleme.izleme import CSV_TAMPON_SATIR, CSV_TAMPON_SURE
+    from su_izleme.yazici import TamponluCSVYazici
+
+    yol = os.path.join(dizin, "kayit.csv")
+    if os.path.exists(yol):
+        os.remove(yol)
+    yazici = TamponluCSVYazici(yol, basliklar=SUTUNLAR, max_satir=CSV_TAMPON_SATIR,
+                               max_sure=CSV_TAMPON_SURE, arka_plan=False)
+    sure = 0.0
+    for zaman, debi, toplam, ir in bloklar(veri):
+        t0 = time.perf_counter()
+        for satir in zip(zaman, debi, toplam, ir):
+            yazici.yaz(list(satir))
+        sure += time.perf_counter() - t0
+    t0 = time.perf_counter()
+    yazici.kapat()
+    sure += time.perf_counter() - t0
+    if yazici.yazilan_satir != len(veri["timestamp"]):
+        ortak["hatalar"].append(f"kaydet_csv: {yazici.yazilan_satir} satır yazıldı")
+    os.remove(yol)
+    return sure, yazici.yazilan_satir
+
+
+def dataframe_ekle_olc(veri, ortak, dizin):
+    from su_izleme.depo import VeriDeposu
+
+    depo = VeriDeposu()  # Canlıdaki gibi küçük başlayıp büyür
+    sure = 0.0
+    for zaman, debi, toplam, ir in bloklar(veri):
+        t0 = time.perf_counter()
+        for satir in zip(zaman, debi, toplam, ir):
+            depo.ekle(*satir)
+        sure += time.perf_counter() - t0
+    if not np.array_equal(depo["cumulative_liters"], veri["cumulative_liters"]):
+        ortak["hatalar"].append("dataframe_ekle: depodaki değerler farklı")
+    return sure, len(depo)
+
+
+def gereksiz_tuketim_olc(veri, ortak, dizin):
+    from su_izleme.tuketim import gereksiz_tuketim_hesapla
+
+    depo = _depo(veri, ortak)
+    t0 = time.perf_counter()
+    ortak["gereksiz"] = gereksiz_tuketim_hesapla(depo)
+    return time.perf_counter() - t0, len(depo)
+
+
+def analiz_gecmis_olc(veri, ortak, dizin):
+    from su_izleme.izleme import Analiz
+
+    ortak.pop("analiz", None)  # Önceki tekrarın analizi (10 milyonda ~1 GB) yenisi kurulmadan bırakılsın
+    analiz = Analiz(rapor_araligi=0, anlik_araligi=0)
+    t0 = time.perf_counter()
+    analiz.gecmis(veri)
+    sure = time.perf_counter() - t0
+    ortak["analiz"] = analiz
+    if "gereksiz" in ortak and abs(analiz.analiz.gereksiz_tuketim() - ortak["gereksiz"]) > 0.011:
+        ortak["hatalar"].append(f"analiz_gecmis: gereksiz tüketim {analiz.analiz.gereksiz_tuketim()} "
+                                f"(toplu hesap {ortak['gereksiz']})")
+    return sure, len(veri["timestamp"])
+
+
+def optimizasyon_analizi_olc(veri, ortak, dizin):
+    analiz = ortak.get("analiz")
+    if analiz is None:
+        analiz_gecmis_olc(veri, ortak, dizin)
+        analiz = ortak["analiz"]
+    omur = analiz.sayac.omur_toplam
+    t0 = time.perf_counter()
+    for _ in range(RAPOR_TEKRARI):
+        analiz.rapor(omur)  # omur_toplam verildiğinde önbellek kullanılmaz
+    return time.perf_counter() - t0, RAPOR_TEKRARI
+
+
+def gorsellestir_olc(veri, ortak, dizin):
+    from su_izleme.cizim import Cizici
+
+    cizici = ortak.get("cizici")
+    if cizici is None:
+        # Figür ilk çizimde kurulur; canlıda olduğu gibi kalıcı figürün sonraki çizimleri ölçülür
+        cizici = ortak["cizici"] = Cizici(os.path.join(dizin, "grafik.png"))
+        cizici.ciz(_depo(veri, ortak), zorla=True)
+    t0 = time.perf_counter()
+    cizici.ciz(_depo(veri, ortak), zorla=True)
+    return time.perf_counter() - t0, len(veri["timestamp"])
+
+
+def _depo(veri, ortak):
+    if "depo" not in ortak:
+        from su_izleme.depo import VeriDeposu
+
+        depo = VeriDeposu(kapasite=len(veri["timestamp"]))
+        depo.ekle_toplu(*(veri[ad] for ad in SUTUNLAR))
+        ortak["depo"] = depo
+    return ortak["depo"]
+
+
+ASAMALAR = {
+    "satir_ayristir": satir_ayristir_olc,
+    "toplu_ayristir": toplu_ayristir_olc,
+    "kaydet_csv": kaydet_csv_olc,
+    "dataframe_ekle": dataframe_ekle_olc,
+    "gereksiz_tuketim_hesapla": gereksiz_tuketim_olc,
+    "analiz_gecmis": analiz_gecmis_olc,
+    "optimizasyon_analizi": optimizasyon_analizi_olc,
+    "gorsellestir": gorsellestir_olc,
+}
+
+
+# -----------------------------
+# ÇALIŞTIRMA
+# -----------------------------
+
+def ortam():
+    """Sonuçların karşılaştırılabilirliği için yazılım / donanım bilgisi"""
+    import matplotlib
+    import pandas
+
+    bilgi = {"python": platform.python_version(), "numpy": np.__version__, "pandas": pandas.__version__,
+             "matplotlib": matplotlib.__version__, "platform": platform.platform(),
+             "islemci": platform.processor() or platform.machine(), "cekirdek": os.cpu_count()}
+    try:
+        bilgi["git"] = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                      cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        bilgi["git"] = ""
+    return bilgi
+
+
+def olc(islev, veri, ortak, dizin, tekrar, butce):
+    """Aşamayı tekrar kez veya butce saniye dolana kadar (en az bir kez) çalıştırır"""
+    sureler = []
+    bas = time.perf_counter()
+    while len(sureler) < tekrar:
+        sure, adet = islev(veri, ortak, dizin)
+        sureler.append(sure)
+        if time.perf_counter() - bas >= butce:
+            break
+    ortanca = float(np.median(sureler))
+    return {"sure_s": ortanca, "en_iyi_s": float(min(sureler)), "tekrar": len(sureler), "adet": adet,
+            "hiz": adet / ortanca if ortanca > 0 else None}
+
+
+def calistir(args):
+    secilen = args.asamalar or list(ASAMALAR)
+    sonuc = {"bicim": BICIM, "tarih": datetime.now().isoformat(timespec="seconds"), "tohum": args.tohum,
+             "ortam": ortam(), "olcumler": []}
+    hatalar = []
+    dizin = tempfile.mkdtemp(dir=args.dizin)
+    print(f"{'Aşama':<26} | {'Kayıt':>11} | {'Ortanca':>11} | {'Hız':>14} | Tekrar")
+    print("-" * 80)
+    try:
+        for n in args.boyutlar:
+            veri = sentetik_veri(n, seed=args.tohum)
+            ortak = {"hatalar": hatalar}
+            for ad in secilen:
+                kayit = olc(ASAMALAR[ad], veri, ortak, dizin, args.tekrar, args.butce)
+                kayit.update(asama=ad, boyut=n)
+                sonuc["olcumler"].append(kayit)
+                hiz = f"{kayit['hiz']:,.0f}/s" if kayit["hiz"] else "-"
+                print(f"{ad:<26} | {n:>11,} | {_sure(kayit['sure_s']):>11} | {hiz:>14} | {kayit['tekrar']}")
+            if "cizici" in ortak:
+                ortak["cizici"].kapat()
+            del veri, ortak
+    finally:
+        shutil.rmtree(dizin, ignore_errors=True)
+
+    for hata in hatalar:
+        print(f"HATA {hata}")
+    sonuc["hatalar"] = hatalar
+    cikti = args.cikti or f"takim_{datetime.now():%Y%m%d_%H%M%S}.json"
+    with open(cikti, "w", encoding="utf-8") as f:
+        json.dump(sonuc, f, ensure_ascii=False, indent=2)
+    print(f"\nSonuçlar yazıldı: {cikti}")
+
+    yavaslama = 0
+    if args.karsilastir:
+        yavaslama = karsilastir(_oku(args.karsilastir), sonuc, args.esik, args.taban_ms)
+    if hatalar or yavaslama:
+        sys.exit(1)
+
+
+def _sure(s):
+    if s >= 1:
+        return f"{s:.2f} s"
+    if s >= 1e-3:
+        return f"{s * 1e3:.1f} ms"
+    return f"{s * 1e6:.0f} µs"
+
+
+# -----------------------------
+# KARŞILAŞTIRMA
+# -----------------------------
+
+def _oku(yol):
+    with open(yol, encoding="utf-8") as f:
+        sonuc = json.load(f)
+    if sonuc.get("bicim") != BICIM:
+        print(f"{yol}: bilinmeyen biçim ({sonuc.get('bicim')}), beklenen {BICIM}")
+        sys.exit(2)
+    return sonuc
+
+
+def karsilastir(eski, yeni, esik=ESIK, taban_ms=TABAN_MS):
+    """En iyi süreleri (aşama, boyut) bazında karşılaştırır; yavaşlama sayısını döndürür"""
+    farkli = [k for k in ("python", "numpy", "pandas", "matplotlib", "platform", "cekirdek")
+              if eski["ortam"].get(k) != yeni["ortam"].get(k)]
+    if farkli:
+        print("Not: ortam farklı, süreler doğrudan karşılaştırılamayabilir:")
+        for k in farkli:
+            print(f"  {k}: {eski['ortam'].get(k)} -> {yeni['ortam'].get(k)}")
+    if eski.get("tohum") != yeni.get("tohum"):
+        print(f"Not: farklı tohumla üretilmiş veri ({eski.get('tohum')} -> {yeni.get('tohum')})")
+
+    onceki = {(k["asama"], k["boyut"]): k for k in eski["olcumler"]}
+    print(f"\n{eski['ortam'].get('git') or eski['tarih']} -> {yeni['ortam'].get('git') or yeni['tarih']} "
+          f"(eşik %{esik * 100:.0f}, {taban_ms} ms altındaki farklar yok sayılır)")
+    print(f"{'Aşama':<26} | {'Kayıt':>11} | {'Eski':>11} | {'Yeni':>11} | {'Oran':>6} | Durum")
+    print("-" * 86)
+    yavaslama = 0
+    for k in yeni["olcumler"]:
+        o = onceki.pop((k["asama"], k["boyut"]), None)
+        if o is None:
+            print(f"{k['asama']:<26} | {k['boyut']:>11,} | {'-':>11} | {_sure(k['en_iyi_s']):>11} | {'':>6} | yeni")
+            continue
+        # Tekrarlı ölçümlerde (optimizasyon_analizi) adet farklı olabilir: işlem başına süre karşılaştırılır
+        eski_s = o["en_iyi_s"] / o["adet"] * k["adet"]
+        oran = k["en_iyi_s"] / eski_s if eski_s > 0 else float("inf")
+        fark_ms = (k["en_iyi_s"] - eski_s) * 1e3
+        if oran > 1 + esik and fark_ms > taban_ms:
+            durum = "YAVAŞLAMA"
+            yavaslama += 1
+        elif oran < 1 - esik and -fark_ms > taban_ms:
+            durum = "hızlanma"
+        else:
+            durum = "aynı"
+        print(f"{k['asama']:<26} | {k['boyut']:>11,} | {_sure(eski_s):>11} | {_sure(k['en_iyi_s']):>11} | "
+              f"{oran:>5.2f}x | {durum}")
+    for asama, boyut in onceki:
+        print(f"{asama:<26} | {boyut:>11,} | {'':>11} | {'-':>11} | {'':>6} | yeni çalıştırmada yok")
+    print(f"\n{yavaslama} yavaşlama" if yavaslama else "\nYavaşlama yok")
+    return yavaslama
+
+
+# -----------------------------
+# GİRİŞ
+# -----------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Alım, kayıt, analiz ve çizim ölçüm takımı")
+    alt = parser.add_subparsers(dest="komut", required=True)
+
+    p = alt.add_parser("calistir", help="Ölçümleri çalıştırıp JSON'a yazar")
+    p.add_argument("--boyutlar", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    p.add_argument("--asamalar", nargs="+", choices=list(ASAMALAR), help="Sadece bu aşamalar (varsayılan: hepsi)")
+    p.add_argument("--tohum", type=int, default=0, help="Sentetik veri tohumu")
+    p.add_argument("--tekrar", type=int, default=5, help="Ölçüm başına en fazla tekrar")
+    p.add_argument("--butce", type=float, default=10.0, help="Ölçüm başına süre bütçesi (s, en az bir tekrar)")
+    p.add_argument("--cikti", help="JSON dosyası (varsayılan: takim_<tarih>.json)")
+    p.add_argument("--karsilastir", metavar="ESKI_JSON", help="Bitince bu çalıştırmayla karşılaştır")
+    p.add_argument("--esik", type=float, default=ESIK)
+    p.add_argument("--taban-ms", type=float, default=TABAN_MS)
+    p.add_argument("--dizin", help="Geçici dosyaların yazılacağı dizin")
+
+    p = alt.add_parser("karsilastir", help="İki JSON'u karşılaştırır, yavaşlama varsa çıkış kodu 1")
+    p.add_argument("eski")
+    p.add_argument("yeni")
+    p.add_argument("--esik", type=float, default=ESIK, help="Yavaşlama sayılan artış oranı")
+    p.add_argument("--taban-ms", type=float, default=TABAN_MS, help="Gürültü sayılan mutlak fark (ms)")
+
+    p = alt.add_parser("uret", help="Sentetik geçmişi su_tuketim.csv biçiminde yazar")
+    p.add_argument("cikti")
+    p.add_argument("--satir", type=int, default=10_000)
+    p.add_argument("--tohum", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.komut == "calistir":
+        calistir(args)
+    elif args.komut == "karsilastir":
+        if karsilastir(_oku(args.eski), _oku(args.yeni), args.esik, args.taban_ms):
+            sys.exit(1)
+    else:
+        csv_uret(args.cikti, args.satir, args.tohum)
+        print(f"{args.cikti}: {args.satir} satır yazıldı (tohum {args.tohum})")
+
+
+if __name__ == "__main__":
+    main()
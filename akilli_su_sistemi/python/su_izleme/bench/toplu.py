@@ -0,0 +1,96 @@
+# TOPLU RAPOR HIZLANMASI
+# --sayac adet sayaç için --gun günlük sentetik geçmiş (--aralik s'de bir örnek) üretilir; toplu.toplu_rapor
+# tek süreçte (havuzsuz) ve --isler süreçle çalıştırılır. Hızlanma = tek süreç süresi / havuz süresi.
+# Doğruluk: her sayacın gün bölümlerinden birleştirilen toplamı, tüketimi ve gereksiz tüketimi
+# GecmisSorgusu.rapor'un tüm aralık üzerindeki tek geçişiyle karşılaştırılır.
+# Not: hızlanma çekirdek sayısıyla sınırlıdır (os.cpu_count() ölçümün başında yazdırılır).
+# Kullanım:  python -m su_izleme.bench.toplu [--sayac 4] [--gun 365] [--aralik 5] [--isler 1 2 4]
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from su_izleme import SUTUNLAR
+from su_izleme.bench.sentetik import BASLANGIC, sentetik_veri
+from su_izleme.kalici import KolonDeposu
+from su_izleme.sorgu import GecmisSorgusu
+from su_izleme.toplu import sayaclar, sonuclandir, toplu_rapor
+
+BLOK = 1_000_000
+
+
+def veri_hazirla(dizin, sayac, gun, aralik_s):
+    """<dizin>/sayacN depoları; toplam satır sayısını döndürür"""
+    n = int(gun * 86_400 / aralik_s)
+    for s in range(sayac):
+        depo = KolonDeposu(os.path.join(dizin, f"sayac{s + 1}"))
+        toplam = 0.0
+        for i in range(0, n, BLOK):
+            adet = min(BLOK, n - i)
+            veri = sentetik_veri(adet, seed=s * 1000 + i // BLOK, aralik_s=aralik_s,
+                                 baslangic=BASLANGIC + np.timedelta64(int(i * aralik_s * 1e9), "ns"))
+            veri["cumulative_liters"] = veri["cumulative_liters"] + toplam
+            toplam = float(veri["cumulative_liters"][-1])
+            depo.ekle_toplu(*(veri[ad] for ad in SUTUNLAR))
+    return n * sayac
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Toplu rapor süreç havuzu hızlanması")
+    parser.add_argument("--sayac", type=int, default=4)
+    parser.add_argument("--gun", type=int, default=365)
+    parser.add_argument("--aralik", type=float, default=5.0, help="Örnekler arası saniye")
+    parser.add_argument("--isler", type=int, nargs="+", help="Denenecek süreç sayıları (varsayılan: 2'nin katları, çekirdeğe kadar)")
+    parser.add_argument("--tekrar", type=int, default=2)
+    parser.add_argument("--dizin", help="Geçici dosyaların yazılacağı dizin")
+    args = parser.parse_args(argv)
+    cekirdek = os.cpu_count() or 1
+    isler = args.isler or sorted({2 ** i for i in range(1, cekirdek.bit_length())} | {cekirdek} - {1}) or [2]
+    hatalar = 0
+
+    dizin = tempfile.mkdtemp(dir=args.dizin)
+    try:
+        t0 = time.perf_counter()
+        satir = veri_hazirla(dizin, args.sayac, args.gun, args.aralik)
+        dizinler = sayaclar(dizin)
+        print(f"{args.sayac} sayaç × {args.gun} gün, {satir:,} satır ({time.perf_counter() - t0:.1f} s'de üretildi); "
+              f"çekirdek: {cekirdek}")
+
+        # Doğruluk: birleştirilmiş gün bölümleri = tüm aralığın tek geçişi
+        rapor = toplu_rapor(dizinler, is_sayisi=isler[0])
+        for kimlik, ozet in rapor["sayaclar"].items():
+            s = sonuclandir(ozet)
+            tek = GecmisSorgusu(dizinler[kimlik]).rapor("2000-01-01", "2100-01-01")
+            for alan in ("kayit", "toplam", "gereksiz", "ortalama_debi"):
+                if abs(s[alan] - tek[alan]) > 0.011:
+                    hatalar += 1
+                    print(f"HATA {kimlik} {alan}: bölümlerden {s[alan]}, tek geçiş {tek[alan]}")
+
+        def olc(is_sayisi):
+            sureler = []
+            for _ in range(args.tekrar):
+                t = time.perf_counter()
+                toplu_rapor(dizinler, is_sayisi=is_sayisi)
+                sureler.append(time.perf_counter() - t)
+            return min(sureler)
+
+        tek = olc(1)
+        print(f"\n{'Süreç':>6} | {'Süre':>8} | {'Hızlanma':>8} | Verim")
+        print("-" * 38)
+        print(f"{'1':>6} | {tek:>6.2f} s | {1:>7.2f}x | havuzsuz ({rapor['bolum']} bölüm)")
+        for is_sayisi in isler:
+            sure = olc(is_sayisi)
+            print(f"{is_sayisi:>6} | {sure:>6.2f} s | {tek / sure:>7.2f}x | %{tek / sure / min(is_sayisi, cekirdek) * 100:.0f}")
+    finally:
+        shutil.rmtree(dizin, ignore_errors=True)
+    if hatalar:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+# ÜRETİCİ-TÜKETİCİ BORU HATTI
+# Eskiden ser.readline(), CSV yazma, analiz ve grafik aynı döngüdeydi; 300 dpi savefig
+# sırasında seri port okunamıyor, 9600 baud UART tamponu taşıp satırlar bozuluyordu.
+#
+#   okuyucu iş parçacığı --(ham kuyruk)--> dağıtıcı --(aşama kuyrukları)--> kayıt / analiz / ...
+#
+# - Okuyucu sadece satır okur ve zaman damgasını OKUMA ANINDA alır; asla beklemez.
+#   Ham kuyruk doluysa satır düşürülür ve sayılır.
+# - Her aşamanın kendi sınırlı kuyruğu ve iş parçacığı vardır. dusur=False olan aşama
+#   dolduğunda dağıtıcıyı bekletir (geri basınç), dusur=True olan aşama yeni öğeyi düşürür.
+# - cozucu verilirse (ör. ikili.OtomatikCozucu) satır yerine bekleyen tüm baytlar tek seferde
+#   okunur ve çözücü bunları toplu olarak örneklere ayırır (ikili çerçeve protokolü için).
+# - Arduino'nun hazır olması için sabit beklenmez: okuma port açılır açılmaz başlar, HAZIR işareti
+#   veya ilk geçerli örnek gelince 'hazir' olayı kurulur (bkz. su_izleme/acilis.py).
+# - Her aşama islev çağrılarında geçen süreyi biriktirir (sure); kanca(ad, adet, sure_s) verilirse
+#   her partiden sonra çağrılır. zamanlama_satiri() aşama başına örnek süresini gösterir.
+#   BoruHatti'ye kanca verilirse ayrıştırma süresi de "ayristirma" adıyla bildirilir (bkz. metrik.py).
+
+import queue
+import threading
+import time
+from datetime import datetime
+
+from su_izleme.acilis import HAZIR_ISARETI
+from su_izleme.ayristir import satir_ayristir
+
+_BITTI = object()  # Aşama kuyruklarına kapanış işareti
+
+
+def _olculen(islev, ad, kanca):
+    """islev'in her çağrısının süresini kanca(ad, 1, sure_s) ile bildiren sarmalayıcı"""
+
+    def sarmal(*args):
+        t0 = time.perf_counter()
+        try:
+            return islev(*args)
+        finally:
+            kanca(ad, 1, time.perf_counter() - t0)
+
+    return sarmal
+
+
+class Asama:
+    """Kendi kuyruğundan öğeleri toplu alıp islev(liste) çağıran tüketici aşaması.
+
+    kanca: her partiden sonra kanca(ad, öğe sayısı, süre s) şeklinde çağrılır (zamanlama / profil için).
+    """
+
+    def __init__(self, ad, islev, kuyruk_boyu=1000, dusur=False, max_toplu=256, kanca=None):
+        self.ad = ad
+        self.islev = islev
+        self.kanca = kanca
+        self.dusur = dusur
+        self.max_toplu = max_toplu
+        self.kuyruk = queue.Queue(maxsize=kuyruk_boyu)
+        self.islenen = 0
+        self.dusen = 0
+        self.hata = 0
+        self.sure = 0.0  # islev çağrılarında geçen toplam süre (s)
+        self._is = threading.Thread(target=self._calis, name=f"asama-{ad}", daemon=True)
+
+    def baslat(self):
+        self._is.start()
+
+    def gonder(self, oge):
+        """Öğeyi aşamaya iletir; düşürüldüyse False döner"""
+        if self.dusur:
+            try:
+                self.kuyruk.put_nowait(oge)
+            except queue.Full:
+                self.dusen += 1
+                return False
+        else:
+            self.kuyruk.put(oge)  # Kuyruk doluysa yer açılana kadar bekle (geri basınç)
+        return True
+
+    def _calis(self):
+        while True:
+            toplu = [self.kuyruk.get()]
+            while len(toplu) < self.max_toplu:
+                try:
+                    toplu.append(self.kuyruk.get_nowait())
+                except queue.Empty:
+                    break
+            bitti = toplu[-1] is _BITTI
+            if bitti:
+                toplu.pop()
+            if toplu:
+                t0 = time.perf_counter()
+                try:
+                    self.islev(toplu)
+                except Exception as e:
+                    self.hata += 1
+                    print(f"'{self.ad}' aşaması hatası: {e}")
+                sure = time.perf_counter() - t0
+                self.sure += sure
+                self.islenen += len(toplu)
+                if self.kanca is not None:
+                    self.kanca(self.ad, len(toplu), sure)
+            if bitti:
+                return
+
+    def durdur(self, zaman_asimi=None):
+        """Kuyruktakileri işledikten sonra aşamayı kapatır"""
+        self.kuyruk.put(_BITTI)
+        self._is.join(zaman_asimi)
+
+    def istatistik(self):
+        return {"islenen": self.islenen, "dusen": self.dusen, "hata": self.hata,
+                "kuyruk": self.kuyruk.qsize(), "sure": self.sure}
+
+
+class BoruHatti:
+    """Seri kaynağı okuyup ayrıştırılmış örnekleri (ts, flow, cumulative, ir) aşamalara dağıtır.
+
+    kaynak: readline() metodu olan herhangi bir nesne (serial.Serial, dosya, simülatör).
+        cozucu verilmişse read(n) yeterlidir; varsa in_waiting ile bekleyen baytların hepsi okunur.
+    cozucu: besle(bytes) -> (flow, cumulative, ir) dizileri döndüren parça çözücü
+        (ikili.OtomatikCozucu, ikili.IkiliCozucu, ikili.MetinCozucu).
+    ek_asamalar: örnek almayan ama hat ile birlikte başlatılıp durdurulan aşamalar
+    (ör. analiz aşamasının tetiklediği grafik aşaması).
+    kanca: kendi kancası olmayan tüm aşamalara verilir (bkz. Asama); ayrıştırıcı / çözücü çağrıları
+        da "ayristirma" adıyla ölçülür. Verilmezse ayrıştırma yolunda ölçüm yapılmaz.
+    """
+
+    def __init__(self, kaynak, asamalar, ek_asamalar=(), ham_kuyruk_boyu=4096,
+                 ayristirici=satir_ayristir, cozucu=None, kanca=None):
+        self.kaynak = kaynak
+        self.cozucu = cozucu
+        self.asamalar = list(asamalar)
+        self.ek_asamalar = list(ek_asamalar)
+        for asama in self.asamalar + self.ek_asamalar:
+            if asama.kanca is None:
+                asama.kanca = kanca
+        self.ayristirici = ayristirici
+        self._besle = cozucu.besle if cozucu is not None else None
+        if kanca is not None:
+            self.ayristirici = _olculen(ayristirici, "ayristirma", kanca)
+            if cozucu is not None:
+                self._besle = _olculen(cozucu.besle, "ayristirma", kanca)
+        self.ham_kuyruk = queue.Queue(maxsize=ham_kuyruk_boyu)
+        self._dur = threading.Event()
+        self.okunan = 0
+        self.dusen = 0  # Ham kuyruk dolduğu için düşen satırlar
+        self.hatali = 0  # Ayrıştırılamayan satırlar (çözücü modunda geçersiz çerçeveler)
+        self.ornek = 0  # Aşamalara iletilen geçerli örnekler
+        self.hazir = threading.Event()  # Arduino HAZIR işaretini veya ilk örneği gönderdi
+        self.hazir_suresi = None  # baslat()'tan hazır olana kadar geçen saniye
+        self._baslangic = None
+        self._okuyucu = threading.Thread(target=self._oku, name="seri-okuyucu", daemon=True)
+        self._dagitici = threading.Thread(target=self._dagit, name="dagitici", daemon=True)
+
+    def baslat(self):
+        self._baslangic = time.monotonic()
+        for asama in self.asamalar + self.ek_asamalar:
+            asama.baslat()
+        self._dagitici.start()
+        self._okuyucu.start()
+
+    def hazir_bekle(self, zaman_asimi=None):
+        """Arduino hazır olana kadar (en fazla zaman_asimi saniye) bekler; hazırsa True döner"""
+        return self.hazir.wait(zaman_asimi)
+
+    def _hazir_isaretle(self):
+        self.hazir_suresi = time.monotonic() - self._baslangic
+        self.hazir.set()
+
+    def _parca_oku(self):
+        return self.kaynak.read(max(getattr(self.kaynak, "in_waiting", 0), 1))
+
+    def _oku(self):
+        oku = self.kaynak.readline if self.cozucu is None else self._parca_oku
+        while not self._dur.is_set():
+            try:
+                ham = oku()
+            except Exception as e:
+                print(f"Seri okuma hatası: {e}")
+                time.sleep(0.1)
+                continue
+            if not ham:
+                continue  # Zaman aşımı: veri gelmedi
+            ts = datetime.now()  # Zaman damgası okuma anında alınır
+            self.okunan += 1
+            try:
+                self.ham_kuyruk.put_nowait((ts, ham))
+            except queue.Full:
+                self.dusen += 1
+        self.ham_kuyruk.put((None, None))
+
+    def _dagit(self):
+        while True:
+            ts, ham = self.ham_kuyruk.get()
+            if ts is None:
+                return
+            if not self.hazir.is_set() and HAZIR_ISARETI in ham:
+                self._hazir_isaretle()
+            if self.cozucu is not None:
+                self._parca_dagit(ts, ham)
+                continue
+            try:
+                degerler = self.ayristirici(ham)
+            except ValueError:
+                self.hatali += 1
+                continue
+            if degerler is None:
+                continue
+            if not self.hazir.is_set():
+                self._hazir_isaretle()
+            self.ornek += 1
+            ornek = (ts,) + tuple(degerler)
+            for asama in self.asamalar:
+                asama.gonder(ornek)
+
+    def _parca_dagit(self, ts, ham):
+        flow, cumulative, ir = self._besle(ham)
+        self.hatali = self.cozucu.hatali
+        if len(flow) and not self.hazir.is_set():
+            self._hazir_isaretle()
+        # Aynı parçadan çıkan örnekler aynı okuma zamanını paylaşır
+        for degerler in zip(flow.tolist(), cumulative.tolist(), ir.tolist()):
+            self.ornek += 1
+            ornek = (ts,) + degerler
+            for asama in self.asamalar:
+                asama.gonder(ornek)
+
+    def durdur(self, zaman_asimi=5.0):
+        """Okumayı durdurur, kuyruklarda kalanları işletip iş parçacıklarını kapatır"""
+        self._dur.set()
+        self._okuyucu.join(zaman_asimi)
+        self._dagitici.join(zaman_asimi)
+        for asama in self.asamalar + self.ek_asamalar:
+            asama.durdur(zaman_asimi)
+
+    def istatistik(self):
+        sure = time.monotonic() - self._baslangic if self._baslangic else 0.0
+        return {
+            "okunan": self.okunan,
+            "dusen": self.dusen,
+            "hatali": self.hatali,
+            "ornek": self.ornek,
+            "kayip": getattr(self.cozucu, "kayip", 0),  # İkili protokolde sıra numarası atlamaları
+            "ornek_hizi": self.ornek / sure if sure > 0 else 0.0,
+            "ham_kuyruk": self.ham_kuyruk.qsize(),
+            "asamalar": {a.ad: a.istatistik() for a in self.asamalar + self.ek_asamalar},
+        }
+
+    def durum_satiri(self):
+        """Konsola yazılabilecek tek satırlık özet"""
+        s = self.istatistik()
+        asamalar = " ".join(f"{ad}[k={a['kuyruk']} d={a['dusen']}]" for ad, a in s["asamalar"].items())
+        return (f"Okunan: {s['okunan']} | Örnek: {s['ornek']} ({s['ornek_hizi']:.1f}/s) | "
+                f"Düşen: {s['dusen']} | Hatalı: {s['hatali']} | Kayıp: {s['kayip']} | {asamalar}")
+
+    def zamanlama_satiri(self):
+        """Aşama başına ortalama işlem süresi (µs/öğe) ve toplam süre"""
+        parcalar = []
+        for asama in self.asamalar + self.ek_asamalar:
+            ortalama = asama.sure / asama.islenen * 1e6 if asama.islenen else 0.0
+            parcalar.append(f"{asama.ad} {ortalama:.1f} µs/öğe ({asama.sure:.2f} s)")
+        return "Aşama süreleri: " + " | ".join(parcalar)
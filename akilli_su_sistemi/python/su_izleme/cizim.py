@@ -0,0 +1,240 @@
+# KALICI GRAFİK ÇİZİCİ
+# Eski gorsellestir her çağrıda yeni bir pyplot figürü kurup kaydedilmiş TÜM noktaları
+# 300 dpi çiziyordu; süre geçmişle birlikte büyüyor, Water2'de plt.close() olmadığı için
+# figürler bellekte birikiyordu. Bu çizici:
+#   - Figürü bir kez kurar (pyplot'un global durumunu kullanmaz), sonraki çizimlerde sadece
+#     çizgilerin verisini yerinde günceller
+#   - Veriyi ekran çözünürlüğüne seyreltir: her piksel sütunu için min/maks (en fazla 2 nokta/piksel),
+#     böylece çizim süresi geçmişin uzunluğundan bağımsız kalır
+#   - Duvar saatine göre kısıtlanır: min_aralik saniyeden sık ve veri değişmeden çizmez
+#   - matplotlib ilk çizimde (çizim iş parçacığında) yüklenir; betiğin açılışını yavaşlatmaz
+# Kayıtlı geçmişin grafiği:  python -m su_izleme plot [--bas ... --bit ...] [--ozet su_tuketim.ozet --gun 90]
+
+import argparse
+import time
+
+import numpy as np
+
+# (sütun, başlık, y ekseni etiketi, renk, çizgi kalınlığı)
+DEBI_PANELI = ("flow_lpm", "Anlık Debi Akışı (Litre/dk)", "Litre/dk", "b", 1)
+TOPLAM_PANELI = ("cumulative_liters", "Toplam Tüketim (Litre)", "Litre", "g", 2)
+IR_PANELI = ("ir_state", "IR Sensör Durumu (0 = Yok, 1 = Var)", "Durum", "r", 1)
+PANELLER = {"debi": DEBI_PANELI, "toplam": TOPLAM_PANELI, "ir": IR_PANELI}
+
+
+def panel_listesi(deger):
+    """'debi,toplam,ir' biçimindeki seçeneği panel listesine çevirir (argparse type olarak)"""
+    adlar = [ad.strip() for ad in deger.split(",") if ad.strip()]
+    if not adlar or any(ad not in PANELLER for ad in adlar):
+        raise argparse.ArgumentTypeError(f"Panel adları: {', '.join(PANELLER)} (virgülle ayrılmış)")
+    return [PANELLER[ad] for ad in adlar]
+
+
+def kova_baslari(x, kova):
+    """Sıralı x'i 'kova' eşit genişlikte aralığa böler, boş olmayan aralıkların ilk indekslerini döndürür"""
+    return np.unique(np.searchsorted(x, np.linspace(x[0], x[-1], kova + 1)[:-1]))
+
+
+def _minmaks(x, y, baslar):
+    """Her aralıktan min ve maks değerini (aralıktaki sıralarına göre) iki nokta olarak tutar"""
+    sonlar = np.append(baslar[1:], len(y)) - 1
+    enk = np.minimum.reduceat(y, baslar)
+    enb = np.maximum.reduceat(y, baslar)
+    artan = y[baslar] <= y[sonlar]  # Aralık içinde önce min mi geliyor, önce maks mı
+    xs = np.empty(2 * len(baslar), dtype=x.dtype)
+    ys = np.empty(2 * len(baslar), dtype=y.dtype)
+    xs[0::2], xs[1::2] = x[baslar], x[sonlar]
+    ys[0::2] = np.where(artan, enk, enb)
+    ys[1::2] = np.where(artan, enb, enk)
+    return xs, ys
+
+
+def seyrelt(x, y, kova):
+    """Sıralı x üzerinde veriyi 'kova' eşit aralığa böler, her aralıktan min ve maks değerini
+    tutar. En fazla 2*kova nokta döndürür; veri zaten küçükse olduğu gibi döner."""
+    if len(x) <= 2 * kova:
+        return x, y
+    return _minmaks(x, y, kova_baslari(x, kova))
+
+
+class Cizici:
+    """Bir VeriDeposu'nun sütunlarını alt alta paneller halinde PNG dosyasına çizer.
+
+    ciz() çağrıları min_aralik saniyeden sık gelirse veya depoya yeni örnek eklenmemişse
+    atlanır (False döner); zorla=True bu kısıtı kaldırır. Figür ilk çizimde kurulur,
+    kapat() figürü serbest bırakır.
+    """
+
+    def __init__(self, dosya, paneller=(DEBI_PANELI, TOPLAM_PANELI), boyut=(12, 8), dpi=100,
+                 min_aralik=10.0, baslik_boyu=14):
+        self.dosya = dosya
+        self.dpi = dpi
+        self.min_aralik = min_aralik
+        self.cizim_sayisi = 0
+        self.son_sure = 0.0  # Son çizimin saniye cinsinden süresi
+        self._son_zaman = None
+        self._son_sayac = None
+        self._yerlesim_tamam = False
+        self._paneller = list(paneller)
+        self._boyut = boyut
+        self._baslik_boyu = baslik_boyu
+        self.fig = None
+        self._cizgiler = []
+        # Her eksenin piksel genişliği kadar kova yeterli (ekran çözünürlüğü)
+        self._kova = max(int(boyut[0] * dpi), 1)
+
+    def _kur(self):
+        from matplotlib.figure import Figure
+
+        self.fig = Figure(figsize=self._boyut, dpi=self.dpi)
+        eksenler = self.fig.subplots(len(self._paneller), 1, sharex=True, squeeze=False)[:, 0]
+        for ax, (sutun, baslik, etiket, renk, kalinlik) in zip(eksenler, self._paneller):
+            cizgi, = ax.plot([], [], color=renk, linewidth=kalinlik)
+            ax.set_title(baslik, fontsize=self._baslik_boyu)
+            ax.set_ylabel(etiket)
+            ax.grid(axis="y", alpha=0.5)
+            ax.xaxis_date()
+            self._cizgiler.append((ax, sutun, cizgi))
+        eksenler[-1].set_xlabel("Zaman")
+
+    def ciz(self, depo, zorla=False):
+        """Depodaki veriyi çizip dosyaya kaydeder; çizim yapıldıysa True döner"""
+        simdi = time.monotonic()
+        if not zorla:
+            if self._son_zaman is not None and simdi - self._son_zaman < self.min_aralik:
+                return False
+            if depo.toplam_sayac == self._son_sayac:
+                return False
+        if depo.empty:
+            return False
+
+        from matplotlib.dates import date2num
+
+        if self.fig is None:
+            self._kur()
+        gorunum = depo.gorunum()  # Kopyasız ve birbiriyle tutarlı sütunlar
+        zaman = gorunum["timestamp"].view(np.int64)
+        # Aralıklar bir kez bulunur; tarih dönüşümü sadece seyreltilmiş noktalara yapılır
+        baslar = kova_baslari(zaman, self._kova) if len(zaman) > 2 * self._kova else None
+        for ax, sutun, cizgi in self._cizgiler:
+            if baslar is None:
+                x, y = zaman, gorunum[sutun]
+            else:
+                x, y = _minmaks(zaman, gorunum[sutun], baslar)
+            cizgi.set_data(date2num(x.view("datetime64[ns]")), y)
+            ax.relim()
+            ax.autoscale_view()
+        if not self._yerlesim_tamam:
+            self.fig.tight_layout()
+            self._yerlesim_tamam = True
+        self.fig.savefig(self.dosya, dpi=self.dpi)
+
+        self._son_zaman = simdi
+        self._son_sayac = depo.toplam_sayac
+        self.son_sure = time.monotonic() - simdi
+        self.cizim_sayisi += 1
+        return True
+
+    def kapat(self):
+        if self.fig is not None:
+            self.fig.clear()
+        self._cizgiler = []
+
+
+def ozet_ciz(ozetleyici, dosya, gun=90, bit=None, boyut=(12, 8), dpi=100):
+    """Son 'gun' günü ham veri yerine özet katmanlarından çizer (bkz. su_izleme.ozet).
+
+    Ekran genişliğini dolduran en kaba katman seçilir, kovalar ekrandan sıksa piksel başına birleştirilir.
+    Üst panelde ortalama debi ve kova içi min/maks bandı, alt panelde kova başına tüketilen litre
+    gösterilir. Kullanılan katmanı döndürür.
+    """
+    from matplotlib.dates import date2num
+    from matplotlib.figure import Figure
+
+    if bit is None:
+        bit = ozetleyici.son_zaman
+        if bit is None:
+            return None
+        bit = bit + np.timedelta64(1, "ns")
+    bas = np.datetime64(bit, "ns") - np.timedelta64(gun * 86400, "s")
+    from su_izleme.ozet import kovalari_birlestir
+
+    piksel = int(boyut[0] * dpi)
+    katman, kovalar = ozetleyici.sorgula(bas, bit, hedef_nokta=piksel)
+    if len(kovalar) == 0:
+        return None
+    if len(kovalar) > piksel:  # Kısa aralıkta 1 dk katmanı bile ekrandan sık olabilir
+        kovalar = kovalari_birlestir(kovalar, kova_baslari(kovalar["baslangic"], piksel))
+
+    x = date2num(kovalar["baslangic"].view("datetime64[ns]"))
+    debili = kovalar["debi_adet"] > 0  # Sonlu debisi olmayan kovalar çizilmez
+    ortalama = np.where(debili, kovalar["debi_toplam"] / np.maximum(kovalar["debi_adet"], 1), np.nan)
+
+    fig = Figure(figsize=boyut, dpi=dpi)
+    ust, alt = fig.subplots(2, 1, sharex=True)
+    alt_sinir = np.where(debili, kovalar["debi_min"], np.nan)
+    ust_sinir = np.where(debili, kovalar["debi_maks"], np.nan)
+    ust.fill_between(x, alt_sinir, ust_sinir, color="b", alpha=0.2, linewidth=0, step="post")
+    ust.step(x, ortalama, where="post", color="b", linewidth=1)
+    ust.set_title(f"Debi (Litre/dk) - son {gun} gün, {katman} ortalama ve min/maks", fontsize=14)
+    ust.set_ylabel("Litre/dk")
+    alt.step(x, kovalar["litre"], where="post", color="g", linewidth=1)
+    alt.set_title(f"Tüketim (Litre / kova, {katman} katmanından)", fontsize=14)
+    alt.set_ylabel("Litre")
+    alt.set_xlabel("Zaman")
+    for ax in (ust, alt):
+        ax.grid(axis="y", alpha=0.5)
+        ax.xaxis_date()
+    fig.tight_layout()
+    fig.savefig(dosya, dpi=dpi)
+    fig.clear()
+    return katman
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kayıtlı tüketim geçmişinin grafiği")
+    parser.add_argument("--dosya", default="su_tuketim_grafik.png", help="Çıktı PNG dosyası")
+    parser.add_argument("--kolon", default="su_tuketim.kolon", help="Sütunsal depo dizini")
+    parser.add_argument("--csv", default="su_tuketim.csv", help="Önce eşitlenecek CSV (yoksa atlanır)")
+    parser.add_argument("--bas", help="Aralık başı (ör. '2024-01-02 07:00'); verilmezse tüm geçmiş")
+    parser.add_argument("--bit", help="Aralık sonu (dahil değil)")
+    parser.add_argument("--ozet", help="Ham veri yerine bu özet dizininden çiz (uzun dönem)")
+    parser.add_argument("--gun", type=int, default=90, help="Özet grafiğinin kapsadığı gün sayısı")
+    parser.add_argument("--paneller", type=panel_listesi, default=panel_listesi("debi,toplam"),
+                        help=f"Ham veri panelleri ({', '.join(PANELLER)})")
+    parser.add_argument("--dpi", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    if args.ozet:
+        from su_izleme.ozet import Ozetleyici
+
+        katman = ozet_ciz(Ozetleyici(args.ozet), args.dosya, gun=args.gun, bit=args.bit, dpi=args.dpi)
+        if katman is None:
+            print("Grafik için veri yok")
+            return
+        print(f"Son {args.gun} günün grafiği {katman} katmanından çizildi -> {args.dosya} "
+              f"({time.perf_counter() - t0:.1f} s)")
+        return
+
+    from su_izleme.depo import VeriDeposu
+    from su_izleme.sorgu import GecmisSorgusu
+
+    sorgu = GecmisSorgusu(args.kolon, csv=args.csv)
+    if args.bas or args.bit:
+        veri = sorgu.aralik(args.bas or np.datetime64(0, "ns"), args.bit or np.datetime64(2**63 - 1, "ns"))
+    else:
+        veri = sorgu.kolon.yukle()
+    depo = VeriDeposu(kapasite=len(veri["timestamp"]))
+    depo.ekle_toplu(veri["timestamp"], veri["flow_lpm"], veri["cumulative_liters"], veri["ir_state"])
+    if depo.empty:
+        print("Grafik için veri yok")
+        return
+    cizici = Cizici(args.dosya, paneller=args.paneller, boyut=(12, 4 + 2 * len(args.paneller)), dpi=args.dpi)
+    cizici.ciz(depo, zorla=True)
+    cizici.kapat()
+    print(f"{len(depo):,} kayıt çizildi -> {args.dosya} ({time.perf_counter() - t0:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
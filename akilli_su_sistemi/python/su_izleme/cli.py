@@ -0,0 +1,49 @@
+# KOMUT SATIRI
+# Tek giriş noktası:  python -m su_izleme <komut> [seçenekler]
+#   monitor (izle)    Seri porttan canlı izleme: CSV kaydı, analiz, rapor, grafik   su_izleme/izleme.py
+#   report  (rapor)   Geçmişte zaman aralığı raporu (sütunsal depo, seyrek indeks)   su_izleme/sorgu.py
+#   plot    (ciz)     Geçmişin grafiği: ham veri veya uzun dönem için özetler       su_izleme/cizim.py
+#   replay  (tekrar)  Kayıtlı geçmişi canlı analiz aşamasından geçirir             su_izleme/tekrar.py
+#   wal     (gunluk)  Yazma günlüğü bölümlerini listeler / derler                   su_izleme/gunluk.py
+#   baseline (profil) Haftanın saatine göre tüketim profili: kur / göster           su_izleme/profil.py
+#   bench   (olcum)   Performans ölçümleri (su_izleme/bench)                       su_izleme/bench
+# Her komut ilgili modülün main(argv) fonksiyonunu çağırır; seçenekler için: <komut> --help.
+# Modüller komut seçilince içe aktarılır (ör. report seri port ve matplotlib yüklemez).
+
+import importlib
+import sys
+
+KOMUTLAR = {
+    "monitor": ("su_izleme.izleme", "Seri porttan canlı izleme (Water1/2/3.py bunun ön ayarlarıdır)"),
+    "report": ("su_izleme.sorgu", "Geçmişte zaman aralığı raporu"),
+    "plot": ("su_izleme.cizim", "Kayıtlı geçmişin grafiği"),
+    "replay": ("su_izleme.tekrar", "Kayıtlı geçmişi analiz aşamasından geçirir"),
+    "wal": ("su_izleme.gunluk", "Yazma günlüğü bölümlerini listeler / derler"),
+    "baseline": ("su_izleme.profil", "Haftanın saatine göre tüketim profili: kur / göster"),
+    "bench": ("su_izleme.bench", "Performans ölçümleri (adsız: listeler)"),
+}
+TAKMA_ADLAR = {"izle": "monitor", "rapor": "report", "ciz": "plot", "tekrar": "replay", "gunluk": "wal",
+               "profil": "baseline", "olcum": "bench"}
+
+
+def kullanim():
+    satirlar = ["Kullanım: python -m su_izleme <komut> [seçenekler]", "", "Komutlar:"]
+    adlar = {v: k for k, v in TAKMA_ADLAR.items()}
+    for komut, (_, aciklama) in KOMUTLAR.items():
+        satirlar.append(f"  {komut:<8} ({adlar[komut]:<6}) {aciklama}")
+    satirlar.append("")
+    satirlar.append("Komutun seçenekleri için: python -m su_izleme <komut> --help")
+    return "\n".join(satirlar)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ("-h", "--help"):
+        print(kullanim())
+        return
+    komut = TAKMA_ADLAR.get(argv[0], argv[0])
+    if komut not in KOMUTLAR:
+        print(f"Bilinmeyen komut: {argv[0]}\n")
+        print(kullanim())
+        sys.exit(2)
+    importlib.import_module(KOMUTLAR[komut][0]).main(argv[1:])
@@ -0,0 +1,160 @@
+# VERİ DEPOSU - NumPy tabanlı sütunsal örnek deposu
+# data.loc[len(data)] = new_row her eklemede DataFrame'i yeniden oluşturduğu için
+# kayıt sayısı büyüdükçe yavaşlıyordu. Bu depo sütunları önceden ayrılmış dizilerde tutar:
+#   - pencere=None  : kapasite dolunca iki katına çıkar (ortalama O(1) ekleme)
+#   - pencere=N     : sadece son N örnek tutulur (sabit bellek, halka tampon)
+# Analiz ve grafik fonksiyonlarına kopya değil, salt okunur görünümler (view) verilir.
+
+import numpy as np
+
+from su_izleme import SUTUNLAR
+
+# Sütun veri tipleri (CSV şeması ile aynı sıra)
+VERI_TIPLERI = {
+    "timestamp": "datetime64[ns]",
+    "flow_lpm": np.float64,
+    "cumulative_liters": np.float64,
+    "ir_state": np.int8,
+}
+
+
+class VeriDeposu:
+    """Sabit şemalı (timestamp, flow_lpm, cumulative_liters, ir_state) sütunsal depo.
+
+    Halka modunda (pencere=N) her örnek hem i hem de i+N konumuna yazılır; böylece
+    son N örnek tampon içinde her zaman bitişik durur ve kopyasız dilimlenebilir.
+    """
+
+    def __init__(self, kapasite=4096, pencere=None):
+        if pencere is not None and pencere <= 0:
+            raise ValueError("pencere pozitif olmalı")
+        self.pencere = pencere
+        self._kapasite = 2 * pencere if pencere else max(int(kapasite), 1)
+        self._diziler = {ad: np.empty(self._kapasite, dtype=VERI_TIPLERI[ad]) for ad in SUTUNLAR}
+        self._sayac = 0  # Bugüne kadar eklenen toplam örnek sayısı
+
+    # --- BOYUT BİLGİSİ ---
+    def __len__(self):
+        """Depoda şu an tutulan örnek sayısı"""
+        if self.pencere:
+            return min(self._sayac, self.pencere)
+        return self._sayac
+
+    @property
+    def toplam_sayac(self):
+        """Pencereden düşenler dahil eklenen tüm örneklerin sayısı"""
+        return self._sayac
+
+    @property
+    def empty(self):
+        return self._sayac == 0
+
+    # --- EKLEME ---
+    def _buyut(self, gereken):
+        """Kapasiteyi en az 'gereken' olacak şekilde iki katına çıkarır"""
+        yeni = self._kapasite
+        while yeni < gereken:
+            yeni *= 2
+        for ad, eski in self._diziler.items():
+            dizi = np.empty(yeni, dtype=eski.dtype)
+            dizi[:self._sayac] = eski[:self._sayac]
+            self._diziler[ad] = dizi
+        self._kapasite = yeni
+
+    def ekle(self, timestamp, flow, cumulative, ir_state):
+        """Tek bir örneği ekler (ortalama O(1))"""
+        d = self._diziler
+        if self.pencere:
+            i = self._sayac % self.pencere
+            j = i + self.pencere
+            d["timestamp"][i] = d["timestamp"][j] = timestamp
+            d["flow_lpm"][i] = d["flow_lpm"][j] = flow
+            d["cumulative_liters"][i] = d["cumulative_liters"][j] = cumulative
+            d["ir_state"][i] = d["ir_state"][j] = ir_state
+        else:
+            i = self._sayac
+            if i == self._kapasite:
+                self._buyut(i + 1)
+            d["timestamp"][i] = timestamp
+            d["flow_lpm"][i] = flow
+            d["cumulative_liters"][i] = cumulative
+            d["ir_state"][i] = ir_state
+        self._sayac += 1
+
+    def ekle_toplu(self, timestamp, flow, cumulative, ir_state):
+        """Dizi halindeki çok sayıda örneği tek seferde ekler (geçmiş yükleme için)"""
+        sutunlar = {
+            "timestamp": np.asarray(timestamp, dtype=VERI_TIPLERI["timestamp"]),
+            "flow_lpm": np.asarray(flow, dtype=np.float64),
+            "cumulative_liters": np.asarray(cumulative, dtype=np.float64),
+            "ir_state": np.asarray(ir_state).astype(np.int8, copy=False),
+        }
+        n = len(sutunlar["timestamp"])
+        if any(len(v) != n for v in sutunlar.values()):
+            raise ValueError("Sütun uzunlukları eşit olmalı")
+        if n == 0:
+            return
+
+        if self.pencere:
+            # Pencereye sığmayan eski örnekler zaten düşeceği için yazılmaz
+            atla = max(n - self.pencere, 0)
+            konum = np.arange(self._sayac + atla, self._sayac + n) % self.pencere
+            for ad, degerler in sutunlar.items():
+                self._diziler[ad][konum] = degerler[atla:]
+                self._diziler[ad][konum + self.pencere] = degerler[atla:]
+        else:
+            if self._sayac + n > self._kapasite:
+                self._buyut(self._sayac + n)
+            for ad, degerler in sutunlar.items():
+                self._diziler[ad][self._sayac:self._sayac + n] = degerler
+        self._sayac += n
+
+    # --- OKUMA (KOPYASIZ GÖRÜNÜMLER) ---
+    def _dilim(self):
+        if self.pencere and self._sayac > self.pencere:
+            bas = self._sayac % self.pencere
+            return slice(bas, bas + self.pencere)
+        return slice(0, len(self))
+
+    def sutun(self, ad):
+        """Bir sütunun kronolojik sıralı, salt okunur görünümünü döndürür.
+
+        Görünüm bir sonraki büyütmeye (veya halka modunda yeni eklemeye) kadar geçerlidir.
+        """
+        gorunum = self._diziler[ad][self._dilim()]
+        gorunum.flags.writeable = False
+        return gorunum
+
+    def __getitem__(self, ad):
+        return self.sutun(ad)
+
+    def gorunum(self):
+        """Tüm sütunların aynı uzunlukta görünümlerini sözlük olarak döndürür.
+
+        Başka bir iş parçacığı aynı anda ekleme yapsa bile sütunlar birbiriyle tutarlı kalır.
+        """
+        dilim = self._dilim()
+        sonuc = {}
+        for ad in SUTUNLAR:
+            gorunum = self._diziler[ad][dilim]
+            gorunum.flags.writeable = False
+            sonuc[ad] = gorunum
+        return sonuc
+
+    def son(self):
+        """En son eklenen örneği (timestamp, flow, cumulative, ir) olarak döndürür"""
+        if self._sayac == 0:
+            return None
+        if self.pencere:
+            i = (self._sayac - 1) % self.pencere
+        else:
+            i = self._sayac - 1
+        d = self._diziler
+        return (d["timestamp"][i], float(d["flow_lpm"][i]),
+                float(d["cumulative_liters"][i]), int(d["ir_state"][i]))
+
+    def dataframe(self):
+        """Uyumluluk için pandas DataFrame kopyası üretir (sık çağrılmamalı)"""
+        import pandas as pd
+
+        return pd.DataFrame({ad: np.array(v) for ad, v in self.gorunum().items()})
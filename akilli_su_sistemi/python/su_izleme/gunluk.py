@@ -0,0 +1,246 @@
+# YAZMA GÜNLÜĞÜ (WAL)
+# Süreç CSV'ye yazarken ölürse su_tuketim.csv'nin son satırı yarım kalabiliyordu; açılışta bu satır
+# ya ayrıştırmayı bozuyor ya da değerleri 0'a çeviriyordu. Örnekler artık önce sadece sona eklenen,
+# bölümlere ayrılmış bir günlüğe yazılır:
+#   <dizin>/00000042.gunluk   16 baytlık başlık (BASLIK_IMZA + bölüm no) ve 32 baytlık sabit kayıtlar:
+#                             timestamp i8 (ns) | flow_lpm f8 | cumulative_liters f8 | ir_state i1 | 3 boş | crc32
+#   - Her kayıt kendi CRC32'sini taşır; okurken ilk bozuk veya yarım kayıtta durulur, öncesi kurtarılır.
+#   - Her parti tamponsuz tek write() ile yazılır: süreç çökse de işletim sistemine geçmiştir. os.fsync
+#     fsync_sure aralıkla ve bölüm kapanırken çağrılır (elektrik kesintisinde en fazla bu kadar kayıp).
+#   - Bölüm bolum_bayt boyuna veya bolum_sure yaşına ulaşınca kapanır, yenisi açılır.
+#   - Kapanan bölümler sütunsal depoya (kalici.KolonDeposu.bolum_ekle) eklenip silinir (derleme).
+# Açılışta sadece derlenmemiş bölümler okunur: kurtarma süresi toplam geçmişle değil, derlenmemiş
+# kuyrukla (varsayılan en fazla bolum_sure'lik veri) orantılıdır.
+# Kullanım:  python -m su_izleme wal durum su_tuketim.gunluk [--kolon su_tuketim.kolon] [--derle]
+
+import argparse
+import os
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from su_izleme import SUTUNLAR
+
+BASLIK_IMZA = b"SUGUNLK1"
+BASLIK_BAYT = 16
+KAYIT_TIPI = np.dtype([
+    ("timestamp", "<i8"),
+    ("flow_lpm", "<f8"),
+    ("cumulative_liters", "<f8"),
+    ("ir_state", "i1"),
+    ("bos", "V3"),
+    ("crc", "<u4"),
+])
+CRC_BAYT = KAYIT_TIPI.itemsize - 4  # CRC, kaydın kendisinden önceki 28 baytını kapsar
+UZANTI = ".gunluk"
+BOLUM_BAYT = 4 * 1024 * 1024  # ~131 bin kayıt
+BOLUM_SURE = 600.0  # s; 1 Hz'de 600 kayıt: açılışta en fazla bu kadarı kurtarılır
+FSYNC_SURE = 5.0
+
+
+def kodla(zaman, debi, toplam, ir):
+    """Dizileri CRC'li günlük kayıtlarına çevirir (bayt dizisi)"""
+    kayitlar = np.zeros(len(zaman), dtype=KAYIT_TIPI)
+    kayitlar["timestamp"] = np.asarray(zaman, dtype="datetime64[ns]").view(np.int64)
+    kayitlar["flow_lpm"] = debi
+    kayitlar["cumulative_liters"] = toplam
+    kayitlar["ir_state"] = ir
+    ham = memoryview(kayitlar.view(np.uint8))
+    boy = KAYIT_TIPI.itemsize
+    kayitlar["crc"] = [zlib.crc32(ham[i:i + CRC_BAYT]) for i in range(0, len(ham), boy)]
+    return kayitlar.tobytes()
+
+
+def bolum_oku(yol):
+    """Bölümü okur; (sütun sözlüğü, atılan bayt) döndürür.
+
+    İlk CRC'si tutmayan veya yarım kalan kayıttan itibaren her şey atılır (bozulma sonrası
+    kayıtların sırası ve sürekliliği garanti edilemez). Başlık bozuksa tüm bölüm atılır.
+    """
+    ham = np.fromfile(yol, dtype=np.uint8)
+    if len(ham) < BASLIK_BAYT or ham[:len(BASLIK_IMZA)].tobytes() != BASLIK_IMZA:
+        return _bos_sutunlar(), len(ham)
+    govde = ham[BASLIK_BAYT:]
+    boy = KAYIT_TIPI.itemsize
+    n = len(govde) // boy
+    kayitlar = govde[:n * boy].view(KAYIT_TIPI)
+    bellek = memoryview(govde)
+    crc = kayitlar["crc"].tolist()
+    gecerli = 0
+    for i in range(n):
+        if zlib.crc32(bellek[i * boy:i * boy + CRC_BAYT]) != crc[i]:
+            break
+        gecerli += 1
+    kayitlar = kayitlar[:gecerli]
+    sutunlar = {ad: kayitlar[ad].copy() for ad in SUTUNLAR}
+    sutunlar["timestamp"] = sutunlar["timestamp"].view("datetime64[ns]")
+    return sutunlar, len(govde) - gecerli * boy
+
+
+def _bos_sutunlar():
+    return {"timestamp": np.empty(0, "datetime64[ns]"), "flow_lpm": np.empty(0), "cumulative_liters": np.empty(0),
+            "ir_state": np.empty(0, np.int8)}
+
+
+class YazmaGunlugu:
+    """Bölümlü, CRC'li, sadece sona eklenen örnek günlüğü.
+
+    kolon (kalici.KolonDeposu) derleme hedefidir. derle() önceki oturumların bölümlerini kurtarır; bu
+    oturumda açılan bölümler ancak derlemeyi_ac() çağrıldıktan sonra (geçmiş analize yüklendikten sonra)
+    derlenir, o zamana kadar diskte bekler. Aksi halde yükleme sırasında kapanan bir bölüm hem depodan
+    okunan geçmişte hem canlı akışta bulunur, örnekleri iki kez sayılırdı. Yazma ve derleme aynı kilitle
+    sıralanır.
+    """
+
+    def __init__(self, dizin, kolon, bolum_bayt=BOLUM_BAYT, bolum_sure=BOLUM_SURE, fsync_sure=FSYNC_SURE):
+        self.dizin = dizin
+        self.kolon = kolon
+        self.bolum_bayt = bolum_bayt
+        self.bolum_sure = bolum_sure
+        self.fsync_sure = fsync_sure
+        os.makedirs(dizin, exist_ok=True)
+        self.yazilan = 0
+        self.derlenen = 0
+        self.atilan_bayt = 0  # Kurtarmada bozuk / yarım bulunup atılan
+        self._dosya = None
+        self._no = None
+        self._acilis = 0.0
+        self._son_fsync = 0.0
+        self._derlenebilir = False
+        self._oturum_ilk = None  # Bu oturumda açılan ilk bölümün numarası
+        self._kilit = threading.Lock()
+
+    def _yol(self, no):
+        return os.path.join(self.dizin, f"{no:08d}{UZANTI}")
+
+    def bolumler(self):
+        """Diskteki bölüm numaraları (artan)"""
+        return sorted(int(ad[:-len(UZANTI)]) for ad in os.listdir(self.dizin)
+                      if ad.endswith(UZANTI) and ad[:-len(UZANTI)].isdigit())
+
+    def bos(self):
+        return len(self.kolon) == 0 and not self.bolumler()
+
+    # --- YAZMA ---
+    def ekle_toplu(self, zaman, debi, toplam, ir):
+        veri = kodla(zaman, debi, toplam, ir)
+        with self._kilit:
+            simdi = time.monotonic()
+            if self._dosya is not None and (self._dosya.tell() >= self.bolum_bayt
+                                            or simdi - self._acilis >= self.bolum_sure):
+                self._kapat_bolum()
+                if self._derlenebilir:
+                    self._derle()
+            if self._dosya is None:
+                self._ac_bolum(simdi)
+            self._dosya.write(veri)
+            self.yazilan += len(zaman)
+            if simdi - self._son_fsync >= self.fsync_sure:
+                os.fsync(self._dosya.fileno())
+                self._son_fsync = simdi
+
+    def _ac_bolum(self, simdi):
+        mevcut = self.bolumler()
+        self._no = max(mevcut[-1] if mevcut else 0, self.kolon.meta["gunluk_son"]) + 1
+        if self._oturum_ilk is None:
+            self._oturum_ilk = self._no
+        self._dosya = open(self._yol(self._no), "xb", buffering=0)
+        self._dosya.write(BASLIK_IMZA + self._no.to_bytes(BASLIK_BAYT - len(BASLIK_IMZA), "little"))
+        self._acilis = self._son_fsync = simdi
+
+    def _kapat_bolum(self):
+        os.fsync(self._dosya.fileno())
+        self._dosya.close()
+        self._dosya = None
+
+    # --- DERLEME / KURTARMA ---
+    def derle(self):
+        """Önceki oturumların bölümlerini sütunsal depoya ekleyip siler; (satır, atılan bayt) döndürür.
+
+        Açılıştaki kurtarma budur: önceki oturumların derlenmemiş bölümleri (çökmede yarım kalan dahil).
+        Bu oturumun bölümlerine (bu süreç yazdıysa) dokunulmaz, bkz. derlemeyi_ac().
+        """
+        with self._kilit:
+            return self._derle(self._oturum_ilk if not self._derlenebilir else None)
+
+    def derlemeyi_ac(self):
+        """Bu oturumun kapanmış bölümlerini derler; bundan sonra kapanan bölümler hemen derlenir.
+
+        Geçmiş (depo) analize yüklendikten sonra çağrılmalıdır; (satır, atılan bayt) döndürür.
+        """
+        with self._kilit:
+            self._derlenebilir = True
+            return self._derle()
+
+    def _derle(self, sinir=None):
+        satir = atilan = 0
+        for no in self.bolumler():
+            if (no == self._no and self._dosya is not None) or (sinir is not None and no >= sinir):
+                continue
+            yol = self._yol(no)
+            sutunlar, bozuk = bolum_oku(yol)
+            if bozuk:
+                print(f"Günlük bölümü {no}: {bozuk} bayt bozuk / yarım kayıt atıldı")
+            if self.kolon.bolum_ekle(no, sutunlar):  # Önceki derlemede eklenip silinemediyse tekrar eklenmez
+                satir += len(sutunlar["timestamp"])
+                atilan += bozuk
+            os.remove(yol)
+        self.derlenen += satir
+        self.atilan_bayt += atilan
+        return satir, atilan
+
+    def kapat(self):
+        """Açık bölümü kapatır; derleme açıldıysa onu da derler (düzgün kapanışta günlük boşalır)"""
+        with self._kilit:
+            if self._dosya is not None:
+                self._kapat_bolum()
+            if self._derlenebilir:
+                self._derle()
+
+    def temizle(self):
+        """Tüm bölümleri ve sütunsal depoyu siler (--yeni-csv)"""
+        with self._kilit:
+            if self._dosya is not None:
+                self._dosya.close()
+                self._dosya = None
+            for no in self.bolumler():
+                os.remove(self._yol(no))
+            self.kolon.temizle()
+
+    def durum_satiri(self):
+        return (f"Günlük: {self.yazilan} yazıldı, {self.derlenen} derlendi, bölüm {len(self.bolumler())}"
+                + (f", {self.atilan_bayt} bayt atıldı" if self.atilan_bayt else ""))
+
+
+def main(argv=None):
+    from su_izleme.kalici import KolonDeposu
+
+    parser = argparse.ArgumentParser(description="Yazma günlüğünü inceler / sütunsal depoya derler")
+    alt = parser.add_subparsers(dest="komut", required=True)
+    durum = alt.add_parser("durum", help="Bölümleri ve geçerli kayıt sayılarını listeler")
+    durum.add_argument("dizin", help="Günlük dizini (ör. su_tuketim.gunluk)")
+    durum.add_argument("--kolon", default="su_tuketim.kolon", help="Derleme hedefi sütunsal depo")
+    durum.add_argument("--derle", action="store_true", help="Bölümleri depoya ekleyip sil (izleme kapalıyken)")
+    args = parser.parse_args(argv)
+
+    kolon = KolonDeposu(args.kolon)
+    gunluk = YazmaGunlugu(args.dizin, kolon)
+    for no in gunluk.bolumler():
+        sutunlar, bozuk = bolum_oku(gunluk._yol(no))
+        zaman = sutunlar["timestamp"]
+        aralik = f"{zaman[0]} - {zaman[-1]}" if len(zaman) else "-"
+        print(f"{no:08d}: {len(zaman)} kayıt, {bozuk} bayt bozuk | {aralik}")
+    print(f"Sütunsal depo: {len(kolon)} satır, son derlenen bölüm {kolon.meta['gunluk_son']}")
+    if args.derle:
+        if not kolon.gunluk_kaynakli:
+            print("Depo henüz CSV'den besleniyor; ilk derleme izleme açılışında (eski CSV aktarıldıktan sonra) yapılır")
+            return
+        t0 = time.perf_counter()
+        satir, atilan = gunluk.derle()
+        print(f"{satir} satır derlendi ({atilan} bayt atıldı, {time.perf_counter() - t0:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
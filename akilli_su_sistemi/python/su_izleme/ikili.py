@@ -0,0 +1,230 @@
+# İKİLİ SERİ PROTOKOL
+# Water2.ino'da IKILI_PROTOKOL 1 yapılırsa her ölçüm metin yerine 15 baytlık sabit bir çerçeve olarak gönderilir:
+#
+#   bayt  0-1   : 0xA5 0x5A          senkron
+#   bayt  2-3   : uint16  sıra no    (her çerçevede 1 artar, kayıp tespiti için)
+#   bayt  4-7   : float32 flowRate   (L/dk)
+#   bayt  8-11  : float32 totalLiters (L)
+#   bayt 12     : uint8   irState
+#   bayt 13-14  : uint16  CRC-16/CCITT-FALSE (bayt 2-12 üzerinden)
+#
+# Tüm alanlar little-endian (AVR ile aynı). Çözme işlemi NumPy ile toplu yapılır.
+# OtomatikCozucu akışın ilk baytlarına bakarak ikili veya eski metin biçimini seçer.
+
+import struct
+
+import numpy as np
+
+from su_izleme.ayristir import satir_ayristir, toplu_ayristir
+
+SENKRON = b"\xa5\x5a"
+CERCEVE = struct.Struct("<2sHffBH")
+BOYUT = CERCEVE.size  # 15
+KAYIT = np.dtype([("senkron", "u1", 2), ("sira", "<u2"), ("flow", "<f4"),
+                  ("total", "<f4"), ("ir", "u1"), ("crc", "<u2")])
+
+
+def _crc_tablosu():
+    tablo = np.zeros(256, dtype=np.uint16)
+    for i in range(256):
+        crc = i << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        tablo[i] = crc & 0xFFFF
+    return tablo
+
+
+CRC_TABLO = _crc_tablosu()
+
+
+def crc16(veri):
+    """CRC-16/CCITT-FALSE (başlangıç 0xFFFF, polinom 0x1021)"""
+    crc = 0xFFFF
+    for b in veri:
+        crc = ((crc << 8) & 0xFFFF) ^ int(CRC_TABLO[((crc >> 8) ^ b) & 0xFF])
+    return crc
+
+
+def crc16_toplu(matris):
+    """(n, k) uint8 matrisinin her satırının CRC'sini vektörel olarak hesaplar"""
+    crc = np.full(len(matris), 0xFFFF, dtype=np.uint16)
+    for sutun in matris.T:
+        crc = (crc << 8) ^ CRC_TABLO[(crc >> 8) ^ sutun]
+    return crc
+
+
+def cerceve_olustur(sira, flow, total, ir):
+    """Tek bir çerçeve üretir (Arduino tarafındaki sendFrame'in Python karşılığı)"""
+    govde = struct.pack("<HffB", sira & 0xFFFF, flow, total, ir)
+    return SENKRON + govde + struct.pack("<H", crc16(govde))
+
+
+def cerceveler_olustur(sira, flow, total, ir):
+    """Dizilerden toplu çerçeve üretir, (n, 15) uint8 matris döndürür (simülatör için)"""
+    kayitlar = np.zeros(len(flow), dtype=KAYIT)
+    kayitlar["senkron"] = (0xA5, 0x5A)
+    kayitlar["sira"] = np.asarray(sira) & 0xFFFF
+    kayitlar["flow"] = flow
+    kayitlar["total"] = total
+    kayitlar["ir"] = ir
+    matris = kayitlar.view(np.uint8).reshape(-1, BOYUT)
+    kayitlar["crc"] = crc16_toplu(matris[:, 2:13])
+    return matris
+
+
+class IkiliCozucu:
+    """Parça parça gelen baytlardan geçerli çerçeveleri toplu olarak ayıklar.
+
+    besle() her çağrıda (flow, cumulative, ir) dizilerini döndürür; tamamlanmamış
+    çerçeve bir sonraki çağrıya saklanır. Sıra numarasındaki atlamalar 'kayip' sayacına eklenir.
+    """
+
+    def __init__(self):
+        self._kalan = b""
+        self._son_sira = None
+        self.cerceve = 0
+        self.kayip = 0
+        self.atlanan_bayt = 0  # Senkron/CRC tutmadığı için atlanan baytlar
+        self.hatali = 0  # CRC'si tutmayan (bozuk) çerçeve sayısı
+
+    def besle(self, veri):
+        tampon = self._kalan + veri
+        b = np.frombuffer(tampon, dtype=np.uint8)
+        son_baslangic = len(b) - BOYUT
+        if son_baslangic < 0:
+            self._kalan = tampon
+            return _bos()
+
+        adaylar = np.flatnonzero((b[:-1] == 0xA5) & (b[1:] == 0x5A))
+        tam = adaylar[adaylar <= son_baslangic]
+        pencere = np.lib.stride_tricks.sliding_window_view(b, BOYUT)[tam]
+        kayitlar = np.ascontiguousarray(pencere).view(KAYIT).ravel()
+        gecerli = crc16_toplu(pencere[:, 2:13]) == kayitlar["crc"]
+        konumlar, kayitlar = tam[gecerli], kayitlar[gecerli]
+
+        # Çakışan çerçeveler (veri içinde tesadüfen geçen senkron) elenir
+        if len(konumlar) > 1 and (np.diff(konumlar) < BOYUT).any():
+            sec, bitis = [], -1
+            for i, k in enumerate(konumlar.tolist()):
+                if k >= bitis:
+                    sec.append(i)
+                    bitis = k + BOYUT
+            konumlar, kayitlar = konumlar[sec], kayitlar[sec]
+
+        # Geçerli bir çerçevenin içine denk gelmeyen başarısız adaylar bozuk çerçevedir
+        # (veri alanlarında tesadüfen geçen A5 5A sayılmaz)
+        basarisiz = tam[~gecerli]
+        if len(basarisiz):
+            icinde = np.zeros(len(basarisiz), dtype=bool)
+            if len(konumlar):
+                onceki = np.searchsorted(konumlar, basarisiz, side="right") - 1
+                icinde = (onceki >= 0) & (basarisiz < konumlar[onceki.clip(min=0)] + BOYUT)
+            self.hatali += int((~icinde).sum())
+
+        if len(konumlar):
+            son = int(konumlar[-1]) + BOYUT
+            self.atlanan_bayt += son - len(konumlar) * BOYUT
+            # Son geçerli çerçeveden sonra yarım kalmış olabilecek kısım saklanır
+            kalan = tampon[son:]
+        else:
+            kalan = tampon
+        # Kalan kısmın başındaki, çerçeve başlangıcı olamayacak baytlar atılır
+        sakla = max(len(kalan) - (BOYUT - 1), 0)
+        ilk_aday = kalan.find(SENKRON, 0, sakla) if sakla else -1
+        if len(kalan) >= BOYUT:
+            kes = ilk_aday if ilk_aday >= 0 else sakla
+            self.atlanan_bayt += kes
+            kalan = kalan[kes:]
+        self._kalan = kalan
+
+        sira = kayitlar["sira"].astype(np.int64)
+        if len(sira):
+            onceki = np.concatenate(([self._son_sira], sira[:-1])) if self._son_sira is not None else sira[:-1]
+            sonraki = sira if self._son_sira is not None else sira[1:]
+            self.kayip += int((((sonraki - onceki) % 65536) - 1).clip(min=0).sum())
+            self._son_sira = int(sira[-1])
+            self.cerceve += len(sira)
+
+        return (np.round(kayitlar["flow"].astype(np.float64), 2),
+                np.round(kayitlar["total"].astype(np.float64), 2),
+                kayitlar["ir"].astype(np.int8))
+
+
+class MetinCozucu:
+    """Eski "flow,cumulative,ir" metin biçimi için parça tabanlı çözücü"""
+
+    MAKS_SATIR = 4096  # Satır sonu gelmeden bu kadar bayt birikirse çöp sayılıp atılır
+
+    def __init__(self):
+        self._kalan = b""
+        self.hatali = 0
+        self.kayip = 0
+
+    def besle(self, veri):
+        flow, cumulative, ir, bozuk, self._kalan = toplu_ayristir(self._kalan + veri)
+        if len(self._kalan) > self.MAKS_SATIR:
+            self._kalan = b""
+            self.hatali += 1
+        if bozuk.any():
+            self.hatali += int(bozuk.sum())
+            flow, cumulative, ir = flow[~bozuk], cumulative[~bozuk], ir[~bozuk]
+        return flow, cumulative, ir.astype(np.int8)
+
+
+class OtomatikCozucu:
+    """Akışın biçimini ilk baytlardan algılar: iki ardışık geçerli ikili çerçeve varsa ikili,
+    iki geçerli metin satırı varsa metin. Algılanana kadar gelen baytlar bekletilir;
+    ALGILAMA_BAYT kadar veride karar verilemezse eski metin biçimi varsayılır."""
+
+    ALGILAMA_BAYT = 1024
+
+    def __init__(self):
+        self.cozucu = None
+        self._bekleyen = b""
+
+    @property
+    def mod(self):
+        if self.cozucu is None:
+            return "algilaniyor"
+        return "ikili" if isinstance(self.cozucu, IkiliCozucu) else "metin"
+
+    @property
+    def hatali(self):
+        return self.cozucu.hatali if self.cozucu else 0
+
+    @property
+    def kayip(self):
+        return self.cozucu.kayip if self.cozucu else 0
+
+    def _algila(self, tampon):
+        b = tampon
+        i = b.find(SENKRON)
+        while 0 <= i <= len(b) - 2 * BOYUT:
+            ilk, ikinci = b[i:i + BOYUT], b[i + BOYUT:i + 2 * BOYUT]
+            if all(c[:2] == SENKRON and crc16(c[2:13]) == struct.unpack_from("<H", c, 13)[0]
+                   for c in (ilk, ikinci)):
+                return IkiliCozucu()
+            i = b.find(SENKRON, i + 1)
+        # İkili çerçevelerde de 0x0A baytı geçebilir; satırın ayrıştırılabilmesi gerekir
+        gecerli_satir = 0
+        for satir in b.split(b"\n")[:-1]:
+            try:
+                gecerli_satir += satir_ayristir(satir) is not None
+            except ValueError:
+                pass
+        if gecerli_satir >= 2 or len(b) >= self.ALGILAMA_BAYT:
+            return MetinCozucu()
+        return None
+
+    def besle(self, veri):
+        if self.cozucu is None:
+            self._bekleyen += veri
+            self.cozucu = self._algila(self._bekleyen)
+            if self.cozucu is None:
+                return _bos()
+            veri, self._bekleyen = self._bekleyen, b""
+        return self.cozucu.besle(veri)
+
+
+def _bos():
+    return np.empty(0), np.empty(0), np.empty(0, dtype=np.int8)
@@ -0,0 +1,594 @@
+# CANLI İZLEME UYGULAMASI
+# Water1/2/3.py eskiden aynı okuma-kayıt-analiz-çizim döngüsünün birbirinden ayrışmış üç kopyasıydı
+# (biri CSV'yi her açılışta siliyor, biri analiz yapmıyor; bir kopyadaki düzeltme ötekilere
+# taşınmıyordu). Hepsi artık bu modülün ön ayarlarıdır:
+#
+#   kaynak (seri port) --> BoruHatti --> GunlukKayit su_tuketim.gunluk (CRC'li yazma günlüğü, bkz. gunluk.py)
+#                                    --> CSVKayit  su_tuketim.csv (tamponlu; günlük açıkken dışa aktarım kopyası)
+#                                    --> Analiz    depo, artımlı analiz, özetler, anomali, haftalık profil, ömür toplamı
+#                                    ~~> Cizim     ek aşama: ana döngünün saniyelik isteğiyle (zaman kısıtlı)
+#
+# Aşamalar islev(liste) arayüzlü sınıflardır; izle() ayarlara göre hangilerinin kurulacağını seçer,
+# tekrar.py aynı Analiz aşamasını kayıtlı geçmişle besler. Geçmiş seri okuma başladıktan sonra arka
+# planda yüklenir; yükleme bitene kadar aşamalar bekler (örnekler kuyrukta kalır). Günlük aşaması
+# beklemez: çökmede kaybolmaması gereken örnekler geçmiş yüklenirken de diske yazılır.
+# --http PORT: Analiz'in bellekteki durumu ve özetleri sunucu.py ile JSON / Prometheus olarak sunulur.
+# Kullanım:  python -m su_izleme monitor --port COM6 [--paneller debi,toplam] [--zamanlama] [--metrik]
+
+import argparse
+import atexit
+import os
+import threading
+import time
+
+import numpy as np
+
+from su_izleme import SUTUNLAR
+from su_izleme.acilis import HAZIR_ZAMAN_ASIMI
+from su_izleme.anomali import SUREKLI_DK, AnomaliDedektoru
+from su_izleme.boru_hatti import Asama, BoruHatti
+from su_izleme.cizim import PANELLER, Cizici, ozet_ciz, panel_listesi
+from su_izleme.depo import VeriDeposu
+from su_izleme.gunluk import YazmaGunlugu
+from su_izleme.ikili import OtomatikCozucu
+from su_izleme.kalici import KolonDeposu
+from su_izleme.metrik import Metrikler
+from su_izleme.normallestir import SayacNormallestirici
+from su_izleme.onbellek import SurumluOnbellek
+from su_izleme.ozet import KATMANLAR, Ozetleyici
+from su_izleme.profil import HAFTA_SAAT, SAPMA_ESIGI, HaftalikProfil
+from su_izleme.tuketim import ArtimliAnaliz
+from su_izleme.yazici import TamponluCSVYazici
+
+RAPOR_ARALIGI = 50  # Her 50 kayıtta analiz raporu yazdır
+ANLIK_ARALIGI = 10  # Her 10 kayıtta son örneği yazdır
+DEBI_ESIGI = 3.0  # Optimizasyon eşiği (L/dk cinsinden)
+CSV_TAMPON_SATIR = 50  # Bu kadar satır birikince CSV'ye toplu yazılır
+CSV_TAMPON_SURE = 5.0  # En eski satır bu kadar saniye bekleyince yazılır (çökmede en fazla bu kadar kayıp)
+KUYRUK_BOYU = 4096  # Okuyucu ile aşamalar arasındaki kuyrukların kapasitesi (örnek)
+CIZIM_ARALIGI = 10.0  # Grafik en fazla bu kadar saniyede bir yenilenir
+CIZIM_DPI = 100  # Ekran için yeterli; çizim süresi dpi'nin karesiyle büyür
+UZUN_DONEM_GUN = 90  # Çıkışta çizilen uzun dönem grafiğinin kapsadığı gün sayısı
+
+
+def optimizasyon_analizi(analiz, total, dedektor, sayac, esik=DEBI_ESIGI, profil_satiri=None):
+    """Tüketim optimizasyonu analizi yapar ve rapor döndürür.
+
+    Değerler ArtimliAnaliz'de hazır tutulduğu için geçmişin boyutundan bağımsızdır.
+    total: sayaç sıfırlamaları düzeltilmiş ömür boyu toplam (L)
+    profil_satiri: verilirse anomali satırının altına eklenir (haftalık profile göre durum)
+    """
+    if analiz.kayit_sayisi < 10:
+        return "Yeterli veri yok. Analiz için en az 10 kayıt gerekli."
+
+    ort_debi = analiz.ortalama_debi()
+    if ort_debi > esik:
+        debi_uyari = f"Yüksek debi: Ortalama {ort_debi} L/dk (Eşik {esik} L/dk)"
+    else:
+        debi_uyari = f"Debi normal: Ortalama {ort_debi} L/dk"
+
+    waste = analiz.gereksiz_tuketim()
+    if waste > 10:
+        waste_uyari = f"Yüksek gereksiz tüketim: {waste} L"
+    elif waste > 0:
+        waste_uyari = f"Orta gereksiz tüketim: {waste} L"
+    else:
+        waste_uyari = "Gereksiz tüketim yok"
+
+    if dedektor.alarmlar:
+        anomali_uyari = f"Anomali uyarısı: {dedektor.alarm_sayisi} adet (son: {dedektor.alarmlar[-1]})"
+    else:
+        anomali_uyari = "Anomali yok"
+    if profil_satiri:
+        anomali_uyari += "\n" + profil_satiri
+
+    rapor = f"""
+SU TÜKETİM ANALİZ RAPORU
+--------------------------
+Toplam Tüketim: {total:.1f} L
+{debi_uyari}
+{waste_uyari}
+{anomali_uyari}
+Sayaç sıfırlanması: {sayac.sifirlama_sayisi} | Veri boşluğu: {sayac.bosluk_sayisi} ({sayac.bosluk_s / 60:.0f} dk)
+Toplam Kayıt: {analiz.kayit_sayisi} adet
+--------------------------
+"""
+    return rapor
+
+
+def anlik_gorunum(df, omur_toplam):
+    """En son kaydı gösterir (toplam: sayaç sıfırlamaları düzeltilmiş ömür boyu toplam)"""
+    if df.empty:
+        return "Henüz veri yok"
+
+    _, flow, cumulative, ir = df.son()
+    return f"Anlık Debi: {flow} L/dk | Toplam: {omur_toplam:.2f} L | IR: {'Var' if ir == 1 else 'Yok'}"
+
+
+# -----------------------------
+# AŞAMALAR
+# -----------------------------
+
+class CSVKayit:
+    """Kayıt aşaması: örnekleri CSV tamponuna yazar (diske toplu halde)"""
+
+    ad = "kayit"
+
+    def __init__(self, yol, max_satir=CSV_TAMPON_SATIR, max_sure=CSV_TAMPON_SURE):
+        self.yol = yol
+        self.yazici = TamponluCSVYazici(yol, basliklar=SUTUNLAR, max_satir=max_satir, max_sure=max_sure)
+        atexit.register(self.yazici.kapat)  # Beklenmedik çıkışta da tampon boşaltılsın
+
+    def __call__(self, ornekler):
+        for ts, flow, cumulative, ir in ornekler:
+            try:
+                self.yazici.yaz([ts, flow, cumulative, ir])
+            except Exception as e:
+                print(f"CSV kaydetme hatası: {e}")
+
+    def kapat(self):
+        self.yazici.kapat()
+
+
+class GunlukKayit:
+    """Günlük aşaması: örnekleri parti başına tek yazımla yazma günlüğüne ekler"""
+
+    ad = "gunluk"
+
+    def __init__(self, gunluk):
+        self.gunluk = gunluk
+        atexit.register(gunluk.kapat)
+
+    def __call__(self, ornekler):
+        try:
+            self.gunluk.ekle_toplu(*zip(*ornekler))
+        except Exception as e:
+            print(f"Günlük yazma hatası: {e}")
+
+    def kapat(self):
+        self.gunluk.kapat()
+
+
+class Analiz:
+    """Analiz aşaması: örnekleri depoya, artımlı analize, özet katmanlarına, anomali dedektörüne,
+    haftalık profile ve sayaç normalleştiriciye ekler.
+
+    Her parti önce haftalık profile göre skorlanır, sonra profile katılır: son örneğin skoru son_durum'da
+    ("sapma"), kapanan saatlerden tüketimi olağanın sapma_esigi sapma üzerinde olanlar uyarı olarak verilir.
+
+    Her anlik_araligi kayıtta son örneği, her rapor_araligi kayıtta raporu yazdırır (0 = kapalı) ve
+    kalıcı durumları (özetler, sayaç kontrol noktası) diske yazar. durum verilirse raporun altına
+    durum() satırı eklenir (ör. BoruHatti.durum_satiri); kanca verilirse rapor süresi "rapor" adıyla bildirilir.
+
+    Başka iş parçacıkları (ör. sunucu.SorguSunucusu) için: son_durum her partiden sonra yeni bir sözlükle
+    değiştirilir (kilitsiz okunur); özet katmanları 'kilit' tutularak okunmalıdır. rapor() ve anlik()
+    sonuçları 'onbellek'te (onbellek.SurumluOnbellek) tutulur: her parti sonunda veri sürümü ilerletilir
+    ve sadece partinin etkilediği zaman aralıklarının sonuçları silinir.
+    """
+
+    ad = "analiz"
+
+    def __init__(self, pencere=None, ozet_dizini=None, sayac_dosyasi=None, esik=DEBI_ESIGI,
+                 rapor_araligi=RAPOR_ARALIGI, anlik_araligi=ANLIK_ARALIGI, surekli_dk=SUREKLI_DK, durum=None,
+                 kanca=None, profil_dosyasi=None, sapma_esigi=SAPMA_ESIGI):
+        self.depo = VeriDeposu(pencere=pencere)  # Önceden ayrılmış sütunsal depo (DataFrame yerine)
+        self.analiz = ArtimliAnaliz()  # Ortalama debi / toplam / gereksiz tüketim, örnek başına güncellenir
+        self.ozet = Ozetleyici(ozet_dizini)  # Örnekler geldikçe güncellenir, raporlarda diske yazılır
+        self.dedektor = AnomaliDedektoru(surekli_dk=surekli_dk)  # Sızıntı/anomali uyarıları örnek geldiği anda
+        self.profil = HaftalikProfil(profil_dosyasi)  # Haftanın saatine göre olağan debi / saatlik tüketim
+        self.sapma_esigi = sapma_esigi
+        self.son_sapma = float("nan")
+        # Arduino yeniden başlayınca cumulative_liters 0'dan sayar; toplam tüketim ham değerden değil buradan okunur
+        self.sayac = SayacNormallestirici(sayac_dosyasi)
+        self.esik = esik
+        self.rapor_araligi = rapor_araligi
+        self.anlik_araligi = anlik_araligi
+        self.durum = durum
+        self.kanca = kanca
+        self.kayit_sayaci = 0
+        self.kilit = threading.Lock()  # Özet katmanlarına eşzamanlı okuma için
+        self.son_durum = None
+        self.onbellek = SurumluOnbellek()
+
+    def temizle(self):
+        """Kalıcı durumları sıfırlar (CSV yeniden oluşturulduğunda)"""
+        self.ozet.temizle()
+        self.profil.temizle()
+        self.sayac.temizle()
+        self.onbellek.temizle()
+
+    def gecmis(self, gecmis):
+        """Sütun sözlüğü halindeki geçmişi tek seferde hesaplara katar"""
+        zaman, debi, toplam, ir = (gecmis[ad] for ad in SUTUNLAR)
+        self.depo.ekle_toplu(zaman, debi, toplam, ir)
+        self.analiz.toplu_guncelle(zaman, debi, toplam, ir)
+        # Özetler sadece henüz özetlenmemiş satırlarla tamamlanır (ilk açılışta tüm geçmişten kurulur)
+        with self.kilit:
+            self.ozet.yakala(zaman, debi, toplam, ir)
+        # Profil de sadece son eklenen zamandan sonrasıyla güncellenir
+        self.profil.ornek_ekle(zaman, debi)
+        self.profil.saat_ekle(self.profil.yeni_saatler(self.ozet))
+        # Ömür boyu toplamın ofseti kontrol noktasından okunur, sadece yeni satırlar taranır
+        self.sayac.yakala(zaman, toplam)
+        self.kaydet()
+        self.kayit_sayaci = len(self.depo)
+        if len(zaman):
+            self.son_durum = self._durum_ozeti(zaman[-1], debi[-1], toplam[-1], ir[-1])
+            self._surum_ilerlet(len(zaman), zaman[0], zaman[-1])
+
+    def __call__(self, ornekler):
+        zaman, debi, toplam, ir = zip(*ornekler)
+        with self.kilit:
+            self.ozet.ekle_toplu(zaman, debi, toplam, ir)  # Özet katmanları parti başına tek seferde güncellenir
+        alarmlar = self.dedektor.toplu_guncelle(zaman, debi, ir)
+        # Haftalık profil: önce skorlanır, sonra profile katılır (örnek kendisiyle karşılaştırılmasın)
+        self.son_sapma = float(self.profil.ornek_skoru(zaman[-1:], debi[-1:])[0])
+        self.profil.ornek_ekle(zaman, debi)
+        saatler = self.profil.yeni_saatler(self.ozet)
+        if len(saatler):
+            profil_alarmlari = self.profil.saat_alarmlari(saatler, self.sapma_esigi)
+            self.profil.saat_ekle(saatler)
+            self.dedektor.ekle(profil_alarmlari)
+            alarmlar = alarmlar + profil_alarmlari
+        for alarm in alarmlar:
+            print(f"\n!!! UYARI {alarm}\n")
+        omur = self.sayac.toplu(zaman, toplam).tolist()  # Örnek başına ömür boyu toplam
+        for (ts, flow, cumulative, ir), omur_toplam in zip(ornekler, omur):
+            self.depo.ekle(ts, flow, cumulative, ir)
+            self.analiz.guncelle(ts, flow, cumulative, ir)
+            self.kayit_sayaci += 1
+
+            if self.anlik_araligi and self.kayit_sayaci % self.anlik_araligi == 0:
+                print(anlik_gorunum(self.depo, omur_toplam))
+
+            if self.rapor_araligi and self.kayit_sayaci % self.rapor_araligi == 0:
+                t0 = time.perf_counter()
+                print("\n" + "=" * 40)
+                print(f"Analiz zamanı! (Kayıt: {self.kayit_sayaci})")
+                print("=" * 40)
+
+                print(self.rapor(omur_toplam))
+                if self.durum is not None:
+                    print(self.durum())
+                self.kaydet()
+                print("Analiz tamamlandı. Veri kaydı devam ediyor...")
+                print("=" * 40 + "\n")
+                if self.kanca is not None:
+                    self.kanca("rapor", 1, time.perf_counter() - t0)
+        self.son_durum = self._durum_ozeti(*ornekler[-1])
+        self._surum_ilerlet(len(ornekler), min(zaman), max(zaman))
+
+    def _surum_ilerlet(self, adet, ilk, son):
+        # Örnek, başlangıcı kendisinden önce olan özet kovalarını (en uzunu 1 gün) da değiştirir
+        genislik_ns = max(KATMANLAR.values()) * 10**9
+        ilk_ns = int(np.datetime64(ilk, "ns").astype(np.int64))
+        self.onbellek.ilerlet(adet, ilk_ns - ilk_ns % genislik_ns, son)
+
+    def _durum_ozeti(self, ts, flow, cumulative, ir):
+        """Son örnek ve yuvarlanmış toplamlar (JSON'a yazılabilir türlerle)"""
+        son_alarm = self.dedektor.alarmlar[-1] if self.dedektor.alarmlar else None
+        return {
+            "zaman": str(np.datetime64(ts, "ms")),
+            "flow_lpm": float(flow),
+            "cumulative_liters": float(cumulative),
+            "ir_state": int(ir),
+            "omur_toplam": round(self.sayac.omur_toplam, 2),
+            "kayit": self.analiz.kayit_sayisi,
+            "ortalama_debi": self.analiz.ortalama_debi(),
+            "gereksiz": self.analiz.gereksiz_tuketim(),
+            "sifirlama": self.sayac.sifirlama_sayisi,
+            "bosluk": self.sayac.bosluk_sayisi,
+            "anomali": self.dedektor.alarm_sayisi,
+            "son_anomali": str(son_alarm) if son_alarm else None,
+            "sapma": round(self.son_sapma, 2) if np.isfinite(self.son_sapma) else None,
+        }
+
+    def rapor(self, omur_toplam=None):
+        """Optimizasyon raporu; omur_toplam verilmezse (son örneğe göre) önbellekten"""
+        if omur_toplam is None:
+            return self.onbellek.al(("rapor",), lambda: self.rapor(self.sayac.omur_toplam))
+        return optimizasyon_analizi(self.analiz, omur_toplam, self.dedektor, self.sayac, self.esik,
+                                    self.profil_satiri())
+
+    def anlik(self):
+        """Son örneğin anlık görünümü (önbellekten)"""
+        return self.onbellek.al(("anlik",), lambda: anlik_gorunum(self.depo, self.sayac.omur_toplam))
+
+    def profil_satiri(self):
+        """Profilin hazır kova sayısı ve bu saatin olağan debisine göre son örnek"""
+        hazir = self.profil.hazir("ornek")
+        if not hazir or self.depo.empty:
+            return f"Haftalık profil: {hazir}/{HAFTA_SAAT} saat hazır"
+        ts, flow, _, _ = self.depo.son()
+        ort, sapma = self.profil.olagan("ornek", np.datetime64(ts, "ns").astype(np.int64))
+        if not np.isfinite(ort):
+            return f"Haftalık profil: {hazir}/{HAFTA_SAAT} saat hazır (bu saat için henüz yetersiz)"
+        return (f"Haftalık profil: {hazir}/{HAFTA_SAAT} saat hazır | Bu saatin olağan debisi {ort:.2f} ± {sapma:.2f} "
+                f"L/dk, anlık {flow} L/dk (z={(flow - ort) / sapma:.1f})")
+
+    def kaydet(self):
+        with self.kilit:
+            self.ozet.kaydet()
+        self.profil.kaydet()
+        self.sayac.kaydet()
+
+
+class Cizim:
+    """Çizim aşaması: biriken grafik isteklerine karşılık tek bir çizim yapar (Cizici zaman kısıtlı)"""
+
+    ad = "cizim"
+
+    def __init__(self, depo, cizici):
+        self.depo = depo
+        self.cizici = cizici
+
+    def __call__(self, istekler=None):
+        self.ciz()
+
+    def ciz(self, zorla=False):
+        if self.depo.empty:
+            return
+        try:
+            if self.cizici.ciz(self.depo, zorla=zorla):
+                print(f"Grafik {self.cizici.dosya} dosyasına kaydedildi ({self.cizici.son_sure * 1000:.0f} ms).")
+        except Exception as e:
+            print(f"KRİTİK GRAFİK OLUŞTURMA HATASI: {e}")
+
+    def kapat(self):
+        self.cizici.kapat()
+
+
+def _bekleyen(islev, olay):
+    """islev'i olay kurulana kadar bekleten sarmalayıcı (geçmiş yüklenirken gelen örnekler için)"""
+
+    def sarmal(toplu):
+        olay.wait()
+        islev(toplu)
+
+    return sarmal
+
+
+# -----------------------------
+# UYGULAMA
+# -----------------------------
+
+def izle(args):
+    """Seri porttan okuyup seçilen aşamaları çalıştırır; Ctrl+C ile kapanır"""
+    import serial
+
+    analiz = Analiz(pencere=args.pencere, ozet_dizini=args.ozet, sayac_dosyasi=args.sayac, esik=args.esik,
+                    rapor_araligi=args.rapor_araligi, anlik_araligi=args.anlik_araligi,
+                    surekli_dk=args.surekli_akis_dk, profil_dosyasi=args.profil or None,
+                    sapma_esigi=args.sapma_esigi)
+    kolon = KolonDeposu(args.kolon)
+    cizim = None
+    if args.cizim_dosyasi:
+        # Kalıcı figür: her çizimde sadece çizgi verisi güncellenir
+        cizim = Cizim(analiz.depo, Cizici(args.cizim_dosyasi, paneller=args.paneller,
+                                          boyut=(12, 4 + 2 * len(args.paneller)), dpi=args.dpi,
+                                          min_aralik=args.cizim_araligi))
+
+    # Geçmiş yükleme: seri okuma başladıktan sonra arka planda yüklenir
+    gecmis_hazir = threading.Event()
+    gunluk = YazmaGunlugu(args.gunluk, kolon) if args.gunluk else None
+    if args.yeni_csv and os.path.exists(args.csv):
+        os.remove(args.csv)  # Eski kayıtlar silinir (sütunsal depo ilk eşitlemede CSV'nin değiştiğini görür)
+    yeni = not os.path.exists(args.csv)
+    if gunluk is not None:
+        # Günlük açıkken geçmiş günlük + sütunsal depodadır; CSV silinmiş olsa da oradan yüklenir
+        if args.yeni_csv:
+            gunluk.temizle()
+        yeni = args.yeni_csv or (yeni and gunluk.bos())
+    if yeni:
+        print("Yeni CSV dosyası oluşturuldu.")
+        analiz.temizle()  # Eski CSV'nin özetleri ve sayaç durumu yeni dosyaya taşınmasın
+        if gunluk is not None:
+            kolon.gunluge_gec()
+            gunluk.derlemeyi_ac()  # Kurtarılacak / yüklenecek geçmiş yok; kapanan bölümler hemen derlenir
+        gecmis_hazir.set()
+    kayit = CSVKayit(args.csv)
+
+    # --- SERİ PORT BAĞLANTISI ---
+    try:
+        # Sabit bekleme yok: Arduino'nun HAZIR satırı (veya ilk örneği) boru hattında yakalanır
+        ser = serial.Serial(args.port, args.baud, timeout=1)
+        print(f"Seri port bağlantısı başarılı: {args.port}")
+    except Exception as e:
+        print(f"Seri port hatası: {e}")
+        kayit.kapat()
+        raise SystemExit(1)
+
+    def gecmis_yukle():
+        try:
+            t0 = time.monotonic()
+            # Sütunsal depo CSV ile eşitlenir: sadece son eşitlemeden sonra eklenen satırlar ayrıştırılır,
+            # geçmişin geri kalanı ikili dosyalardan tek seferde okunur. Günlük açıksa CSV sadece ilk
+            # geçişte aktarılır; sonra yalnızca önceki oturumların derlenmemiş günlük bölümleri okunur.
+            # Tek süreç: seri okuma sürerken işçi süreç başlatılmaz (büyük aktarım için: kalici donustur --is)
+            gunlukten = gunluk is not None and kolon.gunluk_kaynakli
+            yeni_satir, hatali_satir = (0, 0) if gunlukten else kolon.csv_esitle(args.csv, is_sayisi=1)
+            kaynak = f"CSV'den yeni aktarılan: {yeni_satir}, hatalı satır: {hatali_satir}"
+            if gunluk is not None:
+                if not kolon.gunluk_kaynakli:
+                    kolon.gunluge_gec()
+                kurtarilan, atilan = gunluk.derle()
+                kaynak = f"günlükten kurtarılan: {kurtarilan}" + (f", {atilan} bayt bozuk kayıt atıldı" if atilan else "")
+                if yeni_satir or hatali_satir:
+                    kaynak = f"CSV'den ilk aktarım: {yeni_satir} ({hatali_satir} hatalı), " + kaynak
+            if gunlukten:
+                # Önceki oturumların bölümleri derlendikten sonra: CSV hâlâ ilerideyse (ör. günlüksüz bir
+                # oturum yazdıysa) csv_esitle uyarır
+                kolon.csv_esitle(args.csv, is_sayisi=1)
+            analiz.gecmis(kolon.yukle())
+            if gunluk is not None:
+                # Bu oturumun bölümleri ancak şimdi depoya girer: yükleme sürerken kapananlar canlı akışta
+                # zaten vardır, depodan okunan geçmişe de girselerdi iki kez sayılırlardı
+                gunluk.derlemeyi_ac()
+            print(f"Mevcut veriler yüklendi ({time.monotonic() - t0:.1f} s). Kayıt sayısı: {len(analiz.depo)} "
+                  f"({kaynak})")
+        except Exception as e:
+            print(f"KRİTİK HATA: Geçmiş yüklenemedi: {e}. Programı sonlandırın ve CSV / günlük dosyalarını kontrol edin.")
+            os._exit(1)  # Ana iş parçacığı dışından; bu oturumun örnekleri en fazla günlükte
+        gecmis_hazir.set()
+
+    print("\n" + "=" * 50)
+    print("AKILLI SU TÜKETİM İZLEME SİSTEMİ")
+    print("=" * 50)
+    print("Veri okuma başlatılıyor... (Ctrl+C ile durdur)")
+
+    # Okuyucu iş parçacığı satırları kuyruğa atar; kayıt ve analiz ayrı aşamalarda yürür.
+    # Grafik aşaması tek elemanlık kuyruk kullanır: çizim sürerken gelen istekler düşürülür.
+    # Ana döngü her saniye çizim ister; Cizici min_aralik dolmadıysa isteği atlar.
+    asamalar = [Asama(a.ad, _bekleyen(a, gecmis_hazir), kuyruk_boyu=KUYRUK_BOYU) for a in (kayit, analiz)]
+    if gunluk is not None:
+        asamalar.insert(0, Asama("gunluk", GunlukKayit(gunluk), kuyruk_boyu=KUYRUK_BOYU))
+    ek_asamalar = []
+    if cizim is not None:
+        def cizim_asamasi(istekler):
+            if gecmis_hazir.is_set():  # Yarım yüklenmiş geçmiş çizilmez
+                cizim(istekler)
+
+        ek_asamalar.append(Asama(cizim.ad, cizim_asamasi, kuyruk_boyu=1, dusur=True))
+    # Metrikler açıksa aşama, ayrıştırma ve rapor süreleri histogramlara yazılır (kapalıyken kanca yok)
+    metrikler = Metrikler() if args.metrik else None
+    kanca = metrikler.kanca if metrikler else None
+    analiz.kanca = kanca
+    boru = BoruHatti(ser, asamalar, ek_asamalar=ek_asamalar, ham_kuyruk_boyu=KUYRUK_BOYU,
+                     cozucu=OtomatikCozucu(),  # Metin veya ikili (IKILI_PROTOKOL 1) akış otomatik algılanır
+                     kanca=kanca)
+
+    def metrik_yaz():
+        goruntu = metrikler.goruntu(boru)
+        print(Metrikler.satir(goruntu))
+        if args.metrik_dosyasi:
+            try:
+                Metrikler.yaz(goruntu, args.metrik_dosyasi)
+            except OSError as e:
+                print(f"Metrik dosyası yazılamadı: {e}")
+    if args.zamanlama:
+        analiz.durum = lambda: boru.durum_satiri() + "\n" + boru.zamanlama_satiri()
+    else:
+        analiz.durum = boru.durum_satiri
+
+    sunucu = None
+    if args.http is not None:
+        from su_izleme.sunucu import SorguSunucusu
+
+        sunucu = SorguSunucusu(analiz, boru=boru, metrikler=metrikler, adres=args.http_adres, port=args.http)
+        try:
+            print(f"Sorgu sunucusu: http://{args.http_adres}:{sunucu.baslat()}/")
+        except OSError as e:
+            print(f"Sorgu sunucusu açılamadı: {e}")
+            sunucu = None
+
+    # Geçmiş arka planda yüklenir; okuma beklemeden başlar
+    if not gecmis_hazir.is_set():
+        threading.Thread(target=gecmis_yukle, name="gecmis-yukle", daemon=True).start()
+
+    try:
+        boru.baslat()
+        if boru.hazir_bekle(HAZIR_ZAMAN_ASIMI):
+            print(f"Arduino hazır ({boru.hazir_suresi:.1f} s).")
+        else:
+            print(f"Arduino'dan {HAZIR_ZAMAN_ASIMI:.0f} s içinde veri gelmedi, bekleniyor...")
+        son_metrik = time.monotonic()
+        while True:
+            time.sleep(1)
+            for asama in ek_asamalar:
+                asama.gonder(None)  # Grafik ayrı iş parçacığında çizilir, seri okuma beklemez
+            if metrikler and time.monotonic() - son_metrik >= args.metrik_araligi:
+                son_metrik = time.monotonic()
+                metrik_yaz()
+
+    except KeyboardInterrupt:
+        print("\nProgram sonlandırılıyor...")
+        duzgun = True
+    except Exception as e:
+        print(f"Kritik hata: {e}")
+        duzgun = False
+    # Kapanış iki yolda da aynıdır; çökmede rapor ve grafikler atlanır
+    if sunucu is not None:
+        sunucu.durdur()
+    gecmis_hazir.wait()  # Özetler ve sayaç yarım yüklenmiş geçmişle yazılmasın
+    boru.durdur()  # Kuyruklarda kalan örnekler işlenir
+    if duzgun:
+        print(boru.durum_satiri())
+        if args.zamanlama:
+            print(boru.zamanlama_satiri())
+        if metrikler:
+            metrik_yaz()
+
+        if not analiz.depo.empty:
+            print("\nSon durum raporu:")
+            print("=" * 30)
+            print(analiz.rapor())
+            print(f"Toplam kayıt: {len(analiz.depo)}")
+            print(f"Son toplam tüketim: {analiz.sayac.omur_toplam:.2f} L "
+                  f"(sayaç: {analiz.depo['cumulative_liters'][-1]:.2f} L)")
+            if analiz.onbellek.isabet or sunucu is not None:
+                print(analiz.onbellek.durum_satiri())
+
+            if cizim is not None:
+                cizim.ciz(zorla=True)
+            if args.uzun_donem_gun:
+                katman = ozet_ciz(analiz.ozet, "uzun_donem_tuketim.png", gun=args.uzun_donem_gun)
+                if katman:
+                    print(f"Son {args.uzun_donem_gun} günün grafiği özetlerden çizildi ({katman} katmanı).")
+
+    if cizim is not None:
+        cizim.kapat()
+    analiz.kaydet()
+    kayit.kapat()
+    if gunluk is not None:
+        gunluk.kapat()  # Açık bölüm de derlenir: bir sonraki açılışta kurtarılacak bir şey kalmaz
+        print(gunluk.durum_satiri())
+    kolon.csv_esitle(args.csv, is_sayisi=1)  # Bir sonraki açılışta bu oturumun satırları tekrar ayrıştırılmasın
+    ser.close()
+    print("Seri port kapatıldı.")
+    if duzgun:
+        print("Program sonlandı.")
+
+
+def main(argv=None):
+    # Varsayılanlar Water2.py ile aynı; Water1.py ve Water3.py kendi ön ayarlarını verir
+    parser = argparse.ArgumentParser(description="Akıllı su tüketimi canlı izleme")
+    parser.add_argument("--port", default="COM6", help="Arduino IDE'de görünen port (Linux: /dev/ttyUSB0)")
+    parser.add_argument("--baud", type=int, default=9600)
+    parser.add_argument("--csv", default="su_tuketim.csv", help="Ana kayıt dosyası")
+    parser.add_argument("--yeni-csv", action="store_true", help="Açılışta eski CSV'yi silip baştan başla")
+    parser.add_argument("--kolon", default="su_tuketim.kolon", help="CSV'nin hızlı açılış için sütunsal kopyası")
+    parser.add_argument("--gunluk", default="su_tuketim.gunluk",
+                        help="Çökmeye dayanıklı yazma günlüğü dizini ('' = kapalı, geçmiş CSV'den eşitlenir)")
+    parser.add_argument("--ozet", default="su_tuketim.ozet", help="1 dk / 1 sa / 1 gün özet katmanları dizini")
+    parser.add_argument("--sayac", default="su_tuketim.sayac.json", help="Ömür boyu toplamın kontrol noktası")
+    parser.add_argument("--profil", default="su_tuketim.profil.npz",
+                        help="Haftanın saatine göre tüketim profili ('' = sadece bellekte, bkz. profil.py)")
+    parser.add_argument("--sapma-esigi", type=float, default=SAPMA_ESIGI,
+                        help="Saatlik tüketim olağanın kaç standart sapma üzerindeyse uyarılır")
+    parser.add_argument("--pencere", type=int, help="Bellekte tutulacak son N kayıt (varsayılan: tüm geçmiş)")
+    parser.add_argument("--esik", type=float, default=DEBI_ESIGI, help="Optimizasyon debi eşiği (L/dk)")
+    parser.add_argument("--rapor-araligi", type=int, default=RAPOR_ARALIGI, help="Kaç kayıtta bir rapor (0 = kapalı)")
+    parser.add_argument("--anlik-araligi", type=int, default=ANLIK_ARALIGI,
+                        help="Kaç kayıtta bir son örnek yazdırılır (0 = kapalı)")
+    parser.add_argument("--surekli-akis-dk", type=float, default=SUREKLI_DK,
+                        help="Kimse yokken bu kadar dakika kesintisiz akış sızıntı uyarısı verir")
+    parser.add_argument("--cizim-dosyasi", default="su_tuketim_grafik.png", help="Canlı grafik ('' = çizme)")
+    parser.add_argument("--paneller", type=panel_listesi, default=panel_listesi("debi,toplam"),
+                        help=f"Grafik panelleri ({', '.join(PANELLER)})")
+    parser.add_argument("--cizim-araligi", type=float, default=CIZIM_ARALIGI, help="En kısa yenileme aralığı (s)")
+    parser.add_argument("--dpi", type=int, default=CIZIM_DPI)
+    parser.add_argument("--uzun-donem-gun", type=int, default=UZUN_DONEM_GUN,
+                        help="Çıkışta özetlerden çizilen grafiğin gün sayısı (0 = çizme)")
+    parser.add_argument("--zamanlama", action="store_true", help="Raporlarda aşama başına işlem süresini göster")
+    parser.add_argument("--metrik", action="store_true",
+                        help="Aşama gecikme histogramları (p50/p99/maks), örnek hızı ve kuyruk derinlikleri")
+    parser.add_argument("--metrik-araligi", type=float, default=10.0, help="Metrik satırı ve dosyası aralığı (s)")
+    parser.add_argument("--metrik-dosyasi", default="su_tuketim.metrik.json", help="Metriklerin yazıldığı JSON ('' = yazma)")
+    parser.add_argument("--http", type=int, metavar="PORT",
+                        help="JSON / Prometheus sorgu sunucusunu bu portta aç (bkz. sunucu.py; varsayılan: kapalı)")
+    parser.add_argument("--http-adres", default="127.0.0.1", help="Sorgu sunucusunun dinlediği adres")
+    izle(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+# SÜTUNSAL KALICI DEPO
+# su_tuketim.csv'nin yanında, her sütunu ayrı bir ikili dosyada tutan hızlı bir kopya:
+#   <dizin>/timestamp.i8          int64 (nanosaniye, datetime64[ns])
+#   <dizin>/flow_lpm.f8           float64
+#   <dizin>/cumulative_liters.f8  float64
+#   <dizin>/ir_state.i1           int8
+#   <dizin>/meta.json             CSV'nin hangi bayta kadar aktarıldığı / son derlenen günlük bölümü
+# Açılışta geçmiş, CSV ayrıştırmak yerine np.memmap / np.fromfile ile tek seferde okunur.
+# İki besleme yolu vardır:
+#   - CSV (varsayılan): CSV ana kayıttır; csv_esitle yalnızca son eşitlemeden sonra eklenen satırları okur.
+#   - Yazma günlüğü (gunluk.py): kapanan günlük bölümleri bolum_ekle ile eklenir; ilk geçişte eski CSV
+#     bir kez aktarılır, sonra meta "kaynak" = "gunluk" olur ve CSV sadece dışa aktarım kopyasıdır
+#     (csv_esitle bir şey aktarmaz; CSV depodan ileri gitmişse, ör. günlük kapalı bir izleme oturumu
+#     yazdıysa, uyarı verir). CSV yoluna dönmek için dizin silinir, CSV'den yeniden kurulur.
+#
+# Büyük CSV aktarımı: bekleyen bayt aralığı satır sınırlarında PARCA_BAYT'lık parçalara bölünür; parçalar
+# ayrı süreçlerde okunup ayrıştırılır (tür dönüşümü ve hatalı satır sayımı parça başına) ve sırayla
+# depoya eklenir. Aynı anda en fazla is_sayisi + 1 parça bellekte olur: bellek dosya boyuna değil
+# parça boyuna bağlıdır (bkz. bench/aktarim.py). Her parçadan sonra meta kaydedilir; yarıda kesilen
+# aktarım kaldığı parçadan devam eder.
+#
+# Tek seferlik dönüştürme:
+#   python -m su_izleme.kalici donustur su_tuketim.csv [--hedef su_tuketim.kolon] [--is 4] [--parca-mb 16]
+
+import argparse
+import collections
+import io
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from su_izleme import SUTUNLAR
+
+DOSYALAR = {
+    "timestamp": ("timestamp.i8", np.int64),
+    "flow_lpm": ("flow_lpm.f8", np.float64),
+    "cumulative_liters": ("cumulative_liters.f8", np.float64),
+    "ir_state": ("ir_state.i1", np.int8),
+}
+META = "meta.json"
+PARCA_BAYT = 16 * 1024 * 1024  # CSV aktarımında tek seferde ayrıştırılan parça (ayrıştırırken ~6 katı bellek)
+
+
+def csv_parca_ayristir(ham):
+    """Başlıksız CSV baytlarını ayrıştırır; (sütun sözlüğü, hatalı satır sayısı) döndürür.
+
+    Fazladan alanlı (okunamayan) satırlar, zaman damgası okunamayan satırlar ve sayısal alanı eksik
+    ya da sayı olmayan satırlar atılır ve hatalı sayılır. Bozuk değerler 0 yapılmaz: 0 sayaç değeri
+    sayaç sıfırlanması gibi görünür ve ömür boyu toplamı şişirirdi. Boş satırlar sayılmaz.
+    """
+    import pandas as pd
+
+    df = pd.read_csv(io.BytesIO(ham), header=None, names=SUTUNLAR, dtype=str,
+                     on_bad_lines="skip", engine="c")
+    # read_csv'nin sessizce atladığı satırlar: boş olmayan satır sayısından okunan satırlar çıkarılır
+    satir = ham.count(b"\n") + (not ham.endswith(b"\n") and len(ham) > 0)
+    bos = ham.count(b"\n\n") + ham.count(b"\n\r\n") + ham.startswith((b"\n", b"\r\n"))
+    atlanan = max(satir - bos - len(df), 0)
+
+    zaman = pd.to_datetime(df["timestamp"], errors="coerce", format="ISO8601")
+    gecerli = zaman.notna().to_numpy().copy()
+    degerler = {}
+    for ad in SUTUNLAR[1:]:
+        degerler[ad] = pd.to_numeric(df[ad], errors="coerce").to_numpy(dtype=np.float64)
+        gecerli &= ~np.isnan(degerler[ad])
+    sutunlar = {"timestamp": zaman.to_numpy(dtype="datetime64[ns]")[gecerli]}
+    for ad, dizi in degerler.items():
+        sutunlar[ad] = dizi[gecerli]
+    sutunlar["ir_state"] = sutunlar["ir_state"].astype(np.int8)
+    return sutunlar, int(len(gecerli) - gecerli.sum()) + atlanan
+
+
+def satir_sinirlari(f, bas, bit, boyut=PARCA_BAYT):
+    """[bas, bit) bayt aralığını ~boyut baytlık, satır sonunda biten [(a, b)] parçalarına böler"""
+    sinirlar = [bas]
+    konum = bas + boyut
+    while konum < bit:
+        f.seek(konum)
+        konum += len(f.readline())  # Parçayı bir sonraki satır sonuna uzat
+        if konum >= bit:
+            break
+        sinirlar.append(konum)
+        konum += boyut
+    sinirlar.append(bit)
+    return list(zip(sinirlar[:-1], sinirlar[1:]))
+
+
+def csv_bolum_ayristir(yol, bas, bit):
+    """CSV'nin [bas, bit) bayt aralığını okuyup ayrıştırır (işçi süreçte de çalışır)"""
+    with open(yol, "rb") as f:
+        f.seek(bas)
+        ham = f.read(bit - bas)
+    return csv_parca_ayristir(ham)
+
+
+def csv_bolumleri(yol, bolumler, is_sayisi=1):
+    """Parçaları ayrıştırıp dosyadaki sırayla ((a, b), sütunlar, hatalı) olarak üretir.
+
+    is_sayisi > 1 ise parçalar süreç havuzunda ayrıştırılır; en fazla is_sayisi + 1 parça sırada bekler
+    (sonuçlar tüketildikçe yenileri gönderilir). Havuz "spawn" ile kurulur: çağıran süreçte çalışan
+    iş parçacıkları (ör. izlemedeki seri okuyucu) çatallanmaz. İşçiler ana modülü yeniden içe aktardığı
+    için ana betik main() çağrısını if __name__ == "__main__" altında yapmalıdır; canlı izleme bu yüzden
+    (ve seri okuma sürerken işlemci paylaşılmasın diye) is_sayisi=1 ile eşitler.
+    """
+    if is_sayisi <= 1 or len(bolumler) < 2:
+        for a, b in bolumler:
+            yield (a, b), *csv_bolum_ayristir(yol, a, b)
+        return
+    bekleyen = collections.deque()
+    sira = iter(bolumler)
+    with ProcessPoolExecutor(max_workers=is_sayisi, mp_context=multiprocessing.get_context("spawn")) as havuz:
+        for a, b in sira:
+            bekleyen.append(((a, b), havuz.submit(csv_bolum_ayristir, yol, a, b)))
+            if len(bekleyen) > is_sayisi:
+                break
+        while bekleyen:
+            bolum, gelecek = bekleyen.popleft()
+            sonuc = gelecek.result()
+            sonraki = next(sira, None)
+            if sonraki is not None:
+                bekleyen.append((sonraki, havuz.submit(csv_bolum_ayristir, yol, *sonraki)))
+            yield bolum, *sonuc
+
+
+class KolonDeposu:
+    """Eklenebilir, sütun başına bir dosya tutan kalıcı depo"""
+
+    def __init__(self, dizin):
+        self.dizin = dizin
+        os.makedirs(dizin, exist_ok=True)
+        self._meta_yolu = os.path.join(dizin, META)
+        self.meta = {"surum": 1, "csv_konum": 0, "csv_ilk_satir": None,
+                     "kaynak": "csv", "gunluk_son": 0, "gunluk_derleme": None}
+        if os.path.exists(self._meta_yolu):
+            with open(self._meta_yolu, encoding="utf-8") as f:
+                self.meta.update(json.load(f))
+
+    def _yol(self, ad):
+        return os.path.join(self.dizin, DOSYALAR[ad][0])
+
+    def __len__(self):
+        """Tüm sütun dosyalarında eksiksiz bulunan satır sayısı"""
+        sayilar = []
+        for ad, (_, tip) in DOSYALAR.items():
+            yol = self._yol(ad)
+            boyut = os.path.getsize(yol) if os.path.exists(yol) else 0
+            sayilar.append(boyut // np.dtype(tip).itemsize)
+        return min(sayilar)
+
+    def _meta_yaz(self):
+        gecici = self._meta_yolu + ".tmp"
+        with open(gecici, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(gecici, self._meta_yolu)
+
+    # --- YAZMA ---
+    def ekle_toplu(self, timestamp, flow, cumulative, ir_state, fsync=False):
+        """Dizileri sütun dosyalarının sonuna ekler"""
+        degerler = {
+            "timestamp": np.asarray(timestamp, dtype="datetime64[ns]").view(np.int64),
+            "flow_lpm": np.asarray(flow, dtype=np.float64),
+            "cumulative_liters": np.asarray(cumulative, dtype=np.float64),
+            "ir_state": np.asarray(ir_state).astype(np.int8, copy=False),
+        }
+        # Önceki yazma yarım kaldıysa tüm sütunları ortak satır sayısına kırp
+        n = len(self)
+        for ad, (_, tip) in DOSYALAR.items():
+            with open(self._yol(ad), "ab") as f:
+                f.truncate(n * np.dtype(tip).itemsize)
+                f.write(np.ascontiguousarray(degerler[ad]).tobytes())
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+
+    def kirp(self, n):
+        """İlk n satırı tutar, sonrasını siler"""
+        for ad, (_, tip) in DOSYALAR.items():
+            with open(self._yol(ad), "ab") as f:
+                f.truncate(min(n, len(self)) * np.dtype(tip).itemsize)
+
+    def temizle(self):
+        """Tüm verileri siler (CSV baştan aktarılacaksa)"""
+        for ad in DOSYALAR:
+            with open(self._yol(ad), "wb"):
+                pass
+        self.meta.update(csv_konum=0, csv_ilk_satir=None, kaynak="csv", gunluk_son=0, gunluk_derleme=None)
+        self._meta_yaz()
+
+    # --- YAZMA GÜNLÜĞÜ ---
+    @property
+    def gunluk_kaynakli(self):
+        return self.meta["kaynak"] == "gunluk"
+
+    def gunluge_gec(self):
+        """Bundan sonra satırlar sadece yazma günlüğünden gelir (csv_esitle devre dışı)"""
+        self.meta["kaynak"] = "gunluk"
+        self._meta_yaz()
+
+    def bolum_ekle(self, no, sutunlar):
+        """no numaralı günlük bölümünün satırlarını ekler; bölüm zaten eklenmişse False döner.
+
+        Önce niyet (bölüm no, mevcut satır sayısı) meta'ya yazılır, sonra satırlar fsync ile eklenir,
+        en son gunluk_son ilerletilir. Arada kesilen bir ekleme bir sonraki çağrıda geri alınır:
+        bölüm iki kez eklenmez, yarım da kalmaz.
+        """
+        yarim = self.meta["gunluk_derleme"]
+        if yarim is not None:
+            self.kirp(yarim[1])
+            self.meta["gunluk_derleme"] = None
+            self._meta_yaz()
+        if no <= self.meta["gunluk_son"]:
+            return False
+        self.meta["gunluk_derleme"] = [no, len(self)]
+        self._meta_yaz()
+        self.ekle_toplu(*(sutunlar[ad] for ad in SUTUNLAR), fsync=True)
+        self.meta.update(gunluk_son=no, gunluk_derleme=None)
+        self._meta_yaz()
+        return True
+
+    # --- OKUMA ---
+    def yukle(self, mmap=True):
+        """Tüm geçmişi sütun sözlüğü olarak döndürür.
+
+        mmap=True ise diskteki dosyalar kopyalanmadan eşlenir (sayfalar erişildikçe okunur),
+        aksi halde her sütun tek bir np.fromfile çağrısıyla belleğe alınır.
+        """
+        n = len(self)
+        sutunlar = {}
+        for ad, (_, tip) in DOSYALAR.items():
+            if n == 0:
+                dizi = np.empty(0, dtype=tip)
+            elif mmap:
+                dizi = np.memmap(self._yol(ad), dtype=tip, mode="r", shape=(n,))
+            else:
+                dizi = np.fromfile(self._yol(ad), dtype=tip, count=n)
+            sutunlar[ad] = dizi
+        sutunlar["timestamp"] = sutunlar["timestamp"].view("datetime64[ns]")
+        return sutunlar
+
+    def oku(self, bas, bit, sutunlar=None):
+        """[bas, bit) satır aralığını dosyalarda doğrudan o konuma giderek okur.
+
+        sutunlar verilmezse tüm sütunlar okunur; zaman damgası int64 (ns) olarak döner.
+        """
+        bas, bit = max(bas, 0), min(bit, len(self))
+        sonuc = {}
+        for ad in sutunlar or DOSYALAR:
+            _, tip = DOSYALAR[ad]
+            boy = np.dtype(tip).itemsize
+            if bit <= bas:
+                sonuc[ad] = np.empty(0, dtype=tip)
+                continue
+            sonuc[ad] = np.fromfile(self._yol(ad), dtype=tip, count=bit - bas, offset=bas * boy)
+        return sonuc
+
+    # --- CSV EŞİTLEME ---
+    def csv_esitle(self, csv_yolu, parca_bayt=PARCA_BAYT, is_sayisi=None):
+        """CSV'de son eşitlemeden sonra eklenen tam satırları depoya aktarır.
+
+        (aktarılan satır, hatalı satır) döndürür. CSV baştan yazılmışsa depo sıfırlanır.
+        is_sayisi verilmezse bekleyen kısım en az 4 parçaysa çekirdek sayısı kadar süreç kullanılır
+        (her açılıştaki küçük artımlar için süreç başlatılmaz).
+        Depo yazma günlüğünden besleniyorsa hiçbir şey aktarılmaz; CSV'nin son satırı depodaki son
+        örnekten yeniyse uyarı yazılır (bu satırlar geçmişe girmez).
+        """
+        if not os.path.exists(csv_yolu):
+            return 0, 0
+        if self.gunluk_kaynakli:
+            self.csv_ileride(csv_yolu)
+            return 0, 0
+        aktarilan = hatali = 0
+        with open(csv_yolu, "rb") as f:
+            baslik = f.readline()
+            ilk_satir = f.readline().decode("utf-8", errors="replace")
+            boyut = os.fstat(f.fileno()).st_size
+
+            konum = self.meta["csv_konum"]
+            if konum > boyut or (konum and self.meta["csv_ilk_satir"] != ilk_satir):
+                # CSV kısaldı veya yeniden oluşturuldu (ör. Water1.py başlangıçta siler)
+                self.temizle()
+                konum = 0
+            if konum == 0:
+                konum = len(baslik)
+                self.meta["csv_ilk_satir"] = ilk_satir
+
+            # Sondaki yarım (henüz bitmemiş) satır bir sonraki eşitlemeye bırakılır
+            f.seek(max(boyut - 4096, konum))
+            son = f.read()
+            bit = max(boyut - len(son) + son.rfind(b"\n") + 1, konum)
+
+            bolumler = satir_sinirlari(f, konum, bit, parca_bayt)
+        if is_sayisi is None:
+            is_sayisi = (os.cpu_count() or 1) if len(bolumler) >= 4 else 1
+        for (_, b), sutunlar, bozuk in csv_bolumleri(csv_yolu, bolumler, is_sayisi):
+            self.ekle_toplu(*(sutunlar[ad] for ad in SUTUNLAR))
+            aktarilan += len(sutunlar["timestamp"])
+            hatali += bozuk
+            self.meta["csv_konum"] = b
+            self._meta_yaz()
+
+        self.meta["csv_konum"] = bit
+        self._meta_yaz()
+        return aktarilan, hatali
+
+    def csv_ileride(self, csv_yolu):
+        """Günlük kaynaklı depoda CSV'nin son tam satırı depodaki son örnekten yeniyse uyarır ve True döndürür"""
+        with open(csv_yolu, "rb") as f:
+            baslik = len(f.readline())
+            boyut = os.fstat(f.fileno()).st_size
+            bas = max(boyut - 4096, baslik)
+            f.seek(bas)
+            son = f.read()
+        if bas > baslik:
+            son = son[son.find(b"\n") + 1:]  # İlk (yarım olabilecek) satır atılır
+        son = son[:son.rfind(b"\n") + 1]  # Bitmemiş son satır da
+        csv_zaman = csv_parca_ayristir(son)[0]["timestamp"]
+        if len(csv_zaman) == 0:
+            return False
+        n = len(self)
+        depo_zaman = self.oku(n - 1, n, ("timestamp",))["timestamp"].view("datetime64[ns]")
+        if len(depo_zaman) and csv_zaman[-1] <= depo_zaman[0]:
+            return False
+        depo_son = str(depo_zaman[0].astype("datetime64[s]")) if len(depo_zaman) else "boş"
+        print(f"Uyarı: {csv_yolu} depoda olmayan satırlar içeriyor (CSV son: "
+              f"{csv_zaman[-1].astype('datetime64[s]')}, depo son: {depo_son}). Depo yazma günlüğünden "
+              f"besleniyor, bu satırlar geçmişe alınmadı; CSV'den yeniden kurmak için {self.dizin} silinmeli.")
+        return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="su_tuketim.csv -> sütunsal depo dönüştürücü")
+    alt = parser.add_subparsers(dest="komut", required=True)
+    donustur = alt.add_parser("donustur", help="CSV'yi sütunsal depoya aktarır (tekrar çalıştırılırsa sadece yeni satırlar)")
+    donustur.add_argument("csv", help="Kaynak CSV dosyası")
+    donustur.add_argument("--hedef", help="Hedef dizin (varsayılan: <csv adı>.kolon)")
+    donustur.add_argument("--is", type=int, dest="is_sayisi", help="Ayrıştırıcı süreç sayısı (varsayılan: otomatik)")
+    donustur.add_argument("--parca-mb", type=float, default=PARCA_BAYT / 2**20,
+                          help="Parça boyu (MB); süreç başına bellek bunun ~6 katı")
+    args = parser.parse_args(argv)
+
+    hedef = args.hedef or os.path.splitext(args.csv)[0] + ".kolon"
+    t0 = time.perf_counter()
+    depo = KolonDeposu(hedef)
+    aktarilan, hatali = depo.csv_esitle(args.csv, parca_bayt=int(args.parca_mb * 2**20), is_sayisi=args.is_sayisi)
+    print(f"{aktarilan} satır aktarıldı, {hatali} hatalı satır atlandı "
+          f"({time.perf_counter() - t0:.1f} s). Toplam: {len(depo)} satır -> {hedef}")
+
+
+if __name__ == "__main__":
+    main()
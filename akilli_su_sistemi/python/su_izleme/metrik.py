@@ -0,0 +1,137 @@
+# ÇALIŞMA ZAMANI METRİKLERİ
+# İzleme geride kaldığında darboğazın ayrıştırma mı, CSV yazımı mı, analiz/rapor mu, grafik mi olduğu
+# görülsün diye aşama başına gecikme histogramları ve sayaçlar:
+#   - Histogram: logaritmik kovalı, sabit bellekli; p50 / p99 kovanın geometrik ortasıyla (en fazla
+#     ±%(√KOVA_ORANI-1) ≈ %10 hata), maksimum kesin. Asama kancası (bkz. boru_hatti) parti başına bir kez çağrılır.
+#   - Örnek hızı son iki görüntü arasındaki farktan; düşen / hatalı / kayıp sayaçları ve kuyruk
+#     derinlikleri BoruHatti.istatistik()'ten okunur.
+# Metrikler kapalıyken kanca verilmez: aşamalarda sadece toplam süre biriktirilir.
+# Çıktı: periyodik tek satırlık günlük ve atomik yazılan JSON dosyası (ör. su_tuketim.metrik.json).
+# Kullanım:  python -m su_izleme monitor --metrik [--metrik-dosyasi ...] [--metrik-araligi 10]
+
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime
+
+EN_KUCUK_S = 1e-6  # İlk kovanın üst sınırı (1 µs)
+KOVA_ORANI = 1.2  # Ardışık kova sınırlarının oranı
+KOVA_SAYISI = 112  # 1 µs * 1.2^110 ≈ 500 s; daha uzunlar son kovaya düşer
+_LOG_ORAN = math.log(KOVA_ORANI)
+
+
+def kova_siniri(i):
+    """i. kovanın üst sınırı (s)"""
+    return EN_KUCUK_S * KOVA_ORANI ** i
+
+
+class Histogram:
+    """Süre (s) değerleri için logaritmik kovalı histogram; ekleme O(1), bellek sabit"""
+
+    def __init__(self):
+        self.kovalar = [0] * KOVA_SAYISI
+        self.adet = 0
+        self.toplam = 0.0
+        self.maks = 0.0
+
+    def ekle(self, sure):
+        if sure <= EN_KUCUK_S:
+            i = 0
+        else:
+            i = min(math.ceil(math.log(sure / EN_KUCUK_S) / _LOG_ORAN), KOVA_SAYISI - 1)
+        self.kovalar[i] += 1
+        self.adet += 1
+        self.toplam += sure
+        if sure > self.maks:
+            self.maks = sure
+
+    def yuzdelik(self, p):
+        """p. yüzdelik (0-100); değerin düştüğü kovanın geometrik ortası, maksimumu geçmez"""
+        if self.adet == 0:
+            return 0.0
+        hedef = max(math.ceil(self.adet * p / 100), 1)
+        birikim = 0
+        for i, n in enumerate(self.kovalar):
+            birikim += n
+            if birikim >= hedef:
+                return min(kova_siniri(i - 0.5) if i else EN_KUCUK_S, self.maks)
+        return self.maks
+
+    def sozluk(self):
+        """Milisaniye cinsinden özet"""
+        return {
+            "adet": self.adet,
+            "ortalama_ms": self.toplam / self.adet * 1e3 if self.adet else 0.0,
+            "p50_ms": self.yuzdelik(50) * 1e3,
+            "p99_ms": self.yuzdelik(99) * 1e3,
+            "maks_ms": self.maks * 1e3,
+        }
+
+
+class Metrikler:
+    """Ad başına gecikme histogramı ve öğe sayacı tutan kayıt defteri.
+
+    kanca(ad, adet, sure_s) doğrudan Asama / BoruHatti kancası olarak verilir; farklı iş parçacıkları
+    farklı adlara yazdığı için sadece yeni ad eklenirken kilitlenir. goruntu(boru) tüm sayaçları ve
+    son görüntüden bu yana örnek hızını içeren bir sözlük döndürür.
+    """
+
+    def __init__(self):
+        self.histogramlar = {}
+        self.ogeler = {}
+        self._kilit = threading.Lock()
+        self._baslangic = time.monotonic()
+        self._onceki = None  # (zaman, örnek sayısı): hız son iki görüntü arasındaki farktan
+
+    def _histogram(self, ad):
+        histogram = self.histogramlar.get(ad)
+        if histogram is None:
+            with self._kilit:
+                self.ogeler.setdefault(ad, 0)  # Histogramdan önce: kilitsiz okuyan kanca sayacı hazır bulsun
+                histogram = self.histogramlar.setdefault(ad, Histogram())
+        return histogram
+
+    def kanca(self, ad, adet, sure):
+        self._histogram(ad).ekle(sure)
+        self.ogeler[ad] += adet
+
+    def goruntu(self, boru=None):
+        simdi = time.monotonic()
+        sonuc = {"zaman": datetime.now().isoformat(timespec="seconds"),
+                 "calisma_s": round(simdi - self._baslangic, 1)}
+        if boru is not None:
+            s = boru.istatistik()
+            ornek = s["ornek"]
+            if self._onceki is not None and simdi > self._onceki[0]:
+                sonuc["ornek_hizi"] = (ornek - self._onceki[1]) / (simdi - self._onceki[0])
+            else:
+                sonuc["ornek_hizi"] = s["ornek_hizi"]
+            self._onceki = (simdi, ornek)
+            for anahtar in ("okunan", "ornek", "dusen", "hatali", "kayip", "ham_kuyruk"):
+                sonuc[anahtar] = s[anahtar]
+            sonuc["asamalar"] = s["asamalar"]
+        sonuc["gecikme"] = {ad: dict(h.sozluk(), oge=self.ogeler[ad]) for ad, h in list(self.histogramlar.items())}
+        return sonuc
+
+    @staticmethod
+    def satir(goruntu):
+        """Görüntüyü konsola yazılabilecek tek satıra çevirir"""
+        parcalar = []
+        if "ornek_hizi" in goruntu:
+            kuyruklar = " ".join(f"{ad}={a['kuyruk']}" for ad, a in goruntu["asamalar"].items())
+            parcalar.append(f"{goruntu['ornek_hizi']:.1f} örnek/s | kuyruk ham={goruntu['ham_kuyruk']} {kuyruklar} | "
+                            f"düşen {goruntu['dusen']} hatalı {goruntu['hatali']} kayıp {goruntu['kayip']}")
+        for ad, g in goruntu["gecikme"].items():
+            parcalar.append(f"{ad} p50 {g['p50_ms']:.2f} p99 {g['p99_ms']:.2f} maks {g['maks_ms']:.1f} ms")
+        return "Metrik: " + " | ".join(parcalar)
+
+    @staticmethod
+    def yaz(goruntu, yol):
+        """Görüntüyü JSON olarak atomik yazar (okuyan taraf yarım dosya görmez)"""
+        gecici = yol + ".tmp"
+        with open(gecici, "w", encoding="utf-8") as f:
+            json.dump(goruntu, f, ensure_ascii=False, indent=1)
+        os.replace(gecici, yol)
+
@@ -0,0 +1,124 @@
+# SAYAÇ NORMALLEŞTİRME (ömür boyu toplam)
+# cumulative_liters Arduino'daki totalLiters değişkenidir ve kart her yeniden başladığında 0'dan
+# sayar; son satırın değeri bu yüzden sıfırlamadan sonra toplam tüketim değildir. Bu modül
+# alım aşamasında:
+#   - Sıfırlamaları yakalar: ham değer bir öncekinden küçükse sayaç yeniden başlamıştır, önceki
+#     değer ofsete eklenir (ömür = ofset + ham). tuketim.ornek_hacimleri ile aynı kural: yeni değer
+#     sıfırdan tüketim sayılır, böylece ömür toplamı özet katmanlarındaki litrelerin toplamına eşittir.
+#   - Sayaç değeri okunamayan (NaN) örneklerde son geçerli değeri kullanır
+#   - BOSLUK_S'den uzun veri kesintilerini sayar (seri port koptu, cihaz kapalıydı). Cihaz kesinti
+#     boyunca açık kaldıysa aradaki tüketim sayaç farkında zaten vardır; kesintide yeniden
+#     başladıysa son örnekten kapanışa kadar akan su bilinemez, olaylar listesinden görülebilir.
+# Durum (ofset, son ham değer, işlenen örnek sayısı) bir kontrol noktası dosyasına yazılır;
+# açılışta geçmişin tamamı değil, sadece kontrol noktasından sonra eklenen satırlar işlenir.
+
+import json
+import os
+from collections import deque
+
+import numpy as np
+
+from su_izleme.tuketim import BOSLUK_S, kaydir
+
+MAKS_OLAY = 100  # Bellekte tutulan son sıfırlama / boşluk olayı
+
+
+class SayacNormallestirici:
+    """Ham cumulative_liters akışını ömür boyu artan toplama çevirir.
+
+    toplu() her parti için ömür toplamı dizisini döndürür. dosya verilirse kaydet() durumu
+    atomik olarak yazar ve açılışta okur; yakala() geçmişte kontrol noktasından sonraki satırları işler.
+    Son sıfırlama ve boşluk olayları 'olaylar' içinde (zaman, tür, açıklama) olarak tutulur.
+    """
+
+    _ALANLAR = ("ofset", "omur_toplam", "son_ham", "son_ns", "ornek_sayisi",
+                "sifirlama_sayisi", "bosluk_sayisi", "bosluk_s")
+
+    def __init__(self, dosya=None, bosluk_s=BOSLUK_S):
+        self.dosya = dosya
+        self.bosluk_ns = int(bosluk_s * 1e9)
+        self.olaylar = deque(maxlen=MAKS_OLAY)
+        self._sifirla()
+        if dosya and os.path.exists(dosya):
+            with open(dosya, encoding="utf-8") as f:
+                self.__dict__.update({k: v for k, v in json.load(f).items() if k in self._ALANLAR})
+
+    def _sifirla(self):
+        self.ofset = 0.0  # Önceki sıfırlamalarda kaybolan sayaç değerlerinin toplamı
+        self.omur_toplam = 0.0
+        self.son_ham = None
+        self.son_ns = None
+        self.ornek_sayisi = 0
+        self.sifirlama_sayisi = 0
+        self.bosluk_sayisi = 0
+        self.bosluk_s = 0.0  # Boşluklarda geçen toplam süre
+        self.olaylar.clear()
+
+    def toplu(self, timestamp, cumulative):
+        """Zaman sırasındaki ham sayaç değerlerini ömür boyu toplama çevirir"""
+        ham = np.array(cumulative, dtype=np.float64)
+        if len(ham) == 0:
+            return ham
+        ns = np.asarray(timestamp, dtype="datetime64[ns]").view(np.int64)
+        eksik = np.isnan(ham)
+        if eksik.any():
+            # Son geçerli değerle doldur (partinin başındaki eksikler önceki partinin son değerini alır)
+            son = np.maximum.accumulate(np.where(eksik, -1, np.arange(len(ham))))
+            bas = self.son_ham
+            if bas is None:
+                bas = ham[~eksik][0] if not eksik.all() else 0.0
+            ham = np.where(son >= 0, ham[np.maximum(son, 0)], bas)
+        onceki = kaydir(ham, ham[0] if self.son_ham is None else self.son_ham)
+        onceki_ns = kaydir(ns, ns[0] if self.son_ns is None else self.son_ns)
+
+        sifirlama = ham < onceki
+        ofset = self.ofset + np.cumsum(np.where(sifirlama, onceki, 0.0))
+        omur = ofset + ham
+
+        bosluk = ns - onceki_ns > self.bosluk_ns
+        for i in np.flatnonzero(sifirlama | bosluk).tolist():
+            zaman = np.datetime64(int(ns[i]), "ns")
+            if bosluk[i]:
+                sure = (ns[i] - onceki_ns[i]) / 1e9
+                self.bosluk_sayisi += 1
+                self.bosluk_s += sure
+                self.olaylar.append((zaman, "bosluk", f"{sure:.0f} s veri gelmedi"))
+            if sifirlama[i]:
+                self.sifirlama_sayisi += 1
+                self.olaylar.append((zaman, "sifirlama", f"Sayaç {onceki[i]:.2f} L'den {ham[i]:.2f} L'ye düştü"))
+
+        self.ofset = float(ofset[-1])
+        self.omur_toplam = float(omur[-1])
+        self.son_ham = float(ham[-1])
+        self.son_ns = int(ns[-1])
+        self.ornek_sayisi += len(ham)
+        return omur
+
+    def temizle(self):
+        """Durumu sıfırlar ve kontrol noktasını yeniden yazar"""
+        self._sifirla()
+        self.kaydet()
+
+    def yakala(self, timestamp, cumulative):
+        """Geçmişten kontrol noktasında olmayan satırları işler; işlenen satır sayısını döndürür.
+
+        Geçmiş kontrol noktasından kısaysa (CSV yeniden oluşturulmuş) baştan hesaplanır.
+        """
+        bas = self.ornek_sayisi
+        if bas > len(timestamp):
+            self._sifirla()
+            bas = 0
+        self.toplu(timestamp[bas:], cumulative[bas:])
+        return len(timestamp) - bas
+
+    def kaydet(self):
+        if not self.dosya:
+            return
+        gecici = self.dosya + ".tmp"
+        with open(gecici, "w", encoding="utf-8") as f:
+            json.dump({k: getattr(self, k) for k in self._ALANLAR}, f)
+        os.replace(gecici, self.dosya)
+
+    def durum_satiri(self):
+        return (f"Ömür boyu toplam: {self.omur_toplam:.2f} L | Sayaç sıfırlanması: {self.sifirlama_sayisi} | "
+                f"Veri boşluğu: {self.bosluk_sayisi} ({self.bosluk_s / 60:.0f} dk)")
@@ -0,0 +1,142 @@
+# SÜRÜMLÜ SONUÇ ÖNBELLEĞİ
+# Rapor (optimizasyon_analizi), anlık görünüm ve aralık sorguları her istendiğinde yeniden
+# hesaplanıyordu; yeni örnek gelmese de, aynı yanıtı birkaç tüketici (sorgu sunucusu, konsol) istese de.
+# Bu önbellek sonuçları veri sürümüne bağlar:
+#   - surum, eklenen örneklerle tekdüze artan sıra numarasıdır (ilerlet(adet, bas, bit) her partide).
+#   - Her kayıt bir zaman aralığına bağlıdır ([bas, bit), None = sınırsız). Parti [bas, bit] aralığına
+#     örnek eklediğinde sadece bu aralıkla kesişen kayıtlar silinir: geçmiş günlerin sorguları yeni
+#     örneklerden etkilenmez, tüm geçmişe bağlı kayıtlar (rapor, anlık) her partide yenilenir.
+#   - Hesaplama kilit dışında yapılır; hesap sürerken gelen ve aralığı kesen bir parti varsa sonuç
+#     döndürülür ama saklanmaz (bayat). Bunun için son GECERSIZ_GECMIS partinin aralığı tutulur.
+#   - LRU: en uzun süredir kullanılmayan kayıtlar, kayıt sayısı maks_kayit'ı veya tahmini boyut
+#     maks_bayt'ı aşınca atılır.
+# Sayaçlar (isabet, ıska, tahliye, geçersiz, bayat) istatistik() ile okunur; sunucu.py /metrik ve
+# /metrics bunları yayınlar.
+
+import sys
+import threading
+from collections import OrderedDict, deque
+
+import numpy as np
+
+MAKS_KAYIT = 1024
+MAKS_BAYT = 32 * 1024 * 1024
+GECERSIZ_GECMIS = 64  # Hesap sürerken gelen partileri denetlemek için tutulan son parti aralığı
+
+
+def boyut(deger):
+    """Değerin bellekteki yaklaşık boyu (bayt): diziler, metinler ve iç içe kaplar"""
+    if isinstance(deger, np.ndarray):
+        return deger.nbytes + 112
+    if isinstance(deger, dict):
+        return sys.getsizeof(deger) + sum(boyut(k) + boyut(v) for k, v in deger.items())
+    if isinstance(deger, (list, tuple)):
+        return sys.getsizeof(deger) + sum(boyut(v) for v in deger)
+    return sys.getsizeof(deger)
+
+
+def _kesisir(bas, bit, a, b):
+    """[bas, bit) kaydı (None = sınırsız) ile [a, b] partisi kesişiyor mu"""
+    return (bit is None or a < bit) and (bas is None or b >= bas)
+
+
+class SurumluOnbellek:
+    """Veri sürümü ve zaman aralığıyla anahtarlanan, boyut sınırlı LRU önbellek (iş parçacığı güvenli)"""
+
+    def __init__(self, maks_kayit=MAKS_KAYIT, maks_bayt=MAKS_BAYT):
+        self.maks_kayit = maks_kayit
+        self.maks_bayt = maks_bayt
+        self.surum = 0
+        self.bayt = 0
+        self.isabet = 0
+        self.iska = 0
+        self.tahliye = 0
+        self.gecersiz = 0
+        self.bayat = 0
+        self._kayitlar = OrderedDict()  # anahtar -> (değer, bas, bit, boyut)
+        self._partiler = deque()  # (surum, bas, bit): son partilerin aralıkları
+        self._unutulan = 0  # Bu sürümden eski hesaplar denetlenemez (partiler listesinden düştü)
+        self._kilit = threading.Lock()
+
+    def al(self, anahtar, hesapla, bas=None, bit=None):
+        """Anahtarın geçerli sonucunu döndürür; yoksa hesapla() çağrılıp [bas, bit) aralığıyla saklanır.
+
+        bas / bit sonucun bağlı olduğu verinin zaman aralığıdır (ns, datetime64 veya None = sınırsız);
+        anahtar aralığı ve sonucu etkileyen diğer parametreleri içermelidir.
+        """
+        with self._kilit:
+            kayit = self._kayitlar.get(anahtar)
+            if kayit is not None:
+                self._kayitlar.move_to_end(anahtar)
+                self.isabet += 1
+                return kayit[0]
+            self.iska += 1
+            surum = self.surum
+        deger = hesapla()
+        self._koy(anahtar, deger, _ns(bas), _ns(bit), surum)
+        return deger
+
+    def _koy(self, anahtar, deger, bas, bit, surum):
+        n = boyut(deger)
+        with self._kilit:
+            if surum < self._unutulan or any(s > surum and _kesisir(bas, bit, a, b) for s, a, b in self._partiler):
+                self.bayat += 1  # Hesap sürerken aralığa örnek eklendi
+                return
+            if n > self.maks_bayt:
+                return
+            eski = self._kayitlar.pop(anahtar, None)
+            if eski is not None:
+                self.bayt -= eski[3]
+            self._kayitlar[anahtar] = (deger, bas, bit, n)
+            self.bayt += n
+            while len(self._kayitlar) > self.maks_kayit or self.bayt > self.maks_bayt:
+                _, eski = self._kayitlar.popitem(last=False)
+                self.bayt -= eski[3]
+                self.tahliye += 1
+
+    def ilerlet(self, adet, bas, bit):
+        """adet örneklik bir partinin [bas, bit] aralığına eklendiğini bildirir; kesişen kayıtları siler"""
+        if adet <= 0:
+            return
+        bas, bit = _ns(bas), _ns(bit)
+        with self._kilit:
+            self.surum += adet
+            if len(self._partiler) == GECERSIZ_GECMIS:
+                self._unutulan = self._partiler.popleft()[0]
+            self._partiler.append((self.surum, bas, bit))
+            silinecek = [k for k, (_, a, b, _) in self._kayitlar.items() if _kesisir(a, b, bas, bit)]
+            for anahtar in silinecek:
+                self.bayt -= self._kayitlar.pop(anahtar)[3]
+            self.gecersiz += len(silinecek)
+
+    def temizle(self):
+        """Tüm kayıtları siler (veri baştan kurulduğunda); sürüm artmaya devam eder"""
+        with self._kilit:
+            self.surum += 1
+            self._unutulan = self.surum
+            self._partiler.clear()
+            self._kayitlar.clear()
+            self.bayt = 0
+
+    def __len__(self):
+        return len(self._kayitlar)
+
+    def istatistik(self):
+        istek = self.isabet + self.iska
+        return {"surum": self.surum, "kayit": len(self._kayitlar), "bayt": self.bayt, "isabet": self.isabet,
+                "iska": self.iska, "isabet_orani": round(self.isabet / istek, 4) if istek else 0.0,
+                "tahliye": self.tahliye, "gecersiz": self.gecersiz, "bayat": self.bayat}
+
+    def durum_satiri(self):
+        s = self.istatistik()
+        return (f"Önbellek: {s['kayit']} kayıt ({s['bayt'] / 1024:.0f} KB) | İsabet: {s['isabet']} "
+                f"(%{s['isabet_orani'] * 100:.0f}) | Iska: {s['iska']} | Geçersiz: {s['gecersiz']} | "
+                f"Tahliye: {s['tahliye']}")
+
+
+def _ns(ts):
+    if ts is None:
+        return None
+    if isinstance(ts, (int, np.integer)):
+        return int(ts)
+    return int(np.datetime64(ts, "ns").astype(np.int64))
@@ -0,0 +1,303 @@
+# ÇOK ÇÖZÜNÜRLÜKLÜ ÖZETLER (1 dk / 1 sa / 1 gün)
+# 1 Hz örneklerden önceden toplanmış katmanlar tutar; uzun dönem grafik ve raporlar milyonlarca
+# ham nokta yerine bu katmanlardan okunur. Her kova için:
+#   adet, debi_adet (sonlu debili örnek), debi_min, debi_maks, debi_toplam (ortalama = toplam / debi_adet),
+#   litre (sayaç farkı),
+#   varlik_s / yokluk_s (IR sensörüne göre kişi varken / yokken geçen saniye)
+# Örnek i'nin süresi ve tüketimi (t[i] - t[i-1], c[i] - c[i-1]; kurallar için tuketim.ornek_hacimleri)
+# i'nin düştüğü kovaya yazılır. Debisi sonlu olmayan (NaN) örnekler debi alanlarına katılmaz; hiç sonlu
+# debisi olmayan kovada debi_min / debi_maks +inf / -inf kalır.
+#
+# Kalıcılık (dizin verilirse):
+#   <dizin>/1dk.ozet, 1sa.ozet, 1gun.ozet   kapanmış kovalar (OZET_TIPI kayıtları, sona eklenir)
+#   <dizin>/durum.json                       dosyalardaki geçerli kayıt sayısı, açık kovalar, son örnek
+# durum.json dosyalardan sonra ve atomik yazılır; yarım kalan ekleme açılışta kırpılır.
+
+import json
+import os
+
+import numpy as np
+
+from su_izleme.tuketim import BOSLUK_S, kaydir, ornek_hacimleri
+
+KATMANLAR = {"1dk": 60, "1sa": 3600, "1gun": 86400}  # Katman adı -> kova genişliği (s)
+DURUM = "durum.json"
+OZET_TIPI = np.dtype([
+    ("baslangic", "<i8"),  # Kova başlangıcı (datetime64[ns] olarak)
+    ("adet", "<i8"),
+    ("debi_adet", "<i8"),
+    ("debi_min", "<f8"),
+    ("debi_maks", "<f8"),
+    ("debi_toplam", "<f8"),
+    ("litre", "<f8"),
+    ("varlik_s", "<f8"),
+    ("yokluk_s", "<f8"),
+])
+_NS = 1_000_000_000
+SURUM = 2  # durum.json / .ozet biçimi; farklıysa katmanlar geçmişten yeniden kurulur
+
+
+def _kovala(anahtar, flow, litre, varlik, yokluk, genislik_ns):
+    """Sıralı kova anahtarlarına göre ardışık grupları tek geçişte toplar"""
+    baslar = np.flatnonzero(np.concatenate(([True], anahtar[1:] != anahtar[:-1])))
+    grup = np.empty(len(baslar), dtype=OZET_TIPI)
+    grup["baslangic"] = anahtar[baslar] * genislik_ns
+    grup["adet"] = np.diff(np.append(baslar, len(anahtar)))
+    sonlu = np.isfinite(flow)
+    grup["debi_adet"] = np.add.reduceat(sonlu.astype(np.int64), baslar)
+    grup["debi_min"] = np.minimum.reduceat(np.where(sonlu, flow, np.inf), baslar)
+    grup["debi_maks"] = np.maximum.reduceat(np.where(sonlu, flow, -np.inf), baslar)
+    grup["debi_toplam"] = np.add.reduceat(np.where(sonlu, flow, 0.0), baslar)
+    grup["litre"] = np.add.reduceat(litre, baslar)
+    grup["varlik_s"] = np.add.reduceat(varlik, baslar)
+    grup["yokluk_s"] = np.add.reduceat(yokluk, baslar)
+    return grup
+
+
+def kovalari_birlestir(kovalar, baslar):
+    """Ardışık kovaları 'baslar' indekslerinden başlayan gruplar halinde tek kovaya indirir"""
+    grup = np.empty(len(baslar), dtype=OZET_TIPI)
+    grup["baslangic"] = kovalar["baslangic"][baslar]
+    grup["debi_min"] = np.minimum.reduceat(kovalar["debi_min"], baslar)
+    grup["debi_maks"] = np.maximum.reduceat(kovalar["debi_maks"], baslar)
+    for alan in ("adet", "debi_adet", "debi_toplam", "litre", "varlik_s", "yokluk_s"):
+        grup[alan] = np.add.reduceat(kovalar[alan], baslar)
+    return grup
+
+
+def _birlestir(a, b):
+    """Aynı kovaya ait iki kaydı birleştirir (a yerinde güncellenir)"""
+    a["adet"] += b["adet"]
+    a["debi_adet"] += b["debi_adet"]
+    a["debi_min"] = min(a["debi_min"], b["debi_min"])
+    a["debi_maks"] = max(a["debi_maks"], b["debi_maks"])
+    for alan in ("debi_toplam", "litre", "varlik_s", "yokluk_s"):
+        a[alan] += b[alan]
+
+
+class Ozetleyici:
+    """Örnekleri geldikçe üç katmana toplayan, isteğe bağlı olarak diske yazan özetleyici"""
+
+    def __init__(self, dizin=None, bosluk_s=BOSLUK_S):
+        self.dizin = dizin
+        self.bosluk_s = bosluk_s
+        self._temiz_baslat()
+        if dizin:
+            os.makedirs(dizin, exist_ok=True)
+            self._yukle()
+
+    def _temiz_baslat(self):
+        self._parcalar = {k: [] for k in KATMANLAR}  # Kapanmış kovalar (dizi parçaları)
+        self._diskte = {k: 0 for k in KATMANLAR}  # Dosyaya yazılmış kapanmış kova sayısı
+        self._bellekte = {k: 0 for k in KATMANLAR}
+        self._acik = {k: None for k in KATMANLAR}  # Henüz kapanmamış son kova
+        self._son_t = None  # Son örneğin zamanı (ns) ve sayaç değeri
+        self._son_c = None
+        self.ornek_sayisi = 0
+
+    def _yol(self, katman):
+        return os.path.join(self.dizin, f"{katman}.ozet")
+
+    # --- EKLEME ---
+    def ekle(self, timestamp, flow, cumulative, ir_state):
+        self.ekle_toplu([timestamp], [flow], [cumulative], [ir_state])
+
+    def ekle_toplu(self, timestamp, flow, cumulative, ir_state):
+        """Zaman sırasındaki örnek dizilerini tüm katmanlara ekler"""
+        t = np.asarray(timestamp, dtype="datetime64[ns]").view(np.int64)
+        if len(t) == 0:
+            return
+        flow = np.asarray(flow, dtype=np.float64)
+        cumulative = np.asarray(cumulative, dtype=np.float64)
+        varlik_mi = np.asarray(ir_state) != 0
+
+        onceki_t = kaydir(t, t[0] if self._son_t is None else self._son_t)
+        onceki_c = kaydir(cumulative, cumulative[0] if self._son_c is None else self._son_c)
+        sure, litre = ornek_hacimleri(t, flow, cumulative, onceki_t, onceki_c, self.bosluk_s)
+        varlik = np.where(varlik_mi, sure, 0.0)
+        yokluk = sure - varlik
+
+        for katman, genislik in KATMANLAR.items():
+            genislik_ns = genislik * _NS
+            anahtar = np.maximum.accumulate(t // genislik_ns)  # Geriye giden saat kovayı geri açmaz
+            acik = self._acik[katman]
+            if acik is not None:
+                anahtar = np.maximum(anahtar, acik["baslangic"] // genislik_ns)
+            grup = _kovala(anahtar, flow, litre, varlik, yokluk, genislik_ns)
+            if acik is not None:
+                if acik["baslangic"] == grup[0]["baslangic"]:
+                    _birlestir(grup[0], acik)
+                else:
+                    self._kapat(katman, np.array([acik], dtype=OZET_TIPI))
+            if len(grup) > 1:
+                self._kapat(katman, grup[:-1])
+            self._acik[katman] = grup[-1].copy()
+
+        self._son_t = int(t[-1])
+        self._son_c = float(cumulative[-1])
+        self.ornek_sayisi += len(t)
+
+    def _kapat(self, katman, kovalar):
+        self._parcalar[katman].append(kovalar)
+        self._bellekte[katman] += len(kovalar)
+
+    def yakala(self, timestamp, flow, cumulative, ir_state):
+        """Geçmişten, özetlerde henüz olmayan örnekleri ekler (açılışta).
+
+        Özetlerdeki örnek sayısı geçmişle uyuşmuyorsa (ör. CSV yeniden oluşturulmuş) katmanlar
+        sıfırdan kurulur. Eklenen örnek sayısını döndürür.
+        """
+        t = np.asarray(timestamp, dtype="datetime64[ns]").view(np.int64)
+        bas = 0
+        if self._son_t is not None:
+            bas = int(np.searchsorted(t, self._son_t, side="right"))
+            if bas != self.ornek_sayisi:
+                self.temizle()
+                bas = 0
+        self.ekle_toplu(timestamp[bas:], flow[bas:], cumulative[bas:], ir_state[bas:])
+        return len(t) - bas
+
+    def temizle(self):
+        """Tüm katmanları boşaltır (diskteki dosyalar dahil)"""
+        self._temiz_baslat()
+        if self.dizin:
+            for katman in KATMANLAR:
+                with open(self._yol(katman), "wb"):
+                    pass
+            self._durum_yaz()
+
+    # --- KALICILIK ---
+    def _yukle(self):
+        durum_yolu = os.path.join(self.dizin, DURUM)
+        if not os.path.exists(durum_yolu):
+            return
+        with open(durum_yolu, encoding="utf-8") as f:
+            durum = json.load(f)
+        if durum.get("surum") != SURUM:
+            return  # Eski biçim: kaydet() dosyaları baştan yazar, yakala() geçmişi yeniden ekler
+        for katman in KATMANLAR:
+            n = durum["kayit"][katman]
+            yol = self._yol(katman)
+            if os.path.exists(yol) and os.path.getsize(yol) > n * OZET_TIPI.itemsize:
+                with open(yol, "r+b") as f:
+                    f.truncate(n * OZET_TIPI.itemsize)  # durum.json yazılmadan kalan ekleme
+            kovalar = np.fromfile(yol, dtype=OZET_TIPI, count=n) if n else np.empty(0, dtype=OZET_TIPI)
+            self._parcalar[katman] = [kovalar]
+            self._diskte[katman] = self._bellekte[katman] = len(kovalar)
+            acik = durum["acik"][katman]
+            self._acik[katman] = np.array(tuple(acik), dtype=OZET_TIPI)[()] if acik else None
+        self._son_t = durum["son_t"]
+        self._son_c = durum["son_c"]
+        self.ornek_sayisi = durum["ornek_sayisi"]
+
+    def _durum_yaz(self):
+        durum = {
+            "surum": SURUM,
+            "kayit": self._diskte,
+            "acik": {k: (a.item() if a is not None else None) for k, a in self._acik.items()},
+            "son_t": self._son_t,
+            "son_c": self._son_c,
+            "ornek_sayisi": self.ornek_sayisi,
+        }
+        gecici = os.path.join(self.dizin, DURUM + ".tmp")
+        with open(gecici, "w", encoding="utf-8") as f:
+            json.dump(durum, f)
+        os.replace(gecici, os.path.join(self.dizin, DURUM))
+
+    def kaydet(self):
+        """Yeni kapanan kovaları dosyalara ekler ve durumu yazar"""
+        if not self.dizin:
+            return
+        for katman in KATMANLAR:
+            yeni = self._bellekte[katman] - self._diskte[katman]
+            if yeni:
+                with open(self._yol(katman), "ab") as f:
+                    f.truncate(self._diskte[katman] * OZET_TIPI.itemsize)
+                    f.write(self._kapali(katman)[-yeni:].tobytes())
+                self._diskte[katman] += yeni
+        self._durum_yaz()
+
+    # --- SORGULAMA ---
+    def _kapali(self, katman):
+        parcalar = self._parcalar[katman]
+        if len(parcalar) > 1:
+            self._parcalar[katman] = parcalar = [np.concatenate(parcalar)]
+        return parcalar[0] if parcalar else np.empty(0, dtype=OZET_TIPI)
+
+    def katman(self, ad, bas=None, bit=None):
+        """Bir katmanın [bas, bit) aralığında başlayan kovalarını (açık kova dahil) döndürür"""
+        kovalar = self._kapali(ad)
+        if self._acik[ad] is not None:
+            kovalar = np.concatenate((kovalar, np.array([self._acik[ad]], dtype=OZET_TIPI)))
+        baslangic = kovalar["baslangic"]
+        i = 0 if bas is None else np.searchsorted(baslangic, _ns(bas))
+        j = len(kovalar) if bit is None else np.searchsorted(baslangic, _ns(bit))
+        return kovalar[i:j]
+
+    def kapanan(self, ad, sonra=None):
+        """Bir katmanın başlangıcı 'sonra'dan (ns) büyük kapanmış kovaları (açık kova hariç)"""
+        kovalar = self._kapali(ad)
+        if sonra is None:
+            return kovalar
+        return kovalar[np.searchsorted(kovalar["baslangic"], sonra, side="right"):]
+
+    def sorgula(self, bas, bit, hedef_nokta=1000):
+        """[bas, bit) için en az hedef_nokta kova veren en kaba katmanı seçer.
+
+        Aralık en ince katmanda bile hedef_nokta'dan az kova içeriyorsa 1 dk katmanı kullanılır.
+        (katman adı, kovalar) döndürür.
+        """
+        uzunluk_s = (_ns(bit) - _ns(bas)) / _NS
+        secilen = "1dk"
+        for ad, genislik in KATMANLAR.items():
+            if uzunluk_s / genislik >= hedef_nokta:
+                secilen = ad
+        return secilen, self.katman(secilen, bas, bit)
+
+    def toplam(self, bas, bit):
+        """[bas, bit) aralığının toplamlarını, aralığı tam kaplayan en kaba kovalardan hesaplar.
+
+        Gün kovalarıyla kaplanamayan kenarlar saat, onlar da dakika kovalarıyla tamamlanır
+        (çözünürlük 1 dakika: başlangıcı aralıkta olan dakika kovası dahil edilir).
+        """
+        secili = []
+        bas, bit = _ns(bas), _ns(bit)
+        kalan = [(bas, bit)]
+        for ad in ("1gun", "1sa", "1dk"):
+            genislik_ns = KATMANLAR[ad] * _NS
+            sonraki = []
+            for a, b in kalan:
+                kovalar = self.katman(ad, a, b)
+                if ad != "1dk":
+                    kovalar = kovalar[kovalar["baslangic"] + genislik_ns <= b]
+                if len(kovalar) == 0:
+                    sonraki.append((a, b))
+                    continue
+                # Kaplanan kısım ilk kovanın başı ile son kovanın sonu arası; boşluklar veri yok demektir
+                ilk, son = int(kovalar["baslangic"][0]), int(kovalar["baslangic"][-1]) + genislik_ns
+                secili.append(kovalar)
+                sonraki += [(a, ilk), (son, b)]
+            kalan = [(a, b) for a, b in sonraki if a < b]
+
+        if not secili:
+            return {"adet": 0, "litre": 0.0, "debi_ort": 0.0, "debi_min": 0.0, "debi_maks": 0.0,
+                    "varlik_s": 0.0, "yokluk_s": 0.0}
+        k = np.concatenate(secili)
+        debi_adet = int(k["debi_adet"].sum())
+        return {
+            "adet": int(k["adet"].sum()),
+            "litre": float(k["litre"].sum()),
+            "debi_ort": float(k["debi_toplam"].sum() / debi_adet) if debi_adet else 0.0,
+            "debi_min": float(k["debi_min"].min()) if debi_adet else 0.0,
+            "debi_maks": float(k["debi_maks"].max()) if debi_adet else 0.0,
+            "varlik_s": float(k["varlik_s"].sum()),
+            "yokluk_s": float(k["yokluk_s"].sum()),
+        }
+
+    @property
+    def son_zaman(self):
+        return None if self._son_t is None else np.datetime64(self._son_t, "ns")
+
+
+def _ns(ts):
+    return int(np.datetime64(ts, "ns").astype(np.int64))
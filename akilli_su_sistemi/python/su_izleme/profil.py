@@ -0,0 +1,262 @@
+# HAFTALIK TABAN PROFİLİ (HAFTANIN 168 SAATİ)
+# Tek referans noktası sabit debi eşiğiydi (Water2.py'de FLOW_THRESHOLD = 3.0): sabah duşu ile gece
+# 03:00'teki ince akış aynı ölçüyle değerlendiriliyordu. Bu profil her sayaç için haftanın saatine göre
+# (Pzt 00:00 = 0 ... Paz 23:00 = 167) iki dağılım tutar:
+#   ornek  örnek debisi (L/dk); her örnek düştüğü saate sayılır
+#   saat   saatlik tüketim (L); ozet.Ozetleyici'nin kapanan 1 sa kovalarından, süresinin en az
+#          MIN_KAPSAM'ı ölçülmüş saatler (cihaz kapalı geçen saatler dağılımı aşağı çekmesin)
+# Her kovada (adet, toplam, kare toplamı) tutulur: parti başına np.bincount ile tek geçişte güncellenir
+# (sonlu olmayan değerler atlanır: tek bir NaN kovayı kalıcı olarak bozardı),
+# ortalama ve sapma doğrudan hesaplanır. Skor, standart sapma cinsinden farktır:
+#   z = (x - ort) / max(sapma, MIN_SAPMA)     yeterli gözlemi olmayan kovada NaN (karşılaştırmalar False)
+# Tüm sayaçlar tek bir (sayaç, 168) matristedir: yüzlerce sayacın bir günü tek bir indeksleme ve
+# dizi işlemiyle skorlanır (bkz. bench/profil.py); bu yüzden her parti sonrasında çalıştırılabilir.
+# Zaman damgaları yerel saattir (CSV'deki gibi).
+#
+# Kalıcılık (dosya verilirse): np.savez + os.replace (atomik). Her sayacın son eklenen örnek / saat
+# zamanı da saklanır; açılışta geçmiş tekrar verildiğinde sadece sonrası eklenir.
+# Kullanım:  python -m su_izleme baseline kur su_tuketim.kolon [veri/mutfak ...] [--dosya su_tuketim.profil.npz]
+#            python -m su_izleme baseline goster [--dosya su_tuketim.profil.npz] [--sayac yerel] [--tur saat]
+
+import argparse
+import os
+
+import numpy as np
+
+HAFTA_SAAT = 168
+SAAT_NS = 3600 * 10**9
+PAZARTESI = 72  # 1970-01-01 perşembedir: epoch'tan beri geçen saate 72 eklenince 0 = pazartesi 00:00
+GUNLER = ("Pzt", "Sal", "Çar", "Per", "Cum", "Cmt", "Paz")
+TURLER = ("ornek", "saat")
+VARSAYILAN = "yerel"  # Tek sayaçlı izlemenin sayaç kimliği
+MIN_KAPSAM = 0.5  # Saatin en az bu kadarı ölçülmüşse saatlik tüketim profile girer
+MIN_GOZLEM = {"ornek": 60, "saat": 3}  # Bundan az gözlemli kovalar skorlanmaz
+MIN_SAPMA = {"ornek": 0.1, "saat": 1.0}  # L/dk, L; hep sıfır olan kovalarda her küçük akış sonsuz sapmasın
+SAPMA_ESIGI = 4.0  # Saatlik tüketim olağanın bu kadar sapma üzerindeyse uyarılır
+_BOS = np.iinfo(np.int64).min
+
+
+def haftanin_saati(zaman):
+    """Zaman damgalarının (datetime64 veya ns) haftanın saati indeksi (0 = Pzt 00:00)"""
+    ns = np.asarray(zaman)
+    if ns.dtype.kind != "i":
+        ns = np.asarray(zaman, dtype="datetime64[ns]").view(np.int64)
+    return (ns // SAAT_NS + PAZARTESI) % HAFTA_SAAT
+
+
+def saat_adi(hs):
+    return f"{GUNLER[hs // 24]} {hs % 24:02d}:00"
+
+
+class HaftalikProfil:
+    """Sayaç başına haftanın saatine göre debi ve saatlik tüketim dağılımları.
+
+    istatistik[tur] (sayaç, 168, 3) boyutunda (adet, toplam, kare toplamı) dizisidir; satır sırası
+    'kimlikler' ile aynıdır. Ekleme metotları son eklenen zamandan eski örnekleri atlar.
+    """
+
+    def __init__(self, dosya=None):
+        self.dosya = dosya
+        self._temiz_baslat()
+        if dosya and os.path.exists(dosya):
+            self._yukle()
+
+    def _temiz_baslat(self):
+        self.kimlikler = []
+        self._satir = {}
+        self.istatistik = {tur: np.zeros((0, HAFTA_SAAT, 3)) for tur in TURLER}
+        self.son = {tur: np.zeros(0, dtype=np.int64) for tur in TURLER}  # Sayaç başına son eklenen zaman (ns)
+        self._tablolar = {}
+        self._degisti = False
+
+    def satir(self, kimlik):
+        """Sayacın matris satırı; yeni sayaç için boş satır açılır"""
+        i = self._satir.get(kimlik)
+        if i is None:
+            i = self._satir[kimlik] = len(self.kimlikler)
+            self.kimlikler.append(kimlik)
+            for tur in TURLER:
+                self.istatistik[tur] = np.concatenate((self.istatistik[tur], np.zeros((1, HAFTA_SAAT, 3))))
+                self.son[tur] = np.append(self.son[tur], _BOS)
+            self._tablolar.clear()
+        return i
+
+    # --- EKLEME ---
+    def _ekle(self, tur, kimlik, zaman, deger, gecerli=None):
+        i = self.satir(kimlik)
+        ns = np.asarray(zaman, dtype="datetime64[ns]").view(np.int64)
+        yeni = ns > self.son[tur][i]
+        if not yeni.any():
+            return 0
+        self.son[tur][i] = ns[yeni].max()
+        deger = np.asarray(deger, dtype=np.float64)
+        yeni &= np.isfinite(deger)
+        if gecerli is not None:
+            yeni &= gecerli
+        ns, deger = ns[yeni], deger[yeni]
+        hs = haftanin_saati(ns)
+        ist = self.istatistik[tur][i]
+        ist[:, 0] += np.bincount(hs, minlength=HAFTA_SAAT)
+        ist[:, 1] += np.bincount(hs, weights=deger, minlength=HAFTA_SAAT)
+        ist[:, 2] += np.bincount(hs, weights=deger * deger, minlength=HAFTA_SAAT)
+        self._tablolar.pop(tur, None)
+        self._degisti = True
+        return len(ns)
+
+    def ornek_ekle(self, zaman, debi, kimlik=VARSAYILAN):
+        """Örnek debilerini profile katar; eklenen örnek sayısını döndürür"""
+        return self._ekle("ornek", kimlik, zaman, debi)
+
+    def saat_ekle(self, kovalar, kimlik=VARSAYILAN):
+        """Kapanmış 1 sa özet kovalarını (ozet.OZET_TIPI) profile katar; eklenen saat sayısını döndürür"""
+        return self._ekle("saat", kimlik, kovalar["baslangic"], kovalar["litre"], _kapsamli(kovalar))
+
+    def yeni_saatler(self, ozet, kimlik=VARSAYILAN):
+        """Özetleyicide kapanmış ama bu sayacın profiline henüz eklenmemiş 1 sa kovaları"""
+        return ozet.kapanan("1sa", int(self.son["saat"][self.satir(kimlik)]))
+
+    # --- SKORLAMA ---
+    def tablo(self, tur):
+        """(ortalama, sapma) (sayaç, 168) matrisleri; yetersiz gözlemli kovaların ortalaması NaN"""
+        tablo = self._tablolar.get(tur)
+        if tablo is None:
+            ist = self.istatistik[tur]
+            adet = ist[..., 0]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                ort = ist[..., 1] / adet
+                sapma = np.sqrt(np.maximum(ist[..., 2] / adet - ort * ort, 0.0))
+            ort[adet < MIN_GOZLEM[tur]] = np.nan
+            tablo = self._tablolar[tur] = (ort, np.fmax(sapma, MIN_SAPMA[tur]))
+        return tablo
+
+    def skor(self, tur, zaman, deger, satirlar):
+        """Değerlerin kendi sayaç satırı ve haftanın saatindeki z skorları.
+
+        satirlar matris satırlarıdır (tek sayı veya zaman/deger ile yayınlanabilen dizi): birden çok sayacın
+        değerleri tek çağrıda skorlanır, ör. zaman ve deger (sayaç, 24), satirlar (sayaç, 1).
+        """
+        ort, sapma = self.tablo(tur)
+        hs = haftanin_saati(zaman)
+        return (np.asarray(deger, dtype=np.float64) - ort[satirlar, hs]) / sapma[satirlar, hs]
+
+    def ornek_skoru(self, zaman, debi, kimlik=VARSAYILAN):
+        if kimlik not in self._satir:
+            return np.full(len(debi), np.nan)
+        return self.skor("ornek", zaman, debi, self._satir[kimlik])
+
+    def saat_skoru(self, kovalar, kimlik=VARSAYILAN):
+        """1 sa kovalarının tüketim skorları; kapsamı yetersiz saatler NaN"""
+        if kimlik not in self._satir:
+            return np.full(len(kovalar), np.nan)
+        z = self.skor("saat", kovalar["baslangic"], kovalar["litre"], self._satir[kimlik])
+        return np.where(_kapsamli(kovalar), z, np.nan)
+
+    def olagan(self, tur, zaman, kimlik=VARSAYILAN):
+        """Tek zaman için (ortalama, sapma)"""
+        ort, sapma = self.tablo(tur)
+        i, hs = self._satir[kimlik], int(haftanin_saati(np.int64(zaman)))
+        return float(ort[i, hs]), float(sapma[i, hs])
+
+    def saat_alarmlari(self, kovalar, esik=SAPMA_ESIGI, kimlik=VARSAYILAN):
+        """Kovaları profile göre skorlayıp (eklemeden) olağan dışı saatler için anomali.Alarm listesi"""
+        from su_izleme.anomali import Alarm
+
+        alarmlar = []
+        z = self.saat_skoru(kovalar, kimlik)
+        for j in np.flatnonzero(z > esik):
+            bas = int(kovalar["baslangic"][j])
+            ort, sapma = self.olagan("saat", bas, kimlik)
+            alarmlar.append(Alarm(bas + SAAT_NS, "saat_sapma",
+                                  f"Olağan dışı saat: {saat_adi(int(haftanin_saati(np.int64(bas))))} saatinde "
+                                  f"{kovalar['litre'][j]:.1f} L (olağan {ort:.1f} ± {sapma:.1f} L, z={z[j]:.1f})"))
+        return alarmlar
+
+    def hazir(self, tur="saat", kimlik=VARSAYILAN):
+        """Yeterli gözlemi olan kova sayısı (0-168)"""
+        if kimlik not in self._satir:
+            return 0
+        return int(np.isfinite(self.tablo(tur)[0][self._satir[kimlik]]).sum())
+
+    # --- KALICILIK ---
+    def _yukle(self):
+        with np.load(self.dosya) as dosya:
+            if int(dosya["surum"]) != 1:
+                return
+            self.kimlikler = dosya["kimlikler"].tolist()
+            for tur in TURLER:
+                self.istatistik[tur] = dosya[tur]
+                self.son[tur] = dosya["son_" + tur]
+        self._satir = {k: i for i, k in enumerate(self.kimlikler)}
+
+    def kaydet(self):
+        """Değiştiyse profili atomik olarak diske yazar"""
+        if not self.dosya or not self._degisti:
+            return
+        gecici = self.dosya + ".tmp.npz"
+        np.savez(gecici, surum=1, kimlikler=np.array(self.kimlikler, dtype=str),
+                 **self.istatistik, **{"son_" + tur: self.son[tur] for tur in TURLER})
+        os.replace(gecici, self.dosya)
+        self._degisti = False
+
+    def temizle(self):
+        """Profili boşaltır (diskteki dosya dahil)"""
+        self._temiz_baslat()
+        if self.dosya and os.path.exists(self.dosya):
+            os.remove(self.dosya)
+
+
+def _kapsamli(kovalar):
+    return kovalar["varlik_s"] + kovalar["yokluk_s"] >= MIN_KAPSAM * 3600
+
+
+def profil_tablosu(profil, tur="saat", kimlik=VARSAYILAN):
+    """Gün × saat tablosu: her hücrede olağan değer (yetersiz gözlemde '-')"""
+    ort = profil.tablo(tur)[0][profil.satir(kimlik)]
+    birim = "L" if tur == "saat" else "L/dk"
+    satirlar = [f"{kimlik} | {'saatlik tüketim' if tur == 'saat' else 'örnek debisi'} ({birim}), "
+                f"{profil.hazir(tur, kimlik)}/{HAFTA_SAAT} saat hazır",
+                "    " + "".join(f"{s:>6}" for s in range(24))]
+    for gun, ad in enumerate(GUNLER):
+        hucreler = ort[gun * 24:(gun + 1) * 24]
+        satirlar.append(f"{ad:<4}" + "".join(f"{d:>6.1f}" if np.isfinite(d) else f"{'-':>6}" for d in hucreler))
+    return "\n".join(satirlar)
+
+
+def main(argv=None):
+    from su_izleme import SUTUNLAR
+    from su_izleme.kalici import KolonDeposu
+    from su_izleme.ozet import Ozetleyici
+
+    parser = argparse.ArgumentParser(description="Haftanın saatine göre tüketim profili")
+    alt = parser.add_subparsers(dest="komut", required=True)
+    kur = alt.add_parser("kur", help="Sütunsal depo(lar)daki geçmişten profili kurar / günceller")
+    kur.add_argument("kolonlar", nargs="+", help="Sütunsal depo dizinleri (sayaç kimliği: dizin adı)")
+    kur.add_argument("--tek", action="store_true", help=f"Tek depo '{VARSAYILAN}' kimliğiyle (izlemenin profili)")
+    goster = alt.add_parser("goster", help="Profilin gün × saat tablosu")
+    goster.add_argument("--sayac", default=VARSAYILAN)
+    goster.add_argument("--tur", choices=TURLER, default="saat")
+    for p in (kur, goster):
+        p.add_argument("--dosya", default="su_tuketim.profil.npz", help="Profil dosyası")
+    args = parser.parse_args(argv)
+
+    profil = HaftalikProfil(args.dosya)
+    if args.komut == "goster":
+        if args.sayac not in profil.kimlikler:
+            print(f"Profilde '{args.sayac}' yok (mevcut: {', '.join(profil.kimlikler) or '-'})")
+            return
+        print(profil_tablosu(profil, args.tur, args.sayac))
+        return
+
+    for dizin in args.kolonlar:
+        kimlik = VARSAYILAN if args.tek else os.path.splitext(os.path.basename(os.path.normpath(dizin)))[0]
+        gecmis = KolonDeposu(dizin).yukle()
+        ozet = Ozetleyici()
+        ozet.ekle_toplu(*(gecmis[ad] for ad in SUTUNLAR))
+        ornek = profil.ornek_ekle(gecmis["timestamp"], gecmis["flow_lpm"], kimlik)
+        saat = profil.saat_ekle(profil.yeni_saatler(ozet, kimlik), kimlik)
+        print(f"{kimlik}: {ornek} örnek, {saat} saat eklendi; {profil.hazir('saat', kimlik)}/{HAFTA_SAAT} saat hazır")
+    profil.kaydet()
+
+
+if __name__ == "__main__":
+    main()
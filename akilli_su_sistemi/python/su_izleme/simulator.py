@@ -0,0 +1,250 @@
+# ARDUINO SERİ AKIŞ SİMÜLATÖRÜ
+# Donanım (COM6) olmadan Water*.py ve ağ geçidini çalıştırmak için, Arduino çiziminin
+# (arduino/main.ino/Water2.ino) Serial.print ile bastığı "flow,cumulative,ir\r\n" satırlarını üretir.
+#   - Darbe sayısı, 7.5 kalibrasyon katsayısı ve ~1001 ms ölçüm aralığıyla çizimdeki hesap aynen yapılır
+#   - Profiller: normal kullanım, kaçak, gece mikro kaçak, boşta
+#   - Akış, çizimin setup() sonunda bastığı HAZIR satırıyla başlar (su_izleme/acilis.py)
+#   - İsteğe bağlı bozuk satır (çöp, yarım satır, açılış mesajı) ekleme
+#   - --ikili ile metin yerine IKILI_PROTOKOL 1 çerçeveleri (su_izleme/ikili.py)
+#   - Kayıtlı bir su_tuketim.csv'yi N kat hızla yeniden oynatma
+# Çıkış: pty (seri port gibi açılır), TCP sunucusu veya standart çıktı.
+#
+# Kullanım:
+#   python -m su_izleme.simulator --pty [--hiz 1000] [--profil kacak] [--bozuk-oran 0.01]
+#   python -m su_izleme.simulator --tcp 9000 --tekrar su_tuketim.csv --carpan 60
+
+import argparse
+import os
+import socket
+import sys
+import time
+
+import numpy as np
+
+from su_izleme.acilis import HAZIR_ISARETI
+
+KALIBRASYON = 7.5  # Water2.ino: calibrationFactor (darbe -> litre)
+OLCUM_MS = 1001  # Water2.ino: if (currentTime - oldTime > 1000)
+PROFILLER = ("normal", "kacak", "gece_kacak", "bos")
+BOZUK_ORNEKLER = (b"\xff\xfe\x00garbage", b"12.3", b",,", b"nan,abc,1", b"Arduino hazir")
+
+
+class Simulator:
+    """Water2.ino ile aynı biçimde satır üreten, tohumlu (tekrarlanabilir) sayaç modeli"""
+
+    def __init__(self, profil="normal", bozuk_oran=0.0, seed=0, blok=4096, ikili=False):
+        if profil not in PROFILLER:
+            raise ValueError(f"Bilinmeyen profil: {profil} (seçenekler: {', '.join(PROFILLER)})")
+        self.profil = profil
+        self.bozuk_oran = bozuk_oran
+        self.blok = blok
+        self.ikili = ikili
+        self._sira = 0  # İkili çerçeve sıra numarası
+        self.rng = np.random.default_rng(seed)
+        self.toplam_litre = 0.0  # Water2.ino: totalLiters
+        self.saniye = 0  # Simülasyon saati (her satır ~1 s)
+        self._ir = 0
+        self._kalan = 0  # Mevcut varlık/yokluk döneminin kalan saniyesi
+        self._tampon = []
+
+    def _ir_uret(self, n):
+        """Kişi varlığı: ortalama ~2 dk ziyaretler, aralarında ~10 dk boşluk"""
+        ir = np.empty(n, dtype=np.int8)
+        i = 0
+        while i < n:
+            if self._kalan <= 0:
+                self._ir = 1 - self._ir
+                self._kalan = int(self.rng.exponential(120.0 if self._ir else 600.0)) + 1
+            adet = min(self._kalan, n - i)
+            ir[i:i + adet] = self._ir
+            self._kalan -= adet
+            i += adet
+        return ir
+
+    def _debi_uret(self, ir):
+        """Profile göre beklenen debi (L/dk)"""
+        n = len(ir)
+        saat = ((self.saniye + np.arange(n)) // 3600) % 24
+        if self.profil == "bos":
+            return np.zeros(n)
+        kullanim = np.where(ir == 1, self.rng.gamma(4.0, 1.5, size=n) * (self.rng.random(n) < 0.7), 0.0)
+        if self.profil == "kacak":
+            return kullanim + 0.8  # Sürekli açık kalmış musluk
+        if self.profil == "gece_kacak":
+            return kullanim + np.where((saat >= 1) & (saat < 5), 0.12, 0.0)  # Gece damlaması
+        return kullanim
+
+    def _blok_uret(self):
+        n = self.blok
+        ir = self._ir_uret(n)
+        beklenen_darbe = self._debi_uret(ir) * KALIBRASYON / 60.0 * (OLCUM_MS / 1000.0)
+        darbe = self.rng.poisson(beklenen_darbe)
+        # Water2.ino: flowRate = (pulses / calibrationFactor) / timeDiff; totalLiters += pulses / calibrationFactor
+        debi = (darbe / KALIBRASYON) / (OLCUM_MS / 60000.0)
+        toplam = self.toplam_litre + np.cumsum(darbe / KALIBRASYON)
+        self.toplam_litre = float(toplam[-1])
+        self.saniye += n
+
+        if self.ikili:
+            from su_izleme.ikili import cerceveler_olustur
+
+            matris = cerceveler_olustur(np.arange(self._sira, self._sira + n), debi, toplam, ir)
+            self._sira += n
+            satirlar = [satir.tobytes() for satir in matris]
+        else:
+            satirlar = [f"{f:.2f},{t:.2f},{i}\r\n".encode() for f, t, i in
+                        zip(debi.tolist(), toplam.tolist(), ir.tolist())]
+        if self.bozuk_oran > 0:
+            for k in np.flatnonzero(self.rng.random(n) < self.bozuk_oran):
+                secim = int(self.rng.integers(len(BOZUK_ORNEKLER) + 1))
+                if secim == len(BOZUK_ORNEKLER):
+                    satirlar[k] = satirlar[k][:len(satirlar[k]) // 2]  # Yarım satır/çerçeve (UART taşması gibi)
+                else:
+                    satirlar[k] = BOZUK_ORNEKLER[secim] + b"\r\n"  # İkili modda kayıp çerçeve olarak görünür
+        self._tampon.extend(reversed(satirlar))
+
+    def satirlar(self, n):
+        """Sıradaki n satırı (ikili modda çerçeveyi) bytes listesi olarak döndürür"""
+        sonuc = []
+        while len(sonuc) < n:
+            if not self._tampon:
+                self._blok_uret()
+            sonuc.append(self._tampon.pop())
+        return sonuc
+
+
+class CSVTekrar:
+    """Kayıtlı su_tuketim.csv satırlarını, zaman damgaları arasındaki boşluklara göre oynatır"""
+
+    def __init__(self, csv_yolu, carpan=1.0):
+        from su_izleme.kalici import csv_parca_ayristir
+
+        with open(csv_yolu, "rb") as f:
+            f.readline()  # Başlık
+            sutunlar, _ = csv_parca_ayristir(f.read())
+        self.zaman_s = (sutunlar["timestamp"] - sutunlar["timestamp"][0]) / np.timedelta64(1, "s") / carpan
+        self.satirlar_ = [f"{f:.2f},{c:.2f},{i}\r\n".encode() for f, c, i in
+                          zip(sutunlar["flow_lpm"].tolist(), sutunlar["cumulative_liters"].tolist(),
+                              sutunlar["ir_state"].tolist())]
+
+    def __len__(self):
+        return len(self.satirlar_)
+
+
+def yayinla(yaz, kaynak, hiz, adet=None, sure=None):
+    """kaynak'tan satırları saniyede 'hiz' satır olacak şekilde yaz(bytes) ile gönderir.
+
+    hiz <= 0 ise mümkün olan en yüksek hızla gönderilir. Gönderilen satır sayısını döndürür.
+    """
+    t0 = time.perf_counter()
+    gonderilen = 0
+    while (adet is None or gonderilen < adet) and (sure is None or time.perf_counter() - t0 < sure):
+        if hiz > 0:
+            sirada = int((time.perf_counter() - t0) * hiz) - gonderilen
+            if sirada <= 0:
+                time.sleep(min(1.0 / hiz, 0.01))
+                continue
+        else:
+            sirada = 4096
+        if adet is not None:
+            sirada = min(sirada, adet - gonderilen)
+        yaz(b"".join(kaynak.satirlar(min(sirada, 4096))))
+        gonderilen += min(sirada, 4096)
+    return gonderilen
+
+
+def tekrar_yayinla(yaz, tekrar):
+    """CSV kaydını orijinal zamanlamasıyla (çarpanla hızlandırılmış) gönderir"""
+    t0 = time.perf_counter()
+    for hedef, satir in zip(tekrar.zaman_s.tolist(), tekrar.satirlar_):
+        bekle = hedef - (time.perf_counter() - t0)
+        if bekle > 0:
+            time.sleep(bekle)
+        yaz(satir)
+    return len(tekrar)
+
+
+class PtyCikis:
+    """Seri port gibi açılabilen sahte terminal. Okuyan taraf yetişemezse UART gibi taşar:
+    sığmayan baytlar atılır ve 'tasan_bayt' sayacı artar."""
+
+    def __init__(self, baglanti=None):
+        import tty
+
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)
+        os.set_blocking(self.master, False)
+        self.yol = os.ttyname(self.slave)
+        self.baglanti = baglanti
+        if baglanti:
+            if os.path.lexists(baglanti):
+                os.remove(baglanti)
+            os.symlink(self.yol, baglanti)
+        self.tasan_bayt = 0
+
+    def __call__(self, veri):
+        try:
+            yazilan = os.write(self.master, veri)
+        except BlockingIOError:
+            yazilan = 0
+        self.tasan_bayt += len(veri) - yazilan
+
+    def kapat(self):
+        if self.baglanti and os.path.islink(self.baglanti):
+            os.remove(self.baglanti)
+        os.close(self.master)
+        os.close(self.slave)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Arduino seri akış simülatörü")
+    cikis = parser.add_mutually_exclusive_group()
+    cikis.add_argument("--pty", action="store_true", help="Sahte seri port (pty) aç ve yolunu yazdır")
+    cikis.add_argument("--tcp", type=int, metavar="PORT", help="TCP sunucusu olarak yayınla")
+    parser.add_argument("--baglanti", help="pty için sabit bir sembolik bağlantı yolu (ör. /tmp/arduino)")
+    parser.add_argument("--hiz", type=float, default=1.0, help="Satır/s (0 = sınırsız)")
+    parser.add_argument("--adet", type=int, help="Bu kadar satırdan sonra dur")
+    parser.add_argument("--profil", choices=PROFILLER, default="normal")
+    parser.add_argument("--bozuk-oran", type=float, default=0.0, help="Bozuk satır olasılığı (0-1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ikili", action="store_true", help="Metin yerine ikili çerçeve gönder")
+    parser.add_argument("--tekrar", metavar="CSV", help="Kayıtlı CSV'yi yeniden oynat")
+    parser.add_argument("--carpan", type=float, default=1.0, help="Yeniden oynatma hız çarpanı")
+    args = parser.parse_args(argv)
+
+    kapat = None
+    if args.pty:
+        pty = PtyCikis(args.baglanti)
+        print(f"Sahte seri port: {args.baglanti or pty.yol}", file=sys.stderr)
+        yaz, kapat = pty, pty.kapat
+    elif args.tcp:
+        sunucu = socket.create_server(("127.0.0.1", args.tcp))
+        print(f"Bağlantı bekleniyor: tcp://127.0.0.1:{args.tcp}", file=sys.stderr)
+        baglanti, _ = sunucu.accept()
+        yaz, kapat = baglanti.sendall, baglanti.close
+    else:
+        cikti = sys.stdout.buffer
+
+        def yaz(veri):
+            cikti.write(veri)
+            cikti.flush()
+
+    try:
+        yaz(HAZIR_ISARETI + b"\r\n")  # Water2.ino: setup() sonu
+        if args.tekrar:
+            gonderilen = tekrar_yayinla(yaz, CSVTekrar(args.tekrar, args.carpan))
+        else:
+            simulator = Simulator(args.profil, args.bozuk_oran, args.seed, ikili=args.ikili)
+            gonderilen = yayinla(yaz, simulator, args.hiz, adet=args.adet)
+        print(f"{gonderilen} satır gönderildi.", file=sys.stderr)
+    except (KeyboardInterrupt, BrokenPipeError, ConnectionError):
+        pass
+    finally:
+        if args.pty:
+            time.sleep(1.0)  # Okuyan tarafın pty'de kalan satırları alması için
+        if kapat:
+            kapat()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+# GEÇMİŞ ÜZERİNDE ZAMAN ARALIĞI SORGULARI
+# "Dün 07:00 ile 09:00 arasında ne kadar su harcandı?" sorusu için tüm su_tuketim.csv'yi
+# pandas'a yüklemek yerine sütunsal depodan (su_izleme.kalici) sadece ilgili bloklar okunur.
+#
+# Seyrek zaman indeksi: depo BLOK satırlık bloklara bölünür, her blok için en küçük ve en büyük
+# zaman damgası tutulur (<kolon dizini>/zaman.idx.npz). Sorgu, bu küçük tablodan ikili arama ile
+# aralığa değebilecek blokları bulur, sadece onları dosyadaki konumlarından okur ve kesin
+# filtrelemeyi okunan satırlarda yapar. Saat geri alınmış olsa da (sırasız zaman damgaları)
+# sonuç doğrudur; sadece okunan blok sayısı artar.
+# Sorgu süresi dosyanın boyuna değil aralıktaki satır sayısına bağlıdır.
+#
+# Kullanım:
+#   python -m su_izleme report --bas "2024-01-02 07:00" --bit "2024-01-02 09:00"
+#   python -m su_izleme report --bas 2024-01-02 --bit 2024-01-03 --csv su_tuketim.csv --kolon su_tuketim.kolon
+#   python -m su_izleme report --toplu --veri-dizini veri --kirilim ay      (sayaç × gün, süreç havuzu: toplu.py)
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from su_izleme.kalici import KolonDeposu
+from su_izleme.tuketim import aralik_toplamlari, kaydir, ornek_hacimleri, tuketim_araliklari
+
+BLOK = 4096  # İndeksteki blok başına satır
+SAAT_NS = 3600 * 10**9
+INDEKS = "zaman.idx.npz"
+
+
+def _ns(ts):
+    """Metin / datetime / np.datetime64 zamanı nanosaniye (int) cinsine çevirir"""
+    return int(np.datetime64(ts, "ns").astype(np.int64))
+
+
+class ZamanIndeksi:
+    """Sütunsal deponun zaman sütunu üzerinde blok başına (min, maks) tutan seyrek indeks.
+
+    Tamamlanmış bloklar diske yazılır; açılışta sadece indekslenmemiş satırlar okunur.
+    Depo sıfırlanıp yeniden doldurulmuşsa (ilk ve son indekslenmiş zaman tutmuyorsa) baştan kurulur.
+    """
+
+    def __init__(self, kolon, blok=BLOK):
+        self.kolon = kolon
+        self.blok = blok
+        self._yol = os.path.join(kolon.dizin, INDEKS)
+        self.minimum = np.empty(0, dtype=np.int64)
+        self.maksimum = np.empty(0, dtype=np.int64)
+        self.satir = 0  # İndeksin kapsadığı satır sayısı (son blok yarım olabilir)
+        self._kayitli_blok = 0
+        self._yukle()
+        self.guncelle()
+
+    def _yukle(self):
+        if not os.path.exists(self._yol):
+            return
+        with np.load(self._yol) as dosya:
+            if int(dosya["blok"]) != self.blok:
+                return
+            minimum, maksimum, kontrol = dosya["minimum"], dosya["maksimum"], dosya["kontrol"]
+        satir = len(minimum) * self.blok
+        if satir == 0 or satir > len(self.kolon):
+            return
+        ilk = self.kolon.oku(0, 1, ["timestamp"])["timestamp"][0]
+        son = self.kolon.oku(satir - 1, satir, ["timestamp"])["timestamp"][0]
+        if (ilk, son) != tuple(kontrol):
+            return  # Depo yeniden oluşturulmuş
+        self.minimum, self.maksimum = minimum, maksimum
+        self.satir = satir
+        self._kayitli_blok = len(minimum)
+        self._siralilari_hesapla()
+
+    def _siralilari_hesapla(self):
+        # Önek maksimumu ve sonek minimumu sıralıdır: aralığın kesin dışında kalan bloklar ikili aramayla atlanır
+        self._onek_maks = np.maximum.accumulate(self.maksimum)
+        self._sonek_min = np.minimum.accumulate(self.minimum[::-1])[::-1]
+
+    def guncelle(self):
+        """Depoya eklenen satırları indekse katar; eklenen satır sayısını döndürür"""
+        n = len(self.kolon)
+        if n < self.satir:  # Depo kısalmış (temizlenmiş): baştan kur
+            self.minimum = self.maksimum = np.empty(0, dtype=np.int64)
+            self.satir = self._kayitli_blok = 0
+        if n == self.satir:
+            return 0
+        # Yarım kalan son blok yeniden hesaplanır
+        bas = (self.satir // self.blok) * self.blok
+        zaman = self.kolon.oku(bas, n, ["timestamp"])["timestamp"]
+        baslar = np.arange(0, len(zaman), self.blok)
+        ilk_blok = bas // self.blok
+        self.minimum = np.concatenate((self.minimum[:ilk_blok], np.minimum.reduceat(zaman, baslar)))
+        self.maksimum = np.concatenate((self.maksimum[:ilk_blok], np.maximum.reduceat(zaman, baslar)))
+        eklenen, self.satir = n - self.satir, n
+        self._siralilari_hesapla()
+        if n // self.blok > self._kayitli_blok:
+            self._kaydet()
+        return eklenen
+
+    def _kaydet(self):
+        tam = self.satir // self.blok
+        ilk = self.kolon.oku(0, 1, ["timestamp"])["timestamp"][0]
+        son = self.kolon.oku(tam * self.blok - 1, tam * self.blok, ["timestamp"])["timestamp"][0]
+        gecici = self._yol + ".tmp.npz"
+        np.savez(gecici, blok=self.blok, minimum=self.minimum[:tam], maksimum=self.maksimum[:tam],
+                 kontrol=np.array([ilk, son], dtype=np.int64))
+        os.replace(gecici, self._yol)
+        self._kayitli_blok = tam
+
+    def satir_araligi(self, bas_ns, bit_ns):
+        """[bas_ns, bit_ns) aralığındaki tüm satırları kapsayan [ilk, son) satır aralığını döndürür"""
+        if self.satir == 0:
+            return 0, 0
+        ilk_blok = int(np.searchsorted(self._onek_maks, bas_ns, side="left"))
+        son_blok = int(np.searchsorted(self._sonek_min, bit_ns, side="left"))
+        if son_blok <= ilk_blok:
+            return 0, 0
+        return ilk_blok * self.blok, min(son_blok * self.blok, self.satir)
+
+
+class GecmisSorgusu:
+    """Sütunsal depo üzerinde zaman aralığı sorguları (toplam, ortalama, gereksiz tüketim).
+
+    csv verilirse açılışta depo CSV ile eşitlenir (sadece yeni satırlar aktarılır).
+    Her sorgudan önce depoya eklenen satırlar indekse katılır.
+    """
+
+    def __init__(self, kolon_dizini, csv=None, blok=BLOK):
+        self.kolon = KolonDeposu(kolon_dizini)
+        if csv:
+            self.kolon.csv_esitle(csv)
+        self.indeks = ZamanIndeksi(self.kolon, blok=blok)
+        self.okunan_satir = 0  # Son sorguda diskten okunan satır sayısı
+
+    def _oku(self, bas, bit, sutunlar, onceki=False):
+        """[bas, bit) zaman aralığındaki satırların sütunlarını döndürür.
+
+        onceki=True ise her satırın dosyadaki bir önceki satırının zamanı ve sayaç değeri de
+        ('onceki_ns', 'onceki_cumulative') döner; aralığın ilk satırının tüketimi için gerekir.
+        """
+        self.indeks.guncelle()
+        bas_ns, bit_ns = _ns(bas), _ns(bit)
+        ilk, son = self.indeks.satir_araligi(bas_ns, bit_ns)
+        ek = 1 if onceki and ilk > 0 else 0
+        if onceki and "cumulative_liters" not in sutunlar:
+            sutunlar = list(sutunlar) + ["cumulative_liters"]
+        veri = self.kolon.oku(ilk - ek, son, ["timestamp"] + list(sutunlar))
+        self.okunan_satir = son - ilk + ek
+        zaman = veri["timestamp"]
+        maske = (zaman >= bas_ns) & (zaman < bit_ns)
+        if ek:
+            maske[0] = False
+        sonuc = {ad: dizi[maske] for ad, dizi in veri.items()}
+        sonuc["timestamp"] = sonuc["timestamp"].view("datetime64[ns]")
+        if onceki and len(zaman):
+            # Dosyanın ilk satırının öncesi yok: kendisiyle farkı 0 sayılır
+            cumulative = veri["cumulative_liters"]
+            sonuc["onceki_ns"] = kaydir(zaman, zaman[0])[maske]
+            sonuc["onceki_cumulative"] = kaydir(cumulative, cumulative[0])[maske]
+        elif onceki:
+            sonuc["onceki_ns"] = zaman
+            sonuc["onceki_cumulative"] = veri["cumulative_liters"]
+        return sonuc
+
+    def aralik(self, bas, bit):
+        """[bas, bit) aralığındaki tüm örnekleri sütun sözlüğü olarak döndürür"""
+        return self._oku(bas, bit, ["flow_lpm", "cumulative_liters", "ir_state"])
+
+    def toplam(self, bas, bit):
+        """[bas, bit) aralığında tüketilen su (L): ardışık sayaç değerleri farkının toplamı.
+
+        Sayaç geri giderse (Arduino yeniden başladı) yeni değer sıfırdan tüketim sayılır.
+        """
+        veri = self._oku(bas, bit, ["flow_lpm"], onceki=True)
+        _, litre = ornek_hacimleri(veri["timestamp"].view(np.int64), veri["flow_lpm"], veri["cumulative_liters"],
+                                   veri["onceki_ns"], veri["onceki_cumulative"])
+        return round(float(litre.sum()), 2)
+
+    def ortalama(self, bas, bit):
+        """[bas, bit) aralığındaki ortalama anlık debi (L/dk)"""
+        debi = self._oku(bas, bit, ["flow_lpm"])["flow_lpm"]
+        if len(debi) == 0:
+            return 0.0
+        return round(float(debi.mean()), 2)
+
+    def araliklar(self, bas, bit):
+        """[bas, bit) içindeki kişi var / yok aralıkları (bkz. tuketim.tuketim_araliklari)"""
+        return self._araliklar(self._oku(bas, bit, ["flow_lpm", "ir_state"], onceki=True))
+
+    @staticmethod
+    def _araliklar(veri):
+        return tuketim_araliklari(veri["timestamp"], veri["flow_lpm"], veri["cumulative_liters"], veri["ir_state"],
+                                  onceki_ns=veri["onceki_ns"], onceki_c=veri["onceki_cumulative"])
+
+    def gereksiz(self, bas, bit):
+        """[bas, bit) aralığında IR sensörü 0 iken akan su (L); gereksiz_tuketim_hesapla ile aynı kural"""
+        return round(aralik_toplamlari(self.araliklar(bas, bit))["yokluk_litre"], 2)
+
+    def kismi_ozet(self, bas, bit):
+        """[bas, bit) için birleştirilebilir ara toplamlar (toplu.birlestir ile toplanır).
+
+        Aralıkların toplamı, birleşik aralığın toplamıyla aynıdır: ilk satırın hacmi dosyadaki
+        önceki satırdan alınır. saatlik: günün saatine (0-23) göre litre.
+        """
+        veri = self._oku(bas, bit, ["flow_lpm", "ir_state"], onceki=True)
+        ns = veri["timestamp"].view(np.int64)
+        debi = veri["flow_lpm"]
+        _, litre = ornek_hacimleri(ns, debi, veri["cumulative_liters"], veri["onceki_ns"], veri["onceki_cumulative"])
+        return {
+            "kayit": len(ns),
+            "debi_toplam": float(debi.sum()),
+            "debi_maks": float(debi.max()) if len(debi) else 0.0,
+            "litre": float(litre.sum()),
+            "gereksiz": float(litre[veri["ir_state"] == 0].sum()),
+            "saatlik": np.bincount(ns // SAAT_NS % 24, weights=litre, minlength=24),
+        }
+
+    def rapor(self, bas, bit):
+        """Aralık için tek okumayla kayıt sayısı, toplam, ortalama, gereksiz tüketim ve
+        en çok suyun boşa aktığı kişi yok aralığı"""
+        veri = self._oku(bas, bit, ["flow_lpm", "ir_state"], onceki=True)
+        araliklar = self._araliklar(veri)
+        toplamlar = aralik_toplamlari(araliklar)
+        debi = veri["flow_lpm"]
+        bos = np.flatnonzero(~araliklar["varlik"] & (araliklar["litre"] > 0))
+        en_buyuk = None
+        if len(bos):
+            i = bos[np.argmax(araliklar["litre"][bos])]
+            en_buyuk = (araliklar["baslangic"][i], araliklar["bitis"][i], round(float(araliklar["litre"][i]), 2))
+        return {
+            "kayit": len(debi),
+            "toplam": round(toplamlar["varlik_litre"] + toplamlar["yokluk_litre"], 2),
+            "ortalama_debi": round(float(debi.mean()), 2) if len(debi) else 0.0,
+            "gereksiz": round(toplamlar["yokluk_litre"], 2),
+            "israf_araligi": len(bos),
+            "en_buyuk_israf": en_buyuk,
+        }
+
+
+def toplu_main(args):
+    from su_izleme.toplu import sayaclar, tablo, toplu_rapor
+
+    if args.veri_dizini:
+        dizinler = sayaclar(args.veri_dizini)
+    else:
+        GecmisSorgusu(args.kolon, csv=args.csv)  # CSV eşitlemesi işçilerden önce, bir kez
+        dizinler = {os.path.splitext(os.path.basename(os.path.normpath(args.kolon)))[0]: args.kolon}
+    t0 = time.perf_counter()
+    rapor = toplu_rapor(dizinler, args.bas, args.bit, args.is_sayisi, args.kirilim)
+    if rapor["bolum"] == 0:
+        print("Raporlanacak kayıt yok")
+        return
+    print(tablo(rapor, args.kirilim))
+    print(f"\n{len(rapor['sayaclar'])} sayaç, {rapor['bolum']} sayaç-gün bölümü "
+          f"{time.perf_counter() - t0:.1f} s'de işlendi ({args.is_sayisi or os.cpu_count()} süreç)")
+
+
+def main(argv=None):
+    from su_izleme.toplu import KIRILIMLAR  # toplu.py bu modülü içe aktarır
+
+    parser = argparse.ArgumentParser(description="Tüketim geçmişinde zaman aralığı sorgusu")
+    parser.add_argument("--bas", help="Aralık başı (ör. '2024-01-02 07:00'; --toplu ile isteğe bağlı)")
+    parser.add_argument("--bit", help="Aralık sonu (dahil değil)")
+    parser.add_argument("--kolon", default="su_tuketim.kolon", help="Sütunsal depo dizini")
+    parser.add_argument("--csv", default="su_tuketim.csv", help="Önce eşitlenecek CSV (yoksa atlanır)")
+    toplu = parser.add_argument_group("toplu rapor (sayaç × gün bölümleri, süreç havuzu; bkz. toplu.py)")
+    toplu.add_argument("--toplu", action="store_true", help="Toplu raporu çalıştır")
+    toplu.add_argument("--veri-dizini", help="Çoklu sayaç: her alt dizin bir sayacın deposu (varsayılan: --kolon)")
+    toplu.add_argument("--kirilim", choices=KIRILIMLAR, default="yok", help="Sayaç toplamının yanında dönem satırları")
+    toplu.add_argument("--is", type=int, dest="is_sayisi", help="Süreç sayısı (varsayılan: çekirdek sayısı)")
+    args = parser.parse_args(argv)
+
+    if args.toplu:
+        toplu_main(args)
+        return
+    if not args.bas or not args.bit:
+        parser.error("--bas ve --bit gerekli (veya --toplu)")
+    sorgu = GecmisSorgusu(args.kolon, csv=args.csv)
+    rapor = sorgu.rapor(args.bas, args.bit)
+    print(f"Aralık: {args.bas} - {args.bit}")
+    print(f"Kayıt: {rapor['kayit']} adet (okunan: {sorgu.okunan_satir})")
+    print(f"Toplam Tüketim: {rapor['toplam']} L")
+    print(f"Ortalama Debi: {rapor['ortalama_debi']} L/dk")
+    print(f"Gereksiz Tüketim: {rapor['gereksiz']} L ({rapor['israf_araligi']} kişi yok aralığında)")
+    if rapor["en_buyuk_israf"]:
+        bas, bit, litre = rapor["en_buyuk_israf"]
+        print(f"En büyük: {litre} L ({bas.astype('datetime64[s]')} - {bit.astype('datetime64[s]')})")
+
+
+if __name__ == "__main__":
+    main()
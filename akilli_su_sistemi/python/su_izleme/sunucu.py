@@ -0,0 +1,320 @@
+# YEREL SORGU SUNUCUSU (HTTP / JSON + Prometheus)
+# Panolar eskiden konsol çıktısını veya üzerine yazılan PNG dosyalarını okumak zorundaydı. İzleme
+# sürecinin içinde, kendi iş parçacığındaki asyncio olay döngüsünde çalışan küçük bir HTTP/1.1 sunucusu:
+#   GET /son                 son örnek ve toplamlar (Analiz.son_durum; kilitsiz okunur)
+#   GET /ozet                son 1 sa / 24 sa / 7 gün tüketimi (özet katmanlarından)
+#   GET /aralik?bas=..&bit=..[&nokta=500]
+#                            aralığın toplamları ve en fazla 'nokta' kova (katman otomatik seçilir)
+#   GET /rapor               optimizasyon raporu (metin)
+#   GET /anlik               son örneğin anlık görünümü (metin)
+#   GET /metrik              metrik.Metrikler görüntüsü ve önbellek sayaçları (JSON)
+#   GET /metrics             Prometheus metin biçimi
+# Yanıtlar CSV'den değil bellekteki özetlerden üretilir ve Analiz.onbellek'te (onbellek.SurumluOnbellek)
+# veri sürümü ve zaman aralığıyla saklanır: yeni örnek gelene kadar aynı yanıt tekrar hesaplanmaz,
+# geçmiş bir aralığın yanıtı yeni örneklerden etkilenmez. Yüzlerce pano aynı anda sorgulasa da analiz
+# iş parçacığı sadece özet kilidinde, kısa süreli bekler. Bağlantılar açık tutulur (keep-alive);
+# varsayılan adres sadece yerel makinedir. JSON yanıtlarında sonlu olmayan sayılar (NaN, ±inf) null yazılır:
+# json.dumps'ın NaN belirteci geçerli JSON değildir, standart istemciler yanıtı reddeder.
+# Kullanım:  python -m su_izleme monitor --http 8080   sonra   curl http://127.0.0.1:8080/son
+
+import asyncio
+import json
+import math
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from su_izleme.cizim import kova_baslari
+from su_izleme.ozet import kovalari_birlestir
+
+ONBELLEK_S = 1.0  # İstemcilere bildirilen Cache-Control süresi (örnekler 1 Hz gelir)
+MAKS_NOKTA = 5000  # /aralik yanıtındaki en fazla kova
+MAKS_BASLIK = 8192  # İstek satırı + başlıkların en fazla boyu (bayt)
+BOSTA_ZAMAN_ASIMI = 30.0  # Boşta bekleyen bağlantı bu kadar saniye sonra kapatılır
+PENCERELER = {"son_1sa": 3600, "son_24sa": 86_400, "son_7gun": 7 * 86_400}
+_DURUM_METNI = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                431: "Request Header Fields Too Large", 503: "Service Unavailable"}
+
+
+class IstekHatasi(Exception):
+    def __init__(self, durum, mesaj):
+        super().__init__(mesaj)
+        self.durum = durum
+
+
+def _sonlu(veri):
+    """İç içe sözlük / listelerdeki sonlu olmayan float değerleri None yapar"""
+    if isinstance(veri, float):
+        return veri if math.isfinite(veri) else None
+    if isinstance(veri, dict):
+        return {k: _sonlu(v) for k, v in veri.items()}
+    if isinstance(veri, (list, tuple)):
+        return [_sonlu(v) for v in veri]
+    return veri
+
+
+def _json(veri):
+    govde = json.dumps(_sonlu(veri), ensure_ascii=False, allow_nan=False)
+    return 200, "application/json; charset=utf-8", govde.encode()
+
+
+def _metin(metin):
+    return 200, "text/plain; charset=utf-8", (metin.strip("\n") + "\n").encode()
+
+
+def _yuvarla(toplamlar):
+    return {k: round(v, 3) if isinstance(v, float) else v for k, v in toplamlar.items()}
+
+
+def _kovalar_json(kovalar):
+    debili = kovalar["debi_adet"] > 0  # Sonlu debisi olmayan kovanın debi alanları boş (null)
+    return {
+        "baslangic": [str(t) for t in kovalar["baslangic"].view("datetime64[ns]").astype("datetime64[s]")],
+        "adet": kovalar["adet"].tolist(),
+        "litre": np.round(kovalar["litre"], 3).tolist(),
+        "debi_ort": np.where(debili, np.round(kovalar["debi_toplam"] / np.maximum(kovalar["debi_adet"], 1), 3),
+                             np.nan).tolist(),
+        "debi_min": np.where(debili, kovalar["debi_min"], np.nan).tolist(),
+        "debi_maks": np.where(debili, kovalar["debi_maks"], np.nan).tolist(),
+        "varlik_s": np.round(kovalar["varlik_s"], 1).tolist(),
+        "yokluk_s": np.round(kovalar["yokluk_s"], 1).tolist(),
+    }
+
+
+def _prometheus(satirlar, ad, tur, aciklama, degerler):
+    """degerler: [(etiket sözlüğü veya None, değer)]"""
+    satirlar.append(f"# HELP {ad} {aciklama}")
+    satirlar.append(f"# TYPE {ad} {tur}")
+    for etiketler, deger in degerler:
+        if etiketler:
+            etiket = ",".join(f'{k}="{v}"' for k, v in etiketler.items())
+            satirlar.append(f"{ad}{{{etiket}}} {deger}")
+        else:
+            satirlar.append(f"{ad} {deger}")
+
+
+class SorguSunucusu:
+    """Bir izleme.Analiz aşamasının bellekteki durumunu HTTP üzerinden sunar.
+
+    boru (BoruHatti) ve metrikler (metrik.Metrikler) verilirse /metrik ve /metrics bunları da içerir.
+    baslat() sunucuyu ayrı bir daemon iş parçacığında açar ve dinlenen portu döndürür (port=0: boş port).
+    """
+
+    def __init__(self, analiz, boru=None, metrikler=None, adres="127.0.0.1", port=8080):
+        self.analiz = analiz
+        self.boru = boru
+        self.metrikler = metrikler
+        self.adres = adres
+        self.port = port
+        self.istek_sayisi = 0
+        self.baglanti_sayisi = 0
+        self._yollar = {
+            "/": self._dizin,
+            "/son": self._son,
+            "/ozet": self._ozet,
+            "/aralik": self._aralik,
+            "/rapor": lambda _: _metin(self.analiz.rapor()),
+            "/anlik": lambda _: _metin(self.analiz.anlik()),
+            "/metrik": self._metrik,
+            "/metrics": self._metrics,
+        }
+        self._dongu = None
+        self._sunucu = None
+        self._hazir = threading.Event()
+        self._hata = None
+        self._is = threading.Thread(target=self._calis, name="sorgu-sunucusu", daemon=True)
+
+    # --- YAŞAM DÖNGÜSÜ ---
+    def baslat(self):
+        self._is.start()
+        self._hazir.wait()
+        if self._hata is not None:
+            raise self._hata
+        return self.port
+
+    def _calis(self):
+        self._dongu = asyncio.new_event_loop()
+        try:
+            self._sunucu = self._dongu.run_until_complete(
+                asyncio.start_server(self._istemci, self.adres, self.port, limit=MAKS_BASLIK))
+        except OSError as e:
+            self._hata = e
+            self._hazir.set()
+            return
+        self.port = self._sunucu.sockets[0].getsockname()[1]
+        self._hazir.set()
+        try:
+            self._dongu.run_forever()
+        finally:
+            self._sunucu.close()
+            self._dongu.run_until_complete(self._sunucu.wait_closed())
+            self._dongu.close()
+
+    def durdur(self):
+        if self._dongu is not None and self._dongu.is_running():
+            self._dongu.call_soon_threadsafe(self._dongu.stop)
+            self._is.join(5.0)
+
+    # --- HTTP ---
+    async def _istemci(self, reader, writer):
+        self.baglanti_sayisi += 1
+        try:
+            while True:
+                try:
+                    baslik = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), BOSTA_ZAMAN_ASIMI)
+                except asyncio.LimitOverrunError:
+                    writer.write(self._paketle(431, "text/plain; charset=utf-8", b"Baslik cok uzun\n", False))
+                    break
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+                satirlar = baslik.decode("latin-1").split("\r\n")
+                parcalar = satirlar[0].split(" ")
+                if len(parcalar) != 3:
+                    writer.write(self._paketle(400, "text/plain; charset=utf-8", b"Gecersiz istek\n", False))
+                    break
+                yontem, hedef, surum = parcalar
+                basliklar = {k.strip().lower(): v.strip() for k, _, v in (s.partition(":") for s in satirlar[1:] if s)}
+                acik_kalsin = (surum == "HTTP/1.1" and basliklar.get("connection", "").lower() != "close"
+                               or basliklar.get("connection", "").lower() == "keep-alive")
+                if yontem not in ("GET", "HEAD"):
+                    durum, tur, govde = 405, "text/plain; charset=utf-8", b"Sadece GET\n"
+                else:
+                    durum, tur, govde = self.yanit(hedef)
+                yanit = self._paketle(durum, tur, govde, acik_kalsin)
+                writer.write(yanit[:len(yanit) - len(govde)] if yontem == "HEAD" else yanit)
+                await writer.drain()
+                if not acik_kalsin:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.baglanti_sayisi -= 1
+            writer.close()
+
+    @staticmethod
+    def _paketle(durum, tur, govde, acik_kalsin):
+        baslik = (f"HTTP/1.1 {durum} {_DURUM_METNI.get(durum, '')}\r\n"
+                  f"Content-Type: {tur}\r\nContent-Length: {len(govde)}\r\n"
+                  f"Cache-Control: max-age={ONBELLEK_S:.0f}\r\n"
+                  f"Connection: {'keep-alive' if acik_kalsin else 'close'}\r\n\r\n")
+        return baslik.encode() + govde
+
+    def yanit(self, hedef):
+        """İstek hedefi (yol?sorgu) için (durum, içerik türü, gövde) döndürür"""
+        self.istek_sayisi += 1
+        adres = urlsplit(hedef)
+        islev = self._yollar.get(adres.path.rstrip("/") or "/")
+        if islev is None:
+            return 404, "text/plain; charset=utf-8", b"Bilinmeyen yol; / adresine bakin\n"
+        try:
+            return islev({k: v[-1] for k, v in parse_qs(adres.query).items()})
+        except IstekHatasi as e:
+            return e.durum, "application/json; charset=utf-8", json.dumps({"hata": str(e)}).encode()
+
+    # --- YOLLAR ---
+    def _dizin(self, _):
+        return _json({"yollar": sorted(self._yollar), "ornek": "/aralik?bas=2024-01-02T07:00&bit=2024-01-02T09:00"})
+
+    def _son(self, _):
+        durum = self.analiz.son_durum
+        if durum is None:
+            raise IstekHatasi(503, "Henüz veri yok")
+        return _json(durum)
+
+    def _ozet(self, _):
+        if self.analiz.son_durum is None:
+            raise IstekHatasi(503, "Henüz veri yok")
+        return self.analiz.onbellek.al(("/ozet",), self._ozet_hesapla)  # Pencereler son örnekte biter
+
+    def _ozet_hesapla(self):
+        durum = self.analiz.son_durum
+        with self.analiz.kilit:
+            son = self.analiz.ozet.son_zaman
+            if son is None:
+                raise IstekHatasi(503, "Özetler henüz hazır değil")
+            bit = son + np.timedelta64(1, "ns")
+            pencereler = {ad: _yuvarla(self.analiz.ozet.toplam(bit - np.timedelta64(s, "s"), bit))
+                          for ad, s in PENCERELER.items()}
+        return _json(dict(durum, **pencereler))
+
+    def _aralik(self, sorgu):
+        try:
+            bas = np.datetime64(sorgu["bas"], "ns")
+            bit = np.datetime64(sorgu["bit"], "ns")
+            nokta = min(int(sorgu.get("nokta", 500)), MAKS_NOKTA)
+        except KeyError as e:
+            raise IstekHatasi(400, f"Eksik parametre: {e.args[0]}")
+        except ValueError as e:
+            raise IstekHatasi(400, f"Geçersiz parametre: {e}")
+        if not bas < bit or nokta < 1:
+            raise IstekHatasi(400, "bas < bit ve nokta >= 1 olmalı")
+        return self.analiz.onbellek.al(("/aralik", int(bas.astype(np.int64)), int(bit.astype(np.int64)), nokta),
+                                       lambda: self._aralik_hesapla(bas, bit, nokta), bas, bit)
+
+    def _aralik_hesapla(self, bas, bit, nokta):
+        with self.analiz.kilit:
+            toplamlar = self.analiz.ozet.toplam(bas, bit)
+            katman, kovalar = self.analiz.ozet.sorgula(bas, bit, hedef_nokta=nokta)
+        if len(kovalar) > nokta:
+            kovalar = kovalari_birlestir(kovalar, kova_baslari(kovalar["baslangic"], nokta))
+        return _json({"bas": str(bas.astype("datetime64[s]")), "bit": str(bit.astype("datetime64[s]")),
+                      "toplam": _yuvarla(toplamlar), "katman": katman, "kovalar": _kovalar_json(kovalar)})
+
+    def _metrik(self, _):
+        if self.metrikler is None:
+            raise IstekHatasi(404, "Metrikler kapalı (--metrik)")
+        # goruntu(boru) örnek hızını önceki çağrıya göre hesaplar: izleme döngüsünün aralığı bozulmasın
+        goruntu = self.metrikler.goruntu()
+        if self.boru is not None:
+            goruntu["boru"] = self.boru.istatistik()
+        goruntu["onbellek"] = self.analiz.onbellek.istatistik()
+        return _json(goruntu)
+
+    def _metrics(self, _):
+        satirlar = []
+        durum = self.analiz.son_durum
+        if durum is not None:
+            _prometheus(satirlar, "su_ornek_toplam", "counter", "Analiz edilen örnek", [(None, durum["kayit"])])
+            _prometheus(satirlar, "su_omur_toplam_litre", "counter", "Sayaç sıfırlamaları düzeltilmiş toplam tüketim",
+                        [(None, durum["omur_toplam"])])
+            _prometheus(satirlar, "su_debi_lpm", "gauge", "Son anlık debi (L/dk)", [(None, durum["flow_lpm"])])
+            _prometheus(satirlar, "su_kisi_var", "gauge", "IR sensörü (1 = kişi var)", [(None, durum["ir_state"])])
+            _prometheus(satirlar, "su_gereksiz_litre", "gauge", "Kişi yokken akan toplam su",
+                        [(None, durum["gereksiz"])])
+            _prometheus(satirlar, "su_sayac_sifirlama_toplam", "counter", "Arduino sayaç sıfırlanması",
+                        [(None, durum["sifirlama"])])
+            _prometheus(satirlar, "su_anomali_toplam", "counter", "Anomali uyarısı", [(None, durum["anomali"])])
+        if self.boru is not None:
+            s = self.boru.istatistik()
+            for anahtar, aciklama in (("okunan", "Seri porttan okunan satır / parça"),
+                                      ("dusen", "Ham kuyruk dolduğu için düşen"),
+                                      ("hatali", "Ayrıştırılamayan satır / çerçeve"),
+                                      ("kayip", "İkili protokolde kayıp örnek")):
+                _prometheus(satirlar, f"su_{anahtar}_toplam", "counter", aciklama, [(None, s[anahtar])])
+            _prometheus(satirlar, "su_ham_kuyruk", "gauge", "Okuyucu kuyruğundaki öğe", [(None, s["ham_kuyruk"])])
+            asamalar = s["asamalar"].items()
+            _prometheus(satirlar, "su_asama_kuyruk", "gauge", "Aşama kuyruğundaki öğe",
+                        [({"asama": ad}, a["kuyruk"]) for ad, a in asamalar])
+            _prometheus(satirlar, "su_asama_islenen_toplam", "counter", "Aşamanın işlediği öğe",
+                        [({"asama": ad}, a["islenen"]) for ad, a in asamalar])
+            _prometheus(satirlar, "su_asama_hata_toplam", "counter", "Aşama hatası",
+                        [({"asama": ad}, a["hata"]) for ad, a in asamalar])
+        if self.metrikler is not None:
+            ad = "su_gecikme_saniye"
+            satirlar.append(f"# HELP {ad} Aşama / ayrıştırma / rapor çağrısı süresi")
+            satirlar.append(f"# TYPE {ad} summary")
+            for asama, h in list(self.metrikler.histogramlar.items()):
+                for q in (0.5, 0.99):
+                    satirlar.append(f'{ad}{{asama="{asama}",quantile="{q}"}} {h.yuzdelik(q * 100):.6g}')
+                satirlar.append(f'{ad}_sum{{asama="{asama}"}} {h.toplam:.6g}')
+                satirlar.append(f'{ad}_count{{asama="{asama}"}} {h.adet}')
+        o = self.analiz.onbellek.istatistik()
+        for anahtar, aciklama in (("isabet", "Önbellekten verilen sonuç"), ("iska", "Önbellekte bulunmayıp hesaplanan"),
+                                  ("gecersiz", "Yeni örneklerin geçersiz kıldığı kayıt"),
+                                  ("tahliye", "Boyut / kayıt sınırı yüzünden atılan kayıt")):
+            _prometheus(satirlar, f"su_onbellek_{anahtar}_toplam", "counter", aciklama, [(None, o[anahtar])])
+        _prometheus(satirlar, "su_onbellek_bayt", "gauge", "Önbellekteki sonuçların tahmini boyu", [(None, o["bayt"])])
+        _prometheus(satirlar, "su_http_istek_toplam", "counter", "Sorgu sunucusuna gelen istek",
+                    [(None, self.istek_sayisi)])
+        return 200, "text/plain; version=0.0.4; charset=utf-8", ("\n".join(satirlar) + "\n").encode()
@@ -0,0 +1,87 @@
+# KAYITLI GEÇMİŞİ YENİDEN İŞLEME
+# Canlı izlemedeki Analiz aşaması (su_izleme/izleme.py) aynı Asama iş parçacığı ve parti boyutuyla
+# kayıtlı geçmişle beslenir; seri port ve CSV yazımı yoktur, örnekler beklemeden akar.
+#   - Eşik / sızıntı süresi gibi ayarların eski verideki etkisini görmek (uyarılar kayıtlı zamanlarıyla basılır)
+#   - Aşama süresini ölçmek (--zamanlama): örnek başına µs ve parti / rapor gecikmesi histogramları
+#     (metrik.py) canlı izlemedeki sürelerin karşılığıdır
+# Zamanında yeniden oynatma (seri port üzerinden) için: python -m su_izleme.simulator --tekrar CSV
+# Kullanım:  python -m su_izleme replay [--csv su_tuketim.csv] [--kolon su_tuketim.kolon] [--esik 3.0]
+
+import argparse
+import time
+
+import numpy as np
+
+from su_izleme import SUTUNLAR
+from su_izleme.anomali import SUREKLI_DK
+from su_izleme.boru_hatti import Asama
+from su_izleme.izleme import DEBI_ESIGI, Analiz
+from su_izleme.kalici import KolonDeposu
+from su_izleme.metrik import Metrikler
+
+PARTI = 65536  # Diskten tek seferde okunan satır
+
+
+def ornekler(kolon, bas=0, bit=None, parti=PARTI):
+    """Depodaki satırları canlı akıştaki gibi (ts, flow, cumulative, ir) demetleri olarak üretir"""
+    bit = len(kolon) if bit is None else min(bit, len(kolon))
+    for i in range(bas, bit, parti):
+        veri = kolon.oku(i, min(i + parti, bit))
+        # datetime64[us] -> datetime: canlı akıştaki zaman damgalarıyla aynı tür
+        zaman = veri["timestamp"].view("datetime64[ns]").astype("datetime64[us]").tolist()
+        yield from zip(zaman, *(veri[ad].tolist() for ad in SUTUNLAR[1:]))
+
+
+def tekrar(kolon, analiz, bas=0, bit=None, kanca=None):
+    """Geçmişi Analiz aşamasından geçirir; (örnek sayısı, süre s, aşama) döndürür"""
+    asama = Asama(analiz.ad, analiz, kuyruk_boyu=4096, kanca=kanca)
+    t0 = time.perf_counter()
+    asama.baslat()
+    adet = 0
+    for ornek in ornekler(kolon, bas, bit):
+        asama.gonder(ornek)
+        adet += 1
+    asama.durdur()
+    return adet, time.perf_counter() - t0, asama
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kayıtlı geçmişi analiz aşamasından geçirir")
+    parser.add_argument("--csv", default="su_tuketim.csv", help="Önce eşitlenecek CSV (yoksa atlanır)")
+    parser.add_argument("--kolon", default="su_tuketim.kolon", help="Sütunsal depo dizini")
+    parser.add_argument("--bas", type=int, default=0, help="İlk satır")
+    parser.add_argument("--adet", type=int, help="İşlenecek satır sayısı (varsayılan: tümü)")
+    parser.add_argument("--esik", type=float, default=DEBI_ESIGI, help="Optimizasyon debi eşiği (L/dk)")
+    parser.add_argument("--surekli-akis-dk", type=float, default=SUREKLI_DK)
+    parser.add_argument("--rapor-araligi", type=int, default=0, help="Kaç kayıtta bir rapor (0 = sadece sonda)")
+    parser.add_argument("--zamanlama", action="store_true", help="Aşama süresini yazdır")
+    args = parser.parse_args(argv)
+
+    kolon = KolonDeposu(args.kolon)
+    aktarilan, hatali = kolon.csv_esitle(args.csv)
+    if aktarilan or hatali:
+        print(f"CSV'den {aktarilan} satır aktarıldı ({hatali} hatalı)")
+    # Kalıcı dosya verilmez: tekrar, canlı izlemenin özetlerine ve sayaç durumuna dokunmaz
+    metrikler = Metrikler() if args.zamanlama else None
+    kanca = metrikler.kanca if metrikler else None
+    analiz = Analiz(esik=args.esik, rapor_araligi=args.rapor_araligi, anlik_araligi=0,
+                    surekli_dk=args.surekli_akis_dk, kanca=kanca)
+    bit = None if args.adet is None else args.bas + args.adet
+    adet, sure, asama = tekrar(kolon, analiz, args.bas, bit, kanca=kanca)
+    if adet == 0:
+        print("Yeniden işlenecek kayıt yok")
+        return
+
+    print(analiz.rapor())
+    print(analiz.sayac.durum_satiri())
+    ilk, son = analiz.depo["timestamp"][0], analiz.depo["timestamp"][-1]
+    print(f"{adet:,} kayıt ({np.datetime_as_string(ilk, 's')} - {np.datetime_as_string(son, 's')}) "
+          f"{sure:.1f} s'de işlendi ({adet / sure:,.0f} örnek/s)")
+    if args.zamanlama:
+        print(f"Aşama süresi: {asama.sure / adet * 1e6:.1f} µs/örnek ({asama.sure:.2f} s), "
+              f"okuma ve kuyruk dahil toplam {sure / adet * 1e6:.1f} µs/örnek")
+        print(Metrikler.satir(metrikler.goruntu()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+# TOPLU RAPOR (SAYAÇ × GÜN, SÜREÇ HAVUZU)
+# optimizasyon_analizi bellekteki tek sayacın tüm geçmişi için tek rapor üretir; aylık / fatura tipi
+# raporlar için tüm sayaçlarda döngüyle çalıştırılınca tek çekirdekte kalıyordu. Burada geçmiş
+# sayaç ve gün bölümlerine ayrılır:
+#   - Her bölüm ayrı bir süreçte, sütunsal depodan sadece o günün satırları okunarak özetlenir
+#     (GecmisSorgusu.kismi_ozet): kayıt, debi toplamı / maksimumu, tüketim, gereksiz tüketim ve
+#     günün saatlerine göre tüketim. Bölümlere sadece (sayaç, dizin, gün) gönderilir, veri değil.
+#   - Ara toplamlar ana süreçte birleştirilir (birlestir): ortalama debi, yoğun saat ve paylar
+#     birleşik toplamlardan hesaplanır, bölüm sonuçlarının ortalaması alınmaz.
+# Günün ilk örneğinin hacmi önceki günün son örneğinden alındığı için gün toplamları, tüm aralığın
+# tek seferde hesaplanan toplamıyla aynıdır. Havuz kalici.csv_bolumleri'ndeki gibi "spawn" ile kurulur:
+# çağıranın iş parçacıkları ve kilitleri çatallanmaz, davranış her işletim sisteminde aynıdır.
+# Çoklu sayaç düzeni ag_gecidi.py'ninkidir: <veri dizini>/<sayaç kimliği>/ altında birer sütunsal depo.
+# Kullanım:  python -m su_izleme report --toplu [--veri-dizini veri] [--kirilim ay] [--is 4]
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from su_izleme.kalici import DOSYALAR
+from su_izleme.sorgu import GecmisSorgusu
+
+GUN_NS = 86_400 * 10**9
+KIRILIMLAR = ("yok", "gun", "ay")
+
+_sorgular = {}  # İşçi süreç başına açık depolar (aynı sayacın sonraki günleri için)
+
+
+def bos_ozet():
+    return {"kayit": 0, "debi_toplam": 0.0, "debi_maks": 0.0, "litre": 0.0, "gereksiz": 0.0,
+            "saatlik": np.zeros(24)}
+
+
+def birlestir(a, b):
+    """İki ara toplamı birleştirir (a yerinde güncellenir ve döndürülür)"""
+    for alan in ("kayit", "debi_toplam", "litre", "gereksiz", "saatlik"):
+        a[alan] = a[alan] + b[alan]
+    a["debi_maks"] = max(a["debi_maks"], b["debi_maks"])
+    return a
+
+
+def sonuclandir(ozet):
+    """Ara toplamdan rapor değerleri (ortalama debi, gereksiz payı, yoğun saat)"""
+    litre = ozet["litre"]
+    saat = int(np.argmax(ozet["saatlik"]))
+    return {
+        "kayit": ozet["kayit"],
+        "toplam": round(litre, 2),
+        "ortalama_debi": round(ozet["debi_toplam"] / ozet["kayit"], 2) if ozet["kayit"] else 0.0,
+        "maks_debi": round(ozet["debi_maks"], 2),
+        "gereksiz": round(ozet["gereksiz"], 2),
+        "gereksiz_pay": ozet["gereksiz"] / litre if litre > 0 else 0.0,
+        "yogun_saat": saat,
+        "yogun_saat_litre": round(float(ozet["saatlik"][saat]), 2),
+        "yogun_saat_pay": float(ozet["saatlik"][saat]) / litre if litre > 0 else 0.0,
+    }
+
+
+def sayaclar(veri_dizini):
+    """Veri dizinindeki sayaç depoları: {kimlik: dizin}"""
+    return {ad: os.path.join(veri_dizini, ad) for ad in sorted(os.listdir(veri_dizini))
+            if os.path.exists(os.path.join(veri_dizini, ad, DOSYALAR["timestamp"][0]))}
+
+
+def bolumler(sayac_dizinleri, bas=None, bit=None):
+    """[(kimlik, dizin, bas_ns, bit_ns)]: her sayacın verisi olan günleri, [bas, bit) ile kırpılmış.
+
+    İndeksler burada bir kez güncellenip kaydedilir; işçiler sadece okur.
+    """
+    sonuc = []
+    for kimlik, dizin in sayac_dizinleri.items():
+        sorgu = GecmisSorgusu(dizin)
+        n = len(sorgu.kolon)
+        if n == 0:
+            continue
+        ilk = int(sorgu.indeks.minimum.min())
+        son = int(sorgu.indeks.maksimum.max()) + 1
+        a = ilk if bas is None else max(ilk, int(np.datetime64(bas, "ns").astype(np.int64)))
+        b = son if bit is None else min(son, int(np.datetime64(bit, "ns").astype(np.int64)))
+        for gun in range(a - a % GUN_NS, b, GUN_NS):
+            sonuc.append((kimlik, dizin, max(gun, a), min(gun + GUN_NS, b)))
+    return sonuc
+
+
+def bolum_ozeti(bolum):
+    """İşçide çalışır: bir (sayaç, gün) bölümünün ara toplamı"""
+    kimlik, dizin, bas, bit = bolum
+    sorgu = _sorgular.get(dizin)
+    if sorgu is None:
+        sorgu = _sorgular[dizin] = GecmisSorgusu(dizin)
+    return kimlik, bas, sorgu.kismi_ozet(bas, bit)
+
+
+def donem(bas_ns, kirilim):
+    if kirilim == "gun":
+        return str(np.datetime64(bas_ns, "ns").astype("datetime64[D]"))
+    if kirilim == "ay":
+        return str(np.datetime64(bas_ns, "ns").astype("datetime64[M]"))
+    return ""
+
+
+def toplu_rapor(sayac_dizinleri, bas=None, bit=None, is_sayisi=None, kirilim="yok"):
+    """Sayaç × gün bölümlerini is_sayisi süreçte özetleyip birleştirir.
+
+    is_sayisi=1 ise havuz kurulmaz (aynı süreçte sırayla). Sözlük döndürür:
+      donemler {(kimlik, dönem): ara toplam}, sayaclar {kimlik: ara toplam}, genel, bolum
+    """
+    gorevler = bolumler(sayac_dizinleri, bas, bit)
+    is_sayisi = is_sayisi or os.cpu_count() or 1
+    if is_sayisi == 1 or len(gorevler) <= 1:
+        sonuclar = map(bolum_ozeti, gorevler)
+        return _topla(sonuclar, kirilim, len(gorevler))
+    # Parti: işçi başına ~4 parti (yük dengesi) ama gidiş-dönüş sayısı bölüm sayısıyla büyümesin
+    parti = max(1, len(gorevler) // (is_sayisi * 4))
+    with ProcessPoolExecutor(max_workers=is_sayisi, mp_context=multiprocessing.get_context("spawn")) as havuz:
+        return _topla(havuz.map(bolum_ozeti, gorevler, chunksize=parti), kirilim, len(gorevler))
+
+
+def _topla(sonuclar, kirilim, bolum_sayisi):
+    donemler, sayac_toplam, genel = {}, {}, bos_ozet()
+    for kimlik, bas, ozet in sonuclar:
+        birlestir(donemler.setdefault((kimlik, donem(bas, kirilim)), bos_ozet()), ozet)
+        birlestir(sayac_toplam.setdefault(kimlik, bos_ozet()), ozet)
+        birlestir(genel, ozet)
+    return {"donemler": donemler, "sayaclar": sayac_toplam, "genel": genel, "bolum": bolum_sayisi}
+
+
+def tablo(rapor, kirilim="yok"):
+    """Raporu sayaç (ve dönem) başına bir satırlık tabloya çevirir"""
+    satirlar = [f"{'Sayaç':<14} {'Dönem':<10} | {'Kayıt':>10} | {'Toplam L':>10} | {'Ort. debi':>9} | "
+                f"{'Maks':>6} | {'Gereksiz L':>14} | Yoğun saat"]
+    satirlar.append("-" * len(satirlar[0]))
+
+    def satir(kimlik, donem_adi, ozet):
+        s = sonuclandir(ozet)
+        return (f"{kimlik:<14} {donem_adi:<10} | {s['kayit']:>10,} | {s['toplam']:>10.2f} | "
+                f"{s['ortalama_debi']:>9.2f} | {s['maks_debi']:>6.2f} | "
+                f"{s['gereksiz']:>8.2f} ({s['gereksiz_pay'] * 100:>2.0f}%) | "
+                f"{s['yogun_saat']:02d}:00 {s['yogun_saat_litre']:.1f} L ({s['yogun_saat_pay'] * 100:.0f}%)")
+
+    for kimlik, ozet in rapor["sayaclar"].items():
+        if kirilim != "yok":
+            for (k, donem_adi), donem_ozeti in sorted(rapor["donemler"].items()):
+                if k == kimlik:
+                    satirlar.append(satir(kimlik, donem_adi, donem_ozeti))
+        satirlar.append(satir(kimlik, "toplam", ozet))
+    if len(rapor["sayaclar"]) > 1:
+        satirlar.append("-" * len(satirlar[0]))
+        satirlar.append(satir("TÜM SAYAÇLAR", "", rapor["genel"]))
+    return "\n".join(satirlar)
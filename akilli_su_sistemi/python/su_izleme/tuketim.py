@@ -0,0 +1,208 @@
+# TÜKETİM ANALİZİ
+# Toplu (tüm geçmiş üzerinden) ve artımlı (örnek başına O(1)) tüketim hesapları.
+# optimizasyon_analizi her UPDATE_INTERVAL kayıtta tüm geçmişi yeniden tarıyordu;
+# ArtimliAnaliz aynı sonuçları her yeni örnekte sabit maliyetle günceller.
+# Hacim ve süre, tüm zaman çizelgesinde ardışık örnekler arasından alınır (ornek_hacimleri) ve
+# kişi var / yok aralıklarına paylaştırılır (tuketim_araliklari); gereksiz tüketim "yok" aralıklarının toplamıdır.
+
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+
+BOSLUK_S = 10.0  # Ardışık iki örnek arası bundan uzunsa (cihaz kapalı) süre sayılmaz
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _ns(ts):
+    """datetime / np.datetime64 / int zaman damgasını nanosaniye (int) cinsine çevirir"""
+    if isinstance(ts, datetime):
+        return (ts.replace(tzinfo=None) - _EPOCH) // timedelta(microseconds=1) * 1000
+    if isinstance(ts, np.datetime64):
+        return int(ts.astype("datetime64[ns]").astype(np.int64))
+    return int(ts)
+
+
+# -----------------------------
+# TOPLU HESAPLAR
+# -----------------------------
+
+def ortalama_tuketim(df):
+    """Ortalama anlık debiyi L/dk cinsinden hesaplar; sonlu olmayan (NaN) debiler sayılmaz"""
+    debi = np.asarray(df["flow_lpm"], dtype=np.float64)
+    debi = debi[np.isfinite(debi)]
+    if len(debi) == 0:
+        return 0.0
+    return round(float(debi.mean()), 2)
+
+
+def kaydir(dizi, ilk):
+    """Her örneğin bir önceki değerini verir; ilk örneğin öncesi 'ilk' olur"""
+    dizi = np.asarray(dizi)
+    return np.concatenate((np.asarray([ilk], dtype=dizi.dtype), dizi[:-1]))
+
+
+def ornek_hacimleri(zaman_ns, debi, cumulative, onceki_ns, onceki_c, bosluk_s=BOSLUK_S):
+    """Her örnek için bir önceki ölçümden bu yana geçen süreyi (s) ve akan suyu (L) döndürür.
+
+    Hacim sayaç farkından alınır; sayaç geri gittiyse (Arduino yeniden başladı) yeni değer
+    sıfırdan tüketim sayılır. Örneğin veya bir önceki örneğin sayaç değeri yoksa (NaN) debi × süre
+    kullanılır: önceki değerin eksikliği sıfırlama sayılmaz (yoksa sayacın tamamı tüketim olurdu).
+    Geri giden veya bosluk_s'den uzun (cihaz kapalı) aralıkların süresi 0 sayılır.
+    """
+    sure = (np.asarray(zaman_ns, dtype=np.int64) - onceki_ns) / 1e9
+    sure[(sure < 0) | (sure > bosluk_s)] = 0.0
+    cumulative = np.asarray(cumulative, dtype=np.float64)
+    litre = cumulative - onceki_c
+    litre = np.where(litre < 0, cumulative, litre)  # NaN < 0 yanlış: eksik fark NaN kalır
+    eksik = np.isnan(litre)
+    if eksik.any():
+        litre[eksik] = (np.asarray(debi, dtype=np.float64) * sure / 60.0)[eksik]
+    return sure, litre
+
+
+def tuketim_araliklari(zaman, debi, cumulative, ir_state, onceki_ns=None, onceki_c=None, bosluk_s=BOSLUK_S):
+    """Zaman çizelgesini kişi var / yok aralıklarına böler; her aralığın süresini ve hacmini
+    tüm çizelge üzerinden tek geçişte hesaplar.
+
+    Örnek i'nin önceki ölçümle arasındaki süre ve hacim i'nin IR durumuna yazılır. onceki_ns /
+    onceki_c ilk örnekten önceki ölçümdür (veya örnek başına önceki ölçüm dizileridir); verilmezse
+    ilk örneğin süresi ve hacmi 0 sayılır. Sütun sözlüğü döndürür:
+      baslangic, bitis  aralığın ilk ve son örneğinin zamanı
+      varlik            aralıkta kişi var mı
+      ornek, sure_s, litre
+    """
+    zaman = np.asarray(zaman, dtype="datetime64[ns]")
+    ns = zaman.view(np.int64)
+    if len(ns) == 0:
+        return {"baslangic": zaman, "bitis": zaman, "varlik": np.empty(0, dtype=bool),
+                "ornek": np.empty(0, dtype=np.int64), "sure_s": np.empty(0), "litre": np.empty(0)}
+    cumulative = np.asarray(cumulative, dtype=np.float64)
+    if onceki_ns is None:
+        onceki_ns, onceki_c = ns[0], cumulative[0]
+    if np.ndim(onceki_ns) == 0:
+        onceki_ns, onceki_c = kaydir(ns, onceki_ns), kaydir(cumulative, onceki_c)
+    sure, litre = ornek_hacimleri(ns, debi, cumulative, onceki_ns, onceki_c, bosluk_s)
+
+    varlik = np.asarray(ir_state) != 0
+    baslar = np.flatnonzero(np.concatenate(([True], varlik[1:] != varlik[:-1])))
+    sonlar = np.append(baslar[1:], len(ns))
+    return {
+        "baslangic": zaman[baslar],
+        "bitis": zaman[sonlar - 1],
+        "varlik": varlik[baslar],
+        "ornek": sonlar - baslar,
+        "sure_s": np.add.reduceat(sure, baslar),
+        "litre": np.add.reduceat(litre, baslar),
+    }
+
+
+def aralik_toplamlari(araliklar):
+    """tuketim_araliklari sonucundan kişi var / yok toplam hacim (L) ve süre (s)"""
+    varlik = araliklar["varlik"]
+    return {
+        "varlik_litre": float(araliklar["litre"][varlik].sum()),
+        "yokluk_litre": float(araliklar["litre"][~varlik].sum()),
+        "varlik_s": float(araliklar["sure_s"][varlik].sum()),
+        "yokluk_s": float(araliklar["sure_s"][~varlik].sum()),
+    }
+
+
+def gereksiz_tuketim_hesapla(df):
+    """IR sensörü 0 iken akan toplam suyu litre cinsinden hesaplar.
+
+    Süre ve hacim tüm zaman çizelgesinde ardışık örnekler arasından alınır; kişi varken geçen
+    aralıklar gereksiz sayılmaz.
+    """
+    if df.empty:
+        return 0.0
+    try:
+        araliklar = tuketim_araliklari(df["timestamp"], df["flow_lpm"], df["cumulative_liters"], df["ir_state"])
+        total_waste = aralik_toplamlari(araliklar)["yokluk_litre"]
+        return round(total_waste, 2)
+    except Exception as e:
+        print(f"Gereksiz tüketim hesaplama hatası: {e}")
+        return 0.0
+
+
+# -----------------------------
+# ARTIMLI HESAPLAR
+# -----------------------------
+
+class ArtimliAnaliz:
+    """Ortalama debi, toplam tüketim ve gereksiz tüketimi örnek başına O(1) günceller.
+
+    Sonuçlar ortalama_tuketim / gereksiz_tuketim_hesapla ile aynıdır; örneklerin zaman
+    sırasıyla geldiği varsayılır.
+    """
+
+    def __init__(self):
+        self.kayit_sayisi = 0
+        self._debi_toplam = 0.0
+        self._debi_sayisi = 0  # Ortalamaya katılan sonlu debi sayısı (ayrıştırıcı "nan" kabul eder)
+        self._son_cumulative = 0.0  # Son örneğin ham sayaç değeri (NaN olabilir; sonraki fark bununla alınır)
+        self._son_gecerli = 0.0  # Son geçerli sayaç değeri (toplam)
+        self._israf = 0.0
+        self._son_ns = None  # Son örneğin zamanı
+
+    def guncelle(self, timestamp, flow, cumulative, ir_state):
+        """Tek bir yeni örneği hesaplara katar"""
+        self.kayit_sayisi += 1
+        if math.isfinite(flow):
+            self._debi_toplam += flow
+            self._debi_sayisi += 1
+        ns = _ns(timestamp)
+        if self._son_ns is not None and ir_state == 0:
+            # ornek_hacimleri'nin tek örnek karşılığı
+            sure = (ns - self._son_ns) / 1e9
+            if sure < 0 or sure > BOSLUK_S:
+                sure = 0.0
+            litre = cumulative - self._son_cumulative
+            if litre < 0:
+                litre = cumulative
+            if litre != litre:  # Bu veya önceki örneğin sayacı NaN
+                litre = flow * sure / 60.0
+            self._israf += litre
+        self._son_ns = ns
+        self._son_cumulative = cumulative
+        if cumulative == cumulative:
+            self._son_gecerli = cumulative
+
+    def toplu_guncelle(self, timestamp, flow, cumulative, ir_state):
+        """Dizi halindeki örnekleri (ör. CSV geçmişi) vektörel olarak hesaplara katar"""
+        flow = np.asarray(flow, dtype=np.float64)
+        if len(flow) == 0:
+            return
+        ns = np.asarray(timestamp, dtype="datetime64[ns]").view(np.int64)
+        cumulative = np.asarray(cumulative, dtype=np.float64)
+        self.kayit_sayisi += len(flow)
+        sonlu = np.isfinite(flow)
+        self._debi_toplam += float(flow[sonlu].sum())
+        self._debi_sayisi += int(sonlu.sum())
+
+        if self._son_ns is None:
+            onceki_ns, onceki_c = ns[0], cumulative[0]
+        else:
+            onceki_ns, onceki_c = self._son_ns, self._son_cumulative
+        _, litre = ornek_hacimleri(ns, flow, cumulative, kaydir(ns, onceki_ns), kaydir(cumulative, onceki_c))
+        self._israf += float(litre[np.asarray(ir_state) == 0].sum())
+        self._son_ns = int(ns[-1])
+        self._son_cumulative = float(cumulative[-1])
+        gecerli = cumulative[~np.isnan(cumulative)]
+        if len(gecerli):
+            self._son_gecerli = float(gecerli[-1])
+
+    def ortalama_debi(self):
+        """Ortalama anlık debi (L/dk)"""
+        if self._debi_sayisi == 0:
+            return 0.0
+        return round(self._debi_toplam / self._debi_sayisi, 2)
+
+    def toplam(self):
+        """Son okunan geçerli toplam tüketim (L)"""
+        return self._son_gecerli
+
+    def gereksiz_tuketim(self):
+        """IR sensörü 0 iken akan toplam su (L)"""
+        return round(self._israf, 2)
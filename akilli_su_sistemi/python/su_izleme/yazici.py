@@ -0,0 +1,133 @@
+# TAMPONLU CSV YAZICI
+# kaydet_csv her örnekte dosyayı açıp kapatıyordu (örnek başına bir open/close).
+# Bu sınıf dosyayı bir kez açar, satırları bellekte biriktirir ve toplu yazar:
+#   - max_satir satır birikince veya en eski satır max_sure saniyeyi geçince diske yazılır
+#   - os.fsync yalnızca kontrol noktalarında (fsync_sure aralıkla ve kapanışta) çağrılır
+# Program çökerse en fazla max_satir satır / max_sure saniyelik veri kaybolur (yazma günlüğü açıksa
+# kaybolmaz, bkz. gunluk.py). Çökmede yarım kalan son satır açılışta kesilir; yeni satırlar ona yapışmaz.
+
+import csv
+import os
+import threading
+import time
+
+
+def yarim_satiri_kes(yol):
+    """Dosya satır sonuyla bitmiyorsa son (yarım) satırı siler; silinen bayt sayısını döndürür"""
+    with open(yol, "r+b") as f:
+        boyut = f.seek(0, os.SEEK_END)
+        konum = boyut
+        while konum > 0:
+            blok = min(4096, konum)
+            f.seek(konum - blok)
+            parca = f.read(blok)
+            if konum == boyut and parca.endswith(b"\n"):
+                return 0
+            satir_sonu = parca.rfind(b"\n")
+            if satir_sonu >= 0:
+                konum = konum - blok + satir_sonu + 1
+                break
+            konum -= blok
+        f.truncate(konum)
+    print(f"{yol}: yarım kalan son satır ({boyut - konum} bayt) silindi")
+    return boyut - konum
+
+
+class TamponluCSVYazici:
+    """Uzun ömürlü, toplu yazan CSV yazıcısı"""
+
+    def __init__(self, yol, basliklar=None, max_satir=50, max_sure=5.0,
+                 fsync_sure=60.0, arka_plan=True):
+        if max_satir < 1 or max_sure <= 0:
+            raise ValueError("max_satir ve max_sure pozitif olmalı")
+        self.yol = yol
+        self.max_satir = max_satir
+        self.max_sure = max_sure
+        self.fsync_sure = fsync_sure
+
+        if os.path.exists(yol):
+            yarim_satiri_kes(yol)
+        yeni_dosya = not os.path.exists(yol) or os.path.getsize(yol) == 0
+        self._dosya = open(yol, "a", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._dosya)
+        if basliklar and yeni_dosya:
+            self._writer.writerow(basliklar)
+            self._dosya.flush()
+
+        self._tampon = []
+        self._ilk_zaman = None  # Tampondaki en eski satırın eklenme zamanı
+        self._son_fsync = time.monotonic()
+        self._kilit = threading.Lock()
+        self._durdur = threading.Event()
+        self.yazilan_satir = 0
+        self.bosaltma_sayisi = 0
+
+        # Yeni örnek gelmese bile eski satırlar max_sure içinde diske insin
+        self._is = None
+        if arka_plan:
+            self._is = threading.Thread(target=self._zamanlayici, name="csv-bosaltici", daemon=True)
+            self._is.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.kapat()
+
+    @property
+    def kapali(self):
+        return self._dosya.closed
+
+    def yaz(self, row):
+        """Satırı tampona ekler; sınırlar aşıldıysa diske yazar"""
+        with self._kilit:
+            if self._dosya.closed:
+                raise ValueError("Yazıcı kapatılmış")
+            self._tampon.append(row)
+            if self._ilk_zaman is None:
+                self._ilk_zaman = time.monotonic()
+            if (len(self._tampon) >= self.max_satir
+                    or time.monotonic() - self._ilk_zaman >= self.max_sure):
+                self._bosalt()
+
+    def bosalt(self, fsync=False):
+        """Tampondakileri hemen diske yazar (fsync=True ise kontrol noktası oluşturur)"""
+        with self._kilit:
+            if not self._dosya.closed:
+                self._bosalt(fsync)
+
+    def _bosalt(self, fsync=False):
+        # Kilit çağıran tarafından tutulur
+        if self._tampon:
+            self._writer.writerows(self._tampon)
+            self.yazilan_satir += len(self._tampon)
+            self.bosaltma_sayisi += 1
+            self._tampon = []
+            self._ilk_zaman = None
+        self._dosya.flush()
+        simdi = time.monotonic()
+        if fsync or simdi - self._son_fsync >= self.fsync_sure:
+            os.fsync(self._dosya.fileno())
+            self._son_fsync = simdi
+
+    def _zamanlayici(self):
+        aralik = min(self.max_sure / 2, 1.0)
+        while not self._durdur.wait(aralik):
+            with self._kilit:
+                if self._dosya.closed:
+                    return
+                if self._ilk_zaman is not None and time.monotonic() - self._ilk_zaman >= self.max_sure:
+                    self._bosalt()
+
+    def kapat(self):
+        """Kalan satırları yazar, fsync yapar ve dosyayı kapatır (tekrar çağrılabilir)"""
+        self._durdur.set()
+        with self._kilit:
+            if self._dosya.closed:
+                return
+            try:
+                self._bosalt(fsync=True)
+            finally:
+                self._dosya.close()
+        if self._is is not None and self._is is not threading.current_thread():
+            self._is.join(timeout=1.0)